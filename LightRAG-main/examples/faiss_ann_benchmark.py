@@ -0,0 +1,177 @@
+"""
+Faiss ANN Benchmark: recall and latency of HNSW / IVF-PQ against the flat index
+
+This script loads the same synthetic corpus into FaissVectorDBStorage once per
+index type, then queries each storage and reports recall@k against the exact
+flat index together with query latency percentiles and build time.
+
+Vectors are drawn from a mixture of Gaussian clusters so the data has the
+neighbourhood structure ANN indexes rely on; no embedding model is needed.
+
+Requirements:
+    pip install faiss-cpu
+
+Usage:
+    python examples/faiss_ann_benchmark.py --vectors 200000 --dim 768 --queries 500
+    python examples/faiss_ann_benchmark.py --types hnsw --hnsw-ef-search 64 256
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.namespace import NameSpace
+from lightrag.utils import EmbeddingFunc
+
+
+def make_corpus(num_vectors: int, dim: int, num_queries: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, num_vectors // 1000), dim))
+    assignments = rng.integers(0, len(centers), num_vectors + num_queries)
+    data = centers[assignments] + 0.5 * rng.standard_normal(
+        (num_vectors + num_queries, dim)
+    )
+    data = data.astype(np.float32)
+    return data[:num_vectors], data[num_vectors:]
+
+
+async def build_storage(working_dir, vectors, batch_size, **options):
+    """Create a storage whose embedding function looks vectors up by content"""
+
+    async def lookup_embedding(texts: list[str], _priority: int = 0) -> np.ndarray:
+        return vectors[[int(text) for text in texts]]
+
+    storage = FaissVectorDBStorage(
+        namespace=NameSpace.VECTOR_STORE_CHUNKS,
+        workspace="",
+        global_config={
+            "working_dir": working_dir,
+            "embedding_batch_num": batch_size,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                **options,
+            },
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=vectors.shape[1], func=lookup_embedding, model_name="bench"
+        ),
+    )
+    await storage.initialize()
+
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), batch_size):
+        await storage.upsert(
+            {
+                f"vec-{i}": {"content": str(i)}
+                for i in range(offset, min(offset + batch_size, len(vectors)))
+            }
+        )
+    # Training / rebuilding happens according to the policy at index_done_callback
+    await storage.index_done_callback()
+    return storage, time.perf_counter() - start
+
+
+async def run_queries(storage, queries, top_k):
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        hits = await storage.query("", top_k, query_embedding=query.tolist())
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([hit["id"] for hit in hits])
+    return results, latencies
+
+
+def report(name, build_time, latencies, results, truth, top_k):
+    recall = statistics.mean(
+        len(set(found) & set(expected)) / top_k
+        for found, expected in zip(results, truth)
+    )
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:<22} recall@{top_k}={recall:6.3f}  "
+        f"p50={statistics.median(latencies):7.2f} ms  p95={p95:7.2f} ms  "
+        f"build={build_time:7.1f} s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=2048)
+    parser.add_argument(
+        "--types", nargs="+", default=["hnsw", "ivfpq"], choices=["hnsw", "ivfpq"]
+    )
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--hnsw-ef-search", type=int, nargs="+", default=[64, 128])
+    parser.add_argument("--ivf-nlist", type=int, default=0, help="0 = auto")
+    parser.add_argument("--ivf-nprobe", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--pq-m", type=int, default=0, help="0 = auto")
+    args = parser.parse_args()
+
+    initialize_share_data(workers=1)
+    vectors, queries = make_corpus(args.vectors, args.dim, args.queries)
+    print(f"corpus: {args.vectors} vectors x {args.dim} dims, {args.queries} queries")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flat, build_time = await build_storage(
+            f"{tmp}/flat", vectors, args.batch_size, faiss_index_type="flat"
+        )
+        truth, latencies = await run_queries(flat, queries, args.top_k)
+        report("flat", build_time, latencies, truth, truth, args.top_k)
+        await flat.drop()
+
+        if "hnsw" in args.types:
+            storage, build_time = await build_storage(
+                f"{tmp}/hnsw",
+                vectors,
+                args.batch_size,
+                faiss_index_type="hnsw",
+                faiss_hnsw_m=args.hnsw_m,
+            )
+            for ef in args.hnsw_ef_search:
+                storage._hnsw_ef_search = ef
+                storage._apply_search_params()
+                results, latencies = await run_queries(storage, queries, args.top_k)
+                report(
+                    f"hnsw ef={ef}", build_time, latencies, results, truth, args.top_k
+                )
+            await storage.drop()
+
+        if "ivfpq" in args.types:
+            storage, build_time = await build_storage(
+                f"{tmp}/ivfpq",
+                vectors,
+                args.batch_size,
+                faiss_index_type="ivfpq",
+                faiss_ivf_nlist=args.ivf_nlist,
+                faiss_pq_m=args.pq_m,
+                faiss_train_min_vectors=min(10000, args.vectors),
+            )
+            for nprobe in args.ivf_nprobe:
+                storage._ivf_nprobe = nprobe
+                storage._apply_search_params()
+                results, latencies = await run_queries(storage, queries, args.top_k)
+                report(
+                    f"ivfpq nprobe={nprobe}",
+                    build_time,
+                    latencies,
+                    results,
+                    truth,
+                    args.top_k,
+                )
+            await storage.drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+"""
+Neo4j Evidence Index Benchmark: evidence queries before and after the evidence indexes
+
+This script seeds a synthetic workspace the way earlier versions stored it (no
+indexes on evidence fields, no denormalized scene_tags_key), then reports:
+
+1. how long the scene_tags_key backfill takes,
+2. query latency of the evidence queries without the evidence indexes,
+3. query latency once the indexes are created and online.
+
+Evidence levels and scene tags are skewed so that the queried values are
+selective (S-level evidence and the "rare" scene are about 1% of the nodes),
+which is the case where label scans are most expensive.
+
+Requirements:
+    A running Neo4j 5 instance configured with NEO4J_URI / NEO4J_USERNAME /
+    NEO4J_PASSWORD. The benchmark workspace is dropped at the end; relationship
+    indexes are shared by all workspaces and are kept.
+
+Usage:
+    python examples/neo4j_evidence_index_benchmark.py --nodes 1000000 --edges 2000000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from lightrag.kg.neo4j_impl import Neo4JStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
+LEVELS = ["S"] * 1 + ["A"] * 9 + ["B"] * 60 + ["C"] * 30
+RELATION_TYPES = (
+    ["related"] * 80 + ["support"] * 10 + ["contradict"] * 5 + ["causal"] * 5
+)
+SCENES = [f"scene-{i}" for i in range(20)]
+
+
+def random_tags(rng: random.Random) -> list[str]:
+    tags = rng.sample(SCENES, rng.randint(0, 3))
+    if rng.random() < 0.01:
+        tags.append("rare")
+    return tags
+
+
+async def seed(storage: Neo4JStorage, nodes: int, edges: int, batch_size: int):
+    """Write nodes and edges directly, without scene_tags_key like legacy data"""
+    rng = random.Random(42)
+    label = storage._get_workspace_label()
+    async with storage._driver.session(database=storage._DATABASE) as session:
+        for offset in range(0, nodes, batch_size):
+            rows = [
+                {
+                    "entity_id": f"entity-{i}",
+                    "evidence_level": rng.choice(LEVELS),
+                    "scene_tags": random_tags(rng),
+                }
+                for i in range(offset, min(offset + batch_size, nodes))
+            ]
+            result = await session.run(
+                f"""
+                UNWIND $rows AS row
+                CREATE (n:`{label}` {{entity_id: row.entity_id}})
+                SET n.entity_name = row.entity_id,
+                    n.entity_type = "bench",
+                    n.evidence_level = row.evidence_level,
+                    n.scene_tags = row.scene_tags
+                """,
+                rows=rows,
+            )
+            await result.consume()
+
+        for offset in range(0, edges, batch_size):
+            rows = [
+                {
+                    "src": f"entity-{rng.randrange(nodes)}",
+                    "tgt": f"entity-{rng.randrange(nodes)}",
+                    "relation_type": rng.choice(RELATION_TYPES),
+                    "evidence_level": rng.choice(LEVELS),
+                    "scene_tags": random_tags(rng),
+                }
+                for _ in range(offset, min(offset + batch_size, edges))
+            ]
+            result = await session.run(
+                f"""
+                UNWIND $rows AS row
+                MATCH (a:`{label}` {{entity_id: row.src}})
+                MATCH (b:`{label}` {{entity_id: row.tgt}})
+                CREATE (a)-[r:DIRECTED]->(b)
+                SET r.relation_type = row.relation_type,
+                    r.evidence_level = row.evidence_level,
+                    r.scene_tags = row.scene_tags,
+                    r.description = "bench"
+                """,
+                rows=rows,
+            )
+            await result.consume()
+
+
+async def drop_evidence_indexes(storage: Neo4JStorage):
+    label = storage._get_workspace_label()
+    async with storage._driver.session(database=storage._DATABASE) as session:
+        for name in storage._get_evidence_index_statements(label):
+            result = await session.run(f"DROP INDEX {name} IF EXISTS")
+            await result.consume()
+
+
+async def await_indexes(storage: Neo4JStorage):
+    async with storage._driver.session(database=storage._DATABASE) as session:
+        result = await session.run("CALL db.awaitIndexes(600)")
+        await result.consume()
+
+
+def queries(storage: Neo4JStorage):
+    return {
+        "entities by level S": lambda: storage.get_entities_by_evidence_level("S"),
+        "entities by scene": lambda: storage.get_entities_by_scene("rare"),
+        "entities by level+scene": lambda: (
+            storage.get_entities_by_evidence_level_and_scene("S", "scene-1")
+        ),
+        "relations by level S": lambda: storage.get_relations_by_evidence_level("S"),
+        "relations by type": lambda: storage.get_relations_by_type("causal"),
+        "relations by scene": lambda: storage.get_relations_by_scene("rare"),
+        "aggregate evidence": lambda: storage.aggregate_evidence(
+            scene_tag="rare", evidence_level="S"
+        ),
+        "cross validate": lambda: storage.cross_validate("entity-7"),
+    }
+
+
+async def run_queries(storage: Neo4JStorage, repeats: int) -> dict[str, float]:
+    timings = {}
+    for name, query in queries(storage).items():
+        await query()  # warm up the plan cache
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await query()
+            latencies.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(latencies)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges", type=int, default=400000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--workspace", default="evidence_index_bench")
+    args = parser.parse_args()
+
+    initialize_share_data(workers=1)
+    storage = Neo4JStorage(
+        namespace="chunk_entity_relation",
+        workspace=args.workspace,
+        global_config={"working_dir": "."},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    try:
+        await storage.drop()
+        await drop_evidence_indexes(storage)
+
+        start = time.perf_counter()
+        await seed(storage, args.nodes, args.edges, args.batch_size)
+        print(
+            f"seeded {args.nodes} nodes / {args.edges} edges "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+
+        label = storage._get_workspace_label()
+        start = time.perf_counter()
+        await storage._migrate_scene_tags_key(storage._driver, storage._DATABASE, label)
+        print(f"scene_tags_key backfill: {time.perf_counter() - start:.1f} s")
+
+        before = await run_queries(storage, args.repeats)
+
+        start = time.perf_counter()
+        await storage._create_evidence_indexes(
+            storage._driver, storage._DATABASE, label
+        )
+        await await_indexes(storage)
+        print(f"index build: {time.perf_counter() - start:.1f} s")
+
+        after = await run_queries(storage, args.repeats)
+
+        print(f"\n{'query':<26}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float("inf")
+            print(
+                f"{name:<26}{before[name]:>12.2f}{after[name]:>12.2f}{speedup:>9.1f}x"
+            )
+    finally:
+        await storage.drop()
+        await storage.finalize()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+Rerank Latency Benchmark: local cross-encoder vs HTTP rerank service
+
+This script sends the same concurrent rerank workload to the in-process
+`local_rerank` binding and to an HTTP rerank binding, then prints latency
+percentiles and throughput for both.
+
+Configuration:
+1. Local reranker (always benchmarked):
+    RERANK_LOCAL_MODEL (default: BAAI/bge-reranker-base)
+    RERANK_LOCAL_BACKEND=sentence-transformers | onnx
+    RERANK_LOCAL_BATCH_SIZE, RERANK_LOCAL_BATCH_WAIT_MS, RERANK_LOCAL_WORKERS
+2. HTTP reranker (skipped when RERANK_BINDING_HOST is not set):
+    RERANK_BINDING=cohere | jina | aliyun
+    RERANK_MODEL
+    RERANK_BINDING_HOST
+    RERANK_BINDING_API_KEY
+
+Usage:
+    python examples/rerank_benchmark.py --queries 64 --concurrency 8 --docs 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from lightrag.rerank import ali_rerank, cohere_rerank, jina_rerank, local_rerank
+
+HTTP_RERANKERS = {"cohere": cohere_rerank, "jina": jina_rerank, "aliyun": ali_rerank}
+
+WORDS = (
+    "capital bank policy risk evidence regulation credit liquidity report audit "
+    "market asset customer compliance disclosure capital ratio loan deposit fund"
+).split()
+
+
+def make_workload(num_queries: int, num_docs: int, doc_words: int, seed: int = 42):
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(num_queries):
+        query = " ".join(rng.choices(WORDS, k=8))
+        docs = [" ".join(rng.choices(WORDS, k=doc_words)) for _ in range(num_docs)]
+        workload.append((query, docs))
+    return workload
+
+
+async def run(name, rerank_func, workload, concurrency, top_n):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query, docs):
+        async with semaphore:
+            start = time.perf_counter()
+            await rerank_func(query=query, documents=docs, top_n=top_n)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Warm-up call loads the model / opens connections outside the measurement
+    await rerank_func(query=workload[0][0], documents=workload[0][1], top_n=top_n)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(q, d) for q, d in workload))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"{name:<8} queries={len(latencies):<5} "
+        f"p50={statistics.median(latencies):8.1f} ms  p95={p95:8.1f} ms  "
+        f"mean={statistics.mean(latencies):8.1f} ms  throughput={len(latencies) / wall:7.1f} q/s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--docs", type=int, default=20, help="documents per query")
+    parser.add_argument("--doc-words", type=int, default=120)
+    parser.add_argument("--top-n", type=int, default=10)
+    args = parser.parse_args()
+
+    workload = make_workload(args.queries, args.docs, args.doc_words)
+
+    local_model = os.getenv("RERANK_LOCAL_MODEL", "BAAI/bge-reranker-base")
+
+    async def local_func(**kwargs):
+        return await local_rerank(model=local_model, **kwargs)
+
+    await run("local", local_func, workload, args.concurrency, args.top_n)
+
+    host = os.getenv("RERANK_BINDING_HOST")
+    if not host:
+        print("http     skipped (RERANK_BINDING_HOST not set)")
+        return
+
+    binding = os.getenv("RERANK_BINDING", "cohere")
+    http_func = HTTP_RERANKERS[binding]
+
+    async def remote_func(**kwargs):
+        return await http_func(
+            model=os.getenv("RERANK_MODEL"),
+            base_url=host,
+            api_key=os.getenv("RERANK_BINDING_API_KEY"),
+            **kwargs,
+        )
+
+    await run("http", remote_func, workload, args.concurrency, args.top_n)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
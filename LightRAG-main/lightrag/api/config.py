@@ -41,6 +41,9 @@ from lightrag.constants import (
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_RERANK_BINDING,
     DEFAULT_ENTITY_TYPES,
+    DEFAULT_LOAD_BALANCE_STRATEGY,
+    DEFAULT_LOAD_BALANCE_EJECT_AFTER,
+    DEFAULT_LOAD_BALANCE_EJECT_SECONDS,
 )
 
 # use the .env that is inside the current folder
@@ -74,6 +77,12 @@ def get_default_host(binding_type: str) -> str:
     )  # fallback to ollama if unknown
 
 
+def parse_csv_env(env_key: str) -> list[str]:
+    """Read a comma separated list from the environment, empty entries dropped"""
+    value = get_env_value(env_key, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 def parse_args() -> argparse.Namespace:
     """
     Parse command line arguments with environment variable fallback
@@ -254,7 +263,7 @@ def parse_args() -> argparse.Namespace:
         "--rerank-binding",
         type=str,
         default=get_env_value("RERANK_BINDING", DEFAULT_RERANK_BINDING),
-        choices=["null", "cohere", "jina", "aliyun"],
+        choices=["null", "cohere", "jina", "aliyun", "local"],
         help=f"Rerank binding type (default: from env or {DEFAULT_RERANK_BINDING})",
     )
 
@@ -355,6 +364,22 @@ def parse_args() -> argparse.Namespace:
     args.llm_binding_api_key = get_env_value("LLM_BINDING_API_KEY", None)
     args.embedding_binding_api_key = get_env_value("EMBEDDING_BINDING_API_KEY", "")
 
+    # Multiple endpoints/keys of the same binding for load balancing and failover
+    # (comma separated; a single host or key is shared by all entries)
+    args.llm_binding_hosts = parse_csv_env("LLM_BINDING_HOSTS")
+    args.llm_binding_api_keys = parse_csv_env("LLM_BINDING_API_KEYS")
+    args.embedding_binding_hosts = parse_csv_env("EMBEDDING_BINDING_HOSTS")
+    args.embedding_binding_api_keys = parse_csv_env("EMBEDDING_BINDING_API_KEYS")
+    args.load_balance_strategy = get_env_value(
+        "LOAD_BALANCE_STRATEGY", DEFAULT_LOAD_BALANCE_STRATEGY
+    )
+    args.load_balance_eject_after = get_env_value(
+        "LOAD_BALANCE_EJECT_AFTER", DEFAULT_LOAD_BALANCE_EJECT_AFTER, int
+    )
+    args.load_balance_eject_seconds = get_env_value(
+        "LOAD_BALANCE_EJECT_SECONDS", DEFAULT_LOAD_BALANCE_EJECT_SECONDS, float
+    )
+
     # Inject model configuration
     args.llm_model = get_env_value("LLM_MODEL", "mistral-nemo:latest")
     # EMBEDDING_MODEL defaults to None - each binding will use its own default model
@@ -4,7 +4,7 @@ LightRAG FastAPI Server
 
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
@@ -48,6 +48,11 @@ from lightrag import LightRAG, __version__ as core_version
 from lightrag.api import __api_version__
 from lightrag.types import GPTKeywordExtractionFormat
 from lightrag.utils import EmbeddingFunc
+from lightrag.llm.load_balance import (
+    build_endpoints,
+    get_endpoint_stats,
+    load_balanced_func,
+)
 from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
@@ -64,6 +69,7 @@ from lightrag.api.routers.graph_routes import create_graph_routes
 from lightrag.api.routers.ollama_api import OllamaAPI
 
 from lightrag.utils import logger, set_verbose_debug
+from lightrag.metrics import render_metrics
 from lightrag.kg.shared_storage import (
     get_namespace_data,
     get_default_workspace,
@@ -535,14 +541,17 @@ def create_app(args):
             if config_cache.openai_llm_options:
                 merged_kwargs.update(config_cache.openai_llm_options)
             merged_kwargs.update(kwargs)
+            # A load-balanced binding selects the endpoint per call
+            llm_base_url = merged_kwargs.pop("base_url", args.llm_binding_host)
+            llm_api_key = merged_kwargs.pop("api_key", args.llm_binding_api_key)
 
             return await openai_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
-                api_key=args.llm_binding_api_key,
+                base_url=llm_base_url,
+                api_key=llm_api_key,
                 **merged_kwargs,
             )
 
@@ -574,14 +583,19 @@ def create_app(args):
             if config_cache.openai_llm_options:
                 merged_kwargs.update(config_cache.openai_llm_options)
             merged_kwargs.update(kwargs)
+            # A load-balanced binding selects the endpoint per call
+            llm_base_url = merged_kwargs.pop("base_url", args.llm_binding_host)
+            llm_api_key = merged_kwargs.pop("api_key", None) or os.getenv(
+                "AZURE_OPENAI_API_KEY", args.llm_binding_api_key
+            )
 
             return await azure_openai_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                base_url=args.llm_binding_host,
-                api_key=os.getenv("AZURE_OPENAI_API_KEY", args.llm_binding_api_key),
+                base_url=llm_base_url,
+                api_key=llm_api_key,
                 api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview"),
                 **merged_kwargs,
             )
@@ -612,14 +626,17 @@ def create_app(args):
                 and "generation_config" not in kwargs
             ):
                 kwargs["generation_config"] = dict(config_cache.gemini_llm_options)
+            # A load-balanced binding selects the endpoint per call
+            llm_base_url = kwargs.pop("base_url", args.llm_binding_host)
+            llm_api_key = kwargs.pop("api_key", args.llm_binding_api_key)
 
             return await gemini_complete_if_cache(
                 args.llm_model,
                 prompt,
                 system_prompt=system_prompt,
                 history_messages=history_messages,
-                api_key=args.llm_binding_api_key,
-                base_url=args.llm_binding_host,
+                api_key=llm_api_key,
+                base_url=llm_base_url,
                 keyword_extraction=keyword_extraction,
                 **kwargs,
             )
@@ -655,6 +672,35 @@ def create_app(args):
         except ImportError as e:
             raise Exception(f"Failed to import {binding} LLM binding: {e}")
 
+    def create_load_balanced_llm_func(binding: str):
+        """
+        Spread LLM calls over LLM_BINDING_HOSTS / LLM_BINDING_API_KEYS when more
+        than one endpoint or key is configured, otherwise use the plain binding.
+        """
+        llm_func = create_llm_model_func(binding)
+        hosts = args.llm_binding_hosts or [args.llm_binding_host]
+        api_keys = args.llm_binding_api_keys or [args.llm_binding_api_key]
+        if len(hosts) == 1 and len(api_keys) == 1:
+            return llm_func
+        if binding == "aws_bedrock":
+            logger.warning("Load balancing is not supported for aws_bedrock LLM")
+            return llm_func
+
+        endpoints = build_endpoints(hosts, api_keys)
+        logger.info(
+            f"LLM load balancing over {len(endpoints)} endpoints "
+            f"({args.load_balance_strategy}): {[e.name for e in endpoints]}"
+        )
+        return load_balanced_func(
+            llm_func,
+            endpoints,
+            url_kwarg="host" if binding in ["lollms", "ollama"] else "base_url",
+            strategy=args.load_balance_strategy,
+            eject_after=args.load_balance_eject_after,
+            eject_seconds=args.load_balance_eject_seconds,
+            name="llm",
+        )
+
     def create_llm_model_kwargs(binding: str, args, llm_timeout: int) -> dict:
         """
         Create LLM model kwargs based on binding type.
@@ -757,7 +803,10 @@ def create_app(args):
 
         # Step 3: Create optimized embedding function (calls underlying function directly)
         # Note: When model is None, each binding will use its own default model
-        async def optimized_embedding_function(texts, embedding_dim=None):
+        # host and api_key can be overridden per call by a load-balanced binding
+        async def optimized_embedding_function(
+            texts, embedding_dim=None, host=host, api_key=api_key
+        ):
             try:
                 if binding == "lollms":
                     from lightrag.llm.lollms import lollms_embed
@@ -956,6 +1005,27 @@ def create_app(args):
         args=args,
     )
 
+    # Spread embedding calls over EMBEDDING_BINDING_HOSTS / EMBEDDING_BINDING_API_KEYS
+    embedding_hosts = args.embedding_binding_hosts or [args.embedding_binding_host]
+    embedding_api_keys = args.embedding_binding_api_keys or [
+        args.embedding_binding_api_key
+    ]
+    if len(embedding_hosts) > 1 or len(embedding_api_keys) > 1:
+        embedding_endpoints = build_endpoints(embedding_hosts, embedding_api_keys)
+        logger.info(
+            f"Embedding load balancing over {len(embedding_endpoints)} endpoints "
+            f"({args.load_balance_strategy}): {[e.name for e in embedding_endpoints]}"
+        )
+        embedding_func.func = load_balanced_func(
+            embedding_func.func,
+            embedding_endpoints,
+            url_kwarg="host",
+            strategy=args.load_balance_strategy,
+            eject_after=args.load_balance_eject_after,
+            eject_seconds=args.load_balance_eject_seconds,
+            name="embedding",
+        )
+
     # Get embedding_send_dim from centralized configuration
     embedding_send_dim = args.embedding_send_dim
 
@@ -1005,13 +1075,19 @@ def create_app(args):
     # Configure rerank function based on args.rerank_bindingparameter
     rerank_model_func = None
     if args.rerank_binding != "null":
-        from lightrag.rerank import cohere_rerank, jina_rerank, ali_rerank
+        from lightrag.rerank import (
+            cohere_rerank,
+            jina_rerank,
+            ali_rerank,
+            local_rerank,
+        )
 
         # Map rerank binding to corresponding function
         rerank_functions = {
             "cohere": cohere_rerank,
             "jina": jina_rerank,
             "aliyun": ali_rerank,
+            "local": local_rerank,
         }
 
         # Select the appropriate rerank function based on binding
@@ -1059,6 +1135,15 @@ def create_app(args):
                 kwargs["max_tokens_per_doc"] = int(
                     os.getenv("RERANK_MAX_TOKENS_PER_DOC", "4096")
                 )
+            elif args.rerank_binding == "local":
+                # Local cross-encoders truncate at their max length, so chunk long
+                # documents instead when requested
+                kwargs["enable_chunking"] = (
+                    os.getenv("RERANK_ENABLE_CHUNKING", "false").lower() == "true"
+                )
+                kwargs["max_tokens_per_doc"] = int(
+                    os.getenv("RERANK_MAX_TOKENS_PER_DOC", "480")
+                )
 
             return await selected_rerank_func(**kwargs, extra_body=extra_body)
 
@@ -1081,7 +1166,7 @@ def create_app(args):
         rag = LightRAG(
             working_dir=args.working_dir,
             workspace=args.workspace,
-            llm_model_func=create_llm_model_func(args.llm_binding),
+            llm_model_func=create_load_balanced_llm_func(args.llm_binding),
             llm_model_name=args.llm_model,
             llm_model_max_async=args.max_async,
             summary_max_tokens=args.summary_max_tokens,
@@ -1326,6 +1411,8 @@ def create_app(args):
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
                 "keyed_locks": keyed_lock_info,
+                # Per-endpoint stats of load-balanced LLM/embedding bindings
+                "load_balancing": get_endpoint_stats(),
                 "core_version": core_version,
                 "api_version": api_version_display,
                 "webui_title": webui_title,
@@ -1335,6 +1422,20 @@ def create_app(args):
             logger.error(f"Error getting health status: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get(
+        "/metrics",
+        dependencies=[Depends(combined_auth)],
+        summary="Prometheus metrics",
+        description="Query stage latency histograms, cache hit and miss counts, lock "
+        "wait times, LLM queue depths and endpoint statistics of this worker process "
+        "in the Prometheus text format",
+        response_class=PlainTextResponse,
+    )
+    async def get_metrics():
+        return PlainTextResponse(
+            render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
     # Custom StaticFiles class for smart caching
     class SmartStaticFiles(StaticFiles):  # Renamed from NoCacheStaticFiles
         async def get_response(self, path: str, scope):
@@ -2472,6 +2472,7 @@ def create_document_routes(
                 rag.full_relations,
                 rag.entity_chunks,
                 rag.relation_chunks,
+                rag.chunk_extractions,
                 rag.entities_vdb,
                 rag.relationships_vdb,
                 rag.chunks_vdb,
@@ -2,12 +2,36 @@
 This module contains all graph-related routes for the LightRAG API.
 """
 
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Literal
+import asyncio
+import base64
+import binascii
+import json
+import os
+import tempfile
+import time
 import traceback
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
-
-from lightrag.utils import logger
+from starlette.background import BackgroundTask
+
+from lightrag.constants import (
+    DEFAULT_EVIDENCE_CACHE_MAX_SIZE,
+    DEFAULT_EVIDENCE_CACHE_TTL,
+    DEFAULT_EVIDENCE_PAGE_SIZE,
+    DEFAULT_EVIDENCE_QUERY_TIMEOUT,
+)
+from lightrag.utils import (
+    aiter_export_records,
+    aiter_export_text,
+    get_env_value,
+    iter_knowledge_graph_arrow,
+    iter_knowledge_graph_ndjson,
+    logger,
+    project_knowledge_graph,
+)
 from ..utils_api import get_combined_auth_dependency
 
 router = APIRouter(tags=["graph"])
@@ -86,8 +110,77 @@ class RelationCreateRequest(BaseModel):
     )
 
 
+class EvidencePageCache:
+    """Bounded LRU cache of evidence query results.
+
+    Keys carry the graph data version, so a write to the workspace makes all
+    earlier entries unreachable. The TTL bounds staleness from writers that do
+    not go through this server, such as direct database access.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_EVIDENCE_CACHE_MAX_SIZE,
+        ttl: float = DEFAULT_EVIDENCE_CACHE_TTL,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def encode_evidence_cursor(sort_key: list) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor"""
+    raw = json.dumps(sort_key, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_evidence_cursor(cursor: str) -> list:
+    """Decode a cursor produced by encode_evidence_cursor, raises ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not isinstance(sort_key, list) or not all(
+        isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in sort_key
+    ):
+        raise ValueError("Invalid cursor")
+    return sort_key
+
+
 def create_graph_routes(rag, api_key: Optional[str] = None):
     combined_auth = get_combined_auth_dependency(api_key)
+    evidence_timeout = get_env_value(
+        "EVIDENCE_QUERY_TIMEOUT", DEFAULT_EVIDENCE_QUERY_TIMEOUT, float
+    )
+    evidence_cache = EvidencePageCache(
+        max_size=get_env_value(
+            "EVIDENCE_CACHE_MAX_SIZE", DEFAULT_EVIDENCE_CACHE_MAX_SIZE, int
+        ),
+        ttl=get_env_value("EVIDENCE_CACHE_TTL", DEFAULT_EVIDENCE_CACHE_TTL, float),
+    )
 
     @router.get("/graph/label/list", dependencies=[Depends(combined_auth)])
     async def get_graph_labels():
@@ -161,6 +254,14 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
         label: str = Query(..., description="Label to get knowledge graph for"),
         max_depth: int = Query(3, description="Maximum depth of graph", ge=1),
         max_nodes: int = Query(1000, description="Maximum nodes to return", ge=1),
+        response_format: Literal["json", "ndjson", "arrow"] = Query(
+            "json", alias="format", description="Response encoding"
+        ),
+        properties: Optional[str] = Query(
+            None,
+            description="Comma-separated node/edge properties to return; "
+            "empty returns ids and labels only",
+        ),
     ):
         """
         Retrieve a connected subgraph of nodes where the label includes the specified label.
@@ -172,9 +273,14 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
             label (str): Label of the starting node
             max_depth (int, optional): Maximum depth of the subgraph,Defaults to 3
             max_nodes: Maxiumu nodes to return
+            format (str): json (default), ndjson (streamed nodes then edges) or
+                arrow (Apache Arrow IPC stream)
+            properties (str, optional): Property projection; details of a single
+                node or edge can be fetched from /graph/entity/detail and
+                /graph/relation/detail
 
         Returns:
-            Dict[str, List[str]]: Knowledge graph for label
+            Dict[str, List[str]] | StreamingResponse: Knowledge graph for label
         """
         try:
             # Log the label parameter to check for leading spaces
@@ -182,11 +288,33 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 f"get_knowledge_graph called with label: '{label}' (length: {len(label)}, repr: {repr(label)})"
             )
 
-            return await rag.get_knowledge_graph(
+            knowledge_graph = await rag.get_knowledge_graph(
                 node_label=label,
                 max_depth=max_depth,
                 max_nodes=max_nodes,
             )
+            if properties is not None:
+                fields = [f.strip() for f in properties.split(",") if f.strip()]
+                knowledge_graph = project_knowledge_graph(knowledge_graph, fields)
+
+            if response_format == "json":
+                return knowledge_graph
+            if response_format == "ndjson":
+                return StreamingResponse(
+                    iter_knowledge_graph_ndjson(knowledge_graph),
+                    media_type="application/x-ndjson",
+                )
+            chunks = iter_knowledge_graph_arrow(knowledge_graph)
+            # Encode the first batch here so encoder errors still get a 500
+            first = next(chunks)
+
+            def stream_arrow():
+                yield first
+                yield from chunks
+
+            return StreamingResponse(
+                stream_arrow(), media_type="application/vnd.apache.arrow.stream"
+            )
         except Exception as e:
             logger.error(f"Error getting knowledge graph for label '{label}': {str(e)}")
             logger.error(traceback.format_exc())
@@ -194,6 +322,83 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"Error getting knowledge graph: {str(e)}"
             )
 
+    @router.get("/graph/export", dependencies=[Depends(combined_auth)])
+    async def export_graph(
+        file_format: Literal["csv", "jsonl", "parquet"] = Query(
+            "jsonl", alias="format", description="Export format"
+        ),
+        include_vector_data: bool = Query(
+            False, description="Include the matching vector database records"
+        ),
+        batch_size: int = Query(
+            1000, description="Nodes/edges fetched per batch", ge=1, le=10000
+        ),
+    ):
+        """
+        Export all entities, relations and relationships as a download.
+
+        csv and jsonl are streamed to the client as rows are read from storage,
+        so memory stays constant regardless of graph size. parquet is written
+        to a temporary file first because its footer is only known at the end.
+
+        Args:
+            format (str): csv, jsonl or parquet (default: jsonl)
+            include_vector_data (bool): Include vector database records
+            batch_size (int): Nodes/edges fetched per batch
+
+        Returns:
+            StreamingResponse | FileResponse: The exported file
+        """
+        filename = f"graph_export.{file_format}"
+        headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+        if file_format == "parquet":
+            fd, path = tempfile.mkstemp(suffix=".parquet")
+            os.close(fd)
+            try:
+                await rag.aexport_data(
+                    path,
+                    file_format="parquet",
+                    include_vector_data=include_vector_data,
+                    batch_size=batch_size,
+                )
+            except Exception as e:
+                os.remove(path)
+                logger.error(f"Error exporting graph: {str(e)}")
+                logger.error(traceback.format_exc())
+                raise HTTPException(
+                    status_code=500, detail=f"Error exporting graph: {str(e)}"
+                )
+            return FileResponse(
+                path,
+                media_type="application/vnd.apache.parquet",
+                filename=filename,
+                background=BackgroundTask(os.remove, path),
+            )
+
+        records = aiter_export_records(
+            rag.chunk_entity_relation_graph,
+            rag.entities_vdb,
+            rag.relationships_vdb,
+            include_vector_data=include_vector_data,
+            batch_size=batch_size,
+        )
+
+        async def stream_export():
+            try:
+                async for chunk in aiter_export_text(records, file_format):
+                    yield chunk.encode("utf-8")
+            except Exception as e:
+                # Headers are already sent; log and abort the transfer
+                logger.error(f"Error exporting graph: {str(e)}")
+                logger.error(traceback.format_exc())
+                raise
+
+        media_type = "text/csv" if file_format == "csv" else "application/x-ndjson"
+        return StreamingResponse(
+            stream_export(), media_type=media_type, headers=headers
+        )
+
     @router.get("/graph/entity/exists", dependencies=[Depends(combined_auth)])
     async def check_entity_exists(
         name: str = Query(..., description="Entity name to check"),
@@ -217,6 +422,69 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"Error checking entity existence: {str(e)}"
             )
 
+    @router.get("/graph/entity/detail", dependencies=[Depends(combined_auth)])
+    async def get_entity_detail(
+        name: str = Query(..., description="Entity name"),
+    ):
+        """
+        Get the full properties of one entity, for clients that loaded the graph
+        with a property projection
+
+        Args:
+            name (str): Name of the entity
+
+        Returns:
+            Dict: Entity name, source id and graph properties
+        """
+        try:
+            if not await rag.chunk_entity_relation_graph.has_node(name):
+                raise HTTPException(
+                    status_code=404, detail=f"Entity '{name}' not found"
+                )
+            return await rag.get_entity_info(name)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting entity detail for '{name}': {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error getting entity detail: {str(e)}"
+            )
+
+    @router.get("/graph/relation/detail", dependencies=[Depends(combined_auth)])
+    async def get_relation_detail(
+        source: str = Query(..., description="Source entity name"),
+        target: str = Query(..., description="Target entity name"),
+    ):
+        """
+        Get the full properties of one relation, for clients that loaded the graph
+        with a property projection
+
+        Args:
+            source (str): Source entity name
+            target (str): Target entity name
+
+        Returns:
+            Dict: Source and target entities, source id and graph properties
+        """
+        try:
+            if not await rag.chunk_entity_relation_graph.has_edge(source, target):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Relation '{source}' -> '{target}' not found",
+                )
+            return await rag.get_relation_info(source, target)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(
+                f"Error getting relation detail for '{source}' -> '{target}': {str(e)}"
+            )
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error getting relation detail: {str(e)}"
+            )
+
     @router.post("/graph/entity/edit", dependencies=[Depends(combined_auth)])
     async def update_entity(request: EntityUpdateRequest):
         """
@@ -685,4 +953,356 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 status_code=500, detail=f"Error merging entities: {str(e)}"
             )
 
+    def get_evidence_graph():
+        graph = rag.chunk_entity_relation_graph
+        if not hasattr(graph, "iter_evidence"):
+            raise HTTPException(
+                status_code=501,
+                detail=f"Evidence queries are not supported by {type(graph).__name__}",
+            )
+        return graph
+
+    def evidence_cache_key(graph, kind: str, params: dict) -> tuple:
+        return (
+            graph.workspace,
+            graph.namespace,
+            graph.get_data_version(),
+            kind,
+            json.dumps(params, sort_keys=True, default=str),
+        )
+
+    async def stream_evidence(
+        kind: str,
+        filters: dict[str, Any],
+        cursor: str | None,
+        limit: int,
+        timeout: float | None,
+    ) -> StreamingResponse:
+        """Stream one page of an evidence query as NDJSON.
+
+        Lines are {"record": {...}} in page order, followed by a final
+        {"next_cursor": ..., "count": n} line (next_cursor is null on the last
+        page). If the query fails or times out mid-page, the final line is
+        {"error": ..., "next_cursor": ...} and the page can be resumed from that
+        cursor. Complete pages are cached until the graph changes.
+        """
+        graph = get_evidence_graph()
+        timeout = timeout or evidence_timeout
+        filters = {k: v for k, v in filters.items() if v is not None}
+        try:
+            after = decode_evidence_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Take the version before reading, so a concurrent write invalidates the page
+        key = evidence_cache_key(
+            graph, kind, {"filters": filters, "cursor": cursor, "limit": limit}
+        )
+        headers = {"X-Data-Version": str(key[2])}
+        cached = evidence_cache.get(key)
+
+        if cached is not None:
+            records, next_cursor = cached
+            headers["X-Cache"] = "hit"
+
+            async def stream_cached():
+                for record in records:
+                    yield (
+                        json.dumps({"record": record}, ensure_ascii=False, default=str)
+                        + "\n"
+                    )
+                yield (
+                    json.dumps({"next_cursor": next_cursor, "count": len(records)})
+                    + "\n"
+                )
+
+            return StreamingResponse(
+                stream_cached(), media_type="application/x-ndjson", headers=headers
+            )
+
+        deadline = time.monotonic() + timeout
+        rows = graph.iter_evidence(
+            kind, filters, after=after, limit=limit, timeout=timeout
+        )
+
+        async def next_row():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            return await asyncio.wait_for(rows.__anext__(), remaining)
+
+        # Fetch the first row before responding, so invalid filters and
+        # unreachable storage still produce a proper HTTP status
+        try:
+            first = await next_row()
+        except StopAsyncIteration:
+            first = None
+        except ValueError as e:
+            await rows.aclose()
+            raise HTTPException(status_code=400, detail=str(e))
+        except asyncio.TimeoutError:
+            await rows.aclose()
+            raise HTTPException(
+                status_code=504, detail=f"Evidence query timed out after {timeout}s"
+            )
+        except Exception as e:
+            await rows.aclose()
+            logger.error(f"Error running evidence query '{kind}': {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=500, detail=f"Error running evidence query: {str(e)}"
+            )
+
+        headers["X-Cache"] = "miss"
+
+        async def stream_rows():
+            records = []
+            last_key = after
+            row = first
+            try:
+                while row is not None:
+                    record, last_key = row
+                    records.append(record)
+                    yield (
+                        json.dumps({"record": record}, ensure_ascii=False, default=str)
+                        + "\n"
+                    )
+                    try:
+                        row = await next_row()
+                    except StopAsyncIteration:
+                        row = None
+            except Exception as e:
+                # Headers are already sent: report in-band with a resumable cursor
+                if isinstance(e, asyncio.TimeoutError):
+                    error = f"Evidence query timed out after {timeout}s"
+                else:
+                    error = f"Error running evidence query: {str(e)}"
+                    logger.error(f"Error streaming evidence query '{kind}': {str(e)}")
+                yield (
+                    json.dumps(
+                        {
+                            "error": error,
+                            "next_cursor": encode_evidence_cursor(last_key)
+                            if last_key
+                            else cursor,
+                            "count": len(records),
+                        }
+                    )
+                    + "\n"
+                )
+                return
+            finally:
+                await rows.aclose()
+
+            next_cursor = (
+                encode_evidence_cursor(last_key) if len(records) >= limit else None
+            )
+            evidence_cache.set(key, (records, next_cursor))
+            yield json.dumps({"next_cursor": next_cursor, "count": len(records)}) + "\n"
+
+        return StreamingResponse(
+            stream_rows(), media_type="application/x-ndjson", headers=headers
+        )
+
+    async def cached_evidence_call(kind: str, params: dict, call, timeout):
+        """Run a single-result evidence query with timeout and result caching"""
+        graph = get_evidence_graph()
+        timeout = timeout or evidence_timeout
+        key = evidence_cache_key(graph, kind, params)
+        result = evidence_cache.get(key)
+        if result is None:
+            try:
+                result = await asyncio.wait_for(call(graph), timeout)
+            except asyncio.TimeoutError:
+                raise HTTPException(
+                    status_code=504,
+                    detail=f"Evidence query timed out after {timeout}s",
+                )
+            except Exception as e:
+                # Failures are reported, never cached as an empty result
+                logger.error(f"Error in evidence query '{kind}': {str(e)}")
+                raise HTTPException(
+                    status_code=500, detail=f"Evidence query failed: {str(e)}"
+                )
+            # Failed queries report {"error": ...}; they are retried, not cached
+            if not (isinstance(result, dict) and "error" in result):
+                evidence_cache.set(key, result)
+        return result
+
+    page_size = Query(
+        DEFAULT_EVIDENCE_PAGE_SIZE, description="Maximum rows per page", ge=1, le=1000
+    )
+    cursor_param = Query(
+        None, description="next_cursor from the previous page; omit for the first page"
+    )
+    timeout_param = Query(
+        None,
+        description="Query timeout in seconds (default: EVIDENCE_QUERY_TIMEOUT)",
+        gt=0,
+        le=600,
+    )
+    level_param = Query(
+        None, description="Evidence level (S/A/B/C)", pattern="^[SABCsabc]$"
+    )
+
+    @router.get("/graph/evidence/entities", dependencies=[Depends(combined_auth)])
+    async def stream_evidence_entities(
+        evidence_level: Optional[str] = level_param,
+        scene_tag: Optional[str] = Query(None, description="Scene tag"),
+        file_path: Optional[str] = Query(None, description="Source file path"),
+        cursor: Optional[str] = cursor_param,
+        limit: int = page_size,
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Stream entities filtered by evidence level, scene tag and/or file path as NDJSON.
+
+        Rows are ordered by entity id and paged with an opaque cursor: pass the
+        next_cursor of the final line to get the next page.
+        """
+        return await stream_evidence(
+            "entities",
+            {
+                "evidence_level": evidence_level,
+                "scene_tag": scene_tag,
+                "file_path": file_path,
+            },
+            cursor,
+            limit,
+            timeout,
+        )
+
+    @router.get("/graph/evidence/relations", dependencies=[Depends(combined_auth)])
+    async def stream_evidence_relations(
+        evidence_level: Optional[str] = level_param,
+        relation_type: Optional[str] = Query(
+            None, description="Relation type (causal/support/contradict/related)"
+        ),
+        scene_tag: Optional[str] = Query(None, description="Scene tag"),
+        cursor: Optional[str] = cursor_param,
+        limit: int = page_size,
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Stream relations filtered by evidence level, relation type and/or scene tag as NDJSON.
+
+        Each record holds source, relation and target properties. Rows are ordered
+        by (source id, target id) and paged with an opaque cursor.
+        """
+        return await stream_evidence(
+            "relations",
+            {
+                "evidence_level": evidence_level,
+                "relation_type": relation_type,
+                "scene_tag": scene_tag,
+            },
+            cursor,
+            limit,
+            timeout,
+        )
+
+    @router.get("/graph/evidence/causal-chain", dependencies=[Depends(combined_auth)])
+    async def stream_causal_chain(
+        entity_id: str = Query(..., description="Start entity of the causal chains"),
+        max_depth: int = Query(5, description="Maximum chain length", ge=1, le=10),
+        evidence_level: Optional[str] = level_param,
+        cursor: Optional[str] = cursor_param,
+        limit: int = page_size,
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Stream causal chains starting at an entity as NDJSON.
+
+        Chains are ordered by length, then evidence weight (S=4 ... C=1), both
+        descending. Only causal relations are followed; evidence_level keeps
+        chains whose relations all have that level.
+        """
+        return await stream_evidence(
+            "causal_chain",
+            {
+                "entity_id": entity_id,
+                "max_depth": max_depth,
+                "evidence_level": evidence_level,
+            },
+            cursor,
+            limit,
+            timeout,
+        )
+
+    @router.get("/graph/evidence/aggregate", dependencies=[Depends(combined_auth)])
+    async def stream_aggregate_evidence(
+        topic: Optional[str] = Query(None, description="Topic keyword"),
+        scene_tag: Optional[str] = Query(None, description="Scene tag"),
+        evidence_level: Optional[str] = level_param,
+        min_weight: float = Query(0, description="Minimum total evidence weight"),
+        cursor: Optional[str] = cursor_param,
+        limit: int = page_size,
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Stream entities with their aggregated outgoing evidence as NDJSON.
+
+        Rows are ordered by total evidence weight (descending), then entity id.
+        """
+        return await stream_evidence(
+            "aggregate",
+            {
+                "topic": topic,
+                "scene_tag": scene_tag,
+                "evidence_level": evidence_level,
+                "min_weight": min_weight,
+            },
+            cursor,
+            limit,
+            timeout,
+        )
+
+    @router.get("/graph/evidence/cross-validate", dependencies=[Depends(combined_auth)])
+    async def cross_validate_claim(
+        claim: str = Query(..., description="Claim entity name"),
+        min_evidence_count: int = Query(
+            1, description="Minimum supporting or contradicting evidence", ge=1
+        ),
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Compare supporting and contradicting evidence of a claim entity.
+        """
+        return await cached_evidence_call(
+            "cross_validate",
+            {"claim": claim, "min_evidence_count": min_evidence_count},
+            lambda graph: graph.cross_validate(claim, min_evidence_count),
+            timeout,
+        )
+
+    @router.get("/graph/evidence/provenance", dependencies=[Depends(combined_auth)])
+    async def get_evidence_provenance(
+        entity: Optional[str] = Query(None, description="Entity name"),
+        source: Optional[str] = Query(None, description="Relation source entity"),
+        target: Optional[str] = Query(None, description="Relation target entity"),
+        timeout: Optional[float] = timeout_param,
+    ):
+        """
+        Get the source provenance of an entity, or of a relation given source and target.
+        """
+        if entity:
+            params = {"entity": entity}
+
+            def call(graph):
+                return graph.get_entity_provenance(entity)
+
+        elif source and target:
+            params = {"source": source, "target": target}
+
+            def call(graph):
+                return graph.get_relation_provenance(source, target)
+
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Either entity or both source and target are required",
+            )
+        provenance = await cached_evidence_call("provenance", params, call, timeout)
+        return {"provenance": provenance}
+
     return router
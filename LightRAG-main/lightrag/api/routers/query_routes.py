@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from lightrag.base import QueryParam
 from lightrag.api.utils_api import get_combined_auth_dependency
-from lightrag.utils import logger
+from lightrag.utils import logger, normalize_metadata_filter
 from pydantic import BaseModel, Field, field_validator
 
 router = APIRouter(tags=["query"])
@@ -110,6 +110,64 @@ class QueryRequest(BaseModel):
         description="If True, enables streaming output for real-time responses. Only affects /query/stream endpoint.",
     )
 
+    metadata_filter: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Restrict vector retrieval to entities, relations and chunks whose metadata matches, e.g. {'evidence_level': ['S', 'A'], 'scene_tags': ['金融']}. Fields are ANDed, the values of one field are ORed.",
+    )
+
+    evidence_ranking: Optional[bool] = Field(
+        default=None,
+        description="Order retrieved entities and relations by a fused score of vector similarity, graph degree, edge weight and evidence level before token truncation. Default is False (EVIDENCE_RANKING).",
+    )
+
+    rank_similarity_weight: Optional[float] = Field(
+        default=None,
+        description="Weight of vector similarity in the evidence ranking score.",
+        ge=0.0,
+    )
+
+    rank_degree_weight: Optional[float] = Field(
+        default=None,
+        description="Weight of graph degree in the evidence ranking score.",
+        ge=0.0,
+    )
+
+    rank_edge_weight: Optional[float] = Field(
+        default=None,
+        description="Weight of the relation weight in the evidence ranking score.",
+        ge=0.0,
+    )
+
+    rank_evidence_weight: Optional[float] = Field(
+        default=None,
+        description="Weight of the evidence level (S > A > B > C) in the evidence ranking score.",
+        ge=0.0,
+    )
+
+    ppr_retrieval: Optional[bool] = Field(
+        default=None,
+        description="Select entities and relations by personalized PageRank from the vector-matched entities, reaching multi-hop evidence without raising top_k. Default is False (PPR_RETRIEVAL).",
+    )
+
+    ppr_max_hops: Optional[int] = Field(
+        default=None,
+        description="Hops around the matched entities that the personalized PageRank walk may reach.",
+        ge=1,
+    )
+
+    ppr_max_nodes: Optional[int] = Field(
+        default=None,
+        description="Maximum number of nodes in the personalized PageRank neighbourhood.",
+        ge=1,
+    )
+
+    ppr_damping: Optional[float] = Field(
+        default=None,
+        description="Probability that the personalized PageRank walk continues instead of restarting at the matched entities.",
+        gt=0.0,
+        lt=1.0,
+    )
+
     @field_validator("query", mode="after")
     @classmethod
     def query_strip_after(cls, query: str) -> str:
@@ -129,6 +187,13 @@ class QueryRequest(BaseModel):
                 raise ValueError("Each message 'role' must be a non-empty string.")
         return conversation_history
 
+    @field_validator("metadata_filter", mode="after")
+    @classmethod
+    def metadata_filter_check(
+        cls, metadata_filter: Dict[str, Any] | None
+    ) -> Dict[str, Any] | None:
+        return normalize_metadata_filter(metadata_filter)
+
     def to_query_params(self, is_stream: bool) -> "QueryParam":
         """Converts a QueryRequest instance into a QueryParam instance."""
         # Use Pydantic's `.model_dump(exclude_none=True)` to remove None values automatically
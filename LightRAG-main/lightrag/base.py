@@ -16,7 +16,7 @@ from typing import (
     List,
     AsyncIterator,
 )
-from .utils import EmbeddingFunc
+from .utils import EmbeddingFunc, normalize_metadata_filter, personalized_pagerank
 from .types import KnowledgeGraph
 from .constants import (
     DEFAULT_TOP_K,
@@ -25,6 +25,15 @@ from .constants import (
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_HISTORY_TURNS,
+    DEFAULT_EVIDENCE_RANKING,
+    DEFAULT_RANK_SIMILARITY_WEIGHT,
+    DEFAULT_RANK_DEGREE_WEIGHT,
+    DEFAULT_RANK_EDGE_WEIGHT,
+    DEFAULT_RANK_EVIDENCE_WEIGHT,
+    DEFAULT_PPR_RETRIEVAL,
+    DEFAULT_PPR_MAX_HOPS,
+    DEFAULT_PPR_MAX_NODES,
+    DEFAULT_PPR_DAMPING,
     DEFAULT_OLLAMA_MODEL_NAME,
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_OLLAMA_MODEL_SIZE,
@@ -168,6 +177,65 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    metadata_filter: dict[str, Any] | None = None
+    """Restrict vector retrieval to records whose metadata matches, e.g.
+    {"evidence_level": ["S", "A"], "scene_tags": ["金融"]}.
+    Fields are ANDed, the values of one field are ORed, and a list-valued field such as
+    scene_tags matches when any of its items is listed. The filter is pushed down to the
+    vector storage, so filtered queries still return top_k results. Fields missing from
+    a storage's meta_fields (e.g. scene_tags for relations) are ignored for that storage.
+    """
+
+    evidence_ranking: bool = (
+        os.getenv("EVIDENCE_RANKING", str(DEFAULT_EVIDENCE_RANKING)).lower() == "true"
+    )
+    """If True, retrieved entities and relations are ordered by a fused score of vector
+    similarity, graph degree, edge weight and evidence level (S > A > B > C) before token
+    truncation, so the context budget is spent on the highest-value evidence first.
+    If False, entities keep vector similarity order and relations are sorted by (degree, weight).
+    """
+
+    rank_similarity_weight: float = float(
+        os.getenv("RANK_SIMILARITY_WEIGHT", str(DEFAULT_RANK_SIMILARITY_WEIGHT))
+    )
+    """Weight of vector similarity in the evidence ranking score."""
+
+    rank_degree_weight: float = float(
+        os.getenv("RANK_DEGREE_WEIGHT", str(DEFAULT_RANK_DEGREE_WEIGHT))
+    )
+    """Weight of graph degree (log-scaled) in the evidence ranking score."""
+
+    rank_edge_weight: float = float(
+        os.getenv("RANK_EDGE_WEIGHT", str(DEFAULT_RANK_EDGE_WEIGHT))
+    )
+    """Weight of the relation weight in the evidence ranking score (relations only)."""
+
+    rank_evidence_weight: float = float(
+        os.getenv("RANK_EVIDENCE_WEIGHT", str(DEFAULT_RANK_EVIDENCE_WEIGHT))
+    )
+    """Weight of the evidence level in the evidence ranking score."""
+
+    ppr_retrieval: bool = (
+        os.getenv("PPR_RETRIEVAL", str(DEFAULT_PPR_RETRIEVAL)).lower() == "true"
+    )
+    """If True, entities and relations are re-selected by a personalized PageRank
+    (random walk with restart) seeded with the vector-matched entities and the endpoints
+    of the vector-matched relations. The walk covers the graph within ppr_max_hops of the
+    seeds, so multi-hop evidence is reached without raising top_k. The top_k entities and
+    top_k relations by stationary score are passed on to token truncation, and chunks are
+    picked from them in score order.
+    """
+
+    ppr_max_hops: int = int(os.getenv("PPR_MAX_HOPS", str(DEFAULT_PPR_MAX_HOPS)))
+    """Hops around the seeds that the personalized PageRank walk may reach."""
+
+    ppr_max_nodes: int = int(os.getenv("PPR_MAX_NODES", str(DEFAULT_PPR_MAX_NODES)))
+    """Maximum number of nodes in the personalized PageRank neighbourhood."""
+
+    ppr_damping: float = float(os.getenv("PPR_DAMPING", str(DEFAULT_PPR_DAMPING)))
+    """Probability that the walk continues to a neighbour instead of restarting at the
+    seeds. Lower values keep the scores closer to the seeds."""
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -258,9 +326,31 @@ class BaseVectorStorage(StorageNameSpace, ABC):
         safe_model_name = re.sub(r"[^a-zA-Z0-9_]", "_", model_name.lower())
         return f"{safe_model_name}_{embedding_dim}d"
 
+    def _applicable_metadata_filter(
+        self, metadata_filter: dict[str, Any] | None
+    ) -> dict[str, list] | None:
+        """Normalize a metadata filter and keep only the fields this storage stores.
+
+        Returns:
+            dict[str, list] | None: {field: allowed values}, or None if nothing to filter
+        """
+        metadata_filter = normalize_metadata_filter(metadata_filter)
+        if not metadata_filter:
+            return None
+        applicable = {
+            key: values
+            for key, values in metadata_filter.items()
+            if key in self.meta_fields
+        }
+        return applicable or None
+
     @abstractmethod
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """Query the vector storage and retrieve top_k results.
 
@@ -269,6 +359,9 @@ class BaseVectorStorage(StorageNameSpace, ABC):
             top_k: Number of top results to return
             query_embedding: Optional pre-computed embedding for the query.
                            If provided, skips embedding computation for better performance.
+            metadata_filter: Optional {field: value(s)} filter applied inside the storage
+                           before ranking (see QueryParam.metadata_filter). Fields not in
+                           meta_fields are ignored.
         """
 
     @abstractmethod
@@ -565,6 +658,73 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             result[node_id] = edges if edges is not None else []
         return result
 
+    async def personalized_pagerank(
+        self,
+        seeds: dict[str, float],
+        max_hops: int = DEFAULT_PPR_MAX_HOPS,
+        max_nodes: int = DEFAULT_PPR_MAX_NODES,
+        damping: float = DEFAULT_PPR_DAMPING,
+    ) -> tuple[dict[str, float], dict[tuple[str, str], float]]:
+        """Random walk with restart to the seed nodes, within max_hops of the seeds
+
+        Default implementation expands the neighbourhood one hop per
+        get_nodes_edges_batch call, reads edge weights with get_edges_batch
+        and runs the walk in NumPy. Override this method for backends that
+        can run the walk closer to the data.
+
+        Args:
+            seeds: Restart weight of each seed node
+            max_hops: Hops around the seeds the walk may reach
+            max_nodes: Maximum number of nodes in the neighbourhood
+            damping: Probability of moving to a neighbour instead of restarting
+
+        Returns:
+            Stationary score of each reached node, and the probability flow
+            over each edge keyed by its sorted (source, target) pair
+        """
+        index = {node_id: i for i, node_id in enumerate(seeds)}
+        node_ids = list(seeds)
+        edges: dict[tuple[str, str], None] = {}
+        frontier = list(seeds)
+        for _ in range(max_hops):
+            if not frontier:
+                break
+            node_edges = await self.get_nodes_edges_batch(frontier)
+            next_frontier = []
+            for node_id in frontier:
+                for edge in node_edges.get(node_id) or []:
+                    pair = tuple(sorted(edge))
+                    if pair in edges:
+                        continue
+                    for endpoint in pair:
+                        if endpoint not in index and len(node_ids) < max_nodes:
+                            index[endpoint] = len(node_ids)
+                            node_ids.append(endpoint)
+                            next_frontier.append(endpoint)
+                    if pair[0] in index and pair[1] in index:
+                        edges[pair] = None
+            frontier = next_frontier
+
+        pairs = list(edges)
+        edge_data = await self.get_edges_batch(
+            [{"src": src, "tgt": tgt} for src, tgt in pairs]
+        )
+        weights = []
+        for pair in pairs:
+            try:
+                weights.append(float((edge_data.get(pair) or {}).get("weight", 1.0)))
+            except (TypeError, ValueError):
+                weights.append(1.0)
+
+        scores, flows = personalized_pagerank(
+            [seeds.get(node_id, 0.0) for node_id in node_ids],
+            [index[src] for src, _ in pairs],
+            [index[tgt] for _, tgt in pairs],
+            weights,
+            damping=damping,
+        )
+        return dict(zip(node_ids, scores.tolist())), dict(zip(pairs, flows.tolist()))
+
     @abstractmethod
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """Insert a new node or update an existing node in the graph.
@@ -678,6 +838,51 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             A list of all edges, where each edge is a dictionary of its properties
         """
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all nodes in batches.
+
+        The default implementation slices get_all_nodes(); storages that can page
+        or stream from the database should override it to keep memory bounded.
+
+        Args:
+            batch_size: Maximum number of nodes per batch
+
+        Yields:
+            Lists of node dictionaries in the same format as get_all_nodes
+        """
+        nodes = await self.get_all_nodes()
+        for i in range(0, len(nodes), batch_size):
+            yield nodes[i : i + batch_size]
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Iterate over all edges in batches, each undirected edge once.
+
+        The default implementation slices get_all_edges(), dropping the reverse
+        direction of edges it lists twice; storages that can page or stream from
+        the database should override it to keep memory bounded, returning one
+        direction per edge so callers need not remember the edges they have seen.
+
+        Args:
+            batch_size: Maximum number of edges per batch
+
+        Yields:
+            Lists of edge dictionaries in the same format as get_all_edges
+        """
+        edges = await self.get_all_edges()
+        # get_all_edges() already holds every edge, so the seen set adds no
+        # more than a constant factor to its memory
+        seen = set()
+        unique_edges = []
+        for edge in edges:
+            src, tgt = str(edge.get("source")), str(edge.get("target"))
+            edge_key = (src, tgt) if src <= tgt else (tgt, src)
+            if edge_key not in seen:
+                seen.add(edge_key)
+                unique_edges.append(edge)
+        del seen
+        for i in range(0, len(unique_edges), batch_size):
+            yield unique_edges[i : i + batch_size]
+
     @abstractmethod
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels(entity names) by node degree (most connected entities)
@@ -10,6 +10,12 @@ consistency and makes maintenance easier.
 DEFAULT_WOKERS = 2
 DEFAULT_MAX_GRAPH_NODES = 1000
 
+# Evidence query endpoints: per-request timeout (seconds), page size and page cache
+DEFAULT_EVIDENCE_QUERY_TIMEOUT = 30
+DEFAULT_EVIDENCE_PAGE_SIZE = 100
+DEFAULT_EVIDENCE_CACHE_TTL = 300
+DEFAULT_EVIDENCE_CACHE_MAX_SIZE = 256
+
 # Default values for extraction settings
 DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
@@ -23,10 +29,16 @@ DEFAULT_SUMMARY_MAX_TOKENS = 1200
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
+# Keep an existing summary that fits SUMMARY_MAX_TOKENS out of the map phase on merge
+DEFAULT_SUMMARY_INCREMENTAL = True
 # Maximum input tokens allowed for entity extraction (including history and gleaning)
 DEFAULT_MAX_EXTRACT_INPUT_TOKENS = 12000
 # Maximum completion tokens for entity extraction (OpenAI-compatible)
 DEFAULT_ENTITY_EXTRACT_MAX_COMPLETION_TOKENS = 1024
+# Maximum number of chunks packed into one extraction request (1 disables packing)
+DEFAULT_ENTITY_EXTRACT_PACK_SIZE = 1
+# Maximum content tokens of the chunks packed into one extraction request
+DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS = 2000
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -55,6 +67,19 @@ DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
 
+# Evidence-weighted ranking of retrieved entities and relations
+DEFAULT_EVIDENCE_RANKING = False
+DEFAULT_RANK_SIMILARITY_WEIGHT = 0.4
+DEFAULT_RANK_DEGREE_WEIGHT = 0.2
+DEFAULT_RANK_EDGE_WEIGHT = 0.1
+DEFAULT_RANK_EVIDENCE_WEIGHT = 0.3
+
+# Multi-hop retrieval by personalized PageRank from the matched entities
+DEFAULT_PPR_RETRIEVAL = False
+DEFAULT_PPR_MAX_HOPS = 2
+DEFAULT_PPR_MAX_NODES = 2000
+DEFAULT_PPR_DAMPING = 0.5
+
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
 
@@ -62,6 +87,17 @@ DEFAULT_HISTORY_TURNS = 0
 DEFAULT_MIN_RERANK_SCORE = 0.0
 DEFAULT_RERANK_BINDING = "null"
 
+# Local (in-process) cross-encoder rerank defaults
+DEFAULT_RERANK_LOCAL_MODEL = "BAAI/bge-reranker-base"
+DEFAULT_RERANK_LOCAL_BACKEND = "sentence-transformers"  # or "onnx"
+DEFAULT_RERANK_LOCAL_BATCH_SIZE = 32  # max (query, doc) pairs per forward pass
+DEFAULT_RERANK_LOCAL_BATCH_WAIT_MS = 5  # wait for concurrent queries to join a batch
+DEFAULT_RERANK_LOCAL_WORKERS = 1  # inference thread pool size
+DEFAULT_RERANK_LOCAL_MAX_LENGTH = 512
+
+# Rerank score cache: maximum number of cached (query, chunk) scores
+DEFAULT_RERANK_CACHE_MAX_SIZE = 100000
+
 # Default source ids limit in meta data for entity and relation
 DEFAULT_MAX_SOURCE_IDS_PER_ENTITY = 300
 DEFAULT_MAX_SOURCE_IDS_PER_RELATION = 300
@@ -89,10 +125,23 @@ DEFAULT_TEMPERATURE = 1.0
 
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
+DEFAULT_MIN_ASYNC = 1  # Lower bound of the adaptive LLM concurrency limit
+DEFAULT_ADAPTIVE_CONCURRENCY = False  # Adapt LLM/embedding concurrency to provider load
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
+DEFAULT_EMBEDDING_FUNC_MIN_ASYNC = 1  # Lower bound of the adaptive embedding limit
+
+# Client-side provider quotas (0 disables): requests and tokens per minute
+DEFAULT_LLM_RPM = 0
+DEFAULT_LLM_TPM = 0
+DEFAULT_EMBEDDING_RPM = 0
+DEFAULT_EMBEDDING_TPM = 0
+# Completion tokens reserved for LLM calls without max_tokens (settled afterwards)
+DEFAULT_RATE_LIMIT_COMPLETION_TOKENS = 512
+# Seconds identical embedding texts keep sharing a computed vector (0: in flight only)
+DEFAULT_EMBEDDING_COALESCE_WINDOW = 0.0
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
 
 # Gunicorn worker timeout
@@ -102,6 +151,11 @@ DEFAULT_TIMEOUT = 300
 DEFAULT_LLM_TIMEOUT = 180
 DEFAULT_EMBEDDING_TIMEOUT = 30
 
+# Load balancing over multiple LLM/embedding endpoints (LLM_BINDING_HOSTS etc.)
+DEFAULT_LOAD_BALANCE_STRATEGY = "least_outstanding"  # or "latency"
+DEFAULT_LOAD_BALANCE_EJECT_AFTER = 3  # consecutive failures before ejection
+DEFAULT_LOAD_BALANCE_EJECT_SECONDS = 30
+
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
 DEFAULT_LOG_BACKUP_COUNT = 5  # Default 5 backups
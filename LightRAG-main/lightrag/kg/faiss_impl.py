@@ -6,7 +6,7 @@ import json
 import numpy as np
 from dataclasses import dataclass
 
-from lightrag.utils import logger, compute_mdhash_id
+from lightrag.utils import logger, compute_mdhash_id, match_metadata_filter
 from lightrag.base import BaseVectorStorage
 
 from .shared_storage import (
@@ -18,6 +18,9 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Supported values for the faiss_index_type option
+FAISS_INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
 
 @final
 @dataclass
@@ -25,6 +28,17 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    The index type is selected with `faiss_index_type` in vector_db_storage_cls_kwargs
+    (or the FAISS_INDEX_TYPE environment variable):
+    - "flat": exact brute-force search (default)
+    - "hnsw": approximate graph search, deletes are tombstoned until the next rebuild
+    - "ivfpq": inverted lists with product quantization, trained once enough vectors exist
+
+    Vectors keep stable ids (IndexIDMap2 for flat/HNSW, native ids for IVF-PQ) so
+    deletes go through remove_ids instead of rebuilding the whole index. Vectors are
+    stored only in the index and reconstructed from it when needed; metadata is
+    persisted separately in a compressed columnar file.
     """
 
     def __post_init__(self):
@@ -38,6 +52,45 @@ class FaissVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
+        def option(name, default, value_type=str):
+            value = kwargs.get(name)
+            if value is None:
+                value = os.getenv(name.upper())
+            return default if value in (None, "") else value_type(value)
+
+        self._index_type = option("faiss_index_type", "flat").lower()
+        if self._index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported faiss_index_type '{self._index_type}', "
+                f"expected one of {', '.join(FAISS_INDEX_TYPES)}"
+            )
+        # HNSW graph parameters
+        self._hnsw_m = option("faiss_hnsw_m", 32, int)
+        self._hnsw_ef_construction = option("faiss_hnsw_ef_construction", 200, int)
+        self._hnsw_ef_search = option("faiss_hnsw_ef_search", 128, int)
+        # IVF-PQ parameters; nlist 0 means derive it from the vector count at training time
+        self._ivf_nlist = option("faiss_ivf_nlist", 0, int)
+        self._ivf_nprobe = option("faiss_ivf_nprobe", 16, int)
+        self._pq_m = option("faiss_pq_m", 0, int)
+        self._pq_nbits = option("faiss_pq_nbits", 8, int)
+        # Metadata-filtered queries score up to this many matching vectors exactly,
+        # larger matching sets are searched in the index restricted to their ids
+        self._filter_exact_max = option("faiss_filter_exact_max", 10000, int)
+        # Training / rebuild policy
+        # - IVF-PQ stays on a flat index until train_min_vectors vectors are stored
+        # - an IVF-PQ index is retrained once it grows by retrain_growth_factor
+        # - HNSW is rebuilt once tombstoned vectors exceed rebuild_deleted_ratio
+        # - auto_rebuild=False leaves rebuilds to explicit rebuild_index() calls
+        self._train_min_vectors = option("faiss_train_min_vectors", 10000, int)
+        self._max_train_vectors = option("faiss_max_train_vectors", 200000, int)
+        self._retrain_growth_factor = option("faiss_retrain_growth_factor", 2.0, float)
+        self._rebuild_deleted_ratio = option("faiss_rebuild_deleted_ratio", 0.2, float)
+        self._auto_rebuild = option(
+            "faiss_auto_rebuild",
+            True,
+            lambda v: v if isinstance(v, bool) else str(v).lower() == "true",
+        )
+
         # Where to save index file if you want persistent storage
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -53,19 +106,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         self._faiss_index_file = os.path.join(
             workspace_dir, f"faiss_index_{self.namespace}.index"
         )
-        self._meta_file = self._faiss_index_file + ".meta.json"
+        self._meta_file = self._faiss_index_file + ".meta.npz"
+        # Metadata file written by earlier versions, including a copy of every vector
+        self._legacy_meta_file = self._faiss_index_file + ".meta.json"
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
         # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
+        # Also resets the local metadata store:
+        # _id_to_meta maps <int faiss_id> → metadata (including your original ID)
+        # _custom_id_to_fid maps <original ID> → <int faiss_id>
+        self._reset_index()
 
         self._load_faiss_index()
 
@@ -90,8 +143,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -157,7 +209,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # 2. Remove them
         # 3. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -165,17 +217,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
+        # Step 2: Add new vectors under fresh ids
         index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        start_idx = self._next_fid
+        self._next_fid += len(list_data)
+        index.add_with_ids(
+            embeddings, np.arange(start_idx, self._next_fid, dtype=np.int64)
+        )
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        # Step 3: Store metadata for each new ID; the vector lives only in the index
+        for fid, meta in enumerate(list_data, start=start_idx):
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -183,11 +236,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
         return [m["__id__"] for m in list_data]
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search by a textual query; returns top_k results with their metadata + similarity distance.
         """
+        metadata_filter = self._applicable_metadata_filter(metadata_filter)
         if query_embedding is not None:
             embedding = np.array([query_embedding], dtype=np.float32)
         else:
@@ -201,7 +259,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        if metadata_filter:
+            distances, indices = self._filtered_search(
+                index, embedding, top_k, metadata_filter
+            )
+        elif self._deleted_fids:
+            # Skip tombstoned HNSW vectors inside the search itself
+            params = faiss.SearchParametersHNSW(
+                sel=self._get_deleted_selector(), efSearch=self._hnsw_ef_search
+            )
+            distances, indices = index.search(embedding, top_k, params=params)
+        else:
+            distances, indices = index.search(embedding, top_k)
 
         distances = distances[0]
         indices = indices[0]
@@ -217,11 +286,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 continue
 
             meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
             results.append(
                 {
-                    **filtered_meta,
+                    **meta,
                     "id": meta.get("__id__"),
                     "distance": float(dist),
                     "created_at": meta.get("__created_at__"),
@@ -302,51 +369,263 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Flat and IVF-PQ indexes drop them with remove_ids. HNSW graphs cannot
+        remove nodes, so their ids are tombstoned and filtered out at search
+        time until the next rebuild.
+        """
+        async with self._storage_lock:
+            fids = [fid for fid in set(fid_list) if fid in self._id_to_meta]
+            if not fids:
+                return
+            for fid in fids:
+                meta = self._id_to_meta.pop(fid)
+                if self._custom_id_to_fid.get(meta["__id__"]) == fid:
+                    del self._custom_id_to_fid[meta["__id__"]]
+
+            if self._index_kind(self._index) == "hnsw":
+                self._deleted_fids.update(fids)
+                self._deleted_selector = None
+            else:
+                self._index.remove_ids(np.array(fids, dtype=np.int64))
+
+    def _filtered_search(
+        self, index, embedding: np.ndarray, top_k: int, metadata_filter: dict
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Search only the vectors whose metadata matches the filter.
+        Small matching sets are scored exactly against their reconstructed vectors;
+        larger ones are searched in the index with an IDSelector, so the result
+        keeps top_k entries however selective the filter is.
+        """
+        fids = np.fromiter(
+            (
+                fid
+                for fid, meta in self._id_to_meta.items()
+                if match_metadata_filter(meta, metadata_filter)
+            ),
+            dtype=np.int64,
+        )
+        if len(fids) <= self._filter_exact_max:
+            scores = self._reconstruct_vectors(fids) @ embedding[0]
+            order = np.argsort(-scores)[:top_k]
+            return scores[order][None, :], fids[order][None, :]
+
+        # Tombstoned ids are never in _id_to_meta, so the batch excludes them too
+        selector = faiss.IDSelectorBatch(fids)
+        kind = self._index_kind(index)
+        if kind == "hnsw":
+            params = faiss.SearchParametersHNSW(
+                sel=selector, efSearch=self._hnsw_ef_search
+            )
+        elif kind == "ivfpq":
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=index.nprobe)
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        return index.search(embedding, top_k, params=params)
+
+    def _get_deleted_selector(self):
+        """Return an IDSelector excluding tombstoned ids, cached until they change"""
+        if self._deleted_selector is None:
+            batch = faiss.IDSelectorBatch(
+                np.fromiter(self._deleted_fids, dtype=np.int64)
+            )
+            # The faiss wrapper keeps `batch` alive for the outer selector
+            self._deleted_selector = faiss.IDSelectorNot(batch)
+        return self._deleted_selector
+
+    @staticmethod
+    def _index_kind(index) -> str:
+        """Return the index type name of a (possibly IndexIDMap-wrapped) Faiss index"""
+        inner = faiss.downcast_index(getattr(index, "index", index))
+        if isinstance(inner, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(inner, faiss.IndexIVFPQ):
+            return "ivfpq"
+        return "flat"
+
+    def _target_kind(self, count: int) -> str:
+        """Index type to build for `count` vectors under the training policy"""
+        if self._index_type == "ivfpq" and count < self._train_min_vectors:
+            return "flat"
+        return self._index_type
+
+    def _pq_subquantizers(self) -> int:
+        """Number of PQ sub-quantizers; it must divide the embedding dimension"""
+        if self._pq_m:
+            if self._dim % self._pq_m:
+                raise ValueError(
+                    f"faiss_pq_m={self._pq_m} must divide embedding dimension {self._dim}"
+                )
+            return self._pq_m
+        for m in (64, 48, 32, 24, 16, 12, 8, 4, 2):
+            if self._dim % m == 0 and m <= self._dim:
+                return m
+        return 1
+
+    def _create_index(self, kind: str, count: int = 0):
+        """Create an empty IndexIDMap2-wrapped index of the given type"""
+        if kind == "hnsw":
+            inner = faiss.IndexHNSWFlat(
+                self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            inner.hnsw.efConstruction = self._hnsw_ef_construction
+            inner.hnsw.efSearch = self._hnsw_ef_search
+        elif kind == "ivfpq":
+            nlist = self._ivf_nlist or int(4 * np.sqrt(count))
+            # k-means needs enough training points per centroid
+            nlist = max(1, min(nlist, count // 39))
+            quantizer = faiss.IndexFlatIP(self._dim)
+            inner = faiss.IndexIVFPQ(
+                quantizer,
+                self._dim,
+                nlist,
+                self._pq_subquantizers(),
+                self._pq_nbits,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            inner.nprobe = min(self._ivf_nprobe, nlist)
+            # IVF indexes store ids natively, and wrapping them in IndexIDMap2
+            # breaks remove_ids because IVF does not renumber on removal.
+            # The hashtable direct map lets vectors be reconstructed by id.
+            inner.set_direct_map_type(faiss.DirectMap.Hashtable)
+            return inner
+        else:
+            inner = faiss.IndexFlatIP(self._dim)
+        return faiss.IndexIDMap2(inner)
+
+    def _reset_index(self):
+        """Replace the index with an empty one and clear all in-memory metadata"""
+        self._index = self._create_index(self._target_kind(0))
+        self._id_to_meta: dict[int, dict[str, Any]] = {}
+        self._custom_id_to_fid: dict[str, int] = {}
+        self._next_fid = 0
+        self._deleted_fids: set[int] = set()
+        self._deleted_selector = None
+        self._trained_size = 0
+
+    def _apply_search_params(self):
+        """Apply the configured query-time parameters to a loaded index"""
+        inner = faiss.downcast_index(getattr(self._index, "index", self._index))
+        if isinstance(inner, faiss.IndexHNSW):
+            inner.hnsw.efSearch = self._hnsw_ef_search
+        elif isinstance(inner, faiss.IndexIVF):
+            inner.nprobe = min(self._ivf_nprobe, inner.nlist)
+
+    def _reconstruct_vectors(self, fids) -> np.ndarray:
+        """
+        Read vectors back from the index by Faiss id.
+        Flat and HNSW indexes return the stored vectors exactly; IVF-PQ returns
+        their product-quantized approximation.
+        """
+        if not len(fids):
+            return np.empty((0, self._dim), dtype=np.float32)
+        return self._index.reconstruct_batch(np.asarray(fids, dtype=np.int64))
+
+    def _rebuild_index(self, vectors: np.ndarray | None = None):
+        """
+        Rebuild the index, training it if needed.
+        Drops HNSW tombstones and switches to the configured index type.
+        Vectors are reconstructed from the current index unless given in
+        _id_to_meta order.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
+        fids = np.fromiter(self._id_to_meta.keys(), dtype=np.int64)
+        if vectors is None:
+            vectors = self._reconstruct_vectors(fids)
+
+        kind = self._target_kind(len(fids))
+        index = self._create_index(kind, len(fids))
+        if kind == "ivfpq":
+            train = vectors
+            if len(train) > self._max_train_vectors:
+                rng = np.random.default_rng(0)
+                train = train[
+                    rng.choice(len(train), self._max_train_vectors, replace=False)
+                ]
+            index.train(train)
+        if len(fids):
+            index.add_with_ids(vectors, fids)
+
+        self._index = index
+        self._deleted_fids = set()
+        self._deleted_selector = None
+        self._trained_size = len(fids)
+        logger.info(
+            f"[{self.workspace}] Rebuilt Faiss {kind} index for {self.namespace} with {len(fids)} vectors"
+        )
 
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
+    def _needs_rebuild(self) -> bool:
+        """Check the rebuild policy against the current index state"""
+        count = len(self._id_to_meta)
+        kind = self._index_kind(self._index)
+        if kind != self._target_kind(count):
+            # A trained IVF-PQ index is kept when deletes drop it below the training threshold
+            return not (kind == "ivfpq" and self._index_type == "ivfpq")
+        if kind == "hnsw" and self._deleted_fids:
+            return len(self._deleted_fids) > self._rebuild_deleted_ratio * max(
+                self._index.ntotal, 1
+            )
+        if kind == "ivfpq" and self._retrain_growth_factor > 0:
+            return count > self._retrain_growth_factor * max(self._trained_size, 1)
+        return False
 
+    async def rebuild_index(self) -> None:
+        """
+        Rebuild (and retrain) the Faiss index from the stored vectors.
+        Changes will be persisted to disk during the next index_done_callback.
+        """
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            self._rebuild_index()
 
     def _save_faiss_index(self):
         """
         Save the current Faiss index + metadata to disk so it can persist across runs.
         """
         faiss.write_index(self._index, self._faiss_index_file)
+        self._write_meta_file()
+        # The legacy JSON metadata has been superseded once the new file is written
+        if os.path.exists(self._legacy_meta_file):
+            os.remove(self._legacy_meta_file)
 
-        # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
-        # We'll keep the int -> dict, but JSON requires string keys.
-        serializable_dict = {}
-        for fid, meta in self._id_to_meta.items():
-            serializable_dict[str(fid)] = meta
+    def _write_meta_file(self):
+        """
+        Write _id_to_meta as a compressed columnar .npz file.
 
-        with open(self._meta_file, "w", encoding="utf-8") as f:
-            json.dump(serializable_dict, f)
+        Layout: `fids` holds the Faiss ids, `fields` the JSON list of field names,
+        and for field i `mask_i` marks the rows that have it while `col_i` holds
+        the JSON-encoded values of those rows. Vectors are not stored here.
+        """
+        metas = list(self._id_to_meta.values())
+        fields = sorted({key for meta in metas for key in meta})
+        arrays = {
+            "fids": np.fromiter(self._id_to_meta.keys(), dtype=np.int64),
+            "fields": np.frombuffer(json.dumps(fields).encode("utf-8"), np.uint8),
+        }
+        for i, field in enumerate(fields):
+            arrays[f"mask_{i}"] = np.fromiter(
+                (field in meta for meta in metas), dtype=bool, count=len(metas)
+            )
+            values = [meta[field] for meta in metas if field in meta]
+            arrays[f"col_{i}"] = np.frombuffer(
+                json.dumps(values, ensure_ascii=False).encode("utf-8"), np.uint8
+            )
+        np.savez_compressed(self._meta_file, **arrays)
+
+    def _read_meta_file(self) -> dict[int, dict[str, Any]]:
+        """Read metadata written by _write_meta_file"""
+        with np.load(self._meta_file, allow_pickle=False) as data:
+            fids = data["fids"].tolist()
+            metas = [{} for _ in fids]
+            for i, field in enumerate(json.loads(data["fields"].tobytes())):
+                values = iter(json.loads(data[f"col_{i}"].tobytes()))
+                for meta, present in zip(metas, data[f"mask_{i}"].tolist()):
+                    if present:
+                        meta[field] = next(values)
+        return dict(zip(fids, metas))
 
     def _load_faiss_index(self):
         """
@@ -376,14 +655,51 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 raise ValueError(error_msg)
 
             # Load metadata
-            with open(self._meta_file, "r", encoding="utf-8") as f:
-                stored_dict = json.load(f)
-
-            # Convert string keys back to int
-            self._id_to_meta = {}
-            for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+            migrate = False
+            legacy_vectors = None
+            if os.path.exists(self._meta_file):
+                self._id_to_meta = self._read_meta_file()
+            else:
+                # Legacy JSON metadata: string keys and a copy of every vector.
+                # The exact vectors are used once to rebuild the index.
+                with open(self._legacy_meta_file, "r", encoding="utf-8") as f:
+                    stored_dict = json.load(f)
+                self._id_to_meta = {
+                    int(fid_str): meta for fid_str, meta in stored_dict.items()
+                }
+                vectors = [
+                    meta.pop("__vector__", None) for meta in self._id_to_meta.values()
+                ]
+                if all(vector is not None for vector in vectors):
+                    legacy_vectors = np.array(vectors, dtype=np.float32).reshape(
+                        -1, self._dim
+                    )
+                migrate = True
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+            }
+
+            self._deleted_fids = set()
+            self._deleted_selector = None
+            self._trained_size = len(self._id_to_meta)
+            if isinstance(self._index, faiss.IndexIDMap):
+                index_ids = faiss.vector_to_array(self._index.id_map)
+                # Ids present in the index but not in metadata are HNSW tombstones
+                self._deleted_fids = set(index_ids.tolist()) - self._id_to_meta.keys()
+                self._next_fid = int(index_ids.max()) + 1 if len(index_ids) else 0
+            elif isinstance(self._index, faiss.IndexIVF):
+                self._next_fid = 0
+            else:
+                # Index files written before ids were mapped hold a bare
+                # IndexFlatIP whose positions are the metadata keys
+                self._next_fid = 0
+                migrate = True
+            self._next_fid = max(self._next_fid, max(self._id_to_meta, default=-1) + 1)
+
+            if migrate or self._needs_rebuild():
+                self._rebuild_index(legacy_vectors)
+            else:
+                self._apply_search_params()
 
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
@@ -395,8 +711,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -406,8 +721,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -415,6 +729,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
+                # Train or rebuild the index first if the policy asks for it
+                if self._auto_rebuild and self._needs_rebuild():
+                    self._rebuild_index()
                 # Save data to disk
                 self._save_faiss_index()
                 # Notify other processes that data has been updated
@@ -448,10 +765,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -475,12 +790,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid)
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     record = {
-                        **filtered_metadata,
+                        **metadata,
                         "id": metadata.get("__id__"),
                         "created_at": metadata.get("__created_at__"),
                     }
@@ -501,17 +812,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not ids:
             return {}
 
-        vectors_dict = {}
+        found = {}
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                found[id] = fid
+        if not found:
+            return {}
 
-        return vectors_dict
+        # Vectors are only stored in the index, read them back in one batch
+        index = await self._get_index()
+        vectors = index.reconstruct_batch(np.fromiter(found.values(), dtype=np.int64))
+        return {id: vector.tolist() for id, vector in zip(found, vectors)}
 
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
@@ -532,16 +845,17 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
-                if os.path.exists(self._faiss_index_file):
-                    os.remove(self._faiss_index_file)
-                if os.path.exists(self._meta_file):
-                    os.remove(self._meta_file)
+                for path in (
+                    self._faiss_index_file,
+                    self._meta_file,
+                    self._legacy_meta_file,
+                ):
+                    if os.path.exists(path):
+                        os.remove(path)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -127,6 +127,7 @@ class MemgraphStorage(BaseGraphStorage):
                         logger.warning(
                             f"[{self.workspace}] Index creation on :{workspace_label}(entity_id) may have failed or already exists: {e}"
                         )
+                    await self._create_evidence_indexes(session, workspace_label)
                     await session.run("RETURN 1")
                     logger.info(f"[{self.workspace}] Connected to Memgraph at {URI}")
             except Exception as e:
@@ -135,6 +136,29 @@ class MemgraphStorage(BaseGraphStorage):
                 )
                 raise
 
+    async def _create_evidence_indexes(self, session, workspace_label: str):
+        """Create label-property and edge-type property indexes for evidence queries.
+
+        Memgraph cannot index list membership, so scene_tags lookups stay scans.
+        Edge-type property indexes need a Memgraph version that supports them;
+        failures are logged and the affected queries fall back to scans.
+        """
+        statements = [
+            f"CREATE INDEX ON :{workspace_label}(evidence_level)",
+            f"CREATE INDEX ON :{workspace_label}(entity_name)",
+            "CREATE EDGE INDEX ON :DIRECTED(evidence_level)",
+            "CREATE EDGE INDEX ON :DIRECTED(relation_type)",
+        ]
+        for statement in statements:
+            try:
+                result = await session.run(statement)
+                await result.consume()
+            except Exception as e:
+                # Index may already exist, which is not an error
+                logger.warning(
+                    f"[{self.workspace}] Index creation '{statement}' may have failed or already exists: {e}"
+                )
+
     async def finalize(self):
         if self._driver is not None:
             await self._driver.close()
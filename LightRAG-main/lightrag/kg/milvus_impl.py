@@ -1,9 +1,10 @@
 import asyncio
+import json
 import os
 from typing import Any, final
 from dataclasses import dataclass
 import numpy as np
-from lightrag.utils import logger, compute_mdhash_id
+from lightrag.utils import METADATA_LIST_FIELDS, logger, compute_mdhash_id
 from ..base import BaseVectorStorage
 from ..constants import DEFAULT_MAX_FILE_PATH_LENGTH
 from ..kg.shared_storage import get_data_init_lock
@@ -19,6 +20,23 @@ config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
 
 
+def build_metadata_filter_expr(metadata_filter: dict[str, list] | None) -> str:
+    """Translate a normalized metadata filter into a Milvus boolean expression.
+
+    Field names are validated identifiers and values are JSON-encoded, so the
+    expression cannot be altered by user input. List-valued fields such as
+    scene_tags are stored as JSON arrays and matched with json_contains_any.
+    """
+    clauses = []
+    for key, values in (metadata_filter or {}).items():
+        literal = json.dumps(values, ensure_ascii=False)
+        if key in METADATA_LIST_FIELDS:
+            clauses.append(f"json_contains_any({key}, {literal})")
+        else:
+            clauses.append(f"{key} in {literal}")
+    return " and ".join(clauses)
+
+
 @final
 @dataclass
 class MilvusVectorDBStorage(BaseVectorStorage):
@@ -1071,8 +1089,13 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         return results
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
+        metadata_filter = self._applicable_metadata_filter(metadata_filter)
         # Ensure collection is loaded before querying
         self._ensure_collection_loaded()
 
@@ -1092,6 +1115,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             data=embedding,
             limit=top_k,
             output_fields=output_fields,
+            filter=build_metadata_filter_expr(metadata_filter),
             search_params={
                 "metric_type": "COSINE",
                 "params": {"radius": self.cosine_better_than_threshold},
@@ -16,7 +16,7 @@ from ..base import (
     DocStatus,
     DocStatusStorage,
 )
-from ..utils import logger, compute_mdhash_id
+from ..utils import METADATA_FILTER_FIELDS, logger, compute_mdhash_id
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..constants import GRAPH_FIELD_SEP
 from ..kg.shared_storage import get_data_init_lock
@@ -2126,6 +2126,26 @@ class MongoVectorDBStorage(BaseVectorStorage):
             self.db = None
             self._data = None
 
+    def _filter_index_fields(self) -> list[str]:
+        """Metadata fields indexed as Atlas Vector Search filter fields"""
+        return [f for f in METADATA_FILTER_FIELDS if f in self.meta_fields]
+
+    def _vector_index_definition(self) -> dict[str, Any]:
+        return {
+            "fields": [
+                {
+                    "type": "vector",
+                    "numDimensions": self.embedding_func.embedding_dim,  # Ensure correct dimensions
+                    "path": "vector",
+                    "similarity": "cosine",  # Options: euclidean, cosine, dotProduct
+                },
+                *(
+                    {"type": "filter", "path": path}
+                    for path in self._filter_index_fields()
+                ),
+            ]
+        }
+
     async def create_vector_index_if_not_exists(self):
         """Creates an Atlas Vector Search index."""
         try:
@@ -2157,22 +2177,27 @@ class MongoVectorDBStorage(BaseVectorStorage):
                         logger.error(f"[{self.workspace}] {error_msg}")
                         raise ValueError(error_msg)
 
+                    # Indexes created by earlier versions have no filter fields
+                    existing_filters = {
+                        field.get("path")
+                        for field in fields
+                        if field.get("type") == "filter"
+                    }
+                    if not set(self._filter_index_fields()) <= existing_filters:
+                        await self._data.update_search_index(
+                            self._index_name, self._vector_index_definition()
+                        )
+                        logger.info(
+                            f"[{self.workspace}] Added metadata filter fields to vector index {self._index_name}"
+                        )
+
                     logger.info(
                         f"[{self.workspace}] vector index {self._index_name} already exists with matching dimensions ({expected_dim})"
                     )
                     return
 
             search_index_model = SearchIndexModel(
-                definition={
-                    "fields": [
-                        {
-                            "type": "vector",
-                            "numDimensions": self.embedding_func.embedding_dim,  # Ensure correct dimensions
-                            "path": "vector",
-                            "similarity": "cosine",  # Options: euclidean, cosine, dotProduct
-                        }
-                    ]
-                },
+                definition=self._vector_index_definition(),
                 name=self._index_name,
                 type="vectorSearch",
             )
@@ -2227,9 +2252,28 @@ class MongoVectorDBStorage(BaseVectorStorage):
         return list_data
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """Queries the vector database using Atlas Vector Search."""
+        metadata_filter = self._applicable_metadata_filter(metadata_filter) or {}
+        # Fields indexed as filter fields are applied inside $vectorSearch, so the
+        # search still returns top_k matches; other fields are matched afterwards.
+        # $in also matches array fields (scene_tags) on any element.
+        indexed = set(self._filter_index_fields())
+        search_filter = {
+            key: {"$in": values}
+            for key, values in metadata_filter.items()
+            if key in indexed
+        }
+        post_filter = {
+            key: {"$in": values}
+            for key, values in metadata_filter.items()
+            if key not in indexed
+        }
         if query_embedding is not None:
             # Convert numpy array to list if needed for MongoDB compatibility
             if hasattr(query_embedding, "tolist"):
@@ -2245,18 +2289,24 @@ class MongoVectorDBStorage(BaseVectorStorage):
             query_vector = embedding[0].tolist()
 
         # Define the aggregation pipeline with the converted query vector
+        vector_search = {
+            "index": self._index_name,  # Use stored index name for consistency
+            "path": "vector",
+            "queryVector": query_vector,
+            "numCandidates": 100,  # Adjust for performance
+            "limit": top_k,
+        }
+        if search_filter:
+            vector_search["filter"] = search_filter
         pipeline = [
+            {"$vectorSearch": vector_search},
+            {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
             {
-                "$vectorSearch": {
-                    "index": self._index_name,  # Use stored index name for consistency
-                    "path": "vector",
-                    "queryVector": query_vector,
-                    "numCandidates": 100,  # Adjust for performance
-                    "limit": top_k,
+                "$match": {
+                    "score": {"$gte": self.cosine_better_than_threshold},
+                    **post_filter,
                 }
             },
-            {"$addFields": {"score": {"$meta": "vectorSearchScore"}}},
-            {"$match": {"score": {"$gte": self.cosine_better_than_threshold}}},
             {"$project": {"vector": 0}},
         ]
 
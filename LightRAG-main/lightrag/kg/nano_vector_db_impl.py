@@ -10,6 +10,7 @@ import time
 from lightrag.utils import (
     logger,
     compute_mdhash_id,
+    match_metadata_filter,
 )
 
 from lightrag.base import BaseVectorStorage
@@ -142,8 +143,14 @@ class NanoVectorDBStorage(BaseVectorStorage):
             )
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
+        metadata_filter = self._applicable_metadata_filter(metadata_filter)
+
         # Use provided embedding or compute it
         if query_embedding is not None:
             embedding = query_embedding
@@ -155,10 +162,22 @@ class NanoVectorDBStorage(BaseVectorStorage):
             embedding = embedding[0]
 
         client = await self._get_client()
+        filter_lambda = None
+        if metadata_filter:
+
+            def filter_lambda(dp):
+                return match_metadata_filter(dp, metadata_filter)
+
+            # The filtered matrix must not be empty, so check for any match first
+            storage = getattr(client, "_NanoVectorDB__storage")
+            if not any(filter_lambda(dp) for dp in storage["data"]):
+                return []
+
         results = client.query(
             query=embedding,
             top_k=top_k,
             better_than_threshold=self.cosine_better_than_threshold,
+            filter_lambda=filter_lambda,
         )
         results = [
             {
@@ -1,8 +1,9 @@
 import os
 import re
 import json
+import time
 from dataclasses import dataclass
-from typing import final
+from typing import Any, AsyncIterator, final
 import configparser
 
 
@@ -17,7 +18,7 @@ import logging
 from ..utils import logger
 from ..base import BaseGraphStorage
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from ..kg.shared_storage import get_data_init_lock
+from ..kg.shared_storage import get_data_init_lock, get_namespace_data
 import pipmaster as pm
 
 if not pm.is_installed("neo4j"):
@@ -28,6 +29,7 @@ from neo4j import (  # type: ignore
     exceptions as neo4jExceptions,
     AsyncDriver,
     AsyncManagedTransaction,
+    Query,
 )
 
 from dotenv import load_dotenv
@@ -45,6 +47,48 @@ config.read("config.ini", "utf-8")
 logging.getLogger("neo4j").setLevel(logging.ERROR)
 
 
+# List membership (`$tag IN n.scene_tags`) cannot use an index, so scene tags are
+# also stored denormalized as "|tag1|tag2|", which a TEXT index serves for CONTAINS
+SCENE_TAGS_KEY_FIELD = "scene_tags_key"
+
+# Nodes/relationships backfilled with scene_tags_key per write transaction
+SCENE_TAGS_MIGRATION_BATCH_SIZE = 10000
+
+
+def scene_tags_key(tags: list[str]) -> str:
+    """Denormalized, indexable form of a scene_tags list"""
+    return "|" + "".join(f"{tag}|" for tag in tags)
+
+
+# Evidence queries that can be streamed page by page with iter_evidence
+EVIDENCE_STREAM_KINDS = ("entities", "relations", "causal_chain", "aggregate")
+
+# Upper bound for causal chain traversal depth (inlined into the Cypher pattern)
+MAX_CAUSAL_CHAIN_DEPTH = 10
+
+EVIDENCE_LEVEL_WEIGHT_CYPHER = """CASE {value}
+    WHEN "S" THEN 4 WHEN "A" THEN 3 WHEN "B" THEN 2 WHEN "C" THEN 1 ELSE 0
+END"""
+
+
+def keyset_condition(keys: list[tuple[str, str]], param: str = "after") -> str:
+    """Cypher predicate selecting rows strictly after the cursor ${param}.
+
+    keys are the (expression, "ASC" | "DESC") pairs of the ORDER BY clause and
+    the cursor holds their values for the last row of the previous page, so
+    pages are contiguous without SKIP/OFFSET.
+    """
+    clause = None
+    for i in reversed(range(len(keys))):
+        expr, direction = keys[i]
+        op = ">" if direction == "ASC" else "<"
+        term = f"{expr} {op} ${param}[{i}]"
+        if clause is not None:
+            term = f"({term} OR ({expr} = ${param}[{i}] AND {clause}))"
+        clause = term
+    return clause
+
+
 READ_RETRY_EXCEPTIONS = (
     neo4jExceptions.ServiceUnavailable,
     neo4jExceptions.TransientError,
@@ -90,6 +134,8 @@ class Neo4JStorage(BaseGraphStorage):
             )
 
         self._driver = None
+        # Replaced by the shared (cross-process) dict in initialize()
+        self._data_versions: dict[str, int] = {}
 
     @staticmethod
     def _sanitize_properties(properties: dict) -> dict:
@@ -101,6 +147,9 @@ class Neo4JStorage(BaseGraphStorage):
                 out[k] = json.dumps(v, ensure_ascii=False)
             else:
                 out[k] = v
+        tags = out.get("scene_tags")
+        if isinstance(tags, list) and all(isinstance(tag, str) for tag in tags):
+            out[SCENE_TAGS_KEY_FIELD] = scene_tags_key(tags)
         return out
 
     @staticmethod
@@ -108,6 +157,7 @@ class Neo4JStorage(BaseGraphStorage):
         if properties is None:
             return None
         out = dict(properties)
+        out.pop(SCENE_TAGS_KEY_FIELD, None)
         for k in {"scene_tags", "source_provenance", "evidence_chain_ids"}:
             v = out.get(k)
             if isinstance(v, str) and v and v[0] in "[{":
@@ -117,6 +167,18 @@ class Neo4JStorage(BaseGraphStorage):
                     pass
         return out
 
+    @staticmethod
+    def _decode_record_value(value: Any) -> Any:
+        """Decode the nodes in a Record.data() value for callers
+
+        Nodes are property dicts there and relationships (start, type, end) tuples.
+        """
+        if isinstance(value, dict):
+            return Neo4JStorage._decode_properties(value)
+        if isinstance(value, tuple):
+            return tuple(Neo4JStorage._decode_record_value(v) for v in value)
+        return value
+
     def _get_workspace_label(self) -> str:
         """Return workspace label (guaranteed non-empty during initialization)"""
         return self.workspace
@@ -150,6 +212,9 @@ class Neo4JStorage(BaseGraphStorage):
         return bool(cjk_pattern.search(text))
 
     async def initialize(self):
+        self._data_versions = await get_namespace_data(
+            "data_versions", workspace=self.workspace
+        )
         async with get_data_init_lock():
             URI = os.environ.get("NEO4J_URI", config.get("neo4j", "uri", fallback=None))
             USERNAME = os.environ.get(
@@ -299,8 +364,112 @@ class Neo4JStorage(BaseGraphStorage):
                     await self._create_fulltext_index(
                         self._driver, self._DATABASE, workspace_label
                     )
+                    # Create indexes for evidence queries and backfill scene_tags_key
+                    await self._create_evidence_indexes(
+                        self._driver, self._DATABASE, workspace_label
+                    )
+                    await self._migrate_scene_tags_key(
+                        self._driver, self._DATABASE, workspace_label
+                    )
                     break
 
+    def _get_evidence_index_statements(self, workspace_label: str) -> dict[str, str]:
+        """Return {index name: CREATE statement} for the evidence query indexes.
+
+        Node indexes are per workspace label; relationship indexes cover the shared
+        DIRECTED type and therefore every workspace of the database.
+        """
+        suffix = self._normalize_index_suffix(workspace_label)
+        node = f"(n:`{workspace_label}`)"
+        rel = "()-[r:DIRECTED]-()"
+        specs = {
+            f"evidence_level_idx_{suffix}": ("INDEX", node, "n.evidence_level"),
+            f"entity_name_idx_{suffix}": ("INDEX", node, "n.entity_name"),
+            f"scene_tags_key_text_idx_{suffix}": (
+                "TEXT INDEX",
+                node,
+                f"n.{SCENE_TAGS_KEY_FIELD}",
+            ),
+            "directed_evidence_level_idx": ("INDEX", rel, "r.evidence_level"),
+            "directed_relation_type_idx": ("INDEX", rel, "r.relation_type"),
+            "directed_scene_tags_key_text_idx": (
+                "TEXT INDEX",
+                rel,
+                f"r.{SCENE_TAGS_KEY_FIELD}",
+            ),
+        }
+        return {
+            name: f"CREATE {kind} {name} IF NOT EXISTS FOR {pattern} ON ({prop})"
+            for name, (kind, pattern, prop) in specs.items()
+        }
+
+    async def _create_evidence_indexes(
+        self, driver: AsyncDriver, database: str, workspace_label: str
+    ):
+        """Create the property indexes used by evidence level, scene and relation type queries.
+
+        Creation is idempotent (IF NOT EXISTS). Failures are logged and the affected
+        queries fall back to label scans.
+        """
+        statements = self._get_evidence_index_statements(workspace_label)
+        async with driver.session(database=database) as session:
+            for index_name, statement in statements.items():
+                try:
+                    result = await session.run(statement)
+                    await result.consume()
+                except Exception as e:
+                    logger.warning(
+                        f"[{self.workspace}] Failed to create evidence index '{index_name}': {str(e)}"
+                    )
+        logger.info(
+            f"[{self.workspace}] Ensured evidence indexes for {workspace_label} in {database}"
+        )
+
+    async def _migrate_scene_tags_key(
+        self, driver: AsyncDriver, database: str, workspace_label: str
+    ):
+        """Backfill scene_tags_key on nodes and relationships written by earlier versions"""
+        # Same format as scene_tags_key(): "|" followed by "tag|" for every tag
+        key_expr = 'reduce(acc = "|", tag IN {var}.scene_tags | acc + tag + "|")'
+        queries = {
+            "nodes": f"""
+            MATCH (n:`{workspace_label}`)
+            WHERE n.scene_tags IS NOT NULL AND n.{SCENE_TAGS_KEY_FIELD} IS NULL
+            WITH n LIMIT $batch_size
+            SET n.{SCENE_TAGS_KEY_FIELD} = {key_expr.format(var="n")}
+            RETURN count(n) AS updated
+            """,
+            "relationships": f"""
+            MATCH (:`{workspace_label}`)-[r:DIRECTED]->()
+            WHERE r.scene_tags IS NOT NULL AND r.{SCENE_TAGS_KEY_FIELD} IS NULL
+            WITH r LIMIT $batch_size
+            SET r.{SCENE_TAGS_KEY_FIELD} = {key_expr.format(var="r")}
+            RETURN count(r) AS updated
+            """,
+        }
+        try:
+            async with driver.session(database=database) as session:
+                for kind, query in queries.items():
+                    total = 0
+                    while True:
+                        result = await session.run(
+                            query, batch_size=SCENE_TAGS_MIGRATION_BATCH_SIZE
+                        )
+                        record = await result.single()
+                        await result.consume()
+                        updated = record["updated"] if record else 0
+                        total += updated
+                        if updated < SCENE_TAGS_MIGRATION_BATCH_SIZE:
+                            break
+                    if total:
+                        logger.info(
+                            f"[{self.workspace}] Backfilled {SCENE_TAGS_KEY_FIELD} on {total} {kind}"
+                        )
+        except Exception as e:
+            logger.warning(
+                f"[{self.workspace}] Failed to backfill {SCENE_TAGS_KEY_FIELD}: {str(e)}"
+            )
+
     async def _create_fulltext_index(
         self, driver: AsyncDriver, database: str, workspace_label: str
     ):
@@ -451,6 +620,18 @@ class Neo4JStorage(BaseGraphStorage):
         # Neo4J handles persistence automatically
         pass
 
+    def get_data_version(self) -> int:
+        """Return a token that changes whenever this workspace's graph is written.
+
+        Writes store a fresh timestamp instead of incrementing a counter, so
+        concurrent writers in different processes never need a lock: any write
+        that finishes after a reader took the token changes it.
+        """
+        return self._data_versions.get(self.namespace, 0)
+
+    def _touch_data_version(self) -> None:
+        self._data_versions[self.namespace] = time.time_ns()
+
     @READ_RETRY
     async def has_node(self, node_id: str) -> bool:
         """
@@ -1078,6 +1259,7 @@ class Neo4JStorage(BaseGraphStorage):
                     await result.consume()  # Ensure result is fully consumed
 
                 await session.execute_write(execute_upsert)
+            self._touch_data_version()
         except Exception as e:
             logger.error(f"[{self.workspace}] Error during upsert: {str(e)}")
             raise
@@ -1139,6 +1321,7 @@ class Neo4JStorage(BaseGraphStorage):
                         await result.consume()  # Ensure result is consumed
 
                 await session.execute_write(execute_upsert)
+            self._touch_data_version()
         except Exception as e:
             logger.error(f"[{self.workspace}] Error during edge upsert: {str(e)}")
             raise
@@ -1324,7 +1507,9 @@ class Neo4JStorage(BaseGraphStorage):
                                 KnowledgeGraphNode(
                                     id=f"{node_id}",
                                     labels=[node.get("entity_id")],
-                                    properties=dict(node),
+                                    properties=Neo4JStorage._decode_properties(
+                                        dict(node)
+                                    ),
                                 )
                             )
                             seen_nodes.add(node_id)
@@ -1341,7 +1526,9 @@ class Neo4JStorage(BaseGraphStorage):
                                     type=rel.type,
                                     source=f"{start.id}",
                                     target=f"{end.id}",
-                                    properties=dict(rel),
+                                    properties=Neo4JStorage._decode_properties(
+                                        dict(rel)
+                                    ),
                                 )
                             )
                             seen_edges.add(edge_id)
@@ -1398,7 +1585,9 @@ class Neo4JStorage(BaseGraphStorage):
                 start_node = KnowledgeGraphNode(
                     id=f"{node_record['n'].get('entity_id')}",
                     labels=[node_record["n"].get("entity_id")],
-                    properties=dict(node_record["n"]._properties),
+                    properties=Neo4JStorage._decode_properties(
+                        dict(node_record["n"]._properties)
+                    ),
                 )
             finally:
                 await node_result.consume()  # Ensure results are consumed
@@ -1469,7 +1658,9 @@ class Neo4JStorage(BaseGraphStorage):
                             target_node = KnowledgeGraphNode(
                                 id=f"{target_id}",
                                 labels=[target_id],
-                                properties=dict(b_node._properties),
+                                properties=Neo4JStorage._decode_properties(
+                                    dict(b_node._properties)
+                                ),
                             )
 
                             # Create KnowledgeGraphEdge
@@ -1478,7 +1669,7 @@ class Neo4JStorage(BaseGraphStorage):
                                 type=rel.type,
                                 source=f"{current_node.id}",
                                 target=f"{target_id}",
-                                properties=dict(rel),
+                                properties=Neo4JStorage._decode_properties(dict(rel)),
                             )
 
                             # Sort source_id and target_id to ensure (A,B) and (B,A) are treated as the same edge
@@ -1589,6 +1780,7 @@ class Neo4JStorage(BaseGraphStorage):
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 await session.execute_write(_do_delete)
+            self._touch_data_version()
         except Exception as e:
             logger.error(f"[{self.workspace}] Error during node deletion: {str(e)}")
             raise
@@ -1657,6 +1849,7 @@ class Neo4JStorage(BaseGraphStorage):
             try:
                 async with self._driver.session(database=self._DATABASE) as session:
                     await session.execute_write(_do_delete_edge)
+                self._touch_data_version()
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error during edge deletion: {str(e)}")
                 raise
@@ -1710,6 +1903,57 @@ class Neo4JStorage(BaseGraphStorage):
             await result.consume()
             return edges
 
+    async def iter_nodes(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Stream all nodes from the result cursor in batches"""
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE,
+            default_access_mode="READ",
+            fetch_size=batch_size,
+        ) as session:
+            query = f"""
+            MATCH (n:`{workspace_label}`)
+            RETURN n
+            """
+            result = await session.run(query)
+            batch = []
+            async for record in result:
+                node_dict = dict(record["n"])
+                node_dict["id"] = node_dict.get("entity_id")
+                batch.append(Neo4JStorage._decode_properties(node_dict))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            await result.consume()
+
+    async def iter_edges(self, batch_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """Stream all edges from the result cursor in batches, one direction per edge"""
+        workspace_label = self._get_workspace_label()
+        async with self._driver.session(
+            database=self._DATABASE,
+            default_access_mode="READ",
+            fetch_size=batch_size,
+        ) as session:
+            query = f"""
+            MATCH (a:`{workspace_label}`)-[r]->(b:`{workspace_label}`)
+            RETURN a.entity_id AS source, b.entity_id AS target, properties(r) AS properties
+            """
+            result = await session.run(query)
+            batch = []
+            async for record in result:
+                edge_properties = Neo4JStorage._decode_properties(record["properties"])
+                edge_properties["source"] = record["source"]
+                edge_properties["target"] = record["target"]
+                batch.append(edge_properties)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            await result.consume()
+
     async def get_popular_labels(self, limit: int = 300) -> list[str]:
         """Get popular labels(entity names) by node degree (most connected entities)
 
@@ -1903,6 +2147,7 @@ class Neo4JStorage(BaseGraphStorage):
                 query = f"MATCH (n:`{workspace_label}`) DETACH DELETE n"
                 result = await session.run(query)
                 await result.consume()  # Ensure result is fully consumed
+                self._touch_data_version()
 
                 # logger.debug(
                 #     f"[{self.workspace}] Process {os.getpid()} drop Neo4j workspace '{workspace_label}' in database {self._DATABASE}"
@@ -1953,7 +2198,9 @@ class Neo4JStorage(BaseGraphStorage):
                 )
                 records = await result.data()
                 await result.consume()
-                return [record["n"] for record in records]
+                return [
+                    Neo4JStorage._decode_properties(record["n"]) for record in records
+                ]
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Error querying entities by evidence level: {e}"
@@ -1978,7 +2225,7 @@ class Neo4JStorage(BaseGraphStorage):
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
-                MATCH (source:`{workspace_label}`)-[r]->(target:`{workspace_label}`)
+                MATCH (source:`{workspace_label}`)-[r:DIRECTED]->(target:`{workspace_label}`)
                 WHERE r.evidence_level = $evidence_level
                 RETURN source, r, target
                 LIMIT $limit
@@ -1992,9 +2239,9 @@ class Neo4JStorage(BaseGraphStorage):
                 await result.consume()
                 return [
                     {
-                        "source": record["source"],
-                        "relation": record["r"],
-                        "target": record["target"],
+                        "source": Neo4JStorage._decode_properties(record["source"]),
+                        "relation": Neo4JStorage._decode_record_value(record["r"]),
+                        "target": Neo4JStorage._decode_properties(record["target"]),
                     }
                     for record in records
                 ]
@@ -2022,7 +2269,7 @@ class Neo4JStorage(BaseGraphStorage):
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
-                MATCH (source:`{workspace_label}`)-[r]->(target:`{workspace_label}`)
+                MATCH (source:`{workspace_label}`)-[r:DIRECTED]->(target:`{workspace_label}`)
                 WHERE r.relation_type = $relation_type
                 RETURN source, r, target
                 LIMIT $limit
@@ -2036,9 +2283,9 @@ class Neo4JStorage(BaseGraphStorage):
                 await result.consume()
                 return [
                     {
-                        "source": record["source"],
-                        "relation": record["r"],
-                        "target": record["target"],
+                        "source": Neo4JStorage._decode_properties(record["source"]),
+                        "relation": Neo4JStorage._decode_record_value(record["r"]),
+                        "target": Neo4JStorage._decode_properties(record["target"]),
                     }
                     for record in records
                 ]
@@ -2060,12 +2307,15 @@ class Neo4JStorage(BaseGraphStorage):
 
         Returns:
             实体的溯源信息列表
+
+        Raises:
+            查询失败时抛出异常（而非返回空列表），以免失败被当作无溯源信息缓存
         """
         workspace_label = self._get_workspace_label()
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
-                MATCH (n:`{workspace_label}` {entity_id: $entity_name})
+                MATCH (n:`{workspace_label}` {{entity_id: $entity_name}})
                 RETURN n.source_provenance as provenance
                 """
                 result = await session.run(query, entity_name=entity_name)
@@ -2076,7 +2326,7 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(
                 f"[{self.workspace}] Error querying entity provenance: {e}"
             )
-            return []
+            raise
 
     async def get_relation_provenance(
         self,
@@ -2091,12 +2341,15 @@ class Neo4JStorage(BaseGraphStorage):
 
         Returns:
             关系的溯源信息列表
+
+        Raises:
+            查询失败时抛出异常（而非返回空列表），以免失败被当作无溯源信息缓存
         """
         workspace_label = self._get_workspace_label()
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
-                MATCH (source:`{workspace_label}` {entity_id: $source})-[r]->(target:`{workspace_label}` {entity_id: $target})
+                MATCH (source:`{workspace_label}` {{entity_id: $source}})-[r]->(target:`{workspace_label}` {{entity_id: $target}})
                 RETURN r.source_provenance as provenance
                 """
                 result = await session.run(
@@ -2111,7 +2364,7 @@ class Neo4JStorage(BaseGraphStorage):
             logger.error(
                 f"[{self.workspace}] Error querying relation provenance: {e}"
             )
-            return []
+            raise
 
     async def get_entities_by_file(
         self,
@@ -2139,7 +2392,9 @@ class Neo4JStorage(BaseGraphStorage):
                 result = await session.run(query, file_path=file_path, limit=limit)
                 records = await result.data()
                 await result.consume()
-                return [record["n"] for record in records]
+                return [
+                    Neo4JStorage._decode_properties(record["n"]) for record in records
+                ]
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Error querying entities by file: {e}"
@@ -2166,14 +2421,22 @@ class Neo4JStorage(BaseGraphStorage):
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
                 MATCH (n:`{workspace_label}`)
-                WHERE ANY(tag IN n.scene_tags WHERE tag = $scene_tag)
+                WHERE n.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key
+                AND $scene_tag IN n.scene_tags
                 RETURN n
                 LIMIT $limit
                 """
-                result = await session.run(query, scene_tag=scene_tag, limit=limit)
+                result = await session.run(
+                    query,
+                    scene_key=scene_tags_key([scene_tag]),
+                    scene_tag=scene_tag,
+                    limit=limit,
+                )
                 records = await result.data()
                 await result.consume()
-                return [record["n"] for record in records]
+                return [
+                    Neo4JStorage._decode_properties(record["n"]) for record in records
+                ]
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Error querying entities by scene: {e}"
@@ -2198,19 +2461,25 @@ class Neo4JStorage(BaseGraphStorage):
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 query = f"""
-                MATCH (source:`{workspace_label}`)-[r]->(target:`{workspace_label}`)
-                WHERE ANY(tag IN r.scene_tags WHERE tag = $scene_tag)
+                MATCH (source:`{workspace_label}`)-[r:DIRECTED]->(target:`{workspace_label}`)
+                WHERE r.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key
+                AND $scene_tag IN r.scene_tags
                 RETURN source, r, target
                 LIMIT $limit
                 """
-                result = await session.run(query, scene_tag=scene_tag, limit=limit)
+                result = await session.run(
+                    query,
+                    scene_key=scene_tags_key([scene_tag]),
+                    scene_tag=scene_tag,
+                    limit=limit,
+                )
                 records = await result.data()
                 await result.consume()
                 return [
                     {
-                        "source": record["source"],
-                        "relation": record["r"],
-                        "target": record["target"],
+                        "source": Neo4JStorage._decode_properties(record["source"]),
+                        "relation": Neo4JStorage._decode_record_value(record["r"]),
+                        "target": Neo4JStorage._decode_properties(record["target"]),
                     }
                     for record in records
                 ]
@@ -2242,19 +2511,23 @@ class Neo4JStorage(BaseGraphStorage):
                 query = f"""
                 MATCH (n:`{workspace_label}`)
                 WHERE n.evidence_level = $evidence_level
-                AND ANY(tag IN n.scene_tags WHERE tag = $scene_tag)
+                AND n.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key
+                AND $scene_tag IN n.scene_tags
                 RETURN n
                 LIMIT $limit
                 """
                 result = await session.run(
                     query,
                     evidence_level=evidence_level.upper(),
+                    scene_key=scene_tags_key([scene_tag]),
                     scene_tag=scene_tag,
                     limit=limit
                 )
                 records = await result.data()
                 await result.consume()
-                return [record["n"] for record in records]
+                return [
+                    Neo4JStorage._decode_properties(record["n"]) for record in records
+                ]
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Error querying entities by level and scene: {e}"
@@ -2373,7 +2646,11 @@ class Neo4JStorage(BaseGraphStorage):
                     params["topic"] = topic
                 
                 if scene_tag:
-                    conditions.append("ANY(tag IN n.scene_tags WHERE tag = $scene_tag)")
+                    conditions.append(
+                        f"n.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key"
+                        " AND $scene_tag IN n.scene_tags"
+                    )
+                    params["scene_key"] = scene_tags_key([scene_tag])
                     params["scene_tag"] = scene_tag
                 
                 if evidence_level:
@@ -2516,3 +2793,217 @@ class Neo4JStorage(BaseGraphStorage):
                 "conclusion": f"查询错误: {str(e)}",
                 "error": str(e)
             }
+
+    def _build_evidence_page_query(
+        self,
+        kind: str,
+        filters: dict[str, Any],
+        after: list | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """构建证据流式查询的一页 Cypher（按游标分页，不使用 SKIP）。
+
+        每行返回 ``_sort_key``（排序键取值列表），作为下一页的游标。
+
+        Args:
+            kind: 查询类型，见 EVIDENCE_STREAM_KINDS
+            filters: 查询条件
+            after: 上一页最后一行的排序键，None 表示第一页
+
+        Returns:
+            (Cypher 语句, 参数字典)，参数中不含 limit
+
+        Raises:
+            ValueError: 查询类型未知或缺少必需条件
+        """
+        workspace_label = self._get_workspace_label()
+        params: dict[str, Any] = {}
+        conditions = []
+
+        def scene_condition(var: str):
+            conditions.append(
+                f"{var}.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key"
+                f" AND $scene_tag IN {var}.scene_tags"
+            )
+            params["scene_key"] = scene_tags_key([filters["scene_tag"]])
+            params["scene_tag"] = filters["scene_tag"]
+
+        if filters.get("evidence_level"):
+            params["evidence_level"] = filters["evidence_level"].upper()
+
+        if kind == "entities":
+            keys = [("n.entity_id", "ASC")]
+            if filters.get("evidence_level"):
+                conditions.append("n.evidence_level = $evidence_level")
+            if filters.get("scene_tag"):
+                scene_condition("n")
+            if filters.get("file_path"):
+                conditions.append("n.file_path = $file_path")
+                params["file_path"] = filters["file_path"]
+            if after is not None:
+                conditions.append(keyset_condition(keys))
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            query = f"""
+            MATCH (n:`{workspace_label}`)
+            {where}
+            RETURN properties(n) AS entity, [n.entity_id] AS _sort_key
+            ORDER BY n.entity_id
+            """
+
+        elif kind == "relations":
+            keys = [("source.entity_id", "ASC"), ("target.entity_id", "ASC")]
+            if filters.get("evidence_level"):
+                conditions.append("r.evidence_level = $evidence_level")
+            if filters.get("relation_type"):
+                conditions.append("r.relation_type = $relation_type")
+                params["relation_type"] = filters["relation_type"].lower()
+            if filters.get("scene_tag"):
+                scene_condition("r")
+            if after is not None:
+                conditions.append(keyset_condition(keys))
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            query = f"""
+            MATCH (source:`{workspace_label}`)-[r:DIRECTED]->(target:`{workspace_label}`)
+            {where}
+            RETURN properties(source) AS source,
+                   properties(r) AS relation,
+                   properties(target) AS target,
+                   [source.entity_id, target.entity_id] AS _sort_key
+            ORDER BY source.entity_id, target.entity_id
+            """
+
+        elif kind == "causal_chain":
+            if not filters.get("entity_id"):
+                raise ValueError("causal_chain requires entity_id")
+            max_depth = int(filters.get("max_depth") or 5)
+            if not 1 <= max_depth <= MAX_CAUSAL_CHAIN_DEPTH:
+                raise ValueError(
+                    f"max_depth must be between 1 and {MAX_CAUSAL_CHAIN_DEPTH}"
+                )
+            params["entity_id"] = filters["entity_id"]
+            keys = [
+                ("chain_length", "DESC"),
+                ("chain_weight", "DESC"),
+                ("path_key", "ASC"),
+            ]
+            path_conditions = [
+                'all(rel IN relationships(path) WHERE rel.relation_type = "causal")'
+            ]
+            if filters.get("evidence_level"):
+                path_conditions.append(
+                    "all(rel IN relationships(path)"
+                    " WHERE rel.evidence_level = $evidence_level)"
+                )
+            if after is not None:
+                conditions.append(keyset_condition(keys))
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            rel_weight = EVIDENCE_LEVEL_WEIGHT_CYPHER.format(value="rel.evidence_level")
+            query = f"""
+            MATCH path = (start:`{workspace_label}` {{entity_id: $entity_id}})-[:DIRECTED*1..{max_depth}]->(end:`{workspace_label}`)
+            WHERE {" AND ".join(path_conditions)}
+            WITH start, end,
+                 nodes(path) AS chain_nodes,
+                 relationships(path) AS chain_rels,
+                 length(path) AS chain_length,
+                 reduce(acc = 0, rel IN relationships(path) | acc + {rel_weight}) AS chain_weight,
+                 reduce(acc = "", n IN nodes(path) | acc + "|" + n.entity_id) AS path_key
+            {where}
+            RETURN start.entity_name AS start_entity,
+                   end.entity_name AS end_entity,
+                   [n IN chain_nodes | {{entity_id: n.entity_id, entity_name: n.entity_name, entity_type: n.entity_type}}] AS chain_entities,
+                   [r IN chain_rels | {{source: r.src_id, target: r.tgt_id, description: r.description, evidence_level: r.evidence_level, keywords: r.keywords}}] AS chain_relations,
+                   chain_length,
+                   chain_weight,
+                   [chain_length, chain_weight, path_key] AS _sort_key
+            ORDER BY chain_length DESC, chain_weight DESC, path_key
+            """
+
+        elif kind == "aggregate":
+            keys = [("total_weight", "DESC"), ("n.entity_id", "ASC")]
+            if filters.get("topic"):
+                conditions.append(
+                    "(n.entity_name CONTAINS $topic OR n.description CONTAINS $topic)"
+                )
+                params["topic"] = filters["topic"]
+            if filters.get("scene_tag"):
+                scene_condition("n")
+            if filters.get("evidence_level"):
+                conditions.append("n.evidence_level = $evidence_level")
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            params["min_weight"] = float(filters.get("min_weight") or 0)
+            having = ["total_weight >= $min_weight"]
+            if after is not None:
+                having.append(keyset_condition(keys))
+            r_weight = EVIDENCE_LEVEL_WEIGHT_CYPHER.format(value="r.evidence_level")
+            query = f"""
+            MATCH (n:`{workspace_label}`)
+            {where}
+            OPTIONAL MATCH (n)-[r]->(other:`{workspace_label}`)
+            WITH n, r, other, toFloat({r_weight}) AS weight
+            WITH n,
+                 collect(DISTINCT {{target: other.entity_name, relation: r.description, level: r.evidence_level, weight: weight}}) AS relations,
+                 sum(weight) AS total_weight,
+                 count(r) AS relation_count
+            WHERE {" AND ".join(having)}
+            RETURN n.entity_name AS entity,
+                   n.entity_type AS entity_type,
+                   n.evidence_level AS level,
+                   n.scene_tags AS tags,
+                   relations,
+                   total_weight,
+                   relation_count,
+                   [total_weight, n.entity_id] AS _sort_key
+            ORDER BY total_weight DESC, n.entity_id
+            """
+
+        else:
+            raise ValueError(f"Unknown evidence query: {kind}")
+
+        if after is not None:
+            if not isinstance(after, list) or len(after) != len(keys):
+                raise ValueError("Cursor does not match the evidence query")
+            params["after"] = after
+        return query + "LIMIT $limit\n", params
+
+    async def iter_evidence(
+        self,
+        kind: str,
+        filters: dict[str, Any] | None = None,
+        after: list | None = None,
+        limit: int = 100,
+        timeout: float | None = None,
+    ) -> AsyncIterator[tuple[dict, list]]:
+        """流式返回一页证据查询结果。
+
+        结果逐条从 Neo4j 游标读取并产出，不在内存中整体物化；每条结果附带排序键，
+        以最后一条的排序键作为 ``after`` 即可获取下一页。
+
+        Args:
+            kind: 查询类型 (entities/relations/causal_chain/aggregate)
+            filters: 查询条件，如 evidence_level、scene_tag、relation_type、entity_id
+            after: 上一页最后一条结果的排序键
+            limit: 本页最大条数
+            timeout: 服务端事务超时（秒），超时后 Neo4j 终止查询
+
+        Yields:
+            (结果, 排序键)
+        """
+        query, params = self._build_evidence_page_query(kind, filters or {}, after)
+        params["limit"] = limit
+        async with self._driver.session(
+            database=self._DATABASE,
+            default_access_mode="READ",
+            fetch_size=min(limit, 1000),
+        ) as session:
+            result = await session.run(Query(query, timeout=timeout), params)
+            try:
+                async for record in result:
+                    row = record.data()
+                    sort_key = row.pop("_sort_key")
+                    # Only node/relationship properties are decoded; the aggregate
+                    # query returns the entity name as a plain string
+                    for field in ("entity", "source", "relation", "target"):
+                        if isinstance(row.get(field), dict):
+                            row[field] = Neo4JStorage._decode_properties(row[field])
+                    yield row, sort_key
+            finally:
+                await result.consume()
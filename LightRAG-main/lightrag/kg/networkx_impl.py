@@ -1,12 +1,20 @@
 import os
 import json
+import heapq
+import time
 from dataclasses import dataclass
 from typing import final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
-from lightrag.utils import logger
+from lightrag.utils import logger, personalized_pagerank
 from lightrag.base import BaseGraphStorage
+from lightrag.constants import (
+    DEFAULT_PPR_DAMPING,
+    DEFAULT_PPR_MAX_HOPS,
+    DEFAULT_PPR_MAX_NODES,
+)
 import networkx as nx
+import numpy as np
 from .shared_storage import (
     get_namespace_lock,
     get_update_flag,
@@ -21,6 +29,160 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+class _DegreeIndex:
+    """Node degrees kept in step with graph writes, plus a cached top-degree order.
+
+    The top-degree order is a prefix of all nodes sorted by degree (highest
+    first). A write only invalidates it when the changed node is in the prefix
+    or climbs above its lowest degree, so writes to the long tail of
+    low-degree nodes keep the cached order.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self.degrees: dict[str, int] = dict(graph.degree())
+        self._top: list[str] = []
+        self._top_set: set[str] = set()
+
+    def update(self, node_id: str, degree: int | None) -> None:
+        """Record the new degree of a node, or its removal when degree is None"""
+        if degree is None:
+            self.degrees.pop(node_id, None)
+            if node_id in self._top_set:
+                self._invalidate()
+            return
+        self.degrees[node_id] = degree
+        if node_id in self._top_set or (
+            self._top and degree > self.degrees[self._top[-1]]
+        ):
+            self._invalidate()
+
+    def top(self, limit: int) -> list[str]:
+        """Return up to limit nodes with the highest degree"""
+        if len(self._top) < min(limit, len(self.degrees)):
+            self._top = heapq.nlargest(
+                limit, self.degrees, key=self.degrees.__getitem__
+            )
+            self._top_set = set(self._top)
+        return self._top[:limit]
+
+    def _invalidate(self) -> None:
+        self._top = []
+        self._top_set = set()
+
+
+class _GraphSnapshot:
+    """Read-optimized copy of a NetworkX graph for the query-path batch reads.
+
+    Node ids are interned to integers and adjacency is stored in CSR arrays
+    (indptr, indices) in NetworkX adjacency order. Degrees are precomputed and
+    node/edge properties are decoded once. Edges are found by binary search in
+    a sorted array of (low, high) node-index keys.
+
+    Property dicts without JSON-encoded fields are shared with the graph, so
+    readers must copy them; the snapshot is dropped on any write.
+    """
+
+    def __init__(self, graph: nx.Graph):
+        self.node_ids: list[str] = list(graph.nodes())
+        self.index: dict[str, int] = {
+            node_id: i for i, node_id in enumerate(self.node_ids)
+        }
+        self.node_props = [
+            self._decode(data) for data in dict(graph.nodes(data=True)).values()
+        ]
+        node_count = len(self.node_ids)
+
+        lengths = []
+        neighbors = []
+        edge_keys = []
+        edge_props = []
+        for i, (_, adjacency) in enumerate(graph.adjacency()):
+            lengths.append(len(adjacency))
+            for v, data in adjacency.items():
+                j = self.index[v]
+                neighbors.append(j)
+                # Each undirected edge is stored once, from its lower endpoint
+                if j >= i:
+                    edge_keys.append(i * node_count + j)
+                    edge_props.append(self._decode(data))
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.asarray(neighbors, dtype=np.int64)
+
+        # NetworkX counts a self-loop twice in the degree
+        rows = np.repeat(np.arange(node_count, dtype=np.int64), lengths)
+        self.degrees = np.diff(self.indptr) + np.bincount(
+            rows[rows == self.indices], minlength=node_count
+        )
+
+        keys = np.asarray(edge_keys, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        self.edge_keys = keys[order]
+        self.edge_props = [edge_props[i] for i in order.tolist()]
+        self.edge_weights = np.fromiter(
+            (self._weight(props) for props in self.edge_props),
+            dtype=np.float64,
+            count=len(self.edge_props),
+        )
+
+    @staticmethod
+    def _weight(props: dict) -> float:
+        try:
+            return float(props.get("weight", 1.0))
+        except (TypeError, ValueError):
+            return 1.0
+
+    @staticmethod
+    def _decode(data: dict) -> dict:
+        if data.keys().isdisjoint(
+            ("scene_tags", "source_provenance", "evidence_chain_ids")
+        ):
+            return data
+        return NetworkXStorage._decode_props(data)
+
+    def lookup(self, node_ids: list[str]) -> np.ndarray:
+        """Integer ids of node_ids, -1 for unknown nodes"""
+        return np.fromiter(
+            (self.index.get(node_id, -1) for node_id in node_ids),
+            dtype=np.int64,
+            count=len(node_ids),
+        )
+
+    def degrees_of(self, node_ids: list[str]) -> np.ndarray:
+        idx = self.lookup(node_ids)
+        if not len(self.degrees):
+            return np.zeros(len(idx), dtype=np.int64)
+        return np.where(idx >= 0, self.degrees[np.maximum(idx, 0)], 0)
+
+    def neighbors(self, node_id: str) -> list[str] | None:
+        i = self.index.get(node_id)
+        if i is None:
+            return None
+        row = self.indices[self.indptr[i] : self.indptr[i + 1]]
+        return [self.node_ids[j] for j in row.tolist()]
+
+    def adjacent(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """All adjacency entries of rows, as (row, neighbour) index arrays"""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(lengths.sum())
+        return np.repeat(rows, lengths), self.indices[positions]
+
+    def find_edges(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        """Positions of the edges in edge_props, -1 for missing edges"""
+        if not pairs or not len(self.edge_keys):
+            return np.full(len(pairs), -1, dtype=np.int64)
+        src = self.lookup([u for u, _ in pairs])
+        tgt = self.lookup([v for _, v in pairs])
+        keys = np.minimum(src, tgt) * len(self.node_ids) + np.maximum(src, tgt)
+        positions = np.minimum(
+            np.searchsorted(self.edge_keys, keys), len(self.edge_keys) - 1
+        )
+        found = (src >= 0) & (tgt >= 0) & (self.edge_keys[positions] == keys)
+        return np.where(found, positions, -1)
+
+
 @final
 @dataclass
 class NetworkXStorage(BaseGraphStorage):
@@ -80,6 +242,16 @@ class NetworkXStorage(BaseGraphStorage):
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Built on first use, dropped whenever the graph is replaced
+        self._degree_index: _DegreeIndex | None = None
+        # Optional read snapshot for the batch reads. It is dropped on every
+        # write and rebuilt on the first read after the next index_done_callback;
+        # reads in between go to the NetworkX graph
+        self._snapshot_enabled = (
+            os.getenv("NETWORKX_READ_SNAPSHOT", "false").lower() == "true"
+        )
+        self._snapshot: _GraphSnapshot | None = None
+        self._snapshot_dirty = False
 
         # Load initial graph
         preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
@@ -117,11 +289,122 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._reset_read_caches()
                 # Reset update flag
                 self.storage_updated.value = False
 
             return self._graph
 
+    def _reset_read_caches(self) -> None:
+        """Drop the degree index and read snapshot after the graph is replaced"""
+        self._degree_index = None
+        self._snapshot = None
+        self._snapshot_dirty = False
+
+    def _invalidate_snapshot(self) -> None:
+        self._snapshot = None
+        self._snapshot_dirty = True
+
+    async def _get_snapshot(self) -> _GraphSnapshot | None:
+        """Return the read snapshot, or None when reads should use the graph"""
+        graph = await self._get_graph()
+        if not self._snapshot_enabled or self._snapshot_dirty:
+            return None
+        if self._snapshot is None:
+            start = time.perf_counter()
+            self._snapshot = _GraphSnapshot(graph)
+            logger.info(
+                f"[{self.workspace}] Built read snapshot of {len(self._snapshot.node_ids)} nodes "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+        return self._snapshot
+
+    async def personalized_pagerank(
+        self,
+        seeds: dict[str, float],
+        max_hops: int = DEFAULT_PPR_MAX_HOPS,
+        max_nodes: int = DEFAULT_PPR_MAX_NODES,
+        damping: float = DEFAULT_PPR_DAMPING,
+    ) -> tuple[dict[str, float], dict[tuple[str, str], float]]:
+        """Random walk with restart, expanded on the CSR arrays of the read snapshot
+
+        The walk runs on the subgraph induced by the nodes within max_hops of
+        the seeds. Without a snapshot the hop-by-hop default implementation
+        is used on the in-memory graph.
+        """
+        snapshot = await self._get_snapshot()
+        if snapshot is None:
+            return await super().personalized_pagerank(
+                seeds, max_hops=max_hops, max_nodes=max_nodes, damping=damping
+            )
+
+        seed_idx = snapshot.lookup(list(seeds))
+        seed_weights = np.fromiter(seeds.values(), dtype=np.float64, count=len(seeds))
+        seed_weights = seed_weights[seed_idx >= 0]
+        seed_idx = seed_idx[seed_idx >= 0]
+        if not len(seed_idx):
+            return {}, {}
+
+        node_count = len(snapshot.node_ids)
+        selected = np.zeros(node_count, dtype=bool)
+        selected[seed_idx] = True
+        levels = [seed_idx]
+        frontier = seed_idx
+        reached = len(seed_idx)
+        for _ in range(max_hops):
+            if not len(frontier) or reached >= max_nodes:
+                break
+            _, neighbors = snapshot.adjacent(frontier)
+            # First occurrence order, so the node cap keeps the earliest discovered
+            _, first = np.unique(neighbors, return_index=True)
+            frontier = neighbors[np.sort(first)]
+            frontier = frontier[~selected[frontier]][: max_nodes - reached]
+            selected[frontier] = True
+            levels.append(frontier)
+            reached += len(frontier)
+
+        nodes = np.concatenate(levels)
+        local = np.full(node_count, -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+        rows, cols = snapshot.adjacent(nodes)
+        # Each undirected edge once, from its lower endpoint
+        keep = selected[cols] & (cols >= rows)
+        rows, cols = rows[keep], cols[keep]
+        positions = np.searchsorted(snapshot.edge_keys, rows * node_count + cols)
+
+        restart = np.zeros(len(nodes))
+        np.add.at(restart, local[seed_idx], seed_weights)
+        scores, flows = personalized_pagerank(
+            restart,
+            local[rows],
+            local[cols],
+            snapshot.edge_weights[positions],
+            damping=damping,
+        )
+        node_ids = snapshot.node_ids
+        node_scores = {
+            node_ids[i]: score for i, score in zip(nodes.tolist(), scores.tolist())
+        }
+        edge_scores = {
+            tuple(sorted((node_ids[r], node_ids[c]))): flow
+            for r, c, flow in zip(rows.tolist(), cols.tolist(), flows.tolist())
+        }
+        return node_scores, edge_scores
+
+    def _get_degree_index(self, graph: nx.Graph) -> _DegreeIndex:
+        if self._degree_index is None:
+            self._degree_index = _DegreeIndex(graph)
+        return self._degree_index
+
+    def _refresh_degrees(self, graph: nx.Graph, node_ids) -> None:
+        """Sync the degree index after a write touching node_ids"""
+        if self._degree_index is None:
+            return
+        for node_id in node_ids:
+            self._degree_index.update(
+                node_id, graph.degree(node_id) if graph.has_node(node_id) else None
+            )
+
     async def has_node(self, node_id: str) -> bool:
         graph = await self._get_graph()
         return graph.has_node(node_id)
@@ -158,6 +441,79 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        snapshot = await self._get_snapshot()
+        if snapshot is not None:
+            return {
+                node_id: dict(snapshot.node_props[i])
+                for node_id, i in zip(node_ids, snapshot.lookup(node_ids).tolist())
+                if i >= 0
+            }
+        graph = await self._get_graph()
+        return {
+            node_id: NetworkXStorage._decode_props(graph.nodes[node_id])
+            for node_id in node_ids
+            if graph.has_node(node_id)
+        }
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        snapshot = await self._get_snapshot()
+        if snapshot is not None:
+            return dict(zip(node_ids, snapshot.degrees_of(node_ids).tolist()))
+        graph = await self._get_graph()
+        return {
+            node_id: graph.degree(node_id) if graph.has_node(node_id) else 0
+            for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        node_ids = list({node_id for pair in edge_pairs for node_id in pair})
+        degrees = await self.node_degrees_batch(node_ids)
+        return {
+            (src_id, tgt_id): degrees[src_id] + degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        edge_pairs = [(pair["src"], pair["tgt"]) for pair in pairs]
+        snapshot = await self._get_snapshot()
+        if snapshot is not None:
+            return {
+                edge_pair: dict(snapshot.edge_props[i])
+                for edge_pair, i in zip(
+                    edge_pairs, snapshot.find_edges(edge_pairs).tolist()
+                )
+                if i >= 0
+            }
+        graph = await self._get_graph()
+        return {
+            (src_id, tgt_id): NetworkXStorage._decode_props(graph.edges[src_id, tgt_id])
+            for src_id, tgt_id in edge_pairs
+            if graph.has_edge(src_id, tgt_id)
+        }
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        snapshot = await self._get_snapshot()
+        if snapshot is not None:
+            return {
+                node_id: [
+                    (node_id, neighbor)
+                    for neighbor in snapshot.neighbors(node_id) or []
+                ]
+                for node_id in node_ids
+            }
+        graph = await self._get_graph()
+        return {
+            node_id: list(graph.edges(node_id)) if graph.has_node(node_id) else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(
         self, node_id: str | None = None, node_data: dict[str, str] | None = None, **kwargs
     ) -> None:
@@ -176,7 +532,11 @@ class NetworkXStorage(BaseGraphStorage):
         if node_data.get("entity_id") != node_id:
             node_data = {**node_data, "entity_id": node_id}
         graph = await self._get_graph()
+        self._invalidate_snapshot()
+        is_new = not graph.has_node(node_id)
         graph.add_node(node_id, **NetworkXStorage._encode_props(node_data))
+        if is_new:
+            self._refresh_degrees(graph, (node_id,))
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -188,11 +548,15 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        self._invalidate_snapshot()
+        is_new = not graph.has_edge(source_node_id, target_node_id)
         graph.add_edge(
             source_node_id,
             target_node_id,
             **NetworkXStorage._encode_props(edge_data),
         )
+        if is_new:
+            self._refresh_degrees(graph, (source_node_id, target_node_id))
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -202,8 +566,11 @@ class NetworkXStorage(BaseGraphStorage):
            KG-storage-log should be used to avoid data corruption
         """
         graph = await self._get_graph()
+        self._invalidate_snapshot()
         if graph.has_node(node_id):
+            neighbors = list(graph.neighbors(node_id))
             graph.remove_node(node_id)
+            self._refresh_degrees(graph, [node_id, *neighbors])
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -222,9 +589,12 @@ class NetworkXStorage(BaseGraphStorage):
             nodes: List of node IDs to be deleted
         """
         graph = await self._get_graph()
+        self._invalidate_snapshot()
         for node in nodes:
             if graph.has_node(node):
+                neighbors = list(graph.neighbors(node))
                 graph.remove_node(node)
+                self._refresh_degrees(graph, [node, *neighbors])
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -238,9 +608,11 @@ class NetworkXStorage(BaseGraphStorage):
             edges: List of edges to be deleted, each edge is a (source, target) tuple
         """
         graph = await self._get_graph()
+        self._invalidate_snapshot()
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._refresh_degrees(graph, (source, target))
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -268,12 +640,10 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
 
-        # Get degrees of all nodes and sort by degree descending
-        degrees = dict(graph.degree())
-        sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-        # Return top labels limited by the specified limit
-        popular_labels = [str(node) for node, _ in sorted_nodes[:limit]]
+        # Top labels by degree from the cached degree index
+        popular_labels = [
+            str(node) for node in self._get_degree_index(graph).top(limit)
+        ]
 
         logger.debug(
             f"[{self.workspace}] Retrieved {len(popular_labels)} popular labels (limit: {limit})"
@@ -363,26 +733,21 @@ class NetworkXStorage(BaseGraphStorage):
             max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
 
         graph = await self._get_graph()
+        degree_index = self._get_degree_index(graph)
 
         result = KnowledgeGraph()
 
         # Handle special case for "*" label
         if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
             # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
+            if len(degree_index.degrees) > max_nodes:
                 result.is_truncated = True
                 logger.info(
-                    f"[{self.workspace}] Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
+                    f"[{self.workspace}] Graph truncated: {len(degree_index.degrees)} nodes found, limited to {max_nodes}"
                 )
 
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
             # Create subgraph with the highest degree nodes
-            subgraph = graph.subgraph(limited_nodes)
+            subgraph = graph.subgraph(degree_index.top(max_nodes))
         else:
             # Check if node exists
             if node_label not in graph:
@@ -391,70 +756,54 @@ class NetworkXStorage(BaseGraphStorage):
                 )
                 return KnowledgeGraph()  # Return empty graph
 
-            # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
+            # Level-by-level BFS. Nodes are marked when enqueued, so each level
+            # holds distinct nodes; only the level that overflows max_nodes is
+            # ranked, keeping its highest-degree nodes
             bfs_nodes = []
-            visited = set()
-            # Store (node, depth, degree) in the queue
-            queue = [(node_label, 0, graph.degree(node_label))]
+            enqueued = {node_label}
+            level = [node_label]
+            depth = 0
 
             # Flag to track if there are unexplored neighbors due to depth limit
             has_unexplored_neighbors = False
 
-            # Modified breadth-first search with degree-based prioritization
-            while queue and len(bfs_nodes) < max_nodes:
-                # Get the current depth from the first node in queue
-                current_depth = queue[0][1]
-
-                # Collect all nodes at the current depth
-                current_level_nodes = []
-                while queue and queue[0][1] == current_depth:
-                    current_level_nodes.append(queue.pop(0))
-
-                # Sort nodes at current depth by degree (highest first)
-                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
-
-                # Process all nodes at current depth in order of degree
-                for current_node, depth, degree in current_level_nodes:
-                    if current_node not in visited:
-                        visited.add(current_node)
-                        bfs_nodes.append(current_node)
-
-                        # Only explore neighbors if we haven't reached max_depth
-                        if depth < max_depth:
-                            # Add neighbor nodes to queue with incremented depth
-                            neighbors = list(graph.neighbors(current_node))
-                            # Filter out already visited neighbors
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            # Add neighbors to the queue with their degrees
-                            for neighbor in unvisited_neighbors:
-                                neighbor_degree = graph.degree(neighbor)
-                                queue.append((neighbor, depth + 1, neighbor_degree))
-                        else:
-                            # Check if there are unexplored neighbors (skipped due to depth limit)
-                            neighbors = list(graph.neighbors(current_node))
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            if unvisited_neighbors:
-                                has_unexplored_neighbors = True
-
-                    # Check if we've reached max_nodes
-                    if len(bfs_nodes) >= max_nodes:
-                        break
-
-            # Check if graph is truncated - either due to max_nodes limit or depth limit
-            if (queue and len(bfs_nodes) >= max_nodes) or has_unexplored_neighbors:
-                if len(bfs_nodes) >= max_nodes:
+            while level:
+                budget = max_nodes - len(bfs_nodes)
+                if len(level) > budget:
+                    bfs_nodes.extend(
+                        heapq.nlargest(
+                            budget, level, key=degree_index.degrees.__getitem__
+                        )
+                    )
                     result.is_truncated = True
                     logger.info(
                         f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
                     )
-                else:
-                    logger.info(
-                        f"[{self.workspace}] Graph truncated: found {len(bfs_nodes)} nodes within max_depth {max_depth}"
+                    break
+
+                bfs_nodes.extend(level)
+                if depth == max_depth:
+                    # Check if there are unexplored neighbors (skipped due to depth limit)
+                    has_unexplored_neighbors = any(
+                        neighbor not in enqueued
+                        for node in level
+                        for neighbor in graph.neighbors(node)
                     )
+                    break
+
+                next_level = []
+                for node in level:
+                    for neighbor in graph.neighbors(node):
+                        if neighbor not in enqueued:
+                            enqueued.add(neighbor)
+                            next_level.append(neighbor)
+                level = next_level
+                depth += 1
+
+            if has_unexplored_neighbors:
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: found {len(bfs_nodes)} nodes within max_depth {max_depth}"
+                )
 
             # Create subgraph with BFS discovered nodes
             subgraph = graph.subgraph(bfs_nodes)
@@ -555,6 +904,7 @@ class NetworkXStorage(BaseGraphStorage):
                 self._graph = (
                     NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
                 )
+                self._reset_read_caches()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -570,6 +920,8 @@ class NetworkXStorage(BaseGraphStorage):
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
+                # The next batch read rebuilds the snapshot from the saved graph
+                self._snapshot_dirty = False
                 return True  # Return success
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error saving graph: {e}")
@@ -597,6 +949,7 @@ class NetworkXStorage(BaseGraphStorage):
                 if os.path.exists(self._graphml_xml_file):
                     os.remove(self._graphml_xml_file)
                 self._graph = nx.Graph()
+                self._reset_read_caches()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -2007,6 +2007,24 @@ class PGKVStorage(BaseKVStorage):
             response["create_time"] = create_time
             response["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for CHUNK_EXTRACTIONS namespace
+        if response and is_namespace(
+            self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS
+        ):
+            # Parse entities/relations JSON strings back to lists
+            for field_name in ("entities", "relations"):
+                value = response.get(field_name, [])
+                if isinstance(value, str):
+                    try:
+                        value = json.loads(value)
+                    except json.JSONDecodeError:
+                        value = []
+                response[field_name] = value
+            create_time = response.get("create_time", 0)
+            update_time = response.get("update_time", 0)
+            response["create_time"] = create_time
+            response["update_time"] = create_time if update_time == 0 else update_time
+
         return response if response else None
 
     # Query by id
@@ -2147,6 +2165,25 @@ class PGKVStorage(BaseKVStorage):
                 result["create_time"] = create_time
                 result["update_time"] = create_time if update_time == 0 else update_time
 
+        # Special handling for CHUNK_EXTRACTIONS namespace
+        if results and is_namespace(
+            self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS
+        ):
+            for result in results:
+                # Parse entities/relations JSON strings back to lists
+                for field_name in ("entities", "relations"):
+                    value = result.get(field_name, [])
+                    if isinstance(value, str):
+                        try:
+                            value = json.loads(value)
+                        except json.JSONDecodeError:
+                            value = []
+                    result[field_name] = value
+                create_time = result.get("create_time", 0)
+                update_time = result.get("update_time", 0)
+                result["create_time"] = create_time
+                result["update_time"] = create_time if update_time == 0 else update_time
+
         return _order_results(results)
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
@@ -2279,6 +2316,20 @@ class PGKVStorage(BaseKVStorage):
                     "update_time": current_time,
                 }
                 await self.db.execute(upsert_sql, _data)
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_CHUNK_EXTRACTIONS):
+            # Get current UTC time and convert to naive datetime for database storage
+            current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            for k, v in data.items():
+                upsert_sql = SQL_TEMPLATES["upsert_chunk_extractions"]
+                _data = {
+                    "workspace": self.workspace,
+                    "id": k,
+                    "entities": json.dumps(v["entities"], ensure_ascii=False),
+                    "relations": json.dumps(v["relations"], ensure_ascii=False),
+                    "create_time": current_time,
+                    "update_time": current_time,
+                }
+                await self.db.execute(upsert_sql, _data)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2356,6 +2407,32 @@ class PGKVStorage(BaseKVStorage):
             return {"status": "error", "message": str(e)}
 
 
+# Filterable metadata fields and their columns per vector table;
+# JSONB array columns match when any element is among the given values
+METADATA_FILTER_COLUMNS = {
+    "relationships": {
+        "src_id": "source_id",
+        "tgt_id": "target_id",
+        "file_path": "file_path",
+        "relation_type": "relation_type",
+        "evidence_level": "evidence_level",
+    },
+    "entities": {
+        "entity_name": "entity_name",
+        "file_path": "file_path",
+        "evidence_level": "evidence_level",
+        "scene_tags": "scene_tags",
+    },
+    "chunks": {
+        "full_doc_id": "full_doc_id",
+        "file_path": "file_path",
+        "evidence_level": "evidence_level",
+        "scene_tags": "scene_tags",
+    },
+}
+METADATA_FILTER_JSONB_COLUMNS = frozenset({"scene_tags"})
+
+
 @final
 @dataclass
 class PGVectorStorage(BaseVectorStorage):
@@ -2612,6 +2689,24 @@ class PGVectorStorage(BaseVectorStorage):
                 continue
             await db.execute(f"ALTER TABLE {table_name} ADD COLUMN {col} {ddl}", None)
 
+        # Indexes for metadata-filtered vector queries
+        indexes = {
+            "workspace_evidence_level": "(workspace, evidence_level)",
+        }
+        if "scene_tags" in required:
+            indexes["scene_tags_gin"] = "USING GIN (scene_tags)"
+        for suffix, definition in indexes.items():
+            try:
+                await db.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_safe_index_name(table_name, suffix)} "
+                    f"ON {table_name} {definition}",
+                    None,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"PostgreSQL: Failed to create index {suffix} on {table_name}: {e}"
+                )
+
     @staticmethod
     async def setup_table(
         db: PostgreSQLDB,
@@ -3093,10 +3188,46 @@ class PGVectorStorage(BaseVectorStorage):
                 f"[{self.workspace}] Batch upserted {len(batch_values)} records to {self.namespace}"
             )
 
+    def _build_metadata_filter(
+        self, metadata_filter: dict[str, list] | None, first_param: int
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE conditions and parameters of a metadata filter.
+
+        Conditions are appended after the workspace condition of the query templates,
+        using the table alias of each template and parameters from $first_param on.
+        """
+        if not metadata_filter:
+            return "", []
+        columns = METADATA_FILTER_COLUMNS.get(self.namespace, {})
+        # Table aliases used by the "relationships", "entities" and "chunks" templates
+        alias = {"relationships": "r", "entities": "e", "chunks": "c"}.get(
+            self.namespace
+        )
+        conditions, params = [], []
+        for key, values in metadata_filter.items():
+            column = columns.get(key)
+            if column is None:
+                logger.debug(
+                    f"[{self.workspace}] Metadata filter field '{key}' is not filterable in {self.namespace}, ignored"
+                )
+                continue
+            placeholder = f"${first_param + len(params)}::text[]"
+            if column in METADATA_FILTER_JSONB_COLUMNS:
+                conditions.append(f"{alias}.{column} ?| {placeholder}")
+            else:
+                conditions.append(f"{alias}.{column} = ANY({placeholder})")
+            params.append([str(value) for value in values])
+        return "".join(f"\n  AND {c}" for c in conditions), params
+
     #################### query method ###############
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
+        metadata_filter = self._applicable_metadata_filter(metadata_filter)
         if query_embedding is not None:
             embedding = query_embedding
         else:
@@ -3107,15 +3238,20 @@ class PGVectorStorage(BaseVectorStorage):
 
         embedding_string = ",".join(map(str, embedding))
 
+        filter_sql, filter_params = self._build_metadata_filter(metadata_filter, 4)
         sql = SQL_TEMPLATES[self.namespace].format(
-            embedding_string=embedding_string, table_name=self.table_name
+            embedding_string=embedding_string,
+            table_name=self.table_name,
+            metadata_filter=filter_sql,
         )
         params = {
             "workspace": self.workspace,
             "closer_than_threshold": 1 - self.cosine_better_than_threshold,
             "top_k": top_k,
         }
-        results = await self.db.query(sql, params=list(params.values()), multirows=True)
+        results = await self.db.query(
+            sql, params=[*params.values(), *filter_params], multirows=True
+        )
         return results
 
     async def index_done_callback(self) -> None:
@@ -5483,6 +5619,7 @@ NAMESPACE_TABLE_MAP = {
     NameSpace.KV_STORE_FULL_RELATIONS: "LIGHTRAG_FULL_RELATIONS",
     NameSpace.KV_STORE_ENTITY_CHUNKS: "LIGHTRAG_ENTITY_CHUNKS",
     NameSpace.KV_STORE_RELATION_CHUNKS: "LIGHTRAG_RELATION_CHUNKS",
+    NameSpace.KV_STORE_CHUNK_EXTRACTIONS: "LIGHTRAG_CHUNK_EXTRACTIONS",
     NameSpace.KV_STORE_LLM_RESPONSE_CACHE: "LIGHTRAG_LLM_CACHE",
     NameSpace.VECTOR_STORE_CHUNKS: "LIGHTRAG_VDB_CHUNKS",
     NameSpace.VECTOR_STORE_ENTITIES: "LIGHTRAG_VDB_ENTITY",
@@ -5655,6 +5792,17 @@ TABLES = {
                     CONSTRAINT LIGHTRAG_RELATION_CHUNKS_PK PRIMARY KEY (workspace, id)
                     )"""
     },
+    "LIGHTRAG_CHUNK_EXTRACTIONS": {
+        "ddl": """CREATE TABLE LIGHTRAG_CHUNK_EXTRACTIONS (
+                    id VARCHAR(255),
+                    workspace VARCHAR(255),
+                    entities JSONB,
+                    relations JSONB,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_CHUNK_EXTRACTIONS_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
 }
 
 
@@ -5732,6 +5880,16 @@ SQL_TEMPLATES = {
                                  EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
                                  FROM LIGHTRAG_RELATION_CHUNKS WHERE workspace=$1 AND id = ANY($2)
                                 """,
+    "get_by_id_chunk_extractions": """SELECT id, entities, relations,
+                                EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                FROM LIGHTRAG_CHUNK_EXTRACTIONS WHERE workspace=$1 AND id=$2
+                               """,
+    "get_by_ids_chunk_extractions": """SELECT id, entities, relations,
+                                 EXTRACT(EPOCH FROM create_time)::BIGINT as create_time,
+                                 EXTRACT(EPOCH FROM update_time)::BIGINT as update_time
+                                 FROM LIGHTRAG_CHUNK_EXTRACTIONS WHERE workspace=$1 AND id = ANY($2)
+                                """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
     "upsert_doc_full": """INSERT INTO LIGHTRAG_DOC_FULL (id, content, doc_name, workspace)
                         VALUES ($1, $2, $3, $4)
@@ -5795,6 +5953,14 @@ SQL_TEMPLATES = {
                       count=EXCLUDED.count,
                       update_time = EXCLUDED.update_time
                      """,
+    "upsert_chunk_extractions": """INSERT INTO LIGHTRAG_CHUNK_EXTRACTIONS (workspace, id, entities, relations,
+                      create_time, update_time)
+                      VALUES ($1, $2, $3, $4, $5, $6)
+                      ON CONFLICT (workspace,id) DO UPDATE
+                      SET entities=EXCLUDED.entities,
+                      relations=EXCLUDED.relations,
+                      update_time = EXCLUDED.update_time
+                     """,
     # SQL for VectorStorage
     "upsert_chunk": """INSERT INTO {table_name} (workspace, id, tokens,
                       chunk_order_index, full_doc_id, content, content_vector, file_path,
@@ -5849,9 +6015,10 @@ SQL_TEMPLATES = {
                             r.relation_type,
                             r.evidence_level,
                             r.source_provenance,
-                            EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
+                            EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at,
+                            1 - (r.content_vector <=> '[{embedding_string}]'::vector) AS distance
                      FROM {table_name} r
-                     WHERE r.workspace = $1
+                     WHERE r.workspace = $1{metadata_filter}
                        AND r.content_vector <=> '[{embedding_string}]'::vector < $2
                      ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
                      LIMIT $3;
@@ -5863,9 +6030,10 @@ SQL_TEMPLATES = {
                        e.scene_tags,
                        e.source_provenance,
                        e.evidence_chain_ids,
-                       EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
+                       EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at,
+                       1 - (e.content_vector <=> '[{embedding_string}]'::vector) AS distance
                 FROM {table_name} e
-                WHERE e.workspace = $1
+                WHERE e.workspace = $1{metadata_filter}
                   AND e.content_vector <=> '[{embedding_string}]'::vector < $2
                 ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
                 LIMIT $3;
@@ -5879,7 +6047,7 @@ SQL_TEMPLATES = {
                      c.source_provenance,
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM {table_name} c
-              WHERE c.workspace = $1
+              WHERE c.workspace = $1{metadata_filter}
                 AND c.content_vector <=> '[{embedding_string}]'::vector < $2
               ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
               LIMIT $3;
@@ -12,7 +12,7 @@ import pipmaster as pm
 from ..base import BaseVectorStorage
 from ..exceptions import DataMigrationError
 from ..kg.shared_storage import get_data_init_lock
-from ..utils import compute_mdhash_id, logger
+from ..utils import METADATA_FILTER_FIELDS, compute_mdhash_id, logger
 
 if not pm.is_installed("qdrant-client"):
     pm.install("qdrant-client")
@@ -66,6 +66,38 @@ def workspace_filter_condition(workspace: str) -> models.FieldCondition:
     )
 
 
+def metadata_filter_conditions(
+    metadata_filter: dict[str, list] | None,
+) -> list[models.Condition]:
+    """
+    Translate a normalized metadata filter into Qdrant payload conditions.
+    MatchAny also matches array payloads (e.g. scene_tags) on any element.
+    """
+    conditions = []
+    for key, values in (metadata_filter or {}).items():
+        if all(isinstance(v, str) for v in values) or all(
+            isinstance(v, int) and not isinstance(v, bool) for v in values
+        ):
+            conditions.append(
+                models.FieldCondition(key=key, match=models.MatchAny(any=values))
+            )
+            continue
+        # Booleans and floats cannot be combined in MatchAny
+        conditions.append(
+            models.Filter(
+                should=[
+                    models.FieldCondition(key=key, range=models.Range(gte=v, lte=v))
+                    if isinstance(v, float)
+                    else models.FieldCondition(
+                        key=key, match=models.MatchValue(value=v)
+                    )
+                    for v in values
+                ]
+            )
+        )
+    return conditions
+
+
 def _find_legacy_collection(
     client: QdrantClient,
     namespace: str,
@@ -502,6 +534,16 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                     model_suffix=self.model_suffix,
                 )
 
+                # Keyword indexes let Qdrant plan metadata-filtered searches;
+                # create_payload_index returns without error if the index exists
+                for field_name in METADATA_FILTER_FIELDS:
+                    if field_name in self.meta_fields:
+                        self._client.create_payload_index(
+                            collection_name=self.final_namespace,
+                            field_name=field_name,
+                            field_schema=models.PayloadSchemaType.KEYWORD,
+                        )
+
                 # Removed duplicate max batch size initialization
 
                 self._initialized = True
@@ -561,8 +603,13 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         return results
 
     async def query(
-        self, query: str, top_k: int, query_embedding: list[float] = None
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: list[float] = None,
+        metadata_filter: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
+        metadata_filter = self._applicable_metadata_filter(metadata_filter)
         if query_embedding is not None:
             embedding = query_embedding
         else:
@@ -578,7 +625,10 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             with_payload=True,
             score_threshold=self.cosine_better_than_threshold,
             query_filter=models.Filter(
-                must=[workspace_filter_condition(self.effective_workspace)]
+                must=[
+                    workspace_filter_condition(self.effective_workspace),
+                    *metadata_filter_conditions(metadata_filter),
+                ]
             ),
         ).points
 
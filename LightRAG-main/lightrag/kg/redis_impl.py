@@ -6,6 +6,7 @@ import pipmaster as pm
 import configparser
 from contextlib import asynccontextmanager
 import threading
+from datetime import datetime
 
 if not pm.is_installed("redis"):
     pm.install("redis")
@@ -54,6 +55,115 @@ redis_retry = retry(
     before_sleep=before_sleep_log(logger, logging.WARNING),
 )
 
+# Version of the doc status secondary index layout. Bump it to force a rebuild
+# of the index structures from the stored documents on the next initialize().
+DOC_STATUS_INDEX_VERSION = "1"
+
+# Batch size for Lua index maintenance calls; keeps each script invocation short
+# so that Redis is not blocked for long by a single bulk upsert or backfill.
+DOC_STATUS_INDEX_BATCH_SIZE = 500
+
+# Sort fields supported by get_docs_paginated, each backed by one sorted set
+# per status plus one for all documents ("*").
+DOC_STATUS_SORT_FIELDS = ("created_at", "updated_at", "id", "file_path")
+
+# The index scripts build document and index keys from ARGV at run time (the
+# index entries to remove are only known inside the script), so they cannot
+# declare them in KEYS; RedisDocStatusStorage therefore refuses Redis Cluster.
+
+# Shared Lua helper that removes a document from every secondary index.
+# The per-document index entry ("meta" hash) records the values the document
+# was indexed under: [status, track_id, file_path, file_path sort member].
+_DOC_STATUS_UNINDEX_LUA = """
+local function unindex(idx, doc_id)
+  local raw = redis.call('HGET', idx .. 'meta', doc_id)
+  if not raw then
+    return
+  end
+  local m = cjson.decode(raw)
+  redis.call('SREM', idx .. 'status:' .. m[1], doc_id)
+  redis.call('HINCRBY', idx .. 'counts', m[1], -1)
+  if m[2] ~= '' then
+    redis.call('SREM', idx .. 'track:' .. m[2], doc_id)
+  end
+  if m[3] ~= '' then
+    redis.call('SREM', idx .. 'path:' .. m[3], doc_id)
+  end
+  for _, scope in ipairs({m[1], '*'}) do
+    redis.call('ZREM', idx .. 'created_at:' .. scope, doc_id)
+    redis.call('ZREM', idx .. 'updated_at:' .. scope, doc_id)
+    redis.call('ZREM', idx .. 'id:' .. scope, doc_id)
+    redis.call('ZREM', idx .. 'file_path:' .. scope, m[4])
+  end
+  redis.call('HDEL', idx .. 'meta', doc_id)
+end
+"""
+
+# Atomically write documents and update their secondary indexes.
+# ARGV: index prefix, data prefix, write flag ("1" to SET the document body,
+# "0" to only (re)index documents that still exist), followed by groups of
+# 8 values per document:
+#   doc_id, json payload, status, track_id, file_path,
+#   created_at score, updated_at score, file_path sort key
+_DOC_STATUS_UPSERT_LUA = (
+    _DOC_STATUS_UNINDEX_LUA
+    + """
+local idx = ARGV[1]
+local data_prefix = ARGV[2]
+local write = ARGV[3] == '1'
+local indexed = 0
+for i = 4, #ARGV, 8 do
+  local doc_id = ARGV[i]
+  if write or redis.call('EXISTS', data_prefix .. doc_id) == 1 then
+    local status = ARGV[i + 2]
+    local track_id = ARGV[i + 3]
+    local file_path = ARGV[i + 4]
+    local fp_member = ARGV[i + 7] .. '\\0' .. doc_id
+    unindex(idx, doc_id)
+    if write then
+      redis.call('SET', data_prefix .. doc_id, ARGV[i + 1])
+    end
+    redis.call('SADD', idx .. 'status:' .. status, doc_id)
+    redis.call('HINCRBY', idx .. 'counts', status, 1)
+    if track_id ~= '' then
+      redis.call('SADD', idx .. 'track:' .. track_id, doc_id)
+    end
+    if file_path ~= '' then
+      redis.call('SADD', idx .. 'path:' .. file_path, doc_id)
+    end
+    for _, scope in ipairs({status, '*'}) do
+      redis.call('ZADD', idx .. 'created_at:' .. scope, ARGV[i + 5], doc_id)
+      redis.call('ZADD', idx .. 'updated_at:' .. scope, ARGV[i + 6], doc_id)
+      redis.call('ZADD', idx .. 'id:' .. scope, 0, doc_id)
+      redis.call('ZADD', idx .. 'file_path:' .. scope, 0, fp_member)
+    end
+    redis.call(
+      'HSET', idx .. 'meta', doc_id,
+      cjson.encode({status, track_id, file_path, fp_member})
+    )
+    indexed = indexed + 1
+  end
+end
+return indexed
+"""
+)
+
+# Atomically delete documents together with their secondary index entries.
+# ARGV: index prefix, data prefix, doc_id...
+_DOC_STATUS_DELETE_LUA = (
+    _DOC_STATUS_UNINDEX_LUA
+    + """
+local idx = ARGV[1]
+local data_prefix = ARGV[2]
+local deleted = 0
+for i = 3, #ARGV do
+  unindex(idx, ARGV[i])
+  deleted = deleted + redis.call('DEL', data_prefix .. ARGV[i])
+end
+return deleted
+"""
+)
+
 
 class RedisConnectionManager:
     """Shared Redis connection pool manager to avoid creating multiple pools for the same Redis URI"""
@@ -516,7 +626,12 @@ class RedisKVStorage(BaseKVStorage):
 @final
 @dataclass
 class RedisDocStatusStorage(DocStatusStorage):
-    """Redis implementation of document status storage"""
+    """Redis implementation of document status storage
+
+    Requires a standalone (or replicated) Redis server; Redis Cluster is not
+    supported because documents and their secondary indexes are updated by Lua
+    scripts that touch keys not known in advance.
+    """
 
     def __post_init__(self):
         # Check for REDIS_WORKSPACE environment variable first (higher priority)
@@ -557,6 +672,11 @@ class RedisDocStatusStorage(DocStatusStorage):
         self._pool = None
         self._redis = None
         self._initialized = False
+        # Secondary index keys live outside the "{final_namespace}:*" pattern so
+        # that document scans, is_empty() and legacy tooling never see them
+        self._index_prefix = f"{self.final_namespace}#idx:"
+        self._upsert_script = None
+        self._delete_script = None
 
         try:
             # Use shared connection pool
@@ -575,7 +695,7 @@ class RedisDocStatusStorage(DocStatusStorage):
             raise
 
     async def initialize(self):
-        """Initialize Redis connection"""
+        """Initialize Redis connection and build secondary indexes if needed"""
         async with get_data_init_lock():
             if self._initialized:
                 return
@@ -586,7 +706,9 @@ class RedisDocStatusStorage(DocStatusStorage):
                     logger.info(
                         f"[{self.workspace}] Connected to Redis for doc status namespace {self.namespace}"
                     )
-                    self._initialized = True
+                    await self._check_not_cluster(redis)
+                    self._upsert_script = redis.register_script(_DOC_STATUS_UPSERT_LUA)
+                    self._delete_script = redis.register_script(_DOC_STATUS_DELETE_LUA)
             except Exception as e:
                 logger.error(
                     f"[{self.workspace}] Failed to connect to Redis for doc status: {e}"
@@ -595,6 +717,31 @@ class RedisDocStatusStorage(DocStatusStorage):
                 await self.close()
                 raise
 
+            try:
+                await self._ensure_indexes()
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Failed to build doc status indexes: {e}"
+                )
+                raise
+
+            # Only a fully indexed storage counts as initialized, so a failed
+            # index build is retried by the next initialize()
+            self._initialized = True
+
+    async def _check_not_cluster(self, redis) -> None:
+        """Refuse Redis Cluster, the index scripts need all keys on one node"""
+        try:
+            cluster_info = await redis.execute_command("CLUSTER", "INFO")
+        except RedisError:
+            # Standalone servers reject CLUSTER commands (cluster support disabled)
+            return
+        if cluster_info:
+            raise RuntimeError(
+                "RedisDocStatusStorage does not support Redis Cluster: its index "
+                "scripts derive document and index keys at run time"
+            )
+
     @asynccontextmanager
     async def _get_redis_connection(self):
         """Safe context manager for Redis operations."""
@@ -649,6 +796,153 @@ class RedisDocStatusStorage(DocStatusStorage):
         """Ensure Redis resources are cleaned up when exiting context."""
         await self.close()
 
+    @staticmethod
+    def _timestamp_score(value: Any) -> float:
+        """Convert a created_at/updated_at value into a sorted set score"""
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str) and value:
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                try:
+                    return float(value)
+                except ValueError:
+                    pass
+        return 0.0
+
+    def _index_args(self, doc_id: str, doc_data: dict[str, Any]) -> list[Any]:
+        """Build the per-document argument group consumed by the upsert script"""
+        status = doc_data.get("status") or ""
+        status = getattr(status, "value", status)
+        file_path = doc_data.get("file_path") or ""
+        return [
+            doc_id,
+            json.dumps(doc_data),
+            status,
+            doc_data.get("track_id") or "",
+            file_path,
+            self._timestamp_score(doc_data.get("created_at")),
+            self._timestamp_score(doc_data.get("updated_at")),
+            # Same key the in-memory sort used, so page order is unchanged
+            get_pinyin_sort_key(file_path or "no-file-path"),
+        ]
+
+    @staticmethod
+    def _prepare_doc_status(doc_data: dict[str, Any]) -> DocProcessingStatus:
+        """Convert stored document data into a DocProcessingStatus"""
+        # Make a copy of the data to avoid modifying the original
+        data = doc_data.copy()
+        # Remove deprecated content field if it exists
+        data.pop("content", None)
+        # If file_path is not in data, use document id as file path
+        if "file_path" not in data:
+            data["file_path"] = "no-file-path"
+        # Ensure new fields exist with default values
+        if "metadata" not in data:
+            data["metadata"] = {}
+        if "error_msg" not in data:
+            data["error_msg"] = None
+        return DocProcessingStatus(**data)
+
+    async def _get_raw_docs(self, redis, doc_ids: list[str]) -> list[str | None]:
+        """Fetch raw JSON documents for the given ids in bounded pipelines"""
+        values: list[str | None] = []
+        for i in range(0, len(doc_ids), 1000):
+            pipe = redis.pipeline()
+            for doc_id in doc_ids[i : i + 1000]:
+                pipe.get(f"{self.final_namespace}:{doc_id}")
+            values.extend(await pipe.execute())
+        return values
+
+    async def _get_docs_by_index_set(
+        self, redis, set_key: str
+    ) -> dict[str, DocProcessingStatus]:
+        """Load every document whose id is a member of an index set"""
+        result = {}
+        doc_ids = sorted(await redis.smembers(set_key))
+        values = await self._get_raw_docs(redis, doc_ids)
+        for doc_id, value in zip(doc_ids, values):
+            if not value:
+                continue
+            try:
+                result[doc_id] = self._prepare_doc_status(json.loads(value))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.error(
+                    f"[{self.workspace}] Error processing document {doc_id}: {e}"
+                )
+        return result
+
+    async def _ensure_indexes(self) -> None:
+        """Build secondary indexes for documents written before they existed
+
+        Runs once per namespace (guarded by a version marker), so existing
+        workspaces are migrated transparently on first start.
+        """
+        version_key = f"{self._index_prefix}version"
+        async with self._get_redis_connection() as redis:
+            if await redis.get(version_key) == DOC_STATUS_INDEX_VERSION:
+                return
+
+            logger.info(
+                f"[{self.workspace}] Building doc status indexes for {self.namespace}"
+            )
+            # Remove stale index structures from an older layout
+            async for key in redis.scan_iter(
+                match=f"{self._index_prefix}*", count=1000
+            ):
+                await redis.delete(key)
+
+            indexed = 0
+            cursor = 0
+            while True:
+                cursor, keys = await redis.scan(
+                    cursor, match=f"{self.final_namespace}:*", count=1000
+                )
+                if keys:
+                    pipe = redis.pipeline()
+                    for key in keys:
+                        pipe.get(key)
+                    values = await pipe.execute()
+
+                    args: list[Any] = []
+                    for key, value in zip(keys, values):
+                        if not value:
+                            continue
+                        try:
+                            doc_data = json.loads(value)
+                        except json.JSONDecodeError as e:
+                            logger.error(
+                                f"[{self.workspace}] Skipping undecodable document {key}: {e}"
+                            )
+                            continue
+                        args.extend(self._index_args(key.split(":", 1)[1], doc_data))
+                    indexed += await self._run_upsert_script(args, write=False)
+
+                if cursor == 0:
+                    break
+
+            await redis.set(version_key, DOC_STATUS_INDEX_VERSION)
+            logger.info(
+                f"[{self.workspace}] Indexed {indexed} documents in {self.namespace}"
+            )
+
+    async def _run_upsert_script(self, args: list[Any], write: bool) -> int:
+        """Run the upsert script over argument groups in bounded batches"""
+        group = 8
+        batch = DOC_STATUS_INDEX_BATCH_SIZE * group
+        total = 0
+        for i in range(0, len(args), batch):
+            total += await self._upsert_script(
+                args=[
+                    self._index_prefix,
+                    f"{self.final_namespace}:",
+                    "1" if write else "0",
+                    *args[i : i + batch],
+                ]
+            )
+        return total
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         async with self._get_redis_connection() as redis:
@@ -690,32 +984,10 @@ class RedisDocStatusStorage(DocStatusStorage):
         counts = {status.value: 0 for status in DocStatus}
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.final_namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Count statuses
-                        for value in values:
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-                                    status = doc_data.get("status")
-                                    if status in counts:
-                                        counts[status] += 1
-                                except json.JSONDecodeError:
-                                    continue
-
-                    if cursor == 0:
-                        break
+                stored = await redis.hgetall(f"{self._index_prefix}counts")
+                for status, count in stored.items():
+                    if status in counts:
+                        counts[status] = int(count)
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error getting status counts: {e}")
 
@@ -725,113 +997,29 @@ class RedisDocStatusStorage(DocStatusStorage):
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
-        result = {}
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.final_namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Filter by status and create DocProcessingStatus objects
-                        for key, value in zip(keys, values):
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-                                    if doc_data.get("status") == status.value:
-                                        # Extract document ID from key
-                                        doc_id = key.split(":", 1)[1]
-
-                                        # Make a copy of the data to avoid modifying the original
-                                        data = doc_data.copy()
-                                        # Remove deprecated content field if it exists
-                                        data.pop("content", None)
-                                        # If file_path is not in data, use document id as file path
-                                        if "file_path" not in data:
-                                            data["file_path"] = "no-file-path"
-                                        # Ensure new fields exist with default values
-                                        if "metadata" not in data:
-                                            data["metadata"] = {}
-                                        if "error_msg" not in data:
-                                            data["error_msg"] = None
-
-                                        result[doc_id] = DocProcessingStatus(**data)
-                                except (json.JSONDecodeError, KeyError) as e:
-                                    logger.error(
-                                        f"[{self.workspace}] Error processing document {key}: {e}"
-                                    )
-                                    continue
-
-                    if cursor == 0:
-                        break
+                return await self._get_docs_by_index_set(
+                    redis, f"{self._index_prefix}status:{status.value}"
+                )
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error getting docs by status: {e}")
-
-        return result
+                return {}
 
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific track_id"""
-        result = {}
+        if not track_id:
+            return {}
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.final_namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Filter by track_id and create DocProcessingStatus objects
-                        for key, value in zip(keys, values):
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-                                    if doc_data.get("track_id") == track_id:
-                                        # Extract document ID from key
-                                        doc_id = key.split(":", 1)[1]
-
-                                        # Make a copy of the data to avoid modifying the original
-                                        data = doc_data.copy()
-                                        # Remove deprecated content field if it exists
-                                        data.pop("content", None)
-                                        # If file_path is not in data, use document id as file path
-                                        if "file_path" not in data:
-                                            data["file_path"] = "no-file-path"
-                                        # Ensure new fields exist with default values
-                                        if "metadata" not in data:
-                                            data["metadata"] = {}
-                                        if "error_msg" not in data:
-                                            data["error_msg"] = None
-
-                                        result[doc_id] = DocProcessingStatus(**data)
-                                except (json.JSONDecodeError, KeyError) as e:
-                                    logger.error(
-                                        f"[{self.workspace}] Error processing document {key}: {e}"
-                                    )
-                                    continue
-
-                    if cursor == 0:
-                        break
+                return await self._get_docs_by_index_set(
+                    redis, f"{self._index_prefix}track:{track_id}"
+                )
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error getting docs by track_id: {e}")
-
-        return result
+                return {}
 
     async def index_done_callback(self) -> None:
         """Redis handles persistence automatically"""
@@ -856,27 +1044,21 @@ class RedisDocStatusStorage(DocStatusStorage):
 
     @redis_retry
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
-        """Insert or update document status data"""
+        """Insert or update document status data together with its indexes"""
         if not data:
             return
 
         logger.debug(
             f"[{self.workspace}] Inserting {len(data)} records to {self.namespace}"
         )
-        async with self._get_redis_connection() as redis:
-            try:
+        async with self._get_redis_connection():
+            args: list[Any] = []
+            for doc_id, doc_data in data.items():
                 # Ensure chunks_list field exists for new documents
-                for doc_id, doc_data in data.items():
-                    if "chunks_list" not in doc_data:
-                        doc_data["chunks_list"] = []
-
-                pipe = redis.pipeline()
-                for k, v in data.items():
-                    pipe.set(f"{self.final_namespace}:{k}", json.dumps(v))
-                await pipe.execute()
-            except json.JSONDecodeError as e:
-                logger.error(f"[{self.workspace}] JSON decode error during upsert: {e}")
-                raise
+                if "chunks_list" not in doc_data:
+                    doc_data["chunks_list"] = []
+                args.extend(self._index_args(doc_id, doc_data))
+            await self._run_upsert_script(args, write=True)
 
     @redis_retry
     async def get_by_id(self, id: str) -> Union[dict[str, Any], None]:
@@ -889,17 +1071,20 @@ class RedisDocStatusStorage(DocStatusStorage):
                 return None
 
     async def delete(self, doc_ids: list[str]) -> None:
-        """Delete specific records from storage by their IDs"""
+        """Delete specific records and their index entries from storage"""
         if not doc_ids:
             return
 
-        async with self._get_redis_connection() as redis:
-            pipe = redis.pipeline()
-            for doc_id in doc_ids:
-                pipe.delete(f"{self.final_namespace}:{doc_id}")
-
-            results = await pipe.execute()
-            deleted_count = sum(results)
+        async with self._get_redis_connection():
+            deleted_count = 0
+            for i in range(0, len(doc_ids), DOC_STATUS_INDEX_BATCH_SIZE):
+                deleted_count += await self._delete_script(
+                    args=[
+                        self._index_prefix,
+                        f"{self.final_namespace}:",
+                        *doc_ids[i : i + DOC_STATUS_INDEX_BATCH_SIZE],
+                    ]
+                )
             logger.info(
                 f"[{self.workspace}] Deleted {deleted_count} of {len(doc_ids)} doc status entries from {self.namespace}"
             )
@@ -932,97 +1117,50 @@ class RedisDocStatusStorage(DocStatusStorage):
         elif page_size > 200:
             page_size = 200
 
-        if sort_field not in ["created_at", "updated_at", "id", "file_path"]:
+        if sort_field not in DOC_STATUS_SORT_FIELDS:
             sort_field = "updated_at"
 
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For Redis, we need to load all data and sort/filter in memory
-        all_docs = []
-        total_count = 0
+        # Each (sort_field, status) pair has its own sorted set, so both the
+        # total count and the requested page are read without touching the rest
+        scope = status_filter.value if status_filter is not None else "*"
+        zset_key = f"{self._index_prefix}{sort_field}:{scope}"
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size - 1
 
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.final_namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Process documents
-                        for key, value in zip(keys, values):
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-
-                                    # Apply status filter
-                                    if (
-                                        status_filter is not None
-                                        and doc_data.get("status")
-                                        != status_filter.value
-                                    ):
-                                        continue
-
-                                    # Extract document ID from key
-                                    doc_id = key.split(":", 1)[1]
-
-                                    # Prepare document data
-                                    data = doc_data.copy()
-                                    data.pop("content", None)
-                                    if "file_path" not in data:
-                                        data["file_path"] = "no-file-path"
-                                    if "metadata" not in data:
-                                        data["metadata"] = {}
-                                    if "error_msg" not in data:
-                                        data["error_msg"] = None
-
-                                    # Calculate sort key for sorting (but don't add to data)
-                                    if sort_field == "id":
-                                        sort_key = doc_id
-                                    elif sort_field == "file_path":
-                                        # Use pinyin sorting for file_path field to support Chinese characters
-                                        file_path_value = data.get(sort_field, "")
-                                        sort_key = get_pinyin_sort_key(file_path_value)
-                                    else:
-                                        sort_key = data.get(sort_field, "")
-
-                                    doc_status = DocProcessingStatus(**data)
-                                    all_docs.append((doc_id, doc_status, sort_key))
-
-                                except (json.JSONDecodeError, KeyError) as e:
-                                    logger.error(
-                                        f"[{self.workspace}] Error processing document {key}: {e}"
-                                    )
-                                    continue
-
-                    if cursor == 0:
-                        break
-
+                total_count = await redis.zcard(zset_key)
+                if sort_direction.lower() == "desc":
+                    members = await redis.zrevrange(zset_key, start_idx, end_idx)
+                else:
+                    members = await redis.zrange(zset_key, start_idx, end_idx)
+
+                if sort_field == "file_path":
+                    # Members are "<sort key>\0<doc_id>"
+                    doc_ids = [m.rsplit("\x00", 1)[-1] for m in members]
+                else:
+                    doc_ids = list(members)
+
+                values = await self._get_raw_docs(redis, doc_ids)
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error getting paginated docs: {e}")
                 return [], 0
 
-        # Sort documents using the separate sort key
-        reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(key=lambda x: x[2], reverse=reverse_sort)
-
-        # Remove sort key from tuples and keep only (doc_id, doc_status)
-        all_docs = [(doc_id, doc_status) for doc_id, doc_status, _ in all_docs]
-
-        total_count = len(all_docs)
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
+        paginated_docs = []
+        for doc_id, value in zip(doc_ids, values):
+            if not value:
+                continue
+            try:
+                paginated_docs.append(
+                    (doc_id, self._prepare_doc_status(json.loads(value)))
+                )
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                logger.error(
+                    f"[{self.workspace}] Error processing document {doc_id}: {e}"
+                )
 
         return paginated_docs, total_count
 
@@ -1050,37 +1188,21 @@ class RedisDocStatusStorage(DocStatusStorage):
             Union[dict[str, Any], None]: Document data if found, None otherwise
             Returns the same format as get_by_id method
         """
+        if not file_path:
+            return None
         async with self._get_redis_connection() as redis:
             try:
-                # Use SCAN to iterate through all keys in the namespace
-                cursor = 0
-                while True:
-                    cursor, keys = await redis.scan(
-                        cursor, match=f"{self.final_namespace}:*", count=1000
-                    )
-                    if keys:
-                        # Get all values in batch
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.get(key)
-                        values = await pipe.execute()
-
-                        # Check each document for matching file_path
-                        for value in values:
-                            if value:
-                                try:
-                                    doc_data = json.loads(value)
-                                    if doc_data.get("file_path") == file_path:
-                                        return doc_data
-                                except json.JSONDecodeError as e:
-                                    logger.error(
-                                        f"[{self.workspace}] JSON decode error in get_doc_by_file_path: {e}"
-                                    )
-                                    continue
-
-                    if cursor == 0:
-                        break
-
+                doc_ids = sorted(
+                    await redis.smembers(f"{self._index_prefix}path:{file_path}")
+                )
+                for value in await self._get_raw_docs(redis, doc_ids):
+                    if value:
+                        try:
+                            return json.loads(value)
+                        except json.JSONDecodeError as e:
+                            logger.error(
+                                f"[{self.workspace}] JSON decode error in get_doc_by_file_path: {e}"
+                            )
                 return None
             except Exception as e:
                 logger.error(f"[{self.workspace}] Error in get_doc_by_file_path: {e}")
@@ -1090,23 +1212,27 @@ class RedisDocStatusStorage(DocStatusStorage):
         """Drop all document status data from storage and clean up resources"""
         try:
             async with self._get_redis_connection() as redis:
-                # Use SCAN to find all keys with the namespace prefix
-                pattern = f"{self.final_namespace}:*"
-                cursor = 0
                 deleted_count = 0
-
-                while True:
-                    cursor, keys = await redis.scan(cursor, match=pattern, count=1000)
-                    if keys:
-                        # Delete keys in batches
-                        pipe = redis.pipeline()
-                        for key in keys:
-                            pipe.delete(key)
-                        results = await pipe.execute()
-                        deleted_count += sum(results)
-
-                    if cursor == 0:
-                        break
+                # Documents first, then the secondary index structures
+                for pattern in (
+                    f"{self.final_namespace}:*",
+                    f"{self._index_prefix}*",
+                ):
+                    cursor = 0
+                    while True:
+                        cursor, keys = await redis.scan(
+                            cursor, match=pattern, count=1000
+                        )
+                        if keys:
+                            # Delete keys in batches
+                            pipe = redis.pipeline()
+                            for key in keys:
+                                pipe.delete(key)
+                            results = await pipe.execute()
+                            deleted_count += sum(results)
+
+                        if cursor == 0:
+                            break
 
                 logger.info(
                     f"[{self.workspace}] Dropped {deleted_count} doc status keys from {self.namespace}"
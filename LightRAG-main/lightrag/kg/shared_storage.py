@@ -10,6 +10,7 @@ from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Union, TypeVar, Generic
 
 from lightrag.exceptions import PipelineNotInitializedError
+from lightrag.metrics import LOCK_WAIT_SECONDS
 
 DEBUG_LOCKS = False
 
@@ -144,6 +145,7 @@ class UnifiedLock(Generic[T]):
         name: str = "unnamed",
         enable_logging: bool = True,
         async_lock: Optional[asyncio.Lock] = None,
+        metric_name: Optional[str] = None,
     ):
         self._lock = lock
         self._is_async = is_async
@@ -151,8 +153,11 @@ class UnifiedLock(Generic[T]):
         self._name = name  # for debug only
         self._enable_logging = enable_logging  # for debug only
         self._async_lock = async_lock  # auxiliary lock for coroutine synchronization
+        # Lock label of the wait time metric, keyed locks share their namespace's
+        self._metric_name = metric_name or name
 
     async def __aenter__(self) -> "UnifiedLock[T]":
+        wait_start = time.perf_counter()
         try:
             # If in multiprocess mode and async lock exists, acquire it first
             if not self._is_async and self._async_lock is not None:
@@ -170,6 +175,9 @@ class UnifiedLock(Generic[T]):
                 await self._lock.acquire()
             else:
                 self._lock.acquire()
+            LOCK_WAIT_SECONDS.observe(
+                time.perf_counter() - wait_start, self._metric_name
+            )
 
             direct_log(
                 f"== Lock == Process {self._pid}: Acquired lock {self._name} (async={self._is_async})",
@@ -270,7 +278,11 @@ class UnifiedLock(Generic[T]):
                 level="DEBUG",
                 enable_output=self._enable_logging,
             )
+            wait_start = time.perf_counter()
             self._lock.acquire()
+            LOCK_WAIT_SECONDS.observe(
+                time.perf_counter() - wait_start, self._metric_name
+            )
             direct_log(
                 f"== Lock == Process {self._pid}: Acquired lock {self._name} (sync)",
                 level="INFO",
@@ -643,6 +655,7 @@ class KeyedUnifiedLock:
                 name=combined_key,
                 enable_logging=enable_logging,
                 async_lock=async_lock,  # prevents event‑loop blocking
+                metric_name=namespace,
             )
         else:
             return UnifiedLock(
@@ -651,6 +664,7 @@ class KeyedUnifiedLock:
                 name=combined_key,
                 enable_logging=enable_logging,
                 async_lock=None,  # No need for async lock in single process mode
+                metric_name=namespace,
             )
 
     def _release_lock_for_key(self, namespace: str, key: str):
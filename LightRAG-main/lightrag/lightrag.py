@@ -48,16 +48,28 @@ from lightrag.constants import (
     DEFAULT_RELATED_CHUNK_NUMBER,
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_MIN_RERANK_SCORE,
+    DEFAULT_RERANK_CACHE_MAX_SIZE,
     DEFAULT_SUMMARY_MAX_TOKENS,
     DEFAULT_SUMMARY_CONTEXT_SIZE,
+    DEFAULT_SUMMARY_INCREMENTAL,
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
+    DEFAULT_MIN_ASYNC,
+    DEFAULT_ADAPTIVE_CONCURRENCY,
+    DEFAULT_EMBEDDING_FUNC_MIN_ASYNC,
+    DEFAULT_LLM_RPM,
+    DEFAULT_LLM_TPM,
+    DEFAULT_EMBEDDING_RPM,
+    DEFAULT_EMBEDDING_TPM,
+    DEFAULT_EMBEDDING_COALESCE_WINDOW,
     DEFAULT_MAX_PARALLEL_INSERT,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_MAX_SOURCE_IDS_PER_ENTITY,
     DEFAULT_MAX_SOURCE_IDS_PER_RELATION,
     DEFAULT_MAX_EXTRACT_INPUT_TOKENS,
     DEFAULT_ENTITY_EXTRACT_MAX_COMPLETION_TOKENS,
+    DEFAULT_ENTITY_EXTRACT_PACK_SIZE,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
     DEFAULT_LLM_TIMEOUT,
@@ -126,6 +138,7 @@ from lightrag.utils import (
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
+    get_rate_limiter,
     get_content_summary,
     sanitize_text_for_encoding,
     check_storage_env_vars,
@@ -135,11 +148,15 @@ from lightrag.utils import (
     subtract_source_ids,
     make_relation_chunk_key,
     normalize_source_ids_limit_method,
+    rerank_score_cache,
 )
 
 # 导入类型定义
 from lightrag.types import KnowledgeGraph
 
+# 导入查询阶段指标标签
+from lightrag.metrics import query_labels
+
 # 导入环境变量加载
 from dotenv import load_dotenv
 
@@ -257,6 +274,22 @@ class LightRAG:
     )
     """Maximum completion tokens for entity extraction (OpenAI-compatible)."""
 
+    entity_extract_pack_size: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_SIZE", DEFAULT_ENTITY_EXTRACT_PACK_SIZE, int
+        )
+    )
+    """Maximum number of small chunks packed into one extraction request; 1 disables packing."""
+
+    entity_extract_pack_max_tokens: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_PACK_MAX_TOKENS",
+            DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS,
+            int,
+        )
+    )
+    """Maximum total content tokens of the chunks packed into one extraction request."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
@@ -336,6 +369,30 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    embedding_func_min_async: int = field(
+        default=get_env_value(
+            "EMBEDDING_FUNC_MIN_ASYNC", DEFAULT_EMBEDDING_FUNC_MIN_ASYNC, int
+        )
+    )
+    """Minimum number of concurrent embedding function calls when adaptive_concurrency is enabled."""
+
+    embedding_func_rpm: int = field(
+        default=get_env_value("EMBEDDING_RPM", DEFAULT_EMBEDDING_RPM, int)
+    )
+    """Client-side limit of embedding requests per minute (0 disables)."""
+
+    embedding_func_tpm: int = field(
+        default=get_env_value("EMBEDDING_TPM", DEFAULT_EMBEDDING_TPM, int)
+    )
+    """Client-side limit of embedded tokens per minute (0 disables)."""
+
+    embedding_coalesce_window: float = field(
+        default=get_env_value(
+            "EMBEDDING_COALESCE_WINDOW", DEFAULT_EMBEDDING_COALESCE_WINDOW, float
+        )
+    )
+    """Seconds an embedding is shared with later calls for the same text (0: only while in flight)."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
@@ -379,11 +436,34 @@ class LightRAG:
     )
     """Recommended length of LLM summary output."""
 
+    summary_incremental: bool = field(
+        default=get_env_value("SUMMARY_INCREMENTAL", DEFAULT_SUMMARY_INCREMENTAL, bool)
+    )
+    """Merge new descriptions into an existing summary that fits summary_max_tokens instead of re-summarizing it with them."""
+
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
     """Maximum number of concurrent LLM calls."""
 
+    llm_model_min_async: int = field(
+        default=get_env_value("MIN_ASYNC", DEFAULT_MIN_ASYNC, int)
+    )
+    """Minimum number of concurrent LLM calls when adaptive_concurrency is enabled."""
+
+    adaptive_concurrency: bool = field(
+        default=get_env_value(
+            "ADAPTIVE_CONCURRENCY", DEFAULT_ADAPTIVE_CONCURRENCY, bool
+        )
+    )
+    """Adapt LLM and embedding concurrency between the min and max async bounds (AIMD on latency, rate limits and overload errors)."""
+
+    llm_model_rpm: int = field(default=get_env_value("LLM_RPM", DEFAULT_LLM_RPM, int))
+    """Client-side limit of LLM requests per minute (0 disables), shared by instances using the same model."""
+
+    llm_model_tpm: int = field(default=get_env_value("LLM_TPM", DEFAULT_LLM_TPM, int))
+    """Client-side limit of LLM prompt plus completion tokens per minute (0 disables)."""
+
     llm_model_kwargs: dict[str, Any] = field(default_factory=dict)
     """Additional keyword arguments passed to the LLM model function."""
 
@@ -402,6 +482,18 @@ class LightRAG:
     )
     """Minimum rerank score threshold for filtering chunks after reranking."""
 
+    enable_rerank_cache: bool = field(
+        default=get_env_value("ENABLE_RERANK_CACHE", True, bool)
+    )
+    """Reuse rerank scores of (query, chunk) pairs seen before instead of re-sending them to the rerank model."""
+
+    rerank_cache_max_size: int = field(
+        default=get_env_value(
+            "RERANK_CACHE_MAX_SIZE", DEFAULT_RERANK_CACHE_MAX_SIZE, int
+        )
+    )
+    """Maximum number of cached rerank scores (shared by all instances in the process)."""
+
     # Storage
     # ---
 
@@ -605,9 +697,22 @@ class LightRAG:
                 self.embedding_func_max_async,
                 llm_timeout=self.default_embedding_timeout,
                 queue_name="Embedding func",
+                adaptive=self.adaptive_concurrency,
+                min_size=self.embedding_func_min_async,
+                rate_limiter=get_rate_limiter(
+                    f"embedding:{self.embedding_func.model_name}",
+                    self.embedding_func_rpm,
+                    self.embedding_func_tpm,
+                ),
+                tokenizer=self.tokenizer,
             )(self.embedding_func.func)
             # Use dataclasses.replace() to create a new instance, leaving the original unchanged
-            self.embedding_func = replace(self.embedding_func, func=wrapped_func)
+            self.embedding_func = replace(
+                self.embedding_func,
+                func=wrapped_func,
+                coalesce_window=self.embedding_coalesce_window
+                or self.embedding_func.coalesce_window,
+            )
 
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
@@ -675,6 +780,12 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        self.chunk_extractions: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
+            namespace=NameSpace.KV_STORE_CHUNK_EXTRACTIONS,
+            workspace=self.workspace,
+            embedding_func=self.embedding_func,
+        )
+
         self.chunk_entity_relation_graph: BaseGraphStorage = self.graph_storage_cls(  # type: ignore
             namespace=NameSpace.GRAPH_STORE_CHUNK_ENTITY_RELATION,
             workspace=self.workspace,
@@ -718,6 +829,12 @@ class LightRAG:
             self.llm_model_max_async,
             llm_timeout=self.default_llm_timeout,
             queue_name="LLM func",
+            adaptive=self.adaptive_concurrency,
+            min_size=self.llm_model_min_async,
+            rate_limiter=get_rate_limiter(
+                f"llm:{self.llm_model_name}", self.llm_model_rpm, self.llm_model_tpm
+            ),
+            tokenizer=self.tokenizer,
         )(
             partial(
                 self.llm_model_func,  # type: ignore
@@ -764,6 +881,7 @@ class LightRAG:
                 self.full_relations,
                 self.entity_chunks,
                 self.relation_chunks,
+                self.chunk_extractions,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
@@ -796,6 +914,7 @@ class LightRAG:
                 ("full_relations", self.full_relations),
                 ("entity_chunks", self.entity_chunks),
                 ("relation_chunks", self.relation_chunks),
+                ("chunk_extractions", self.chunk_extractions),
                 ("entities_vdb", self.entities_vdb),
                 ("relationships_vdb", self.relationships_vdb),
                 ("chunks_vdb", self.chunks_vdb),
@@ -2328,6 +2447,7 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                chunk_extractions_storage=self.chunk_extractions,
             )
             return chunk_results
         except Exception as e:
@@ -2351,6 +2471,7 @@ class LightRAG:
                 self.full_relations,
                 self.entity_chunks,
                 self.relation_chunks,
+                self.chunk_extractions,
                 self.llm_response_cache,
                 self.entities_vdb,
                 self.relationships_vdb,
@@ -2784,28 +2905,30 @@ class LightRAG:
 
         if data_param.mode in ["local", "global", "hybrid", "mix"]:
             logger.debug(f"[aquery_data] Using kg_query for mode: {data_param.mode}")
-            query_result = await kg_query(
-                query.strip(),
-                self.chunk_entity_relation_graph,
-                self.entities_vdb,
-                self.relationships_vdb,
-                self.text_chunks,
-                data_param,  # Use data_param with only_need_context=True
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=None,
-                chunks_vdb=self.chunks_vdb,
-            )
+            with query_labels(data_param.mode, self.workspace):
+                query_result = await kg_query(
+                    query.strip(),
+                    self.chunk_entity_relation_graph,
+                    self.entities_vdb,
+                    self.relationships_vdb,
+                    self.text_chunks,
+                    data_param,  # Use data_param with only_need_context=True
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=None,
+                    chunks_vdb=self.chunks_vdb,
+                )
         elif data_param.mode == "naive":
             logger.debug(f"[aquery_data] Using naive_query for mode: {data_param.mode}")
-            query_result = await naive_query(
-                query.strip(),
-                self.chunks_vdb,
-                data_param,  # Use data_param with only_need_context=True
-                global_config,
-                hashing_kv=self.llm_response_cache,
-                system_prompt=None,
-            )
+            with query_labels(data_param.mode, self.workspace):
+                query_result = await naive_query(
+                    query.strip(),
+                    self.chunks_vdb,
+                    data_param,  # Use data_param with only_need_context=True
+                    global_config,
+                    hashing_kv=self.llm_response_cache,
+                    system_prompt=None,
+                )
         elif data_param.mode == "bypass":
             logger.debug("[aquery_data] Using bypass mode")
             # bypass mode returns empty data using convert_to_user_format
@@ -2881,27 +3004,29 @@ class LightRAG:
             query_result = None
 
             if param.mode in ["local", "global", "hybrid", "mix"]:
-                query_result = await kg_query(
-                    query.strip(),
-                    self.chunk_entity_relation_graph,
-                    self.entities_vdb,
-                    self.relationships_vdb,
-                    self.text_chunks,
-                    param,
-                    global_config,
-                    hashing_kv=self.llm_response_cache,
-                    system_prompt=system_prompt,
-                    chunks_vdb=self.chunks_vdb,
-                )
+                with query_labels(param.mode, self.workspace):
+                    query_result = await kg_query(
+                        query.strip(),
+                        self.chunk_entity_relation_graph,
+                        self.entities_vdb,
+                        self.relationships_vdb,
+                        self.text_chunks,
+                        param,
+                        global_config,
+                        hashing_kv=self.llm_response_cache,
+                        system_prompt=system_prompt,
+                        chunks_vdb=self.chunks_vdb,
+                    )
             elif param.mode == "naive":
-                query_result = await naive_query(
-                    query.strip(),
-                    self.chunks_vdb,
-                    param,
-                    global_config,
-                    hashing_kv=self.llm_response_cache,
-                    system_prompt=system_prompt,
-                )
+                with query_labels(param.mode, self.workspace):
+                    query_result = await naive_query(
+                        query.strip(),
+                        self.chunks_vdb,
+                        param,
+                        global_config,
+                        hashing_kv=self.llm_response_cache,
+                        system_prompt=system_prompt,
+                    )
             elif param.mode == "bypass":
                 # Bypass mode: directly use LLM without knowledge retrieval
                 use_llm_func = param.model_func or global_config["llm_model_func"]
@@ -3570,6 +3695,8 @@ class LightRAG:
                 try:
                     await self.chunks_vdb.delete(chunk_ids)
                     await self.text_chunks.delete(chunk_ids)
+                    await self.chunk_extractions.delete(chunk_ids)
+                    rerank_score_cache.invalidate_chunks(self.workspace, chunk_ids)
 
                     async with pipeline_status_lock:
                         log_message = (
@@ -3735,6 +3862,7 @@ class LightRAG:
                         pipeline_status_lock=pipeline_status_lock,
                         entity_chunks_storage=self.entity_chunks,
                         relation_chunks_storage=self.relation_chunks,
+                        chunk_extractions_storage=self.chunk_extractions,
                     )
 
                 except Exception as e:
@@ -4169,20 +4297,26 @@ class LightRAG:
     async def aexport_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "jsonl", "parquet", "excel", "md", "txt"] = "csv",
         include_vector_data: bool = False,
+        batch_size: int = 1000,
+        progress_callback: Callable[[str, int], None] | None = None,
     ) -> None:
         """异步导出所有实体、关系和关联到多种格式.
 
         Args:
             output_path: 输出文件的路径（包括扩展名）
-            file_format: 输出格式 - "csv", "excel", "md", "txt"
+            file_format: 输出格式 - "csv", "jsonl", "parquet", "excel", "md", "txt"
                 - csv: 逗号分隔值文件
+                - jsonl: 每行一个JSON对象，带有record_type字段
+                - parquet: 单个Parquet表，带有record_type字段（需要pyarrow）
                 - excel: 多工作表的Microsoft Excel文件
                 - md: Markdown表格
                 - txt: 纯文本格式输出
-                - table: 将格式化的表格打印到控制台
+                csv、jsonl和parquet以流式方式逐批写入，内存占用恒定
             include_vector_data: 是否包含向量数据库中的数据
+            batch_size: 每批读取的节点/边数量
+            progress_callback: 每批完成后以 progress_callback(section, exported_count) 调用
         """
         from lightrag.utils import aexport_data as utils_aexport_data
 
@@ -4193,25 +4327,27 @@ class LightRAG:
             output_path,
             file_format,
             include_vector_data,
+            batch_size,
+            progress_callback,
         )
 
     def export_data(
         self,
         output_path: str,
-        file_format: Literal["csv", "excel", "md", "txt"] = "csv",
+        file_format: Literal["csv", "jsonl", "parquet", "excel", "md", "txt"] = "csv",
         include_vector_data: bool = False,
+        batch_size: int = 1000,
+        progress_callback: Callable[[str, int], None] | None = None,
     ) -> None:
         """同步导出所有实体、关系和关联到多种格式.
 
         Args:
             output_path: 输出文件的路径（包括扩展名）
-            file_format: 输出格式 - "csv", "excel", "md", "txt"
-                - csv: 逗号分隔值文件
-                - excel: 多工作表的Microsoft Excel文件
-                - md: Markdown表格
-                - txt: 纯文本格式输出
-                - table: 将格式化的表格打印到控制台
+            file_format: 输出格式 - "csv", "jsonl", "parquet", "excel", "md", "txt"
+                详见 aexport_data
             include_vector_data: 是否包含向量数据库中的数据
+            batch_size: 每批读取的节点/边数量
+            progress_callback: 每批完成后以 progress_callback(section, exported_count) 调用
         """
         try:
             loop = asyncio.get_event_loop()
@@ -4220,5 +4356,11 @@ class LightRAG:
             asyncio.set_event_loop(loop)
 
         loop.run_until_complete(
-            self.aexport_data(output_path, file_format, include_vector_data)
+            self.aexport_data(
+                output_path,
+                file_format,
+                include_vector_data,
+                batch_size,
+                progress_callback,
+            )
         )
@@ -34,6 +34,7 @@ from tenacity import (
 )
 from lightrag.utils import (
     safe_unicode_decode,
+    split_prompt_context,
     logger,
 )
 from lightrag.api import __api_version__
@@ -46,6 +47,48 @@ class InvalidResponseError(Exception):
     pass
 
 
+def _build_cacheable_messages(
+    system_prompt: str | None,
+    history_messages: list[dict[str, Any]],
+    prompt: str,
+) -> tuple[list[dict[str, Any]] | None, list[dict[str, Any]]]:
+    """Build system blocks and messages with cache breakpoints on the static prefix
+
+    The static part of the system prompt (e.g. extraction instructions with
+    examples, or the query instructions ahead of the retrieved context) and the end
+    of the conversation history are marked with `cache_control`, so Anthropic
+    serves repeated prefixes from its prompt cache. The per-query context follows
+    as a separate uncached system block, so it does not end the cached prefix.
+    """
+    cache_control = {"type": "ephemeral"}
+    system = None
+    if system_prompt:
+        instructions, context = split_prompt_context(system_prompt)
+        system = []
+        if instructions:
+            system.append(
+                {"type": "text", "text": instructions, "cache_control": cache_control}
+            )
+        if context:
+            system.append({"type": "text", "text": context})
+
+    messages: list[dict[str, Any]] = list(history_messages)
+    if messages and isinstance(messages[-1].get("content"), str):
+        last = messages[-1]
+        messages[-1] = {
+            **last,
+            "content": [
+                {
+                    "type": "text",
+                    "text": last["content"],
+                    "cache_control": cache_control,
+                }
+            ],
+        }
+    messages.append({"role": "user", "content": prompt})
+    return system, messages
+
+
 # Core Anthropic completion function with retry
 @retry(
     stop=stop_after_attempt(3),
@@ -62,6 +105,8 @@ async def anthropic_complete_if_cache(
     enable_cot: bool = False,
     base_url: str | None = None,
     api_key: str | None = None,
+    token_tracker: Any | None = None,
+    enable_prompt_cache: bool = True,
     **kwargs: Any,
 ) -> Union[str, AsyncIterator[str]]:
     if history_messages is None:
@@ -99,9 +144,15 @@ async def anthropic_complete_if_cache(
         )
     )
 
-    messages: list[dict[str, Any]] = []
-    messages.extend(history_messages)
-    messages.append({"role": "user", "content": prompt})
+    if enable_prompt_cache:
+        system, messages = _build_cacheable_messages(
+            system_prompt, history_messages, prompt
+        )
+    else:
+        system = system_prompt
+        messages: list[dict[str, Any]] = []
+        messages.extend(history_messages)
+        messages.append({"role": "user", "content": prompt})
 
     logger.debug("===== Sending Query to Anthropic LLM =====")
     logger.debug(f"Model: {model}   Base URL: {base_url}")
@@ -111,8 +162,8 @@ async def anthropic_complete_if_cache(
 
     try:
         create_params = {"model": model, "messages": messages, "stream": True, **kwargs}
-        if system_prompt:
-            create_params["system"] = system_prompt
+        if system:
+            create_params["system"] = system
         response = await anthropic_async_client.messages.create(**create_params)
 
     except APIConnectionError as e:
@@ -131,8 +182,16 @@ async def anthropic_complete_if_cache(
         raise
 
     async def stream_response():
+        usage = {}
         try:
             async for event in response:
+                # Input usage arrives with message_start, output usage with message_delta
+                event_type = getattr(event, "type", None)
+                if event_type == "message_start":
+                    usage["input"] = event.message.usage
+                elif event_type == "message_delta" and getattr(event, "usage", None):
+                    usage["output_tokens"] = event.usage.output_tokens
+
                 content = (
                     event.delta.text
                     if hasattr(event, "delta")
@@ -148,6 +207,26 @@ async def anthropic_complete_if_cache(
         except Exception as e:
             logger.error(f"Error in stream response: {str(e)}")
             raise
+        finally:
+            if token_tracker and "input" in usage:
+                input_usage = usage["input"]
+                # input_tokens only counts the tokens after the last cache breakpoint
+                cache_read = getattr(input_usage, "cache_read_input_tokens", None) or 0
+                cache_write = (
+                    getattr(input_usage, "cache_creation_input_tokens", None) or 0
+                )
+                prompt_tokens = input_usage.input_tokens + cache_read + cache_write
+                completion_tokens = usage.get("output_tokens") or getattr(
+                    input_usage, "output_tokens", 0
+                )
+                token_tracker.add_usage(
+                    {
+                        "prompt_tokens": prompt_tokens,
+                        "cached_tokens": cache_read,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    }
+                )
 
     return stream_response()
 
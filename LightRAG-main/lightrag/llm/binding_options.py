@@ -492,6 +492,7 @@ class GeminiLLMOptions(BindingOptions):
     seed: int | None = None
     thinking_config: dict | None = None
     safety_settings: dict | None = None
+    context_cache_ttl: int = 0
 
     _help: ClassVar[dict[str, str]] = {
         "temperature": "Controls randomness (0.0-2.0, higher = more creative)",
@@ -505,6 +506,7 @@ class GeminiLLMOptions(BindingOptions):
         "seed": "Random seed for reproducible generation (leave empty for random)",
         "thinking_config": "Thinking configuration (JSON dict, e.g., '{\"thinking_budget\": 1024}' or '{\"include_thoughts\": true}')",
         "safety_settings": "JSON object with Gemini safety settings overrides",
+        "context_cache_ttl": "TTL in seconds of an explicit context cache for system prompts (0 disables, implicit caching still applies)",
     }
 
 
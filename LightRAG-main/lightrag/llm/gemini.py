@@ -9,8 +9,12 @@ implementation mirrors the OpenAI helpers while relying on the official
 
 from __future__ import annotations
 
+import asyncio
 import os
+import time
+from collections import OrderedDict
 from collections.abc import AsyncIterator
+from hashlib import md5
 from functools import lru_cache
 from typing import Any
 
@@ -26,6 +30,7 @@ from lightrag.utils import (
     logger,
     remove_think_tags,
     safe_unicode_decode,
+    split_prompt_context,
     wrap_embedding_func_with_attrs,
 )
 
@@ -147,6 +152,117 @@ def _build_generation_config(
     return types.GenerateContentConfig(**sanitized)
 
 
+# Upper bound of explicit context caches tracked per process; least recently used
+# and expired entries are dropped first (the caches themselves expire server-side)
+_CONTEXT_CACHE_MAX_ENTRIES = 64
+
+
+class _ContextCacheEntry:
+    """Cache name and refresh time of one instruction, with its creation lock.
+
+    A None name records an instruction that could not be cached, so it is not
+    retried on every call before the refresh time.
+    """
+
+    __slots__ = ("lock", "name", "refresh_at")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.name: str | None = None
+        self.refresh_at = 0.0
+
+
+# Explicit context caches by (client identity, model, instruction hash), LRU order
+_context_caches: OrderedDict[tuple[str, str, str], _ContextCacheEntry] = OrderedDict()
+
+
+def _client_identity(api_key: str, base_url: str | None) -> str:
+    """Hash of the project or API key a client uses; context caches are per project"""
+    if os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "").lower() == "true":
+        owner = "vertexai:{}:{}".format(
+            os.getenv("GOOGLE_CLOUD_PROJECT", ""),
+            os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+        )
+    else:
+        owner = f"key:{api_key}"
+    return md5(f"{owner}|{base_url or ''}".encode("utf-8")).hexdigest()
+
+
+def _context_cache_entry(key: tuple[str, str, str], now: float) -> _ContextCacheEntry:
+    """Get or add the entry for key, evicting expired and least recently used ones"""
+    entry = _context_caches.get(key)
+    if entry is not None:
+        _context_caches.move_to_end(key)
+        return entry
+
+    # Entries being created (lock held) are kept, their waiters share the result
+    for stale_key in [
+        k
+        for k, e in _context_caches.items()
+        if e.refresh_at <= now and not e.lock.locked()
+    ]:
+        del _context_caches[stale_key]
+    while len(_context_caches) >= _CONTEXT_CACHE_MAX_ENTRIES:
+        oldest = next(
+            (k for k, e in _context_caches.items() if not e.lock.locked()), None
+        )
+        if oldest is None:
+            break
+        del _context_caches[oldest]
+
+    entry = _context_caches[key] = _ContextCacheEntry()
+    return entry
+
+
+async def _get_context_cache(
+    client: genai.Client,
+    client_id: str,
+    model: str,
+    system_instruction: str,
+    ttl: int,
+) -> str | None:
+    """
+    Return the name of a Gemini context cache holding the system instruction.
+
+    The cache is created on first use and recreated shortly before its TTL expires.
+    Only stable instructions should be passed here: every distinct instruction
+    creates (and bills storage for) its own cache. Creation fails for instructions
+    below the model's minimum cacheable size; those requests keep sending the
+    instruction inline (implicit caching still applies).
+    """
+    key = (client_id, model, md5(system_instruction.encode("utf-8")).hexdigest())
+    entry = _context_cache_entry(key, time.monotonic())
+    async with entry.lock:
+        now = time.monotonic()
+        if entry.refresh_at > now:
+            return entry.name
+
+        try:
+            cache = await client.aio.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_instruction, ttl=f"{ttl}s"
+                ),
+            )
+            entry.name = cache.name
+        except Exception as e:
+            logger.debug("Gemini context cache not created for %s: %s", model, e)
+            entry.name = None
+
+        entry.refresh_at = now + ttl * 0.9
+        return entry.name
+
+
+def _usage_token_counts(usage: Any) -> dict[str, int]:
+    """Convert Gemini usage metadata into TokenTracker counts"""
+    return {
+        "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+        "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+        "completion_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+        "total_tokens": getattr(usage, "total_token_count", 0) or 0,
+    }
+
+
 def _format_history_messages(history_messages: list[dict[str, Any]] | None) -> str:
     if not history_messages:
         return ""
@@ -228,6 +344,7 @@ async def gemini_complete_if_cache(
     keyword_extraction: bool = False,
     generation_config: dict[str, Any] | None = None,
     timeout: int | None = None,
+    context_cache_ttl: int | None = None,
     **_: Any,
 ) -> str | AsyncIterator[str]:
     """
@@ -256,6 +373,10 @@ async def gemini_complete_if_cache(
         hashing_kv: Storage interface (for interface parity with other bindings).
         enable_cot: Whether to include Chain of Thought content in the response.
         timeout: Request timeout in seconds (will be converted to milliseconds for Gemini API).
+        context_cache_ttl: TTL in seconds of an explicit context cache for the system
+            prompt. Disabled when 0 or None; may also be given as a generation_config
+            entry (GEMINI_LLM_CONTEXT_CACHE_TTL). Gemini's implicit prefix caching
+            applies either way, and cached tokens are reported to token_tracker.
         **_: Additional keyword arguments (ignored).
 
     Returns:
@@ -278,15 +399,42 @@ async def gemini_complete_if_cache(
     prompt_sections.append(f"[user] {prompt}")
     combined_prompt = "\n".join(prompt_sections)
 
+    # Context caching is a request option, not a generation parameter
+    generation_config = dict(generation_config or {})
+    context_cache_ttl = generation_config.pop("context_cache_ttl", None) or (
+        context_cache_ttl
+    )
+
     config_obj = _build_generation_config(
         generation_config,
         system_prompt=system_prompt,
         keyword_extraction=keyword_extraction,
     )
+    contents = [combined_prompt]
+    if context_cache_ttl and config_obj is not None and config_obj.system_instruction:
+        # Only the instructions ahead of the per-query context are cached, the
+        # context itself changes with every query and is sent with the request
+        instructions, context = split_prompt_context(config_obj.system_instruction)
+        cache_name = None
+        if instructions:
+            cache_name = await _get_context_cache(
+                client,
+                _client_identity(key, base_url),
+                model,
+                instructions,
+                context_cache_ttl,
+            )
+        if cache_name:
+            # The cached instruction must not be sent again with the request
+            config_obj = config_obj.model_copy(
+                update={"cached_content": cache_name, "system_instruction": None}
+            )
+            if context:
+                contents = [context, combined_prompt]
 
     request_kwargs: dict[str, Any] = {
         "model": model,
-        "contents": [combined_prompt],
+        "contents": contents,
     }
     if config_obj is not None:
         request_kwargs["config"] = config_obj
@@ -374,19 +522,7 @@ async def gemini_complete_if_cache(
             finally:
                 # Track token usage after streaming completes
                 if token_tracker and usage_metadata:
-                    token_tracker.add_usage(
-                        {
-                            "prompt_tokens": getattr(
-                                usage_metadata, "prompt_token_count", 0
-                            ),
-                            "completion_tokens": getattr(
-                                usage_metadata, "candidates_token_count", 0
-                            ),
-                            "total_tokens": getattr(
-                                usage_metadata, "total_token_count", 0
-                            ),
-                        }
-                    )
+                    token_tracker.add_usage(_usage_token_counts(usage_metadata))
 
         return _async_stream()
 
@@ -423,13 +559,7 @@ async def gemini_complete_if_cache(
 
     usage = getattr(response, "usage_metadata", None)
     if token_tracker and usage:
-        token_tracker.add_usage(
-            {
-                "prompt_tokens": getattr(usage, "prompt_token_count", 0),
-                "completion_tokens": getattr(usage, "candidates_token_count", 0),
-                "total_tokens": getattr(usage, "total_token_count", 0),
-            }
-        )
+        token_tracker.add_usage(_usage_token_counts(usage))
 
     logger.debug("Gemini response length: %s", len(final_text))
     return final_text
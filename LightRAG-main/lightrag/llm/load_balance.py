@@ -0,0 +1,316 @@
+"""
+Load balancing and failover across several endpoints of one LLM or embedding binding.
+
+A binding function talks to a single server: the address and key come from its
+``base_url``/``host`` and ``api_key`` keyword arguments. ``load_balanced_func``
+wraps such a function and fills these arguments in per call from a pool of
+endpoints, e.g. several vLLM/Ollama replicas or several provider keys, so that one
+LightRAG instance (and one pipeline) can use the combined throughput.
+
+- Selection: ``least_outstanding`` picks the endpoint with the fewest calls in
+  flight, ``latency`` weights the in-flight calls with each endpoint's recent
+  latency so that slower replicas receive proportionally less traffic.
+- Failover: a call that fails because of the endpoint (connection errors,
+  timeouts, HTTP 401/403/408/429/5xx) is retried once on each other endpoint.
+  Errors caused by the request itself (e.g. HTTP 400) are raised immediately.
+- Health ejection: an endpoint failing ``eject_after`` times in a row is taken out
+  of rotation for ``eject_seconds``, then given a single trial call again.
+
+Usage:
+    from lightrag.llm.load_balance import load_balanced_func
+    from lightrag.llm.openai import openai_complete_if_cache
+
+    llm_model_func = load_balanced_func(
+        openai_complete_if_cache,
+        [
+            {"url": "http://vllm-1:8000/v1"},
+            {"url": "http://vllm-2:8000/v1"},
+        ],
+        strategy="latency",
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Any
+
+from lightrag.utils import EmbeddingFunc, _unwrap_retry_error, logger
+
+LOAD_BALANCE_STRATEGIES = ("least_outstanding", "latency")
+
+# Status codes that are specific to the endpoint that answered, not to the request
+_ENDPOINT_ERROR_STATUS = {401, 403, 408, 429}
+
+
+@dataclass
+class Endpoint:
+    """One server (or one API key) of a load-balanced binding and its statistics"""
+
+    url: str | None
+    api_key: str | None = None
+    name: str = ""
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    latency: float | None = None  # EWMA of successful calls in seconds
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = self.url or "default"
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+        }
+
+
+def build_endpoints(
+    urls: Iterable[str | None], api_keys: Iterable[str | None] = (None,)
+) -> list[Endpoint]:
+    """Pair server addresses with API keys
+
+    A single address or key is shared by all entries of the other list, otherwise
+    both lists must have the same length. Keys never appear in endpoint names.
+    """
+    urls = list(urls) or [None]
+    api_keys = list(api_keys) or [None]
+    if len(urls) == 1:
+        urls = urls * len(api_keys)
+    elif len(api_keys) == 1:
+        api_keys = api_keys * len(urls)
+    elif len(urls) != len(api_keys):
+        raise ValueError(
+            f"Cannot pair {len(urls)} endpoints with {len(api_keys)} API keys: "
+            "provide one key, or one key per endpoint"
+        )
+
+    endpoints = []
+    for index, (url, api_key) in enumerate(zip(urls, api_keys)):
+        name = url or "default"
+        if urls.count(url) > 1:
+            name = f"{name}#key{index + 1}"
+        endpoints.append(Endpoint(url=url, api_key=api_key, name=name))
+    return endpoints
+
+
+def is_endpoint_error(error: BaseException) -> bool:
+    """Whether a failed call is worth retrying on another endpoint"""
+    error = _unwrap_retry_error(error)
+    status = (
+        getattr(error, "status_code", None)
+        or getattr(error, "status", None)
+        or getattr(getattr(error, "response", None), "status_code", None)
+    )
+    if isinstance(status, int):
+        return status in _ENDPOINT_ERROR_STATUS or status >= 500
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    # Client libraries wrap transport failures in their own exception types
+    # (openai.APIConnectionError, httpx.ConnectError, aiohttp.ClientConnectorError)
+    name = type(error).__name__
+    return "Connect" in name or "Timeout" in name
+
+
+_pools: weakref.WeakSet = weakref.WeakSet()
+
+
+class EndpointPool:
+    """Selects endpoints for calls and keeps their health and latency statistics"""
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        strategy: str = "least_outstanding",
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        url_kwarg: str = "base_url",
+        name: str = "llm",
+    ):
+        if not endpoints:
+            raise ValueError("A load-balanced binding needs at least one endpoint")
+        if strategy not in LOAD_BALANCE_STRATEGIES:
+            raise ValueError(
+                f"Unknown load balance strategy {strategy!r}, "
+                f"expected one of {LOAD_BALANCE_STRATEGIES}"
+            )
+        self.endpoints = endpoints
+        self.strategy = strategy
+        self.eject_after = max(1, eject_after)
+        self.eject_seconds = eject_seconds
+        self.url_kwarg = url_kwarg
+        self.name = name
+        _pools.add(self)
+
+    def select(self, exclude: Iterable[Endpoint] = ()) -> Endpoint | None:
+        """Pick the endpoint for the next call, None when all were excluded"""
+        excluded = {id(endpoint) for endpoint in exclude}
+        candidates = [e for e in self.endpoints if id(e) not in excluded]
+        if not candidates:
+            return None
+
+        healthy = [e for e in candidates if e.healthy]
+        if not healthy:
+            # Everything is ejected: try the endpoint that is due back first
+            return min(candidates, key=lambda e: e.ejected_until)
+
+        if self.strategy == "latency":
+            known = [e.latency for e in self.endpoints if e.latency is not None]
+            # Endpoints without samples yet are assumed to be as fast as the average
+            default_latency = sum(known) / len(known) if known else 1.0
+            return min(
+                healthy,
+                key=lambda e: (
+                    (e.outstanding + 1)
+                    * (e.latency if e.latency is not None else default_latency),
+                    e.requests,
+                ),
+            )
+        # Ties go to the least used endpoint, which round-robins sequential calls
+        return min(healthy, key=lambda e: (e.outstanding, e.requests))
+
+    def _record_success(self, endpoint: Endpoint, latency: float) -> None:
+        endpoint.consecutive_failures = 0
+        endpoint.ejected_until = 0.0
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += 0.2 * (latency - endpoint.latency)
+
+    def _record_failure(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.eject_after:
+            endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            endpoint.ejections += 1
+            logger.warning(
+                f"{self.name}: ejecting endpoint {endpoint.name} for "
+                f"{self.eject_seconds:g}s after {endpoint.consecutive_failures} "
+                f"consecutive failures ({type(error).__name__}: {error})"
+            )
+
+    async def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Call func on the selected endpoint, failing over on endpoint errors"""
+        tried: list[Endpoint] = []
+        while True:
+            endpoint = self.select(exclude=tried)
+            call_kwargs = dict(kwargs)
+            if endpoint.url is not None:
+                call_kwargs[self.url_kwarg] = endpoint.url
+            if endpoint.api_key is not None:
+                call_kwargs["api_key"] = endpoint.api_key
+
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            start = time.monotonic()
+            try:
+                result = await func(*args, **call_kwargs)
+            except Exception as e:
+                if not is_endpoint_error(e):
+                    raise
+                self._record_failure(endpoint, e)
+                tried.append(endpoint)
+                if len(tried) >= len(self.endpoints):
+                    raise
+                logger.warning(
+                    f"{self.name}: call to {endpoint.name} failed "
+                    f"({type(e).__name__}: {e}), retrying on another endpoint"
+                )
+                continue
+            finally:
+                endpoint.outstanding -= 1
+
+            self._record_success(endpoint, time.monotonic() - start)
+            return result
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "strategy": self.strategy,
+            "endpoints": [endpoint.get_stats() for endpoint in self.endpoints],
+        }
+
+
+def get_endpoint_stats() -> list[dict[str, Any]]:
+    """Per-endpoint statistics of all live load-balanced bindings"""
+    return [pool.get_stats() for pool in list(_pools)]
+
+
+def load_balanced_func(
+    func: Callable,
+    endpoints: list[Endpoint] | list[dict[str, Any]],
+    url_kwarg: str = "base_url",
+    strategy: str = "least_outstanding",
+    eject_after: int = 3,
+    eject_seconds: float = 30.0,
+    name: str = "llm",
+):
+    """Wrap an LLM or embedding binding function to spread calls over endpoints
+
+    Args:
+        func: Async binding function accepting ``url_kwarg`` and ``api_key``.
+            An EmbeddingFunc keeps its attributes and only its inner function
+            is wrapped.
+        endpoints: Endpoint objects, or dicts with ``url``/``api_key``/``name``.
+        url_kwarg: Keyword argument carrying the server address, ``base_url``
+            for OpenAI-compatible and Gemini bindings, ``host`` for Ollama and
+            Lollms completions.
+        strategy: ``least_outstanding`` or ``latency``.
+        eject_after: Consecutive endpoint failures before ejection.
+        eject_seconds: How long an ejected endpoint is left out of rotation.
+        name: Label used in logs and statistics.
+
+    Returns:
+        The wrapped function, exposing the pool as ``.pool`` and its statistics
+        as ``.get_stats()``. Streaming responses fail over only if the stream
+        cannot be opened; errors while consuming it are not retried.
+    """
+    if isinstance(func, EmbeddingFunc):
+        return replace(
+            func,
+            func=load_balanced_func(
+                func.func,
+                endpoints,
+                url_kwarg=url_kwarg,
+                strategy=strategy,
+                eject_after=eject_after,
+                eject_seconds=eject_seconds,
+                name=name,
+            ),
+        )
+
+    pool = EndpointPool(
+        [e if isinstance(e, Endpoint) else Endpoint(**e) for e in endpoints],
+        strategy=strategy,
+        eject_after=eject_after,
+        eject_seconds=eject_seconds,
+        url_kwarg=url_kwarg,
+        name=name,
+    )
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await pool.call(func, *args, **kwargs)
+
+    wrapper.pool = pool
+    wrapper.get_stats = pool.get_stats
+    return wrapper
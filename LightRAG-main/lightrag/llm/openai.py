@@ -99,6 +99,12 @@ def _get_tiktoken_encoding_for_model(model: str) -> Any:
     return _TIKTOKEN_ENCODING_CACHE[model]
 
 
+def _get_cached_tokens(usage: Any) -> int:
+    """Prompt tokens served from OpenAI's automatic prefix cache, 0 if not reported"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+
 def create_openai_async_client(
     api_key: str | None = None,
     base_url: str | None = None,
@@ -312,7 +318,8 @@ async def openai_complete_if_cache(
         client_configs=client_configs,
     )
 
-    # Prepare messages
+    # Prepare messages. Static content goes first: OpenAI caches prompt prefixes
+    # automatically, so the system prompt and history are reused across requests
     messages: list[dict[str, Any]] = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
@@ -466,6 +473,7 @@ async def openai_complete_if_cache(
                     # Use actual usage from the API
                     token_counts = {
                         "prompt_tokens": getattr(final_chunk_usage, "prompt_tokens", 0),
+                        "cached_tokens": _get_cached_tokens(final_chunk_usage),
                         "completion_tokens": getattr(
                             final_chunk_usage, "completion_tokens", 0
                         ),
@@ -636,6 +644,7 @@ async def openai_complete_if_cache(
             if token_tracker and hasattr(response, "usage"):
                 token_counts = {
                     "prompt_tokens": getattr(response.usage, "prompt_tokens", 0),
+                    "cached_tokens": _get_cached_tokens(response.usage),
                     "completion_tokens": getattr(
                         response.usage, "completion_tokens", 0
                     ),
@@ -0,0 +1,391 @@
+"""
+Query latency, cache and lock metrics in the Prometheus text format
+
+Metrics are kept in memory per process and rendered by render_metrics() for the
+/metrics endpoint of the API server. Gauges such as LLM queue depths are read from
+their sources at scrape time. With LIGHTRAG_OTEL_TRACING=true (and the
+opentelemetry-api package installed) every query stage is also an OpenTelemetry
+span; spans are exported by whatever tracer provider the application configures.
+
+This module must not import other lightrag modules at import time, it is used by
+lightrag.utils and lightrag.kg.shared_storage.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator
+
+logger = logging.getLogger("lightrag")
+
+# Upper bounds in seconds, from a dict lookup to a slow LLM answer
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+def _format_labels(labelnames: tuple[str, ...], labels: tuple) -> str:
+    if not labelnames:
+        return ""
+    pairs = []
+    for name, value in zip(labelnames, labels):
+        value = (
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        )
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    """Bucketed observations per label combination (cumulative on render)"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # labels -> [count per bucket (last one is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def get_count(self, *labels) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterator[str]:
+        bucket_names = self.labelnames + ("le",)
+        for labels, (counts, total) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                label_str = _format_labels(
+                    bucket_names, labels + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{label_str} {cumulative}"
+            label_str = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_str} {_format_value(total)}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class MetricsRegistry:
+    """Named counters and histograms of this process"""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric {metric.name} already registered")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+QUERY_STAGE_SECONDS = registry.histogram(
+    "lightrag_query_stage_seconds",
+    "Wall time of query stages",
+    ("stage", "mode", "workspace"),
+)
+CACHE_REQUESTS = registry.counter(
+    "lightrag_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ("cache", "result"),
+)
+LOCK_WAIT_SECONDS = registry.histogram(
+    "lightrag_lock_wait_seconds",
+    "Time spent waiting to acquire shared storage locks",
+    ("lock",),
+)
+
+# (mode, workspace) of the query running in the current task
+_query_labels: ContextVar[tuple[str, str]] = ContextVar(
+    "lightrag_query_labels", default=("", "")
+)
+
+_tracer = None
+
+
+def enable_tracing(enabled: bool = True) -> bool:
+    """Turn OpenTelemetry spans for query stages on or off, return whether active"""
+    global _tracer
+    if not enabled:
+        _tracer = None
+        return False
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        logger.warning(
+            "OpenTelemetry tracing requested but opentelemetry-api is not installed"
+        )
+        _tracer = None
+        return False
+    _tracer = trace.get_tracer("lightrag")
+    return True
+
+
+if os.getenv("LIGHTRAG_OTEL_TRACING", "false").lower() in ("true", "1", "yes"):
+    enable_tracing()
+
+
+@contextmanager
+def query_labels(mode: str, workspace: str) -> Iterator[None]:
+    """Label the stages of the query running inside this block"""
+    token = _query_labels.set((mode or "", workspace or ""))
+    try:
+        yield
+    finally:
+        _query_labels.reset(token)
+
+
+def observe_stage(
+    stage: str, seconds: float, labels: tuple[str, str] | None = None
+) -> None:
+    mode, workspace = labels if labels is not None else _query_labels.get()
+    QUERY_STAGE_SECONDS.observe(seconds, stage, mode, workspace)
+
+
+@contextmanager
+def stage_span(stage: str, timings: dict[str, float] | None = None) -> Iterator[None]:
+    """Time a query stage into the stage histogram (and an OpenTelemetry span)
+
+    If timings is given, the stage's wall time in ms is also stored under its name.
+    """
+    labels = _query_labels.get()
+    start = time.perf_counter()
+    try:
+        if _tracer is None:
+            yield
+        else:
+            with _tracer.start_as_current_span(
+                f"lightrag.{stage}",
+                attributes={
+                    "lightrag.mode": labels[0],
+                    "lightrag.workspace": labels[1],
+                },
+            ):
+                yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe_stage(stage, elapsed, labels)
+        if timings is not None:
+            timings[stage] = round(elapsed * 1000, 3)
+
+
+def time_first_item(
+    iterator: AsyncIterator[Any],
+    stage: str = "llm_first_token",
+    start: float | None = None,
+) -> AsyncIterator[Any]:
+    """Pass a streamed response through, timing the arrival of its first item
+
+    The time runs from start (a time.perf_counter() value, default now).
+    """
+    labels = _query_labels.get()
+    if start is None:
+        start = time.perf_counter()
+
+    async def timed() -> AsyncIterator[Any]:
+        first = True
+        try:
+            async for item in iterator:
+                if first:
+                    observe_stage(stage, time.perf_counter() - start, labels)
+                    first = False
+                yield item
+        finally:
+            # Closing the wrapper must still close the provider stream
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    return timed()
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    if hits:
+        CACHE_REQUESTS.inc(cache, "hit", amount=hits)
+    if misses:
+        CACHE_REQUESTS.inc(cache, "miss", amount=misses)
+
+
+def _sample_lines(
+    name: str,
+    documentation: str,
+    samples: list[tuple[dict[str, Any], Any]],
+    metric_type: str = "gauge",
+) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        label_str = _format_labels(tuple(labels), tuple(labels.values()))
+        lines.append(f"{name}{label_str} {_format_value(value)}")
+    return lines
+
+
+def _runtime_gauges() -> list[str]:
+    """Read queue, single-flight, rerank cache and endpoint state at scrape time"""
+    from lightrag.llm.load_balance import get_endpoint_stats
+    from lightrag.utils import (
+        get_concurrency_metrics,
+        llm_single_flight,
+        rerank_score_cache,
+    )
+
+    queues = get_concurrency_metrics()
+    lines = []
+    for key, name, documentation in (
+        ("queue_depth", "lightrag_llm_queue_depth", "Calls waiting for a worker"),
+        ("executing", "lightrag_llm_executing", "Calls being executed"),
+        ("limit", "lightrag_llm_concurrency_limit", "Current concurrency limit"),
+    ):
+        lines += _sample_lines(
+            name,
+            documentation,
+            [({"queue": q["queue_name"]}, q.get(key)) for q in queues],
+        )
+
+    single_flight = llm_single_flight.get_metrics()
+    lines += _sample_lines(
+        "lightrag_llm_single_flight_calls_total",
+        "LLM calls run (leader) or shared with an identical call (coalesced)",
+        [
+            ({"role": "leader"}, single_flight["leaders"]),
+            ({"role": "coalesced"}, single_flight["coalesced"]),
+        ],
+        "counter",
+    )
+    lines += _sample_lines(
+        "lightrag_rerank_cache_lookups_total",
+        "Rerank score cache lookups by result",
+        [
+            ({"result": "hit"}, rerank_score_cache.hits),
+            ({"result": "miss"}, rerank_score_cache.misses),
+        ],
+        "counter",
+    )
+
+    endpoints = [
+        (pool["name"], endpoint)
+        for pool in get_endpoint_stats()
+        for endpoint in pool["endpoints"]
+    ]
+    for key, name, documentation, metric_type in (
+        ("outstanding", "lightrag_endpoint_outstanding", "Calls in flight", "gauge"),
+        ("requests", "lightrag_endpoint_requests_total", "Calls sent", "counter"),
+        ("failures", "lightrag_endpoint_failures_total", "Failed calls", "counter"),
+        ("healthy", "lightrag_endpoint_healthy", "1 if not ejected", "gauge"),
+    ):
+        lines += _sample_lines(
+            name,
+            documentation,
+            [
+                ({"pool": pool, "endpoint": e["name"]}, int(e[key]))
+                for pool, e in endpoints
+            ],
+            metric_type,
+        )
+    return lines
+
+
+def render_metrics() -> str:
+    """All metrics of this process in the Prometheus text exposition format"""
+    return registry.render() + "\n".join(_runtime_gauges()) + "\n"
@@ -1,10 +1,15 @@
 from __future__ import annotations
-from functools import partial
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import zip_longest
 from pathlib import Path
 
 import asyncio
+import heapq
 import json
+import re
 import json_repair
+import numpy as np
 from typing import Any, AsyncIterator, overload, Literal
 from collections import Counter, defaultdict
 
@@ -25,9 +30,13 @@ from lightrag.utils import (
     compute_args_hash,
     handle_cache,
     save_to_cache,
+    llm_single_flight,
+    single_flight_key,
     CacheData,
+    generate_cache_key,
     use_llm_func_with_cache,
     update_chunk_cache_list,
+    statistic_data,
     remove_think_tags,
     pick_by_weighted_polling,
     pick_by_vector_similarity,
@@ -40,6 +49,7 @@ from lightrag.utils import (
     apply_source_ids_limit,
     merge_source_ids,
     make_relation_chunk_key,
+    compute_evidence_scores,
 )
 from lightrag.base import (
     BaseGraphStorage,
@@ -60,13 +70,17 @@ from lightrag.constants import (
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_SUMMARY_INCREMENTAL,
     SOURCE_IDS_LIMIT_METHOD_KEEP,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
+    DEFAULT_ENTITY_EXTRACT_PACK_SIZE,
+    DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS,
 )
 from lightrag.kg.shared_storage import get_storage_keyed_lock
+from lightrag.metrics import stage_span, time_first_item
 import time
 from dotenv import load_dotenv
 
@@ -170,6 +184,7 @@ async def _handle_entity_relation_summary(
     separator: str,
     global_config: dict,
     llm_response_cache: BaseKVStorage | None = None,
+    existing_count: int = 0,
 ) -> tuple[str, bool]:
     """Handle entity relation description summary using map-reduce approach.
 
@@ -177,14 +192,20 @@ async def _handle_entity_relation_summary(
     1. If total tokens < summary_context_size and len(description_list) < force_llm_summary_on_merge, no need to summarize
     2. If total tokens < summary_max_tokens, summarize with LLM directly
     3. Otherwise, split descriptions into chunks that fit within token limits
-    4. Summarize each chunk, then recursively process the summaries
+    4. Summarize all chunks concurrently, then recursively process the summaries
     5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge
 
+    In incremental mode (summary_incremental), the first `existing_count` descriptions
+    are the stored description of the entity/relation. If they already fit within
+    summary_max_tokens they are kept out of the map phase, so only the new descriptions
+    are reduced and the existing summary is merged with them in the final summarization.
+
     Args:
         entity_or_relation_name: Name of the entity or relation being summarized
         description_list: List of description strings to summarize
         global_config: Global configuration containing tokenizer and limits
         llm_response_cache: Optional cache for LLM responses
+        existing_count: Number of leading descriptions taken from the stored description
 
     Returns:
         Tuple of (final_summarized_description_string, llm_was_used_boolean)
@@ -203,25 +224,47 @@ async def _handle_entity_relation_summary(
     summary_max_tokens = global_config["summary_max_tokens"]
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
 
+    # Token counts are computed once per description and reused across iterations
+    token_counts: dict[str, int] = {}
+
+    def count_tokens(desc: str) -> int:
+        if desc not in token_counts:
+            token_counts[desc] = len(tokenizer.encode(desc))
+        return token_counts[desc]
+
+    # Pin the existing summary when it already fits the budget (incremental mode)
+    pinned_list: list[str] = []
     current_list = description_list[:]  # Copy the list to avoid modifying original
+    if (
+        global_config.get("summary_incremental", DEFAULT_SUMMARY_INCREMENTAL)
+        and 0 < existing_count < len(description_list)
+        and sum(count_tokens(desc) for desc in description_list[:existing_count])
+        <= summary_max_tokens
+    ):
+        pinned_list = description_list[:existing_count]
+        current_list = description_list[existing_count:]
+    pinned_tokens = sum(count_tokens(desc) for desc in pinned_list)
+
     llm_was_used = False  # Track whether LLM was used during the entire process
 
     # Iterative map-reduce process
     while True:
-        # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        # Calculate total tokens in current list (pinned existing summary included)
+        total_tokens = pinned_tokens + sum(count_tokens(desc) for desc in current_list)
+        num_descriptions = len(pinned_list) + len(current_list)
 
         # If total length is within limits, perform final summarization
-        if total_tokens <= summary_context_size or len(current_list) <= 2:
+        if total_tokens <= summary_context_size or num_descriptions <= 2:
+            final_list = pinned_list + current_list
             if (
-                len(current_list) < force_llm_summary_on_merge
+                num_descriptions < force_llm_summary_on_merge
                 and total_tokens < summary_max_tokens
             ):
                 # no LLM needed, just join the descriptions
-                final_description = separator.join(current_list)
+                final_description = separator.join(final_list)
                 return final_description if final_description else "", llm_was_used
             else:
-                if total_tokens > summary_context_size and len(current_list) <= 2:
+                if total_tokens > summary_context_size and num_descriptions <= 2:
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize description found"
                     )
@@ -229,24 +272,33 @@ async def _handle_entity_relation_summary(
                 final_summary = await _summarize_descriptions(
                     description_type,
                     entity_or_relation_name,
-                    current_list,
+                    final_list,
                     global_config,
                     llm_response_cache,
                 )
                 return final_summary, True  # LLM was used for final summarization
 
+        # Pinned summary can not be reduced any further: fold it back into the map phase
+        if len(current_list) <= 1:
+            current_list = pinned_list + current_list
+            pinned_list = []
+            pinned_tokens = 0
+            continue
+
         # Need to split into chunks - Map phase
         # Ensure each chunk has minimum 2 descriptions to guarantee progress
         chunks = []
         current_chunk = []
         current_tokens = 0
+        # Leave room for the pinned summary in every group it will be merged with
+        group_token_limit = max(summary_context_size - pinned_tokens, 0)
 
-        # Currently least 3 descriptions in current_list
+        # Currently least 2 descriptions in current_list
         for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
+            desc_tokens = count_tokens(desc)
 
             # If adding current description would exceed limit, finalize current chunk
-            if current_tokens + desc_tokens > summary_context_size and current_chunk:
+            if current_tokens + desc_tokens > group_token_limit and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
                 if len(current_chunk) == 1:
                     # Force add one more description to ensure minimum 2 per chunk
@@ -271,28 +323,29 @@ async def _handle_entity_relation_summary(
 
         logger.info(
             f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
+            + (" (existing summary kept)" if pinned_list else "")
         )
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
+        # Reduce phase: summarize all groups concurrently. Concurrency is bounded by
+        # the priority limiter wrapped around llm_model_func.
+        async def reduce_chunk(chunk: list[str]) -> str:
             if len(chunk) == 1:
                 # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
-                )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+                return chunk[0]
+            return await _summarize_descriptions(
+                description_type,
+                entity_or_relation_name,
+                chunk,
+                global_config,
+                llm_response_cache,
+            )
+
+        new_summaries = await asyncio.gather(*(reduce_chunk(c) for c in chunks))
+        if any(len(chunk) > 1 for chunk in chunks):
+            llm_was_used = True  # Mark that LLM was used in reduce phase
 
         # Update current list with new summaries for next iteration
-        current_list = new_summaries
+        current_list = list(new_summaries)
 
 
 async def _summarize_descriptions(
@@ -613,6 +666,7 @@ async def rebuild_knowledge_from_chunks(
     pipeline_status_lock=None,
     entity_chunks_storage: BaseKVStorage | None = None,
     relation_chunks_storage: BaseKVStorage | None = None,
+    chunk_extractions_storage: BaseKVStorage | None = None,
 ) -> None:
     """Rebuild entity and relationship descriptions from cached extraction results with parallel processing
 
@@ -620,6 +674,11 @@ async def rebuild_knowledge_from_chunks(
     following the same approach as the insert process. Now with parallel processing
     controlled by llm_model_max_async and using get_storage_keyed_lock for data consistency.
 
+    Chunks with a structured record in chunk_extractions_storage are rebuilt from it
+    directly; only chunks without one (extracted by older versions) fall back to
+    parsing the raw LLM output from llm_response_cache. Parsed fallbacks are written
+    back as records so later rebuilds of the same chunks are parse-free.
+
     Args:
         entities_to_rebuild: Dict mapping entity_name -> list of remaining chunk_ids
         relationships_to_rebuild: Dict mapping (src, tgt) -> list of remaining chunk_ids
@@ -633,6 +692,7 @@ async def rebuild_knowledge_from_chunks(
         pipeline_status_lock: Lock for pipeline status
         entity_chunks_storage: KV storage maintaining full chunk IDs per entity
         relation_chunks_storage: KV storage maintaining full chunk IDs per relation
+        chunk_extractions_storage: KV storage holding the parsed extraction record per chunk
     """
     if not entities_to_rebuild and not relationships_to_rebuild:
         return
@@ -651,15 +711,36 @@ async def rebuild_knowledge_from_chunks(
             pipeline_status["latest_message"] = status_message
             pipeline_status["history_messages"].append(status_message)
 
+    # Process cached results to get entities and relationships for each chunk
+    chunk_entities = {}  # chunk_id -> {entity_name: [entity_data]}
+    chunk_relationships = {}  # chunk_id -> {(src, tgt): [relationship_data]}
+
+    # Structured extraction records need neither the LLM cache nor parsing
+    if chunk_extractions_storage is not None:
+        referenced_chunk_ids = list(all_referenced_chunk_ids)
+        records = await chunk_extractions_storage.get_by_ids(referenced_chunk_ids)
+        for chunk_id, record in zip(referenced_chunk_ids, records):
+            parsed = _parse_chunk_extraction_record(record)
+            if parsed is not None:
+                chunk_entities[chunk_id], chunk_relationships[chunk_id] = parsed
+        if chunk_entities:
+            logger.info(
+                f"Loaded {len(chunk_entities)} structured extraction records, "
+                f"{len(all_referenced_chunk_ids) - len(chunk_entities)} chunks need parsing"
+            )
+
     # Get cached extraction results for these chunks using storage
     # cached_results： chunk_id -> [list of (extraction_result, create_time) from LLM cache sorted by create_time of the first extraction_result]
-    cached_results = await _get_cached_extraction_results(
-        llm_response_cache,
-        all_referenced_chunk_ids,
-        text_chunks_storage=text_chunks_storage,
-    )
+    legacy_chunk_ids = all_referenced_chunk_ids - chunk_entities.keys()
+    cached_results = {}
+    if legacy_chunk_ids:
+        cached_results = await _get_cached_extraction_results(
+            llm_response_cache,
+            legacy_chunk_ids,
+            text_chunks_storage=text_chunks_storage,
+        )
 
-    if not cached_results:
+    if not cached_results and not chunk_entities:
         status_message = "No cached extraction results found, cannot rebuild"
         logger.warning(status_message)
         if pipeline_status is not None and pipeline_status_lock is not None:
@@ -668,10 +749,7 @@ async def rebuild_knowledge_from_chunks(
                 pipeline_status["history_messages"].append(status_message)
         return
 
-    # Process cached results to get entities and relationships for each chunk
-    chunk_entities = {}  # chunk_id -> {entity_name: [entity_data]}
-    chunk_relationships = {}  # chunk_id -> {(src, tgt): [relationship_data]}
-
+    parsed_records = {}
     for chunk_id, results in cached_results.items():
         try:
             # Handle multiple extraction results per chunk
@@ -734,6 +812,10 @@ async def rebuild_knowledge_from_chunks(
                             chunk_relationships[chunk_id][rel_key] = list(rel_list)
                         # Otherwise keep existing version
 
+            parsed_records[chunk_id] = _build_chunk_extraction_record(
+                chunk_entities[chunk_id], chunk_relationships[chunk_id]
+            )
+
         except Exception as e:
             status_message = (
                 f"Failed to parse cached extraction result for chunk {chunk_id}: {e}"
@@ -745,6 +827,10 @@ async def rebuild_knowledge_from_chunks(
                     pipeline_status["history_messages"].append(status_message)
             continue
 
+    # Backfill records for legacy chunks so the next rebuild skips parsing them
+    if chunk_extractions_storage is not None and parsed_records:
+        await chunk_extractions_storage.upsert(parsed_records)
+
     # Get max async tasks limit from global_config for semaphore control
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
@@ -887,6 +973,40 @@ async def rebuild_knowledge_from_chunks(
             pipeline_status["history_messages"].append(status_message)
 
 
+def _build_chunk_extraction_record(
+    maybe_nodes: dict[str, list[dict]], maybe_edges: dict[tuple[str, str], list[dict]]
+) -> dict[str, Any]:
+    """Flatten the parsed entities/relations of one chunk into a JSON-serializable record"""
+    return {
+        "entities": [dp for entity_list in maybe_nodes.values() for dp in entity_list],
+        "relations": [dp for edge_list in maybe_edges.values() for dp in edge_list],
+    }
+
+
+def _parse_chunk_extraction_record(
+    record: dict[str, Any] | None,
+) -> tuple[dict, dict] | None:
+    """Group a stored chunk extraction record back into (entities, relationships)
+
+    Returns None for missing or malformed records so callers fall back to parsing
+    the cached LLM output.
+    """
+    if not isinstance(record, dict):
+        return None
+    entity_records = record.get("entities")
+    relation_records = record.get("relations")
+    if not isinstance(entity_records, list) or not isinstance(relation_records, list):
+        return None
+
+    entities = defaultdict(list)
+    relationships = defaultdict(list)
+    for dp in entity_records:
+        entities[dp["entity_name"]].append(dp)
+    for dp in relation_records:
+        relationships[(dp["src_id"], dp["tgt_id"])].append(dp)
+    return entities, relationships
+
+
 async def _get_cached_extraction_results(
     llm_response_cache: BaseKVStorage,
     chunk_ids: set[str],
@@ -1102,6 +1222,199 @@ async def _process_extraction_result(
     return dict(maybe_nodes), dict(maybe_edges)
 
 
+def _split_packed_extraction_result(
+    result: str, chunk_count: int, chunk_delimiter: str, completion_delimiter: str
+) -> list[str] | None:
+    """Split a packed extraction response into one extraction result per chunk
+
+    Returns None when the response is truncated or its chunk markers do not match
+    the packed input exactly, so the caller can fall back to single-chunk requests.
+    """
+    if completion_delimiter.lower() not in result.lower():
+        return None
+
+    marker = re.compile(
+        rf"^\s*{re.escape(chunk_delimiter)}\s*(\d+)\s*$", flags=re.IGNORECASE
+    )
+    sections: dict[int, list[str]] = {}
+    current = None
+    for line in result.splitlines():
+        match = marker.match(line)
+        if match:
+            index = int(match.group(1))
+            if index in sections or not 1 <= index <= chunk_count:
+                return None
+            sections[index] = []
+            current = index
+        elif line.strip().lower() == completion_delimiter.lower():
+            continue
+        elif current is not None:
+            sections[current].append(line)
+        elif line.strip():
+            # Content before the first marker can not be attributed to a chunk
+            return None
+
+    if len(sections) != chunk_count:
+        return None
+    # Every section is terminated like a single-chunk extraction result
+    return [
+        "\n".join(sections[index] + [completion_delimiter])
+        for index in range(1, chunk_count + 1)
+    ]
+
+
+def _merge_gleaning_result(
+    maybe_nodes: dict, maybe_edges: dict, glean_nodes: dict, glean_edges: dict
+) -> None:
+    """Merge a gleaning result into the initial one, keeping the longer description"""
+    for entity_name, glean_entities in glean_nodes.items():
+        if entity_name in maybe_nodes:
+            # Compare description lengths and keep the better one
+            original_desc_len = len(
+                maybe_nodes[entity_name][0].get("description", "") or ""
+            )
+            glean_desc_len = len(glean_entities[0].get("description", "") or "")
+
+            if glean_desc_len > original_desc_len:
+                maybe_nodes[entity_name] = list(glean_entities)
+            # Otherwise keep original version
+        else:
+            # New entity from gleaning stage
+            maybe_nodes[entity_name] = list(glean_entities)
+
+    for edge_key, glean_edge_list in glean_edges.items():
+        if edge_key in maybe_edges:
+            # Compare description lengths and keep the better one
+            original_desc_len = len(
+                maybe_edges[edge_key][0].get("description", "") or ""
+            )
+            glean_desc_len = len(glean_edge_list[0].get("description", "") or "")
+
+            if glean_desc_len > original_desc_len:
+                maybe_edges[edge_key] = list(glean_edge_list)
+            # Otherwise keep original version
+        else:
+            # New edge from gleaning stage
+            maybe_edges[edge_key] = list(glean_edge_list)
+
+
+_EXTRACTION_PROMPT_NAMES = (
+    "entity_extraction_system_prompt",
+    "entity_extraction_user_prompt",
+    "entity_continue_extraction_user_prompt",
+    "entity_extraction_packed_user_prompt",
+    "entity_continue_extraction_packed_user_prompt",
+    "entity_extraction_examples",
+    "entity_extraction_with_evidence",
+    "entity_extraction_with_evidence_examples",
+)
+
+
+@dataclass(frozen=True)
+class _ExtractionPrompts:
+    """Entity extraction prompts rendered once per language, entity types and mode
+
+    User prompts are stored as the rendered text before and after the input, so a
+    chunk prompt is a plain concatenation and the system prompt plus the user
+    prompt prefix stay byte-identical across chunks for provider prefix caching.
+    """
+
+    system_prompt: str
+    user_prompt_prefix: str
+    user_prompt_suffix: str
+    continue_prompt: str
+    packed_prompt_prefix: str
+    packed_prompt_suffix: str
+    packed_continue_prompt: str
+
+    def user_prompt(self, input_text: str) -> str:
+        return self.user_prompt_prefix + input_text + self.user_prompt_suffix
+
+    def packed_prompt(self, input_texts: str) -> str:
+        return self.packed_prompt_prefix + input_texts + self.packed_prompt_suffix
+
+
+def _render_around(template: str, placeholder: str, **context) -> tuple[str, str]:
+    """Render a template split at `{placeholder}` into the text before and after it"""
+    prefix, _, suffix = template.partition("{" + placeholder + "}")
+    return prefix.format(**context), suffix.format(**context)
+
+
+@lru_cache(maxsize=32)
+def _render_extraction_prompts(
+    language: str,
+    entity_types: tuple[str, ...],
+    enable_evidence: bool,
+    templates: tuple[str, ...],
+) -> _ExtractionPrompts:
+    template = dict(zip(_EXTRACTION_PROMPT_NAMES, templates))
+    example_context = dict(
+        tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
+        completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
+        entity_types=", ".join(entity_types),
+        language=language,
+    )
+    context = dict(
+        example_context,
+        entity_types=",".join(entity_types),
+        chunk_delimiter=PROMPTS["DEFAULT_CHUNK_DELIMITER"],
+    )
+
+    if enable_evidence:
+        # Evidence examples additionally use {topic} as a field separator
+        examples = template["entity_extraction_with_evidence_examples"].format(
+            **example_context, topic=PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+        )
+        system_prompt = template["entity_extraction_with_evidence"].format(
+            **context, examples=examples
+        )
+        # The evidence prompt carries its own output format and is re-sent for gleaning
+        continue_prompt = system_prompt
+    else:
+        examples = template["entity_extraction_examples"].format(**example_context)
+        system_prompt = template["entity_extraction_system_prompt"].format(
+            **context, examples=examples
+        )
+        continue_prompt = template["entity_continue_extraction_user_prompt"].format(
+            **context
+        )
+
+    user_prompt_prefix, user_prompt_suffix = _render_around(
+        template["entity_extraction_user_prompt"], "input_text", **context
+    )
+    packed_prompt_prefix, packed_prompt_suffix = _render_around(
+        template["entity_extraction_packed_user_prompt"], "input_texts", **context
+    )
+    return _ExtractionPrompts(
+        system_prompt=system_prompt,
+        user_prompt_prefix=user_prompt_prefix,
+        user_prompt_suffix=user_prompt_suffix,
+        continue_prompt=continue_prompt,
+        packed_prompt_prefix=packed_prompt_prefix,
+        packed_prompt_suffix=packed_prompt_suffix,
+        packed_continue_prompt=template[
+            "entity_continue_extraction_packed_user_prompt"
+        ].format(**context),
+    )
+
+
+def _compile_extraction_prompts(
+    language: str, entity_types: list[str], enable_evidence: bool
+) -> _ExtractionPrompts:
+    """Return the extraction prompts for the given settings, rendered at most once
+
+    The current templates are part of the cache key, so prompts customized by
+    changing PROMPTS at runtime are picked up without clearing the cache.
+    """
+    templates = tuple(
+        "\n".join(PROMPTS[name]) if isinstance(PROMPTS[name], list) else PROMPTS[name]
+        for name in _EXTRACTION_PROMPT_NAMES
+    )
+    return _render_extraction_prompts(
+        language, tuple(entity_types), enable_evidence, templates
+    )
+
+
 async def _rebuild_from_extraction_result(
     text_chunks_storage: BaseKVStorage,
     extraction_result: str,
@@ -1888,6 +2201,7 @@ async def _merge_nodes_then_upsert(
         GRAPH_FIELD_SEP,
         global_config,
         llm_response_cache,
+        existing_count=len(already_description),
     )
 
     # 9. Build file_path within MAX_FILE_PATHS
@@ -2255,6 +2569,7 @@ async def _merge_edges_then_upsert(
         GRAPH_FIELD_SEP,
         global_config,
         llm_response_cache,
+        existing_count=len(already_description),
     )
 
     # 9. Build file_path within MAX_FILE_PATHS limit
@@ -3002,6 +3317,7 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    chunk_extractions_storage: BaseKVStorage | None = None,
 ) -> list:
     # Check for cancellation at the start of entity extraction
     if pipeline_status is not None and pipeline_status_lock is not None:
@@ -3021,31 +3337,65 @@ async def extract_entities(
         "entity_types", DEFAULT_ENTITY_TYPES
     )
 
-    examples = "\n".join(PROMPTS["entity_extraction_examples"])
+    # Check if evidence mode is enabled
+    enable_evidence = global_config["addon_params"].get("enable_evidence", False)
 
-    example_context_base = dict(
-        tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-        completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
-        entity_types=", ".join(entity_types),
-        language=language,
-    )
-    # add example's format
-    examples = examples.format(**example_context_base)
+    # Everything except the input text is rendered once and shared by all chunks
+    prompts = _compile_extraction_prompts(language, entity_types, enable_evidence)
+    tuple_delimiter = PROMPTS["DEFAULT_TUPLE_DELIMITER"]
+    completion_delimiter = PROMPTS["DEFAULT_COMPLETION_DELIMITER"]
 
-    context_base = dict(
-        tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-        completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
-        entity_types=",".join(entity_types),
-        examples=examples,
-        language=language,
+    # Track how much of the extraction input is a prefix shared between requests,
+    # which is the part providers with prompt caching can serve from cache
+    tokenizer = global_config["tokenizer"]
+    prefix_tokens = len(
+        tokenizer.encode(prompts.system_prompt + prompts.user_prompt_prefix)
     )
+    prompt_token_stats = {"prompt": 0, "prefix": 0}
 
-    # Check if evidence mode is enabled
-    enable_evidence = global_config["addon_params"].get("enable_evidence", False)
+    def _record_prompt_tokens(prompt_tokens: int, shared_prefix_tokens: int) -> None:
+        prompt_token_stats["prompt"] += prompt_tokens
+        prompt_token_stats["prefix"] += shared_prefix_tokens
+        statistic_data["extract_prompt_tokens"] += prompt_tokens
+        statistic_data["extract_prefix_tokens"] += shared_prefix_tokens
 
     processed_chunks = 0
     total_chunks = len(ordered_chunks)
 
+    async def _finish_chunk(
+        chunk_key: str, maybe_nodes: dict, maybe_edges: dict, cache_keys: list[str]
+    ) -> tuple[dict, dict]:
+        """Record cache references and the parsed result of one extracted chunk"""
+        nonlocal processed_chunks
+
+        # Batch update chunk's llm_cache_list with all collected cache keys
+        if cache_keys and text_chunks_storage:
+            await update_chunk_cache_list(
+                chunk_key,
+                text_chunks_storage,
+                cache_keys,
+                "entity_extraction",
+            )
+
+        # Persist the parsed result so rebuilds can skip re-parsing the LLM output
+        if chunk_extractions_storage is not None:
+            await chunk_extractions_storage.upsert(
+                {chunk_key: _build_chunk_extraction_record(maybe_nodes, maybe_edges)}
+            )
+
+        processed_chunks += 1
+        entities_count = len(maybe_nodes)
+        relations_count = len(maybe_edges)
+        log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
+        logger.info(log_message)
+        if pipeline_status is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = log_message
+                pipeline_status["history_messages"].append(log_message)
+
+        # Return the extracted nodes and edges for centralized processing
+        return maybe_nodes, maybe_edges
+
     async def _process_single_content(chunk_key_dp: tuple[str, TextChunkSchema]):
         """Process a single chunk
         Args:
@@ -3054,7 +3404,6 @@ async def extract_entities(
         Returns:
             tuple: (maybe_nodes, maybe_edges) containing extracted entities and relationships
         """
-        nonlocal processed_chunks
         chunk_key = chunk_key_dp[0]
         chunk_dp = chunk_key_dp[1]
         content = chunk_dp["content"]
@@ -3064,50 +3413,11 @@ async def extract_entities(
         # Create cache keys collector for batch processing
         cache_keys_collector = []
 
-        # Get initial extraction - choose prompt based on enable_evidence flag
-        if enable_evidence:
-            # Use evidence-enhanced prompt
-            evidence_examples = "\n".join(PROMPTS["entity_extraction_with_evidence_examples"])
-            evidence_example_context_base = dict(
-                tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-                completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
-                entity_types=", ".join(entity_types),
-                language=language,
-                topic=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-            )
-            evidence_examples = evidence_examples.format(**evidence_example_context_base)
-            
-            evidence_context_base = dict(
-                tuple_delimiter=PROMPTS["DEFAULT_TUPLE_DELIMITER"],
-                completion_delimiter=PROMPTS["DEFAULT_COMPLETION_DELIMITER"],
-                entity_types=",".join(entity_types),
-                examples=evidence_examples,
-                language=language,
-            )
-            
-            entity_extraction_system_prompt = PROMPTS[
-                "entity_extraction_with_evidence"
-            ].format(**evidence_context_base)
-            entity_extraction_user_prompt = PROMPTS["entity_extraction_with_evidence"].format(
-                **{**evidence_context_base, "input_text": content}
-            )
-            entity_continue_extraction_user_prompt = PROMPTS[
-                "entity_extraction_with_evidence"
-            ].format(**{**evidence_context_base, "input_text": content})
-        else:
-            # Use standard prompt
-            entity_extraction_system_prompt = PROMPTS[
-                "entity_extraction_system_prompt"
-            ].format(**context_base)
-            entity_extraction_user_prompt = PROMPTS["entity_extraction_user_prompt"].format(
-                **{**context_base, "input_text": content}
-            )
-            entity_continue_extraction_user_prompt = PROMPTS[
-                "entity_continue_extraction_user_prompt"
-            ].format(**{**context_base, "input_text": content})
+        entity_extraction_system_prompt = prompts.system_prompt
+        entity_extraction_user_prompt = prompts.user_prompt(content)
+        entity_continue_extraction_user_prompt = prompts.continue_prompt
 
         # Calculate initial tokens to prevent context window overflow
-        tokenizer = global_config["tokenizer"]
         max_input_tokens = global_config["max_extract_input_tokens"]
         initial_token_count = len(
             tokenizer.encode(
@@ -3122,6 +3432,7 @@ async def extract_entities(
                 chunk_id=chunk_key,
             )
 
+        _record_prompt_tokens(initial_token_count, prefix_tokens)
         final_result, timestamp = await use_llm_func_with_cache(
             entity_extraction_user_prompt,
             use_llm_func,
@@ -3145,14 +3456,13 @@ async def extract_entities(
             chunk_key,
             timestamp,
             file_path,
-            tuple_delimiter=context_base["tuple_delimiter"],
-            completion_delimiter=context_base["completion_delimiter"],
+            tuple_delimiter=tuple_delimiter,
+            completion_delimiter=completion_delimiter,
         )
 
         # Process additional gleaning results only 1 time when entity_extract_max_gleaning is greater than zero.
         if entity_extract_max_gleaning > 0:
             # Calculate total tokens for the gleaning request to prevent context window overflow
-            tokenizer = global_config["tokenizer"]
             max_input_tokens = global_config["max_extract_input_tokens"]
 
             # Approximate total tokens: system prompt + history + user prompt.
@@ -3171,6 +3481,8 @@ async def extract_entities(
                     f"Gleaning stopped for chunk {chunk_key}: Input tokens ({token_count}) exceeded limit ({max_input_tokens})."
                 )
             else:
+                # The gleaning request repeats the whole initial request as its prefix
+                _record_prompt_tokens(token_count, initial_token_count)
                 glean_result, timestamp = await use_llm_func_with_cache(
                     entity_continue_extraction_user_prompt,
                     use_llm_func,
@@ -3191,72 +3503,198 @@ async def extract_entities(
                     chunk_key,
                     timestamp,
                     file_path,
-                    tuple_delimiter=context_base["tuple_delimiter"],
-                    completion_delimiter=context_base["completion_delimiter"],
+                    tuple_delimiter=tuple_delimiter,
+                    completion_delimiter=completion_delimiter,
                 )
 
                 # Merge results - compare description lengths to choose better version
-                for entity_name, glean_entities in glean_nodes.items():
-                    if entity_name in maybe_nodes:
-                        # Compare description lengths and keep the better one
-                        original_desc_len = len(
-                            maybe_nodes[entity_name][0].get("description", "") or ""
-                        )
-                        glean_desc_len = len(
-                            glean_entities[0].get("description", "") or ""
-                        )
+                _merge_gleaning_result(maybe_nodes, maybe_edges, glean_nodes, glean_edges)
 
-                        if glean_desc_len > original_desc_len:
-                            maybe_nodes[entity_name] = list(glean_entities)
-                        # Otherwise keep original version
-                    else:
-                        # New entity from gleaning stage
-                        maybe_nodes[entity_name] = list(glean_entities)
+        return await _finish_chunk(
+            chunk_key, maybe_nodes, maybe_edges, cache_keys_collector
+        )
 
-                for edge_key, glean_edge_list in glean_edges.items():
-                    if edge_key in maybe_edges:
-                        # Compare description lengths and keep the better one
-                        original_desc_len = len(
-                            maybe_edges[edge_key][0].get("description", "") or ""
-                        )
-                        glean_desc_len = len(
-                            glean_edge_list[0].get("description", "") or ""
-                        )
+    async def _process_packed_contents(
+        pack: list[tuple[str, TextChunkSchema]],
+    ) -> list[tuple[dict, dict]]:
+        """Extract several small chunks with one LLM request
 
-                        if glean_desc_len > original_desc_len:
-                            maybe_edges[edge_key] = list(glean_edge_list)
-                        # Otherwise keep original version
-                    else:
-                        # New edge from gleaning stage
-                        maybe_edges[edge_key] = list(glean_edge_list)
+        The response is split back into per-chunk results by the chunk markers. Each
+        chunk gets its own extract cache entry and extraction record, so rebuilds work
+        exactly as for single-chunk extraction. Packs whose prompt is too large or
+        whose response can not be split fall back to single-chunk requests.
+        """
+        chunk_delimiter = PROMPTS["DEFAULT_CHUNK_DELIMITER"]
+        input_texts = "\n\n".join(
+            f"{chunk_delimiter}{index}\n```\n{chunk_dp['content']}\n```"
+            for index, (_, chunk_dp) in enumerate(pack, start=1)
+        )
+        entity_extraction_system_prompt = prompts.system_prompt
+        packed_user_prompt = prompts.packed_prompt(input_texts)
+        packed_continue_prompt = prompts.packed_continue_prompt
 
-        # Batch update chunk's llm_cache_list with all collected cache keys
-        if cache_keys_collector and text_chunks_storage:
-            await update_chunk_cache_list(
-                chunk_key,
-                text_chunks_storage,
-                cache_keys_collector,
-                "entity_extraction",
+        async def _fallback(reason: str) -> list[tuple[dict, dict]]:
+            logger.warning(
+                f"Packed extraction of {len(pack)} chunks fell back to single-chunk requests: {reason}"
             )
+            return list(await asyncio.gather(*(_process_single_content(c) for c in pack)))
 
-        processed_chunks += 1
-        entities_count = len(maybe_nodes)
-        relations_count = len(maybe_edges)
-        log_message = f"Chunk {processed_chunks} of {total_chunks} extracted {entities_count} Ent + {relations_count} Rel {chunk_key}"
-        logger.info(log_message)
-        if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
+        max_input_tokens = global_config["max_extract_input_tokens"]
+        initial_token_count = len(
+            tokenizer.encode(entity_extraction_system_prompt + packed_user_prompt)
+        )
+        if initial_token_count > max_input_tokens:
+            return await _fallback("prompt exceeds max_extract_input_tokens")
 
-        # Return the extracted nodes and edges for centralized processing
-        return maybe_nodes, maybe_edges
+        # Output of a pack grows with the number of chunks in it
+        max_completion_tokens = global_config.get(
+            "entity_extract_max_completion_tokens"
+        )
+        if max_completion_tokens:
+            max_completion_tokens *= len(pack)
+
+        pack_cache_keys = []
+        _record_prompt_tokens(initial_token_count, packed_prefix_tokens)
+        packed_result, timestamp = await use_llm_func_with_cache(
+            packed_user_prompt,
+            use_llm_func,
+            system_prompt=entity_extraction_system_prompt,
+            llm_response_cache=llm_response_cache,
+            max_completion_tokens=max_completion_tokens,
+            cache_type="extract",
+            cache_keys_collector=pack_cache_keys,
+        )
+        sections = _split_packed_extraction_result(
+            packed_result,
+            len(pack),
+            chunk_delimiter,
+            completion_delimiter,
+        )
+        if sections is None:
+            return await _fallback("response could not be split by chunk markers")
+        section_sources = [(sections, timestamp, (packed_user_prompt,))]
+
+        if entity_extract_max_gleaning > 0:
+            history = pack_user_ass_to_openai_messages(
+                packed_user_prompt, packed_result
+            )
+            token_count = len(
+                tokenizer.encode(
+                    entity_extraction_system_prompt
+                    + json.dumps(history, ensure_ascii=False)
+                    + packed_continue_prompt
+                )
+            )
+            if token_count > max_input_tokens:
+                logger.warning(
+                    f"Gleaning stopped for packed chunks {pack[0][0]}..: Input tokens ({token_count}) exceeded limit ({max_input_tokens})."
+                )
+            else:
+                _record_prompt_tokens(token_count, initial_token_count)
+                glean_result, glean_timestamp = await use_llm_func_with_cache(
+                    packed_continue_prompt,
+                    use_llm_func,
+                    system_prompt=entity_extraction_system_prompt,
+                    llm_response_cache=llm_response_cache,
+                    history_messages=history,
+                    max_completion_tokens=max_completion_tokens,
+                    cache_type="extract",
+                    cache_keys_collector=pack_cache_keys,
+                )
+                glean_sections = _split_packed_extraction_result(
+                    glean_result,
+                    len(pack),
+                    chunk_delimiter,
+                    completion_delimiter,
+                )
+                if glean_sections is None:
+                    logger.warning(
+                        f"Ignored gleaning of packed chunks {pack[0][0]}..: response could not be split by chunk markers"
+                    )
+                else:
+                    section_sources.append(
+                        (
+                            glean_sections,
+                            glean_timestamp,
+                            (packed_continue_prompt, packed_result),
+                        )
+                    )
+
+        save_chunk_cache = llm_response_cache is not None and (
+            llm_response_cache.global_config.get("enable_llm_cache_for_entity_extract")
+        )
+        results = []
+        for index, (chunk_key, chunk_dp) in enumerate(pack):
+            file_path = chunk_dp.get("file_path", "unknown_source")
+            # The pack entries are not bound to a chunk; reference them for cleanup
+            cache_keys = list(pack_cache_keys)
+            maybe_nodes, maybe_edges = {}, {}
+            for source_sections, source_timestamp, hash_args in section_sources:
+                section = source_sections[index]
+                nodes, edges = await _process_extraction_result(
+                    section,
+                    chunk_key,
+                    source_timestamp,
+                    file_path,
+                    tuple_delimiter=tuple_delimiter,
+                    completion_delimiter=completion_delimiter,
+                )
+                _merge_gleaning_result(maybe_nodes, maybe_edges, nodes, edges)
+
+                # Per-chunk extract cache entry, as used by rebuilds from the LLM cache
+                if save_chunk_cache:
+                    args_hash = compute_args_hash(*hash_args, chunk_key)
+                    await save_to_cache(
+                        llm_response_cache,
+                        CacheData(
+                            args_hash=args_hash,
+                            content=section,
+                            prompt=f"{chunk_delimiter}{index + 1}\n{chunk_dp['content']}",
+                            cache_type="extract",
+                            chunk_id=chunk_key,
+                        ),
+                    )
+                    cache_keys.append(
+                        generate_cache_key("default", "extract", args_hash)
+                    )
+
+            results.append(
+                await _finish_chunk(chunk_key, maybe_nodes, maybe_edges, cache_keys)
+            )
+        return results
+
+    # Group consecutive small chunks into packs (opt-in, pack size 1 disables packing)
+    pack_size = global_config.get(
+        "entity_extract_pack_size", DEFAULT_ENTITY_EXTRACT_PACK_SIZE
+    )
+    pack_max_tokens = global_config.get(
+        "entity_extract_pack_max_tokens", DEFAULT_ENTITY_EXTRACT_PACK_MAX_TOKENS
+    )
+    packs = []
+    current_pack, current_pack_tokens = [], 0
+    for chunk in ordered_chunks:
+        chunk_tokens = chunk[1].get("tokens") or 0
+        if current_pack and (
+            len(current_pack) >= pack_size
+            or current_pack_tokens + chunk_tokens > pack_max_tokens
+        ):
+            packs.append(current_pack)
+            current_pack, current_pack_tokens = [], 0
+        current_pack.append(chunk)
+        current_pack_tokens += chunk_tokens
+    if current_pack:
+        packs.append(current_pack)
+    packed_prefix_tokens = 0
+    if any(len(pack) > 1 for pack in packs):
+        packed_prefix_tokens = len(
+            tokenizer.encode(prompts.system_prompt + prompts.packed_prompt_prefix)
+        )
 
     # Get max async tasks limit from global_config
     chunk_max_async = global_config.get("llm_model_max_async", 4)
     semaphore = asyncio.Semaphore(chunk_max_async)
 
-    async def _process_with_semaphore(chunk):
+    async def _process_with_semaphore(pack):
         async with semaphore:
             # Check for cancellation before processing chunk
             if pipeline_status is not None and pipeline_status_lock is not None:
@@ -3267,15 +3705,17 @@ async def extract_entities(
                         )
 
             try:
-                return await _process_single_content(chunk)
+                if len(pack) == 1:
+                    return [await _process_single_content(pack[0])]
+                return await _process_packed_contents(pack)
             except Exception as e:
-                chunk_id = chunk[0]  # Extract chunk_id from chunk[0]
+                chunk_id = pack[0][0]  # Extract chunk_id of the first chunk in pack
                 prefixed_exception = create_prefixed_exception(e, chunk_id)
                 raise prefixed_exception from e
 
     tasks = []
-    for c in ordered_chunks:
-        task = asyncio.create_task(_process_with_semaphore(c))
+    for pack in packs:
+        task = asyncio.create_task(_process_with_semaphore(pack))
         tasks.append(task)
 
     # Wait for tasks to complete or for the first exception to occur
@@ -3293,7 +3733,7 @@ async def extract_entities(
                 if first_exception is None:
                     first_exception = exception
             else:
-                chunk_results.append(task.result())
+                chunk_results.extend(task.result())
         except Exception as e:
             if first_exception is None:
                 first_exception = e
@@ -3315,6 +3755,12 @@ async def extract_entities(
         prefixed_exception = create_prefixed_exception(first_exception, progress_prefix)
         raise prefixed_exception from first_exception
 
+    if prompt_token_stats["prompt"]:
+        logger.info(
+            f"Extraction prompts: {prompt_token_stats['prefix'] / prompt_token_stats['prompt']:.1%} "
+            f"of {prompt_token_stats['prompt']} input tokens are shared prefixes"
+        )
+
     # If all tasks completed successfully, chunk_results already contains the results
     # Return the chunk_results for later processing in merge_nodes_and_edges
     return chunk_results
@@ -3372,9 +3818,10 @@ async def kg_query(
         # Apply higher priority (5) to query relation LLM function
         use_model_func = partial(use_model_func, _priority=5)
 
-    hl_keywords, ll_keywords = await get_keywords_from_query(
-        query, query_param, global_config, hashing_kv
-    )
+    with stage_span("keywords"):
+        hl_keywords, ll_keywords = await get_keywords_from_query(
+            query, query_param, global_config, hashing_kv
+        )
 
     logger.debug(f"High-level keywords: {hl_keywords}")
     logger.debug(f"Low-level  keywords: {ll_keywords}")
@@ -3459,52 +3906,100 @@ async def kg_query(
         ll_keywords_str,
         query_param.user_prompt or "",
         query_param.enable_rerank,
+        # Only filtered queries extend the hash, so existing cache entries stay valid
+        *(
+            [json.dumps(query_param.metadata_filter, sort_keys=True, default=str)]
+            if query_param.metadata_filter
+            else []
+        ),
+        *(
+            [
+                "evidence_ranking",
+                query_param.rank_similarity_weight,
+                query_param.rank_degree_weight,
+                query_param.rank_edge_weight,
+                query_param.rank_evidence_weight,
+            ]
+            if query_param.evidence_ranking
+            else []
+        ),
+        *(
+            [
+                "ppr_retrieval",
+                query_param.ppr_max_hops,
+                query_param.ppr_max_nodes,
+                query_param.ppr_damping,
+            ]
+            if query_param.ppr_retrieval
+            else []
+        ),
     )
 
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
-    )
-
-    if cached_result is not None:
-        cached_response, _ = cached_result  # Extract content, ignore timestamp
-        logger.info(
-            " == LLM cache == Query cache hit, using cached response as query result"
-        )
-        response = cached_response
-    else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
+    async def generate_response():
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
         )
 
-        if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
-            queryparam_dict = {
-                "mode": query_param.mode,
-                "response_type": query_param.response_type,
-                "top_k": query_param.top_k,
-                "chunk_top_k": query_param.chunk_top_k,
-                "max_entity_tokens": query_param.max_entity_tokens,
-                "max_relation_tokens": query_param.max_relation_tokens,
-                "max_total_tokens": query_param.max_total_tokens,
-                "hl_keywords": hl_keywords_str,
-                "ll_keywords": ll_keywords_str,
-                "user_prompt": query_param.user_prompt or "",
-                "enable_rerank": query_param.enable_rerank,
-            }
-            await save_to_cache(
-                hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=response,
-                    prompt=query,
-                    mode=query_param.mode,
-                    cache_type="query",
-                    queryparam=queryparam_dict,
-                ),
+        if cached_result is not None:
+            cached_response, _ = cached_result  # Extract content, ignore timestamp
+            logger.info(
+                " == LLM cache == Query cache hit, using cached response as query result"
             )
+            response = cached_response
+        else:
+            llm_start = time.perf_counter()
+            with stage_span("llm"):
+                response = await use_model_func(
+                    user_query,
+                    system_prompt=sys_prompt,
+                    history_messages=query_param.conversation_history,
+                    enable_cot=True,
+                    stream=query_param.stream,
+                )
+            if not isinstance(response, str):
+                # The llm stage ends once the stream is open, time its first chunk too
+                response = time_first_item(response, start=llm_start)
+
+            if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
+                queryparam_dict = {
+                    "mode": query_param.mode,
+                    "response_type": query_param.response_type,
+                    "top_k": query_param.top_k,
+                    "chunk_top_k": query_param.chunk_top_k,
+                    "max_entity_tokens": query_param.max_entity_tokens,
+                    "max_relation_tokens": query_param.max_relation_tokens,
+                    "max_total_tokens": query_param.max_total_tokens,
+                    "hl_keywords": hl_keywords_str,
+                    "ll_keywords": ll_keywords_str,
+                    "user_prompt": query_param.user_prompt or "",
+                    "enable_rerank": query_param.enable_rerank,
+                }
+                await save_to_cache(
+                    hashing_kv,
+                    CacheData(
+                        args_hash=args_hash,
+                        content=response,
+                        prompt=query,
+                        mode=query_param.mode,
+                        cache_type="query",
+                        queryparam=queryparam_dict,
+                    ),
+                )
+        return response
+
+    # Identical concurrent queries share one LLM call (streams cannot be shared)
+    response = await llm_single_flight.do(
+        None
+        if query_param.stream
+        else single_flight_key(
+            hashing_kv,
+            query_param.mode,
+            "query",
+            args_hash,
+            compute_args_hash(json.dumps(query_param.conversation_history)),
+        ),
+        generate_response,
+    )
 
     # Return unified result based on actual response type
     if isinstance(response, str):
@@ -3585,91 +4080,100 @@ async def extract_keywords_only(
         text,
         language,
     )
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, text, param.mode, cache_type="keywords"
-    )
-    if cached_result is not None:
-        cached_response, _ = cached_result  # Extract content, ignore timestamp
-        try:
-            keywords_data = json_repair.loads(cached_response)
-            return keywords_data.get("high_level_keywords", []), keywords_data.get(
-                "low_level_keywords", []
-            )
-        except (json.JSONDecodeError, KeyError):
-            logger.warning(
-                "Invalid cache format for keywords, proceeding with extraction"
-            )
 
-    # 3. Build the keyword-extraction prompt
-    kw_prompt = PROMPTS["keywords_extraction"].format(
-        query=text,
-        examples=examples,
-        language=language,
-    )
+    async def extract_keywords() -> tuple[list[str], list[str]]:
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, text, param.mode, cache_type="keywords"
+        )
+        if cached_result is not None:
+            cached_response, _ = cached_result  # Extract content, ignore timestamp
+            try:
+                keywords_data = json_repair.loads(cached_response)
+                return keywords_data.get("high_level_keywords", []), keywords_data.get(
+                    "low_level_keywords", []
+                )
+            except (json.JSONDecodeError, KeyError):
+                logger.warning(
+                    "Invalid cache format for keywords, proceeding with extraction"
+                )
 
-    tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
-    logger.debug(
-        f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
-    )
+        # 3. Build the keyword-extraction prompt
+        kw_prompt = PROMPTS["keywords_extraction"].format(
+            query=text,
+            examples=examples,
+            language=language,
+        )
 
-    # 4. Call the LLM for keyword extraction
-    if param.model_func:
-        use_model_func = param.model_func
-    else:
-        use_model_func = global_config["llm_model_func"]
-        # Apply higher priority (5) to query relation LLM function
-        use_model_func = partial(use_model_func, _priority=5)
+        tokenizer: Tokenizer = global_config["tokenizer"]
+        len_of_prompts = len(tokenizer.encode(kw_prompt))
+        logger.debug(
+            f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
+        )
 
-    result = await use_model_func(kw_prompt, keyword_extraction=True)
+        # 4. Call the LLM for keyword extraction
+        if param.model_func:
+            use_model_func = param.model_func
+        else:
+            use_model_func = global_config["llm_model_func"]
+            # Apply higher priority (5) to query relation LLM function
+            use_model_func = partial(use_model_func, _priority=5)
 
-    # 5. Parse out JSON from the LLM response
-    result = remove_think_tags(result)
-    try:
-        keywords_data = json_repair.loads(result)
-        if not keywords_data:
-            logger.error("No JSON-like structure found in the LLM respond.")
+        result = await use_model_func(kw_prompt, keyword_extraction=True)
+
+        # 5. Parse out JSON from the LLM response
+        result = remove_think_tags(result)
+        try:
+            keywords_data = json_repair.loads(result)
+            if not keywords_data:
+                logger.error("No JSON-like structure found in the LLM respond.")
+                return [], []
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error: {e}")
+            logger.error(f"LLM respond: {result}")
             return [], []
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON parsing error: {e}")
-        logger.error(f"LLM respond: {result}")
-        return [], []
 
-    hl_keywords = keywords_data.get("high_level_keywords", [])
-    ll_keywords = keywords_data.get("low_level_keywords", [])
+        hl_keywords = keywords_data.get("high_level_keywords", [])
+        ll_keywords = keywords_data.get("low_level_keywords", [])
 
-    # 6. Cache only the processed keywords with cache type
-    if hl_keywords or ll_keywords:
-        cache_data = {
-            "high_level_keywords": hl_keywords,
-            "low_level_keywords": ll_keywords,
-        }
-        if hashing_kv.global_config.get("enable_llm_cache"):
-            # Save to cache with query parameters
-            queryparam_dict = {
-                "mode": param.mode,
-                "response_type": param.response_type,
-                "top_k": param.top_k,
-                "chunk_top_k": param.chunk_top_k,
-                "max_entity_tokens": param.max_entity_tokens,
-                "max_relation_tokens": param.max_relation_tokens,
-                "max_total_tokens": param.max_total_tokens,
-                "user_prompt": param.user_prompt or "",
-                "enable_rerank": param.enable_rerank,
+        # 6. Cache only the processed keywords with cache type
+        if hl_keywords or ll_keywords:
+            cache_data = {
+                "high_level_keywords": hl_keywords,
+                "low_level_keywords": ll_keywords,
             }
-            await save_to_cache(
-                hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=json.dumps(cache_data),
-                    prompt=text,
-                    mode=param.mode,
-                    cache_type="keywords",
-                    queryparam=queryparam_dict,
-                ),
-            )
+            if hashing_kv.global_config.get("enable_llm_cache"):
+                # Save to cache with query parameters
+                queryparam_dict = {
+                    "mode": param.mode,
+                    "response_type": param.response_type,
+                    "top_k": param.top_k,
+                    "chunk_top_k": param.chunk_top_k,
+                    "max_entity_tokens": param.max_entity_tokens,
+                    "max_relation_tokens": param.max_relation_tokens,
+                    "max_total_tokens": param.max_total_tokens,
+                    "user_prompt": param.user_prompt or "",
+                    "enable_rerank": param.enable_rerank,
+                }
+                await save_to_cache(
+                    hashing_kv,
+                    CacheData(
+                        args_hash=args_hash,
+                        content=json.dumps(cache_data),
+                        prompt=text,
+                        mode=param.mode,
+                        cache_type="keywords",
+                        queryparam=queryparam_dict,
+                    ),
+                )
 
-    return hl_keywords, ll_keywords
+        return hl_keywords, ll_keywords
+
+    # Concurrent requests for the same query share one keyword extraction call
+    hl_keywords, ll_keywords = await llm_single_flight.do(
+        single_flight_key(hashing_kv, param.mode, "keywords", args_hash),
+        extract_keywords,
+    )
+    return list(hl_keywords), list(ll_keywords)
 
 
 async def _get_vector_context(
@@ -3698,9 +4202,13 @@ async def _get_vector_context(
         search_top_k = query_param.chunk_top_k or query_param.top_k
         cosine_threshold = chunks_vdb.cosine_better_than_threshold
 
-        results = await chunks_vdb.query(
-            query, top_k=search_top_k, query_embedding=query_embedding
-        )
+        with stage_span("vdb_search"):
+            results = await chunks_vdb.query(
+                query,
+                top_k=search_top_k,
+                query_embedding=query_embedding,
+                metadata_filter=query_param.metadata_filter,
+            )
         if not results:
             logger.info(
                 f"Naive query: 0 chunks (chunk_top_k:{search_top_k} cosine:{cosine_threshold})"
@@ -3729,6 +4237,40 @@ async def _get_vector_context(
         return []
 
 
+def _relation_key(relation: dict) -> tuple:
+    """Order-independent dedup key of a relation, reusing its name strings."""
+    src, tgt = relation.get("src_tgt") or (
+        relation.get("src_id"),
+        relation.get("tgt_id"),
+    )
+    if src is None or tgt is None or src <= tgt:
+        return (src, tgt)
+    return (tgt, src)
+
+
+def _chunk_key(chunk: dict) -> str | None:
+    return chunk.get("chunk_id") or chunk.get("id")
+
+
+def _round_robin_merge(sources: list[list[dict]], key) -> list[dict]:
+    """Interleave the source lists item by item, keeping the first item per key.
+
+    Items whose key is falsy are dropped, like entities without a name.
+    """
+    merged = []
+    seen = set()
+    add_seen = seen.add
+    for row in zip_longest(*sources):
+        for item in row:
+            if item is None:
+                continue
+            item_key = key(item)
+            if item_key and item_key not in seen:
+                add_seen(item_key)
+                merged.append(item)
+    return merged
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -3767,7 +4309,8 @@ async def _perform_kg_search(
         actual_embedding_func = text_chunks_db.embedding_func
         if actual_embedding_func:
             try:
-                query_embedding = await actual_embedding_func([query])
+                with stage_span("embedding"):
+                    query_embedding = await actual_embedding_func([query])
                 query_embedding = query_embedding[
                     0
                 ]  # Extract first embedding from batch result
@@ -3829,61 +4372,24 @@ async def _perform_kg_search(
                 else:
                     logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
-    # Round-robin merge entities
-    final_entities = []
-    seen_entities = set()
-    max_len = max(len(local_entities), len(global_entities))
-    for i in range(max_len):
-        # First from local
-        if i < len(local_entities):
-            entity = local_entities[i]
-            entity_name = entity.get("entity_name")
-            if entity_name and entity_name not in seen_entities:
-                final_entities.append(entity)
-                seen_entities.add(entity_name)
-
-        # Then from global
-        if i < len(global_entities):
-            entity = global_entities[i]
-            entity_name = entity.get("entity_name")
-            if entity_name and entity_name not in seen_entities:
-                final_entities.append(entity)
-                seen_entities.add(entity_name)
-
-    # Round-robin merge relations
-    final_relations = []
-    seen_relations = set()
-    max_len = max(len(local_relations), len(global_relations))
-    for i in range(max_len):
-        # First from local
-        if i < len(local_relations):
-            relation = local_relations[i]
-            # Build relation unique identifier
-            if "src_tgt" in relation:
-                rel_key = tuple(sorted(relation["src_tgt"]))
-            else:
-                rel_key = tuple(
-                    sorted([relation.get("src_id"), relation.get("tgt_id")])
-                )
-
-            if rel_key not in seen_relations:
-                final_relations.append(relation)
-                seen_relations.add(rel_key)
+    # Round-robin merge entities and relations, local first
+    final_entities = _round_robin_merge(
+        [local_entities, global_entities], lambda e: e.get("entity_name")
+    )
+    final_relations = _round_robin_merge(
+        [local_relations, global_relations], _relation_key
+    )
 
-        # Then from global
-        if i < len(global_relations):
-            relation = global_relations[i]
-            # Build relation unique identifier
-            if "src_tgt" in relation:
-                rel_key = tuple(sorted(relation["src_tgt"]))
-            else:
-                rel_key = tuple(
-                    sorted([relation.get("src_id"), relation.get("tgt_id")])
-                )
+    # Local and global scores share one scale, so the merged lists can be reordered
+    # to put the highest-value evidence in front of the token truncation
+    if query_param.evidence_ranking:
+        final_entities.sort(key=lambda x: x.get("evidence_score", 0.0), reverse=True)
+        final_relations.sort(key=lambda x: x.get("evidence_score", 0.0), reverse=True)
 
-            if rel_key not in seen_relations:
-                final_relations.append(relation)
-                seen_relations.add(rel_key)
+    if query_param.ppr_retrieval and final_entities:
+        final_entities, final_relations = await _select_by_ppr(
+            final_entities, final_relations, knowledge_graph_inst, query_param
+        )
 
     logger.info(
         f"Raw search results: {len(final_entities)} entities, {len(final_relations)} relations, {len(vector_chunks)} vector chunks"
@@ -4115,54 +4621,19 @@ async def _merge_all_chunks(
             query_embedding=query_embedding,
         )
 
-    # Round-robin merge chunks from different sources with deduplication
-    merged_chunks = []
-    seen_chunk_ids = set()
-    max_len = max(len(vector_chunks), len(entity_chunks), len(relation_chunks))
+    # Round-robin merge chunks from different sources with deduplication:
+    # vector chunks (Naive mode), then entity (Local) and relation (Global) chunks
     origin_len = len(vector_chunks) + len(entity_chunks) + len(relation_chunks)
-
-    for i in range(max_len):
-        # Add from vector chunks first (Naive mode)
-        if i < len(vector_chunks):
-            chunk = vector_chunks[i]
-            chunk_id = chunk.get("chunk_id") or chunk.get("id")
-            if chunk_id and chunk_id not in seen_chunk_ids:
-                seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
-
-        # Add from entity chunks (Local mode)
-        if i < len(entity_chunks):
-            chunk = entity_chunks[i]
-            chunk_id = chunk.get("chunk_id") or chunk.get("id")
-            if chunk_id and chunk_id not in seen_chunk_ids:
-                seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
-
-        # Add from relation chunks (Global mode)
-        if i < len(relation_chunks):
-            chunk = relation_chunks[i]
-            chunk_id = chunk.get("chunk_id") or chunk.get("id")
-            if chunk_id and chunk_id not in seen_chunk_ids:
-                seen_chunk_ids.add(chunk_id)
-                merged_chunks.append(
-                    {
-                        "content": chunk["content"],
-                        "file_path": chunk.get("file_path", "unknown_source"),
-                        "chunk_id": chunk_id,
-                    }
-                )
+    merged_chunks = [
+        {
+            "content": chunk["content"],
+            "file_path": chunk.get("file_path", "unknown_source"),
+            "chunk_id": _chunk_key(chunk),
+        }
+        for chunk in _round_robin_merge(
+            [vector_chunks, entity_chunks, relation_chunks], _chunk_key
+        )
+    ]
 
     logger.info(
         f"Round-robin merged chunks: {origin_len} -> {len(merged_chunks)} (deduplicated {origin_len - len(merged_chunks)})"
@@ -4376,18 +4847,22 @@ async def _build_query_context(
         logger.warning("Query is empty, skipping context building")
         return None
 
+    # Per-stage wall time in ms, reported in raw_data metadata
+    stage_timings = {}
+
     # Stage 1: Pure search
-    search_result = await _perform_kg_search(
-        query,
-        ll_keywords,
-        hl_keywords,
-        knowledge_graph_inst,
-        entities_vdb,
-        relationships_vdb,
-        text_chunks_db,
-        query_param,
-        chunks_vdb,
-    )
+    with stage_span("search", stage_timings):
+        search_result = await _perform_kg_search(
+            query,
+            ll_keywords,
+            hl_keywords,
+            knowledge_graph_inst,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks_db,
+            query_param,
+            chunks_vdb,
+        )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
         if query_param.mode != "mix":
@@ -4397,25 +4872,27 @@ async def _build_query_context(
                 return None
 
     # Stage 2: Apply token truncation for LLM efficiency
-    truncation_result = await _apply_token_truncation(
-        search_result,
-        query_param,
-        text_chunks_db.global_config,
-    )
+    with stage_span("truncate", stage_timings):
+        truncation_result = await _apply_token_truncation(
+            search_result,
+            query_param,
+            text_chunks_db.global_config,
+        )
 
     # Stage 3: Merge chunks using filtered entities/relations
-    merged_chunks = await _merge_all_chunks(
-        filtered_entities=truncation_result["filtered_entities"],
-        filtered_relations=truncation_result["filtered_relations"],
-        vector_chunks=search_result["vector_chunks"],
-        query=query,
-        knowledge_graph_inst=knowledge_graph_inst,
-        text_chunks_db=text_chunks_db,
-        query_param=query_param,
-        chunks_vdb=chunks_vdb,
-        chunk_tracking=search_result["chunk_tracking"],
-        query_embedding=search_result["query_embedding"],
-    )
+    with stage_span("merge_chunks", stage_timings):
+        merged_chunks = await _merge_all_chunks(
+            filtered_entities=truncation_result["filtered_entities"],
+            filtered_relations=truncation_result["filtered_relations"],
+            vector_chunks=search_result["vector_chunks"],
+            query=query,
+            knowledge_graph_inst=knowledge_graph_inst,
+            text_chunks_db=text_chunks_db,
+            query_param=query_param,
+            chunks_vdb=chunks_vdb,
+            chunk_tracking=search_result["chunk_tracking"],
+            query_embedding=search_result["query_embedding"],
+        )
 
     if (
         not merged_chunks
@@ -4426,17 +4903,18 @@ async def _build_query_context(
 
     # Stage 4: Build final LLM context with dynamic token processing
     # _build_context_str now always returns tuple[str, dict]
-    context, raw_data = await _build_context_str(
-        entities_context=truncation_result["entities_context"],
-        relations_context=truncation_result["relations_context"],
-        merged_chunks=merged_chunks,
-        query=query,
-        query_param=query_param,
-        global_config=text_chunks_db.global_config,
-        chunk_tracking=search_result["chunk_tracking"],
-        entity_id_to_original=truncation_result["entity_id_to_original"],
-        relation_id_to_original=truncation_result["relation_id_to_original"],
-    )
+    with stage_span("build_context", stage_timings):
+        context, raw_data = await _build_context_str(
+            entities_context=truncation_result["entities_context"],
+            relations_context=truncation_result["relations_context"],
+            merged_chunks=merged_chunks,
+            query=query,
+            query_param=query_param,
+            global_config=text_chunks_db.global_config,
+            chunk_tracking=search_result["chunk_tracking"],
+            entity_id_to_original=truncation_result["entity_id_to_original"],
+            relation_id_to_original=truncation_result["relation_id_to_original"],
+        )
 
     # Convert keywords strings to lists and add complete metadata to raw_data
     hl_keywords_list = hl_keywords.split(", ") if hl_keywords else []
@@ -4462,7 +4940,9 @@ async def _build_query_context(
         ),
         "merged_chunks_count": len(merged_chunks),
         "final_chunks_count": len(raw_data.get("data", {}).get("chunks", [])),
+        "stage_timings_ms": stage_timings,
     }
+    logger.debug(f"[_build_query_context] Stage timings (ms): {stage_timings}")
 
     logger.debug(
         f"[_build_query_context] Context length: {len(context) if context else 0}"
@@ -4474,6 +4954,139 @@ async def _build_query_context(
     return QueryContextResult(context=context, raw_data=raw_data)
 
 
+async def _select_by_ppr(
+    entities: list[dict],
+    relations: list[dict],
+    knowledge_graph_inst: BaseGraphStorage,
+    query_param: QueryParam,
+) -> tuple[list[dict], list[dict]]:
+    """Re-select entities and relations by personalized PageRank.
+
+    The retrieved entities (vector-matched entities and the endpoints of
+    vector-matched relations) seed a random walk with restart over the graph
+    around them. The top_k entities and top_k relations by stationary score
+    replace the one-hop results, best first, with the score stored as
+    ``ppr_score``. Entities and relations reached only by the walk are loaded
+    from the graph.
+    """
+    # Every seed restarts the walk; better evidence restarts it more often
+    seeds: dict[str, float] = {}
+    for entity in entities:
+        name = entity["entity_name"]
+        seeds[name] = seeds.get(name, 0.0) + 1.0 + entity.get("evidence_score", 0.0)
+
+    with stage_span("ppr"):
+        node_scores, edge_scores = await knowledge_graph_inst.personalized_pagerank(
+            seeds,
+            max_hops=query_param.ppr_max_hops,
+            max_nodes=query_param.ppr_max_nodes,
+            damping=query_param.ppr_damping,
+        )
+    top_nodes = heapq.nlargest(query_param.top_k, node_scores, key=node_scores.get)
+    top_edges = heapq.nlargest(query_param.top_k, edge_scores, key=edge_scores.get)
+
+    known_entities = {entity["entity_name"]: entity for entity in entities}
+    known_relations = {
+        tuple(
+            sorted(
+                relation["src_tgt"]
+                if "src_tgt" in relation
+                else (relation["src_id"], relation["tgt_id"])
+            )
+        ): relation
+        for relation in relations
+    }
+    new_nodes = [name for name in top_nodes if name not in known_entities]
+    new_edges = [pair for pair in top_edges if pair not in known_relations]
+    with stage_span("graph_fetch"):
+        nodes_dict, degrees_dict, edges_dict, edge_degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_nodes_batch(new_nodes),
+            knowledge_graph_inst.node_degrees_batch(new_nodes),
+            knowledge_graph_inst.get_edges_batch(
+                [{"src": src, "tgt": tgt} for src, tgt in new_edges]
+            ),
+            knowledge_graph_inst.edge_degrees_batch(new_edges),
+        )
+
+    selected_entities = []
+    for name in top_nodes:
+        entity = known_entities.get(name)
+        if entity is None:
+            node = nodes_dict.get(name)
+            if node is None:
+                continue
+            entity = {**node, "entity_name": name, "rank": degrees_dict.get(name, 0)}
+        entity["ppr_score"] = node_scores[name]
+        selected_entities.append(entity)
+
+    selected_relations = []
+    for pair in top_edges:
+        relation = known_relations.get(pair)
+        if relation is None:
+            edge = edges_dict.get(pair)
+            if edge is None:
+                continue
+            relation = {
+                "src_tgt": pair,
+                "rank": edge_degrees_dict.get(pair, 0),
+                "weight": 1.0,
+                **edge,
+            }
+        relation["ppr_score"] = edge_scores[pair]
+        selected_relations.append(relation)
+
+    logger.info(
+        f"PPR retrieval: {len(seeds)} seeds reached {len(node_scores)} entities, "
+        f"{len(edge_scores)} relations; selected {len(selected_entities)} entities "
+        f"({len(new_nodes)} new), {len(selected_relations)} relations ({len(new_edges)} new)"
+    )
+    return selected_entities, selected_relations
+
+
+def _vector_similarity(result: dict, position: int, total: int) -> float:
+    """Similarity of a vector search hit, falling back to its rank position.
+
+    Backends that do not return a ``distance`` still return hits best first, so
+    the position is mapped onto (0, 1] to keep the similarity term meaningful.
+    """
+    distance = result.get("distance")
+    if distance is not None:
+        return float(distance)
+    return 1.0 - position / max(total, 1)
+
+
+def _rank_by_evidence(
+    items: list[dict],
+    query_param: QueryParam,
+    similarities: list[float] | None = None,
+    degrees: list[float] | None = None,
+    edge_weights: list[float] | None = None,
+) -> list[dict]:
+    """Order entities or relations by the fused evidence score, best first.
+
+    The score is stored on each item as ``evidence_score`` so that results from
+    local and global retrieval can be merged on the same scale. Ties keep their
+    incoming order.
+    """
+    if not items:
+        return items
+    scores = compute_evidence_scores(
+        [item.get("evidence_level") for item in items],
+        similarities=similarities,
+        degrees=degrees,
+        edge_weights=edge_weights,
+        weights=(
+            query_param.rank_similarity_weight,
+            query_param.rank_degree_weight,
+            query_param.rank_edge_weight,
+            query_param.rank_evidence_weight,
+        ),
+    )
+    for item, score in zip(items, scores.tolist()):
+        item["evidence_score"] = score
+    return [items[i] for i in np.argsort(-scores, kind="stable")]
+
+
 async def _get_node_data(
     query: str,
     knowledge_graph_inst: BaseGraphStorage,
@@ -4485,7 +5098,10 @@ async def _get_node_data(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    with stage_span("vdb_search"):
+        results = await entities_vdb.query(
+            query, top_k=query_param.top_k, metadata_filter=query_param.metadata_filter
+        )
 
     if not len(results):
         return [], []
@@ -4494,10 +5110,11 @@ async def _get_node_data(
     node_ids = [r["entity_name"] for r in results]
 
     # Call the batch node retrieval and degree functions concurrently.
-    nodes_dict, degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_nodes_batch(node_ids),
-        knowledge_graph_inst.node_degrees_batch(node_ids),
-    )
+    with stage_span("graph_fetch"):
+        nodes_dict, degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_nodes_batch(node_ids),
+            knowledge_graph_inst.node_degrees_batch(node_ids),
+        )
 
     # Now, if you need the node data and degree in order:
     node_datas = [nodes_dict.get(nid) for nid in node_ids]
@@ -4506,6 +5123,11 @@ async def _get_node_data(
     if not all([n is not None for n in node_datas]):
         logger.warning("Some nodes are missing, maybe the storage is damaged")
 
+    node_similarities = [
+        _vector_similarity(k, i, len(results))
+        for i, (k, n) in enumerate(zip(results, node_datas))
+        if n is not None
+    ]
     node_datas = [
         {
             **n,
@@ -4524,19 +5146,32 @@ async def _get_node_data(
         for k, n, d in zip(results, node_datas, node_degrees)
         if n is not None
     ]
+    entity_similarity = {
+        node["entity_name"]: similarity
+        for node, similarity in zip(node_datas, node_similarities)
+    }
+
+    if query_param.evidence_ranking:
+        node_datas = _rank_by_evidence(
+            node_datas,
+            query_param,
+            similarities=node_similarities,
+            degrees=[node["rank"] for node in node_datas],
+        )
 
     use_relations = await _find_most_related_edges_from_entities(
         node_datas,
         query_param,
         knowledge_graph_inst,
+        entity_similarity=entity_similarity,
     )
 
     logger.info(
         f"Local query: {len(node_datas)} entites, {len(use_relations)} relations"
     )
 
-    # Entities are sorted by cosine similarity
-    # Relations are sorted by rank + weight
+    # Entities are sorted by cosine similarity, relations by rank + weight,
+    # unless evidence ranking orders both by the fused evidence score
     return node_datas, use_relations
 
 
@@ -4544,9 +5179,11 @@ async def _find_most_related_edges_from_entities(
     node_datas: list[dict],
     query_param: QueryParam,
     knowledge_graph_inst: BaseGraphStorage,
+    entity_similarity: dict[str, float] | None = None,
 ):
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    with stage_span("graph_fetch"):
+        batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
 
     all_edges = []
     seen = set()
@@ -4566,10 +5203,11 @@ async def _find_most_related_edges_from_entities(
     edge_pairs_tuples = list(all_edges)  # all_edges is already a list of tuples
 
     # Call the batched functions concurrently.
-    edge_data_dict, edge_degrees_dict = await asyncio.gather(
-        knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
-        knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
-    )
+    with stage_span("graph_fetch"):
+        edge_data_dict, edge_degrees_dict = await asyncio.gather(
+            knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+            knowledge_graph_inst.edge_degrees_batch(edge_pairs_tuples),
+        )
 
     # Reconstruct edge_datas list in the same order as the deduplicated results.
     all_edges_data = []
@@ -4589,6 +5227,23 @@ async def _find_most_related_edges_from_entities(
             }
             all_edges_data.append(combined)
 
+    if query_param.evidence_ranking:
+        # A relation is as similar to the query as the closer of its two entities
+        entity_similarity = entity_similarity or {}
+        return _rank_by_evidence(
+            all_edges_data,
+            query_param,
+            similarities=[
+                max(
+                    entity_similarity.get(e["src_tgt"][0], 0.0),
+                    entity_similarity.get(e["src_tgt"][1], 0.0),
+                )
+                for e in all_edges_data
+            ],
+            degrees=[e["rank"] for e in all_edges_data],
+            edge_weights=[e["weight"] for e in all_edges_data],
+        )
+
     all_edges_data = sorted(
         all_edges_data, key=lambda x: (x["rank"], x["weight"]), reverse=True
     )
@@ -4739,10 +5394,15 @@ async def _find_related_text_unit_from_entities(
     result_chunks = []
     for i, (chunk_id, chunk_data) in enumerate(zip(unique_chunk_ids, chunk_data_list)):
         if chunk_data is not None and "content" in chunk_data:
-            chunk_data_copy = chunk_data.copy()
-            chunk_data_copy["source_type"] = "entity"
-            chunk_data_copy["chunk_id"] = chunk_id  # Add chunk_id for deduplication
-            result_chunks.append(chunk_data_copy)
+            # Only the fields read by _merge_all_chunks, no copy of the record
+            result_chunks.append(
+                {
+                    "content": chunk_data["content"],
+                    "file_path": chunk_data.get("file_path", "unknown_source"),
+                    "chunk_id": chunk_id,  # Add chunk_id for deduplication
+                    "source_type": "entity",
+                }
+            )
 
             # Update chunk tracking if provided
             if chunk_tracking is not None:
@@ -4765,7 +5425,12 @@ async def _get_edge_data(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    with stage_span("vdb_search"):
+        results = await relationships_vdb.query(
+            keywords,
+            top_k=query_param.top_k,
+            metadata_filter=query_param.metadata_filter,
+        )
 
     if not len(results):
         return [], []
@@ -4773,11 +5438,25 @@ async def _get_edge_data(
     # Prepare edge pairs in two forms:
     # For the batch edge properties function, use dicts.
     edge_pairs_dicts = [{"src": r["src_id"], "tgt": r["tgt_id"]} for r in results]
-    edge_data_dict = await knowledge_graph_inst.get_edges_batch(edge_pairs_dicts)
+    # Edge degrees are only needed when they contribute to the evidence score
+    with stage_span("graph_fetch"):
+        if query_param.evidence_ranking and query_param.rank_degree_weight > 0:
+            edge_data_dict, edge_degrees_dict = await asyncio.gather(
+                knowledge_graph_inst.get_edges_batch(edge_pairs_dicts),
+                knowledge_graph_inst.edge_degrees_batch(
+                    [(r["src_id"], r["tgt_id"]) for r in results]
+                ),
+            )
+        else:
+            edge_data_dict = await knowledge_graph_inst.get_edges_batch(
+                edge_pairs_dicts
+            )
+            edge_degrees_dict = {}
 
     # Reconstruct edge_datas list in the same order as results.
     edge_datas = []
-    for k in results:
+    edge_similarities = []
+    for i, k in enumerate(results):
         pair = (k["src_id"], k["tgt_id"])
         edge_props = edge_data_dict.get(pair)
         if edge_props is not None:
@@ -4805,13 +5484,38 @@ async def _get_edge_data(
                 **edge_props,
             }
             edge_datas.append(combined)
+            edge_similarities.append(_vector_similarity(k, i, len(results)))
 
     # Relations maintain vector search order (sorted by similarity)
+    # unless evidence ranking reorders them by the fused evidence score
+    relation_similarity = {}
+    for edge, similarity in zip(edge_datas, edge_similarities):
+        for entity_name in (edge["src_id"], edge["tgt_id"]):
+            relation_similarity[entity_name] = max(
+                relation_similarity.get(entity_name, 0.0), similarity
+            )
+
+    if query_param.evidence_ranking:
+        edge_datas = _rank_by_evidence(
+            edge_datas,
+            query_param,
+            similarities=edge_similarities,
+            degrees=(
+                [
+                    edge_degrees_dict.get((e["src_id"], e["tgt_id"]), 0)
+                    for e in edge_datas
+                ]
+                if edge_degrees_dict
+                else None
+            ),
+            edge_weights=[e["weight"] for e in edge_datas],
+        )
 
     use_entities = await _find_most_related_entities_from_relationships(
         edge_datas,
         query_param,
         knowledge_graph_inst,
+        relation_similarity=relation_similarity,
     )
 
     logger.info(
@@ -4825,6 +5529,7 @@ async def _find_most_related_entities_from_relationships(
     edge_datas: list[dict],
     query_param: QueryParam,
     knowledge_graph_inst: BaseGraphStorage,
+    relation_similarity: dict[str, float] | None = None,
 ):
     entity_names = []
     seen = set()
@@ -4838,7 +5543,8 @@ async def _find_most_related_entities_from_relationships(
             seen.add(e["tgt_id"])
 
     # Only get nodes data, no need for node degrees
-    nodes_dict = await knowledge_graph_inst.get_nodes_batch(entity_names)
+    with stage_span("graph_fetch"):
+        nodes_dict = await knowledge_graph_inst.get_nodes_batch(entity_names)
 
     # Rebuild the list in the same order as entity_names
     node_datas = []
@@ -4851,6 +5557,17 @@ async def _find_most_related_entities_from_relationships(
         combined = {**node, "entity_name": entity_name}
         node_datas.append(combined)
 
+    if query_param.evidence_ranking:
+        # An entity is as similar to the query as its closest matched relation
+        relation_similarity = relation_similarity or {}
+        node_datas = _rank_by_evidence(
+            node_datas,
+            query_param,
+            similarities=[
+                relation_similarity.get(node["entity_name"], 0.0) for node in node_datas
+            ],
+        )
+
     return node_datas
 
 
@@ -4885,16 +5602,9 @@ async def _find_related_text_unit_from_relations(
             )
             if chunks:
                 # Build relation identifier
-                if "src_tgt" in relation:
-                    rel_key = tuple(sorted(relation["src_tgt"]))
-                else:
-                    rel_key = tuple(
-                        sorted([relation.get("src_id"), relation.get("tgt_id")])
-                    )
-
                 relations_with_chunks.append(
                     {
-                        "relation_key": rel_key,
+                        "relation_key": _relation_key(relation),
                         "chunks": chunks,
                         "relation_data": relation,
                     }
@@ -5041,10 +5751,15 @@ async def _find_related_text_unit_from_relations(
     result_chunks = []
     for i, (chunk_id, chunk_data) in enumerate(zip(unique_chunk_ids, chunk_data_list)):
         if chunk_data is not None and "content" in chunk_data:
-            chunk_data_copy = chunk_data.copy()
-            chunk_data_copy["source_type"] = "relationship"
-            chunk_data_copy["chunk_id"] = chunk_id  # Add chunk_id for deduplication
-            result_chunks.append(chunk_data_copy)
+            # Only the fields read by _merge_all_chunks, no copy of the record
+            result_chunks.append(
+                {
+                    "content": chunk_data["content"],
+                    "file_path": chunk_data.get("file_path", "unknown_source"),
+                    "chunk_id": chunk_id,  # Add chunk_id for deduplication
+                    "source_type": "relationship",
+                }
+            )
 
             # Update chunk tracking if provided
             if chunk_tracking is not None:
@@ -5262,48 +5977,76 @@ async def naive_query(
         query_param.max_total_tokens,
         query_param.user_prompt or "",
         query_param.enable_rerank,
+        # Only filtered queries extend the hash, so existing cache entries stay valid
+        *(
+            [json.dumps(query_param.metadata_filter, sort_keys=True, default=str)]
+            if query_param.metadata_filter
+            else []
+        ),
     )
-    cached_result = await handle_cache(
-        hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
-    )
-    if cached_result is not None:
-        cached_response, _ = cached_result  # Extract content, ignore timestamp
-        logger.info(
-            " == LLM cache == Query cache hit, using cached response as query result"
-        )
-        response = cached_response
-    else:
-        response = await use_model_func(
-            user_query,
-            system_prompt=sys_prompt,
-            history_messages=query_param.conversation_history,
-            enable_cot=True,
-            stream=query_param.stream,
-        )
 
-        if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
-            queryparam_dict = {
-                "mode": query_param.mode,
-                "response_type": query_param.response_type,
-                "top_k": query_param.top_k,
-                "chunk_top_k": query_param.chunk_top_k,
-                "max_entity_tokens": query_param.max_entity_tokens,
-                "max_relation_tokens": query_param.max_relation_tokens,
-                "max_total_tokens": query_param.max_total_tokens,
-                "user_prompt": query_param.user_prompt or "",
-                "enable_rerank": query_param.enable_rerank,
-            }
-            await save_to_cache(
-                hashing_kv,
-                CacheData(
-                    args_hash=args_hash,
-                    content=response,
-                    prompt=query,
-                    mode=query_param.mode,
-                    cache_type="query",
-                    queryparam=queryparam_dict,
-                ),
+    async def generate_response():
+        cached_result = await handle_cache(
+            hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
+        )
+        if cached_result is not None:
+            cached_response, _ = cached_result  # Extract content, ignore timestamp
+            logger.info(
+                " == LLM cache == Query cache hit, using cached response as query result"
             )
+            response = cached_response
+        else:
+            llm_start = time.perf_counter()
+            with stage_span("llm"):
+                response = await use_model_func(
+                    user_query,
+                    system_prompt=sys_prompt,
+                    history_messages=query_param.conversation_history,
+                    enable_cot=True,
+                    stream=query_param.stream,
+                )
+            if not isinstance(response, str):
+                # The llm stage ends once the stream is open, time its first chunk too
+                response = time_first_item(response, start=llm_start)
+
+            if hashing_kv and hashing_kv.global_config.get("enable_llm_cache"):
+                queryparam_dict = {
+                    "mode": query_param.mode,
+                    "response_type": query_param.response_type,
+                    "top_k": query_param.top_k,
+                    "chunk_top_k": query_param.chunk_top_k,
+                    "max_entity_tokens": query_param.max_entity_tokens,
+                    "max_relation_tokens": query_param.max_relation_tokens,
+                    "max_total_tokens": query_param.max_total_tokens,
+                    "user_prompt": query_param.user_prompt or "",
+                    "enable_rerank": query_param.enable_rerank,
+                }
+                await save_to_cache(
+                    hashing_kv,
+                    CacheData(
+                        args_hash=args_hash,
+                        content=response,
+                        prompt=query,
+                        mode=query_param.mode,
+                        cache_type="query",
+                        queryparam=queryparam_dict,
+                    ),
+                )
+        return response
+
+    # Identical concurrent queries share one LLM call (streams cannot be shared)
+    response = await llm_single_flight.do(
+        None
+        if query_param.stream
+        else single_flight_key(
+            hashing_kv,
+            query_param.mode,
+            "query",
+            args_hash,
+            compute_args_hash(json.dumps(query_param.conversation_history)),
+        ),
+        generate_response,
+    )
 
     # Return unified result based on actual response type
     if isinstance(response, str):
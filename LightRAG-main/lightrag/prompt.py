@@ -15,6 +15,9 @@ PROMPTS["DEFAULT_TUPLE_DELIMITER"] = "<|#|>"
 # 默认完成分隔符：表示提取任务完成的信号
 PROMPTS["DEFAULT_COMPLETION_DELIMITER"] = "<|COMPLETE|>"
 
+# 默认文本块分隔符：打包提取时标记每个输入文本及其对应的输出段
+PROMPTS["DEFAULT_CHUNK_DELIMITER"] = "<|CHUNK|>"
+
 # ========== 实体和关系提取提示词 ==========
 
 # 实体提取系统提示词：指导LLM如何从文本中提取实体和关系
@@ -114,6 +117,45 @@ Based on the last extraction task, identify and extract any **missed or incorrec
 <Output>
 """
 
+# 打包实体提取用户提示词：一次请求提取多个短文本块
+# 每个输入文本以 {chunk_delimiter}序号 开头，输出按相同标记分段，便于拆分回各文本块
+PROMPTS["entity_extraction_packed_user_prompt"] = """---Task---
+Extract entities and relationships from each of the input texts in Data to be Processed below. Every input text starts with a `{chunk_delimiter}` marker followed by its number.
+
+---Instructions---
+1.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+2.  **One Section per Input Text:** Process every input text independently. Before the entities and relationships of an input text, output its marker on a line of its own exactly as given (e.g. `{chunk_delimiter}1`), even when nothing can be extracted from that text. Output the sections in ascending order and never mix results of different input texts.
+3.  **Output Content Only:** Output *only* the marker lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+4.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after the sections of all input texts.
+5.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+---Data to be Processed---
+<Entity_types>
+[{entity_types}]
+
+<Input Texts>
+{input_texts}
+
+<Output>
+"""
+
+# 打包实体继续提取用户提示词：对打包请求补充提取遗漏或格式错误的实体和关系
+PROMPTS["entity_continue_extraction_packed_user_prompt"] = """---Task---
+Based on the last extraction task, identify and extract any **missed or incorrectly formatted** entities and relationships from each of the input texts.
+
+---Instructions---
+1.  **Strict Adherence to System Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system instructions.
+2.  **Focus on Corrections/Additions:**
+    *   **Do NOT** re-output entities and relationships that were **correctly and fully** extracted in the last task.
+    *   If an entity or relationship was **missed**, or was **truncated, had missing fields, or was otherwise incorrectly formatted** in the last task, output the *corrected and complete* version in the specified format.
+3.  **One Section per Input Text:** Output the marker of every input text on a line of its own exactly as in the last task (e.g. `{chunk_delimiter}1`), followed by the additions for that text only. Output the marker even when nothing is missing for that text.
+4.  **Output Content Only:** Output *only* the marker lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+5.  **Completion Signal:** Output `{completion_delimiter}` once, as the final line after the sections of all input texts.
+6.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+<Output>
+"""
+
 # 实体提取示例：提供实体和关系提取的示例输入输出
 # 用于帮助LLM理解提取格式和要求
 PROMPTS["entity_extraction_examples"] = [
@@ -512,7 +554,7 @@ You are a Knowledge Graph Specialist with expertise in Evidence-based reasoning.
         *   `B`: 中型机构报告、深度分析、行业协会指南
         *   `C`: 普通报告、书籍章节、行业周报/月报
     *   **Evidence Chain ID Assignment:** Generate unique chain_id for each evidence chain:
-        *   Format: `chain_{src_entity}_{relation_type}_{timestamp}` or use auto-generated unique ID
+        *   Format: `chain_{{src_entity}}_{{relation_type}}_{{timestamp}}` or use auto-generated unique ID
         *   Example: chain_央行_causal_20250115 or chain_1a2b3c4d
     *   **Output Format (8 fields):**
         *   Format: `relation{tuple_delimiter}source_entity{tuple_delimiter}target_entity{tuple_delimiter}relation_type{tuple_delimiter}evidence_level{tuple_delimiter}keywords{tuple_delimiter}description{tuple_delimiter}chain_id`
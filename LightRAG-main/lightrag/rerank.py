@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import os
+import asyncio
+import threading
 import aiohttp
-from typing import Any, List, Dict, Optional, Tuple
+import numpy as np
+import pipmaster as pm
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -10,6 +16,14 @@ from tenacity import (
     retry_if_exception_type,
 )
 from .utils import logger
+from .constants import (
+    DEFAULT_RERANK_LOCAL_MODEL,
+    DEFAULT_RERANK_LOCAL_BACKEND,
+    DEFAULT_RERANK_LOCAL_BATCH_SIZE,
+    DEFAULT_RERANK_LOCAL_BATCH_WAIT_MS,
+    DEFAULT_RERANK_LOCAL_WORKERS,
+    DEFAULT_RERANK_LOCAL_MAX_LENGTH,
+)
 
 from dotenv import load_dotenv
 
@@ -19,6 +33,12 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
+@lru_cache(maxsize=8)
+def _get_rerank_tokenizer(tokenizer_cls: type, model_name: str):
+    """Build a tokenizer once per (class, model) and reuse it across rerank calls"""
+    return tokenizer_cls(model_name=model_name)
+
+
 def chunk_documents_for_rerank(
     documents: List[str],
     max_tokens: int = 480,
@@ -54,7 +74,7 @@ def chunk_documents_for_rerank(
     try:
         from .utils import TiktokenTokenizer
 
-        tokenizer = TiktokenTokenizer(model_name=tokenizer_model)
+        tokenizer = _get_rerank_tokenizer(TiktokenTokenizer, tokenizer_model)
     except Exception as e:
         logger.warning(
             f"Failed to initialize tokenizer: {e}. Using character-based approximation."
@@ -513,6 +533,373 @@ async def ali_rerank(
     )
 
 
+def _logits_to_scores(logits: Any) -> List[float]:
+    """Map cross-encoder outputs to relevance scores in [0, 1].
+
+    Single-logit heads are passed through a sigmoid; multi-class heads use the
+    softmax probability of the last (relevant) class.
+    """
+    logits = np.asarray(logits, dtype=np.float32)
+    if logits.ndim == 1:
+        logits = logits[:, None]
+    if logits.shape[1] == 1:
+        return (1.0 / (1.0 + np.exp(-logits[:, 0]))).tolist()
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    probs = np.exp(shifted) / np.exp(shifted).sum(axis=1, keepdims=True)
+    return probs[:, -1].tolist()
+
+
+class LocalCrossEncoderReranker:
+    """
+    In-process cross-encoder reranker running on CPU.
+
+    Concurrent rerank calls are queued and scored together, so (query, document)
+    pairs from several queries share a forward pass of up to ``max_batch_size``
+    pairs. Inference runs in a dedicated thread pool to keep the event loop free.
+
+    Args:
+        model: HuggingFace model id or local directory of the cross-encoder
+        backend: "sentence-transformers" or "onnx" (ONNX Runtime, CPU provider)
+        max_batch_size: Maximum number of pairs scored in one forward pass
+        batch_wait_ms: Time to wait for other queries to join a batch
+        max_workers: Number of inference threads
+        max_length: Maximum token length of a (query, document) pair
+        intra_op_threads: ONNX Runtime intra-op threads (0 lets ORT decide)
+        onnx_file: ONNX file inside the model directory (auto-detected if None)
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_RERANK_LOCAL_MODEL,
+        backend: str = DEFAULT_RERANK_LOCAL_BACKEND,
+        max_batch_size: int = DEFAULT_RERANK_LOCAL_BATCH_SIZE,
+        batch_wait_ms: float = DEFAULT_RERANK_LOCAL_BATCH_WAIT_MS,
+        max_workers: int = DEFAULT_RERANK_LOCAL_WORKERS,
+        max_length: int = DEFAULT_RERANK_LOCAL_MAX_LENGTH,
+        intra_op_threads: int = 0,
+        onnx_file: Optional[str] = None,
+    ):
+        if backend not in ("sentence-transformers", "onnx"):
+            raise ValueError(f"Unsupported local rerank backend: {backend}")
+        self.model = model
+        self.backend = backend
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_wait_ms = max(0.0, batch_wait_ms)
+        self.max_length = max_length
+        self.intra_op_threads = intra_op_threads
+        self.onnx_file = onnx_file
+
+        self._predict: Optional[Callable[[List[Tuple[str, str]]], List[float]]] = None
+        self._load_lock = threading.Lock()
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="lightrag-rerank"
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _load_sentence_transformers(
+        self,
+    ) -> Callable[[List[Tuple[str, str]]], List[float]]:
+        if not pm.is_installed("sentence-transformers"):
+            pm.install("sentence-transformers")
+        from sentence_transformers import CrossEncoder  # type: ignore
+
+        encoder = CrossEncoder(self.model, max_length=self.max_length, device="cpu")
+
+        def predict(pairs: List[Tuple[str, str]]) -> List[float]:
+            scores = np.asarray(
+                encoder.predict(
+                    pairs,
+                    batch_size=len(pairs),
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                )
+            )
+            # Single-label heads already go through CrossEncoder's sigmoid
+            if scores.ndim == 1:
+                return scores.astype(float).tolist()
+            return _logits_to_scores(scores)
+
+        return predict
+
+    def _load_onnx(self) -> Callable[[List[Tuple[str, str]]], List[float]]:
+        if not pm.is_installed("onnxruntime"):
+            pm.install("onnxruntime")
+        if not pm.is_installed("transformers"):
+            pm.install("transformers")
+        import onnxruntime as ort  # type: ignore
+        from transformers import AutoTokenizer  # type: ignore
+
+        model_dir = self.model
+        if not os.path.isdir(model_dir):
+            from huggingface_hub import snapshot_download  # type: ignore
+
+            model_dir = snapshot_download(
+                self.model, allow_patterns=["*.json", "*.txt", "*.model", "*.onnx"]
+            )
+
+        candidates = (
+            [self.onnx_file] if self.onnx_file else ["model.onnx", "onnx/model.onnx"]
+        )
+        onnx_path = next(
+            (
+                os.path.join(model_dir, name)
+                for name in candidates
+                if os.path.isfile(os.path.join(model_dir, name))
+            ),
+            None,
+        )
+        if onnx_path is None:
+            raise FileNotFoundError(
+                f"No ONNX model found in {model_dir} (tried {', '.join(candidates)})"
+            )
+
+        options = ort.SessionOptions()
+        if self.intra_op_threads > 0:
+            options.intra_op_num_threads = self.intra_op_threads
+        session = ort.InferenceSession(
+            onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        input_names = {i.name for i in session.get_inputs()}
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        def predict(pairs: List[Tuple[str, str]]) -> List[float]:
+            encoded = tokenizer(
+                [q for q, _ in pairs],
+                [d for _, d in pairs],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feeds = {
+                name: value.astype(np.int64)
+                for name, value in encoded.items()
+                if name in input_names
+            }
+            return _logits_to_scores(session.run(None, feeds)[0])
+
+        return predict
+
+    def _load_predictor(self) -> Callable[[List[Tuple[str, str]]], List[float]]:
+        """Load the model and return a callable scoring a batch of pairs"""
+        logger.info(f"Loading local rerank model {self.model} ({self.backend})")
+        if self.backend == "onnx":
+            return self._load_onnx()
+        return self._load_sentence_transformers()
+
+    def _score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score pairs in the inference thread, loading the model on first use"""
+        with self._load_lock:
+            if self._predict is None:
+                self._predict = self._load_predictor()
+        scores: List[float] = []
+        for start in range(0, len(pairs), self.max_batch_size):
+            scores.extend(self._predict(pairs[start : start + self.max_batch_size]))
+        return scores
+
+    def _resolve_batch(
+        self,
+        batch: List[Tuple[List[Tuple[str, str]], asyncio.Future]],
+        slots: asyncio.Semaphore,
+        task: asyncio.Future,
+    ) -> None:
+        """Hand the scores of a finished batch back to its waiting callers"""
+        slots.release()
+        if task.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            pairs = sum(len(item_pairs) for item_pairs, _ in batch)
+            logger.error(f"Local rerank batch of {pairs} pairs failed: {error}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        scores = task.result()
+        offset = 0
+        for item_pairs, future in batch:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(item_pairs)])
+            offset += len(item_pairs)
+
+    async def _batch_worker(self) -> None:
+        """Collect queued requests into batches, keeping up to max_workers in flight"""
+        loop = asyncio.get_running_loop()
+        queue, slots = self._queue, self._slots
+        while True:
+            # Wait for a free inference thread first, so requests arriving while
+            # all threads are busy accumulate into the next batch
+            await slots.acquire()
+            batch = [await queue.get()]
+            pending = len(batch[0][0])
+            if pending < self.max_batch_size and self.batch_wait_ms > 0:
+                await asyncio.sleep(self.batch_wait_ms / 1000)
+            while pending < self.max_batch_size and not queue.empty():
+                item = queue.get_nowait()
+                batch.append(item)
+                pending += len(item[0])
+
+            pairs = [pair for item_pairs, _ in batch for pair in item_pairs]
+            task = loop.run_in_executor(self._executor, self._score_pairs, pairs)
+            task.add_done_callback(partial(self._resolve_batch, batch, slots))
+
+    async def score(self, query: str, documents: List[str]) -> List[float]:
+        """Return one relevance score per document, batched with concurrent calls"""
+        if not documents:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._worker = loop.create_task(self._batch_worker())
+        future = loop.create_future()
+        await self._queue.put(([(query, doc) for doc in documents], future))
+        return await future
+
+    async def __call__(
+        self,
+        query: str,
+        documents: List[str],
+        top_n: Optional[int] = None,
+        enable_chunking: bool = False,
+        max_tokens_per_doc: int = 480,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """Rerank documents; accepts the same arguments as the HTTP rerankers"""
+        if not documents:
+            return []
+
+        texts, doc_indices = documents, None
+        if enable_chunking:
+            texts, doc_indices = chunk_documents_for_rerank(
+                documents, max_tokens=max_tokens_per_doc
+            )
+
+        scores = await self.score(query, texts)
+        results = [
+            {"index": i, "relevance_score": float(score)}
+            for i, score in enumerate(scores)
+        ]
+        if doc_indices is not None:
+            results = aggregate_chunk_scores(
+                results, doc_indices, len(documents), aggregation="max"
+            )
+        else:
+            results.sort(key=lambda x: x["relevance_score"], reverse=True)
+
+        if top_n is not None:
+            results = results[:top_n]
+        return results
+
+    def close(self) -> None:
+        """Stop the batch worker and release the inference threads"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+        self._executor.shutdown(wait=False)
+
+
+_local_rerankers: Dict[Tuple[Any, ...], LocalCrossEncoderReranker] = {}
+_local_rerankers_lock = threading.Lock()
+
+
+def get_local_reranker(
+    model: str = DEFAULT_RERANK_LOCAL_MODEL,
+    backend: Optional[str] = None,
+    max_batch_size: Optional[int] = None,
+    batch_wait_ms: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    max_length: Optional[int] = None,
+) -> LocalCrossEncoderReranker:
+    """
+    Return a shared LocalCrossEncoderReranker, creating it on first use.
+
+    Unset options are read from RERANK_LOCAL_BACKEND, RERANK_LOCAL_BATCH_SIZE,
+    RERANK_LOCAL_BATCH_WAIT_MS, RERANK_LOCAL_WORKERS and RERANK_LOCAL_MAX_LENGTH.
+    Sharing one instance per configuration is what lets concurrent queries be
+    batched together and keeps a single copy of the model in memory.
+    """
+    config = (
+        model,
+        backend or os.getenv("RERANK_LOCAL_BACKEND", DEFAULT_RERANK_LOCAL_BACKEND),
+        max_batch_size
+        or int(os.getenv("RERANK_LOCAL_BATCH_SIZE", DEFAULT_RERANK_LOCAL_BATCH_SIZE)),
+        batch_wait_ms
+        if batch_wait_ms is not None
+        else float(
+            os.getenv("RERANK_LOCAL_BATCH_WAIT_MS", DEFAULT_RERANK_LOCAL_BATCH_WAIT_MS)
+        ),
+        max_workers
+        or int(os.getenv("RERANK_LOCAL_WORKERS", DEFAULT_RERANK_LOCAL_WORKERS)),
+        max_length
+        or int(os.getenv("RERANK_LOCAL_MAX_LENGTH", DEFAULT_RERANK_LOCAL_MAX_LENGTH)),
+    )
+    with _local_rerankers_lock:
+        reranker = _local_rerankers.get(config)
+        if reranker is None:
+            reranker = LocalCrossEncoderReranker(
+                model=config[0],
+                backend=config[1],
+                max_batch_size=config[2],
+                batch_wait_ms=config[3],
+                max_workers=config[4],
+                max_length=config[5],
+                intra_op_threads=int(os.getenv("RERANK_LOCAL_ONNX_THREADS", "0")),
+                onnx_file=os.getenv("RERANK_LOCAL_ONNX_FILE") or None,
+            )
+            _local_rerankers[config] = reranker
+        return reranker
+
+
+async def local_rerank(
+    query: str,
+    documents: List[str],
+    top_n: Optional[int] = None,
+    api_key: Optional[str] = None,
+    model: str = DEFAULT_RERANK_LOCAL_MODEL,
+    base_url: Optional[str] = None,
+    extra_body: Optional[Dict[str, Any]] = None,
+    enable_chunking: bool = False,
+    max_tokens_per_doc: int = 480,
+) -> List[Dict[str, Any]]:
+    """
+    Rerank documents with an in-process cross-encoder (no network calls).
+
+    Args:
+        query: The search query
+        documents: List of strings to rerank
+        top_n: Number of top results to return
+        api_key: Unused, accepted for signature compatibility
+        model: HuggingFace model id or local model directory
+        base_url: Unused, accepted for signature compatibility
+        extra_body: Unused, accepted for signature compatibility
+        enable_chunking: Whether to chunk documents exceeding max_tokens_per_doc
+        max_tokens_per_doc: Maximum tokens per document chunk
+
+    Returns:
+        List of dictionary of ["index": int, "relevance_score": float]
+
+    Example:
+        >>> rag = LightRAG(..., rerank_model_func=local_rerank)
+    """
+    reranker = get_local_reranker(model=model)
+    return await reranker(
+        query,
+        documents,
+        top_n=top_n,
+        enable_chunking=enable_chunking,
+        max_tokens_per_doc=max_tokens_per_doc,
+    )
+
+
 """Please run this test as a module:
 python -m lightrag.rerank
 """
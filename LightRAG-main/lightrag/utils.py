@@ -1,4 +1,5 @@
 from __future__ import annotations
+import heapq
 import weakref
 
 import sys
@@ -6,6 +7,7 @@ import sys
 import asyncio
 import html
 import csv
+import io
 import inspect
 import json
 import logging
@@ -15,17 +17,20 @@ import re
 import time
 import uuid
 from dataclasses import dataclass
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from functools import wraps
+from functools import partial, wraps
 from hashlib import md5
 from typing import (
     Any,
+    AsyncIterator,
     Protocol,
     Callable,
     TYPE_CHECKING,
     List,
     Optional,
     Iterable,
+    Iterator,
     Sequence,
     Collection,
 )
@@ -41,7 +46,10 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    DEFAULT_RERANK_CACHE_MAX_SIZE,
+    DEFAULT_RATE_LIMIT_COMPLETION_TOKENS,
 )
+from lightrag.metrics import record_cache, stage_span
 
 # Precompile regex pattern for JSON sanitization (module-level, compiled once)
 _SURROGATE_PATTERN = re.compile(r"[\uD800-\uDFFF\uFFFE\uFFFF]")
@@ -228,6 +236,7 @@ def get_env_value(
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
     from lightrag.base import BaseKVStorage, BaseVectorStorage, QueryParam
+    from lightrag.types import KnowledgeGraph
 
 # use the .env that is inside the current folder
 # allows to use different .env file for each lightrag instance
@@ -270,7 +279,15 @@ def set_verbose_debug(enabled: bool):
     VERBOSE_DEBUG = enabled
 
 
-statistic_data = {"llm_call": 0, "llm_cache": 0, "embed_call": 0}
+# extract_prefix_tokens counts the part of extract_prompt_tokens that is a prompt
+# prefix shared between extraction requests (cacheable by providers)
+statistic_data = {
+    "llm_call": 0,
+    "llm_cache": 0,
+    "embed_call": 0,
+    "extract_prompt_tokens": 0,
+    "extract_prefix_tokens": 0,
+}
 
 
 class LightragPathFilter(logging.Filter):
@@ -436,6 +453,8 @@ class EmbeddingFunc:
         max_token_size: Enable embedding token limit checking for description summarization(Set embedding_token_limit in LightRAG)
         send_dimensions: Whether to inject embedding_dim argument to underlying function
         model_name: Model name for implementing workspace data isolation in vector DB
+        coalesce: Embed each distinct text once when concurrent calls (or a single batch) contain the same text
+        coalesce_window: Seconds to keep sharing a text's embedding after it was computed (0: only while in flight)
     """
 
     embedding_dim: int
@@ -445,6 +464,8 @@ class EmbeddingFunc:
     model_name: str | None = (
         None  # Model name for implementing workspace data isolation in vector DB
     )
+    coalesce: bool = True
+    coalesce_window: float = 0.0
 
     def __post_init__(self):
         """Unwrap nested EmbeddingFunc to prevent double wrapping issues.
@@ -467,6 +488,9 @@ class EmbeddingFunc:
             # Unwrap to get the original function
             self.func = self.func.func
 
+        # Per-text single flight; a plain attribute so asdict() does not copy it
+        self._single_flight = SingleFlight(self.coalesce_window)
+
         if unwrap_count > 0:
             logger.warning(
                 f"Detected nested EmbeddingFunc wrapping (depth: {unwrap_count}), "
@@ -475,6 +499,59 @@ class EmbeddingFunc:
             )
 
     async def __call__(self, *args, **kwargs) -> np.ndarray:
+        if (
+            self.coalesce
+            and args
+            and args[0]
+            and isinstance(args[0], (list, tuple))
+            and all(isinstance(text, str) for text in args[0])
+        ):
+            return await self._coalesced_call(list(args[0]), args[1:], kwargs)
+        return await self._call(*args, **kwargs)
+
+    async def _coalesced_call(
+        self, texts: list[str], args: tuple, kwargs: dict
+    ) -> np.ndarray:
+        """Embed only the texts that are not already being embedded by another call"""
+        single_flight = self._single_flight
+        single_flight.window = self.coalesce_window
+        # Scheduling hints such as _priority do not change the embedding
+        options = repr(sorted((k, v) for k, v in kwargs.items() if k[0] != "_"))
+
+        futures = {}
+        owned = {}
+        for text in texts:
+            if text in futures:
+                continue
+            future, leader = single_flight.claim((text, options))
+            futures[text] = future
+            if leader:
+                owned[text] = future
+        record_cache("embedding", hits=len(texts) - len(owned), misses=len(owned))
+
+        result = None
+        if owned:
+            try:
+                result = await self._call(list(owned), *args, **kwargs)
+            except BaseException as e:
+                for text, future in owned.items():
+                    single_flight.fail((text, options), future, e)
+                raise
+            vectors = result.reshape(len(owned), -1)
+            for (text, future), vector in zip(owned.items(), vectors):
+                single_flight.resolve((text, options), future, vector)
+            if len(owned) == len(texts):
+                return result
+
+        embeddings = []
+        for text in texts:
+            try:
+                embeddings.append(await asyncio.shield(futures[text]))
+            except _LeaderCancelled:
+                embeddings.append((await self._coalesced_call([text], args, kwargs))[0])
+        return np.stack(embeddings)
+
+    async def _call(self, *args, **kwargs) -> np.ndarray:
         # Only inject embedding_dim when send_dimensions is True
         if self.send_dimensions:
             # Check if user provided embedding_dim parameter
@@ -633,6 +710,213 @@ def merge_provenances(
 
     return merged
 
+
+# 可用于向量检索过滤的证据字段（各向量存储据此建立 payload/标量索引）
+METADATA_FILTER_FIELDS = ("evidence_level", "scene_tags", "file_path")
+
+# 取值为列表的 payload 字段：只要列表中任一元素命中即视为匹配
+METADATA_LIST_FIELDS = frozenset({"scene_tags", "evidence_chain_ids"})
+
+_METADATA_FILTER_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def normalize_metadata_filter(
+    metadata_filter: dict[str, Any] | None,
+) -> dict[str, list] | None:
+    """校验并规范化元数据过滤条件。
+
+    过滤条件为 ``{字段: 取值或取值列表}``，不同字段之间为 AND，同一字段的多个
+    取值之间为 OR，例如 ``{"evidence_level": ["S", "A"], "scene_tags": "金融"}``。
+
+    Args:
+        metadata_filter: 原始过滤条件，None 或空字典表示不过滤
+
+    Returns:
+        ``{字段: 取值列表}``，无过滤条件时返回 None
+
+    Raises:
+        ValueError: 字段名不合法、取值类型不支持或取值列表为空
+    """
+    if not metadata_filter:
+        return None
+    if not isinstance(metadata_filter, dict):
+        raise ValueError("metadata_filter must be a dict of field -> value(s)")
+
+    normalized = {}
+    for key, values in metadata_filter.items():
+        if not isinstance(key, str) or not _METADATA_FILTER_KEY.match(key):
+            raise ValueError(f"Invalid metadata filter field: {key!r}")
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            values = [values]
+        if not values:
+            raise ValueError(f"Metadata filter for {key!r} has no values")
+        for value in values:
+            if not isinstance(value, (str, int, float, bool)):
+                raise ValueError(
+                    f"Unsupported metadata filter value for {key!r}: {value!r}"
+                )
+        normalized[key] = list(dict.fromkeys(values))
+    return normalized
+
+
+def match_metadata_filter(payload: dict[str, Any], metadata_filter: dict) -> bool:
+    """判断一条向量记录的 payload 是否满足（已规范化的）过滤条件。"""
+    for key, allowed in metadata_filter.items():
+        value = payload.get(key)
+        if isinstance(value, (list, tuple, set)):
+            if not any(item in allowed for item in value):
+                return False
+        elif value not in allowed:
+            return False
+    return True
+
+
+# 证据等级对应的排序分值，未知等级按 B 处理
+EVIDENCE_LEVEL_SCORES = {"S": 1.0, "A": 0.75, "B": 0.5, "C": 0.25}
+
+
+def _normalize_rank_feature(values: Sequence[float] | None, size: int) -> np.ndarray:
+    """把一组非负特征缩放到 [0, 1]（除以最大值），缺失或全零时返回全零。"""
+    if values is None:
+        return np.zeros(size)
+    array = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)
+    array = np.clip(array, 0.0, None)
+    peak = array.max(initial=0.0)
+    return array / peak if peak > 0 else np.zeros(size)
+
+
+def compute_evidence_scores(
+    evidence_levels: Sequence[str | None],
+    similarities: Sequence[float] | None = None,
+    degrees: Sequence[float] | None = None,
+    edge_weights: Sequence[float] | None = None,
+    weights: tuple[float, float, float, float] = (0.4, 0.2, 0.1, 0.3),
+) -> np.ndarray:
+    """对一批候选实体/关系计算融合排序分（向量化）。
+
+    分值为向量相似度、图度数（log1p 压缩热点节点）、边权重与证据等级的加权平均，
+    各项先在候选集合内按最大值归一化到 [0, 1]。未提供的特征（如实体没有边权重）不参与
+    加权，因此不同来源的候选分值处于同一量纲，可以直接合并排序。
+
+    Args:
+        evidence_levels: 每个候选的证据等级（S/A/B/C）
+        similarities: 向量相似度
+        degrees: 图度数
+        edge_weights: 关系权重
+        weights: (相似度, 度数, 边权重, 证据等级) 的权重
+
+    Returns:
+        与候选一一对应的分值数组，取值范围 [0, 1]
+    """
+    size = len(evidence_levels)
+    if size == 0:
+        return np.zeros(0)
+
+    levels = np.fromiter(
+        (
+            EVIDENCE_LEVEL_SCORES.get(str(level).upper(), EVIDENCE_LEVEL_SCORES["B"])
+            for level in evidence_levels
+        ),
+        dtype=np.float64,
+        count=size,
+    )
+    if degrees is not None:
+        degrees = np.log1p(np.clip(np.asarray(degrees, dtype=np.float64), 0.0, None))
+    features = np.vstack(
+        [
+            _normalize_rank_feature(similarities, size),
+            _normalize_rank_feature(degrees, size),
+            _normalize_rank_feature(edge_weights, size),
+            levels,
+        ]
+    )
+    weight_vector = np.clip(np.asarray(weights, dtype=np.float64), 0.0, None)
+    weight_vector *= [
+        similarities is not None,
+        degrees is not None,
+        edge_weights is not None,
+        True,
+    ]
+    total = weight_vector.sum()
+    if total <= 0:
+        return np.zeros(size)
+    return weight_vector @ features / total
+
+
+def personalized_pagerank(
+    restart: Sequence[float],
+    src: Sequence[int],
+    dst: Sequence[int],
+    edge_weights: Sequence[float] | None = None,
+    damping: float = 0.5,
+    max_iter: int = 50,
+    tol: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """在无向加权图上计算带重启的随机游走（Personalized PageRank）。
+
+    每一步以 damping 的概率沿边（按边权重比例）走到邻居，否则回到种子节点
+    （按 restart 分布）。没有出边的节点把概率质量交还给种子。迭代为 NumPy 稀疏
+    乘法（按边 bincount），每轮开销与边数成正比。
+
+    Args:
+        restart: 每个节点的重启权重（种子分布，会归一化），长度即节点数
+        src: 每条边的起点下标（每条无向边只出现一次）
+        dst: 每条边的终点下标
+        edge_weights: 边权重，默认为 1
+        damping: 继续游走的概率，越小结果越集中在种子附近
+        max_iter: 最大迭代次数
+        tol: L1 收敛阈值
+
+    Returns:
+        (节点稳态概率, 每条边每步承载的概率流量)
+    """
+    restart = np.clip(np.asarray(restart, dtype=np.float64), 0.0, None)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    weights = (
+        np.ones(len(src))
+        if edge_weights is None
+        else np.clip(np.asarray(edge_weights, dtype=np.float64), 0.0, None)
+    )
+    node_count = len(restart)
+    total = restart.sum()
+    if node_count == 0 or total <= 0:
+        return np.zeros(node_count), np.zeros(len(src))
+    restart = restart / total
+
+    # Walk both directions of every edge
+    rows = np.concatenate([src, dst])
+    cols = np.concatenate([dst, src])
+    values = np.concatenate([weights, weights])
+    out_weight = np.bincount(rows, weights=values, minlength=node_count)
+    transition = np.divide(
+        values,
+        out_weight[rows],
+        out=np.zeros_like(values),
+        where=out_weight[rows] > 0,
+    )
+    dangling = out_weight <= 0
+
+    scores = restart.copy()
+    for _ in range(max_iter):
+        spread = np.bincount(
+            cols, weights=transition * scores[rows], minlength=node_count
+        )
+        updated = (
+            damping * (spread + scores[dangling].sum() * restart)
+            + (1.0 - damping) * restart
+        )
+        converged = np.abs(updated - scores).sum() < tol
+        scores = updated
+        if converged:
+            break
+
+    flows = damping * (
+        transition[: len(src)] * scores[src] + transition[len(src) :] * scores[dst]
+    )
+    return scores, flows
+
+
 def generate_cache_key(mode: str, cache_type: str, hash_value: str) -> str:
     """Generate a flattened cache key in the format {mode}:{cache_type}:{hash}
 
@@ -689,6 +973,334 @@ class HealthCheckTimeoutError(Exception):
         )
 
 
+def _unwrap_retry_error(error: BaseException) -> BaseException:
+    """Return the last attempt's exception of a tenacity RetryError"""
+    last_attempt = getattr(error, "last_attempt", None)
+    if last_attempt is not None and last_attempt.failed:
+        return last_attempt.exception()
+    return error
+
+
+def _retry_after_seconds(error: BaseException) -> float | None:
+    """Read the retry-after(-ms) header of a provider error response, if any"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class AdaptiveConcurrencyController:
+    """AIMD concurrency limit for priority_limit_async_func_call
+
+    The limit grows by one per round of successful calls and is cut by backoff_ratio
+    when the provider rate limits (HTTP 429), is overloaded (502/503/504/529),
+    calls time out, or the recent latency exceeds latency_tolerance times its
+    long-run average. Cuts are applied at most once per observed latency so a
+    burst of failures from one round does not collapse the limit. A retry-after
+    header on a rate-limit response pauses new calls for that long.
+    """
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        initial_limit: int | None = None,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        name: str = "limit_async",
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        if initial_limit is None:
+            initial_limit = (self.min_limit + self.max_limit) // 2
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.overloaded = 0
+        self.latency = None  # recent latency (fast EWMA)
+        self.baseline_latency = None  # long-run latency (slow EWMA)
+        self._last_decrease = float("-inf")
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self) -> None:
+        """Wait until a call may start under the current limit"""
+        async with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause <= 0 and self.in_flight < self.limit:
+                    break
+                try:
+                    await asyncio.wait_for(
+                        self._condition.wait(), timeout=pause if pause > 0 else None
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+
+    async def release(
+        self, latency: float | None, error: BaseException | None = None
+    ) -> None:
+        """Finish a call and adapt the limit to its outcome (None: call was skipped)"""
+        async with self._condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self._observe(latency, error)
+            self._condition.notify_all()
+
+    def _observe(self, latency: float, error: BaseException | None) -> None:
+        now = time.monotonic()
+        if error is not None:
+            error = _unwrap_retry_error(error)
+            status = getattr(error, "status_code", None) or getattr(
+                getattr(error, "response", None), "status_code", None
+            )
+            if status == 429 or "RateLimit" in type(error).__name__:
+                self.rate_limited += 1
+                retry_after = _retry_after_seconds(error)
+                if retry_after:
+                    self._paused_until = max(
+                        self._paused_until, now + min(retry_after, 60.0)
+                    )
+                self._decrease(now, "rate limited")
+            elif status in (502, 503, 504, 529) or isinstance(
+                error, (TimeoutError, WorkerTimeoutError)
+            ):
+                self.overloaded += 1
+                self._decrease(now, "provider overloaded")
+            # Other errors (bad requests, parsing) say nothing about capacity
+            return
+
+        if self.latency is None:
+            self.latency = self.baseline_latency = latency
+        else:
+            self.latency += 0.2 * (latency - self.latency)
+            self.baseline_latency += 0.02 * (latency - self.baseline_latency)
+
+        if self.latency > self.latency_tolerance * self.baseline_latency:
+            self._decrease(now, "latency rising")
+        else:
+            # Additive increase: about +1 per round of `limit` successful calls
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self, now: float, reason: str) -> None:
+        if now - self._last_decrease < max(self.latency or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        old_limit = self.limit
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        if self.limit != old_limit:
+            logger.info(
+                f"{self.name}: Concurrency limit {old_limit} -> {self.limit} ({reason})"
+            )
+
+    def get_metrics(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "baseline_latency": self.baseline_latency,
+            "rate_limited": self.rate_limited,
+            "overloaded": self.overloaded,
+        }
+
+
+class TokenBucketRateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for provider quotas
+
+    Both buckets hold up to one minute of quota and refill continuously. A call
+    reserves one request and its estimated prompt plus completion tokens; once the
+    call finishes, settle() corrects the token bucket by the actual count, so
+    estimation errors do not accumulate. Waiting calls are served strictly by
+    priority (lower first, FIFO within a priority), so queries pre-empt bulk
+    extraction queued behind the same quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        name: str = "rate_limit",
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.name = name
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int]] = []  # heap of (priority, seq)
+        self._seq = 0
+        self._condition: asyncio.Condition | None = None
+        self._loop = None
+        self.throttled_seconds = 0.0
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Limiters are shared by model, possibly across event loops (e.g. tests)
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(
+                self.requests_per_minute,
+                self._requests + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until both buckets can cover the request"""
+        wait = 0.0
+        if self.requests_per_minute and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.requests_per_minute
+        if self.tokens_per_minute and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    async def acquire(self, tokens: int = 0, priority: int = 10) -> int:
+        """Wait for quota for one request of `tokens` tokens, return the tokens taken"""
+        if self.tokens_per_minute:
+            # A single request larger than the bucket could never be served
+            tokens = min(tokens, self.tokens_per_minute)
+        else:
+            tokens = 0
+        condition = self._get_condition()
+        async with condition:
+            entry = (priority, self._seq)
+            self._seq += 1
+            heapq.heappush(self._waiters, entry)
+            start = time.monotonic()
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        self._refill()
+                        timeout = self._wait_time(tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                # Let the next waiter check the buckets
+                condition.notify_all()
+
+            self.throttled_seconds += time.monotonic() - start
+            if self.requests_per_minute:
+                self._requests -= 1
+            self._tokens -= tokens
+            return tokens
+
+    def settle(self, reserved_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the actual usage of a call is known"""
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute, self._tokens + reserved_tokens - actual_tokens
+            )
+
+    def get_metrics(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_requests": self._requests if self.requests_per_minute else None,
+            "available_tokens": self._tokens if self.tokens_per_minute else None,
+            "rate_limit_waiting": len(self._waiters),
+            "throttled_seconds": self.throttled_seconds,
+        }
+
+
+# Rate limiters by model, shared by all LightRAG instances using that model
+_rate_limiters: dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_rate_limiter(
+    key: str, requests_per_minute: int = 0, tokens_per_minute: int = 0
+) -> TokenBucketRateLimiter | None:
+    """Return the shared rate limiter for a model/endpoint, None if unlimited"""
+    if not requests_per_minute and not tokens_per_minute:
+        return None
+    limiter = _rate_limiters.get(key)
+    if (
+        limiter is None
+        or limiter.requests_per_minute != requests_per_minute
+        or limiter.tokens_per_minute != tokens_per_minute
+    ):
+        limiter = TokenBucketRateLimiter(
+            requests_per_minute, tokens_per_minute, name=key
+        )
+        _rate_limiters[key] = limiter
+    return limiter
+
+
+def estimate_call_tokens(
+    args: tuple,
+    kwargs: dict[str, Any],
+    tokenizer: Tokenizer,
+    default_completion_tokens: int = DEFAULT_RATE_LIMIT_COMPLETION_TOKENS,
+) -> tuple[int, int]:
+    """Estimate (prompt, completion) tokens of an LLM or embedding call
+
+    LLM calls are (prompt, system_prompt=, history_messages=) with the completion
+    bounded by max_tokens/max_completion_tokens when given; embedding calls take a
+    list of texts and produce no completion tokens.
+    """
+    first = args[0] if args else kwargs.get("prompt", kwargs.get("texts"))
+    if isinstance(first, (list, tuple)):
+        return sum(len(tokenizer.encode(text)) for text in first), 0
+
+    texts = [first or "", kwargs.get("system_prompt") or ""]
+    texts.extend(
+        str(message.get("content", ""))
+        for message in kwargs.get("history_messages") or []
+    )
+    prompt_tokens = sum(len(tokenizer.encode(text)) for text in texts if text)
+    completion_tokens = (
+        kwargs.get("max_tokens")
+        or kwargs.get("max_completion_tokens")
+        or default_completion_tokens
+    )
+    return prompt_tokens, completion_tokens
+
+
+# Functions wrapped by priority_limit_async_func_call, for get_concurrency_metrics
+_limited_funcs: weakref.WeakSet = weakref.WeakSet()
+
+
+def get_concurrency_metrics() -> list[dict[str, Any]]:
+    """Current concurrency limit and queue depth of every priority-limited function"""
+    return [func.get_metrics() for func in list(_limited_funcs)]
+
+
 def priority_limit_async_func_call(
     max_size: int,
     llm_timeout: float = None,
@@ -697,6 +1309,10 @@ def priority_limit_async_func_call(
     max_queue_size: int = 1000,
     cleanup_timeout: float = 2.0,
     queue_name: str = "limit_async",
+    adaptive: bool = False,
+    min_size: int = 1,
+    rate_limiter: TokenBucketRateLimiter | None = None,
+    tokenizer: Tokenizer | None = None,
 ):
     """
     Enhanced priority-limited asynchronous function call decorator with robust timeout handling
@@ -715,6 +1331,13 @@ def priority_limit_async_func_call(
         max_task_duration: Maximum time before health check intervenes (defaults to llm_timeout + 60s)
         cleanup_timeout: Maximum time to wait for cleanup operations (defaults to 2.0s)
         queue_name: Optional queue name for logging identification (defaults to "limit_async")
+        adaptive: Adapt the number of concurrent calls between min_size and max_size with
+            an AdaptiveConcurrencyController instead of always running max_size calls
+        min_size: Lower bound of the adaptive concurrency limit
+        rate_limiter: Optional RPM/TPM limiter every call must acquire quota from, in
+            queue priority order
+        tokenizer: Tokenizer used to estimate and settle the tokens of each call for the
+            rate limiter (without it only requests are metered)
 
     Returns:
         Decorator function
@@ -750,27 +1373,67 @@ def priority_limit_async_func_call(
         task_states_lock = asyncio.Lock()
         active_futures = weakref.WeakSet()
         reinit_count = 0
+        executing = 0
+        # max_size workers are kept alive; the controller gates how many may execute
+        controller = (
+            AdaptiveConcurrencyController(min_size, max_size, name=queue_name)
+            if adaptive
+            else None
+        )
 
         async def worker():
             """Enhanced worker that processes tasks with proper timeout and state management"""
+            nonlocal executing
             try:
                 while not shutdown_event.is_set():
                     try:
+                        # Take the execution slot before dequeuing: calls the limit
+                        # cannot run yet stay queued, where later calls with a
+                        # higher priority still overtake them
+                        if controller is not None:
+                            await controller.acquire()
                         # Get task from queue with timeout for shutdown checking
                         try:
-                            (
-                                priority,
-                                count,
-                                task_id,
-                                args,
-                                kwargs,
-                            ) = await asyncio.wait_for(queue.get(), timeout=1.0)
+                            item = await asyncio.wait_for(queue.get(), timeout=1.0)
                         except asyncio.TimeoutError:
+                            if controller is not None:
+                                await controller.release(None)
                             continue
+                        priority, count, task_id, args, kwargs = item
+
+                        reserved_tokens = prompt_tokens = 0
+                        if rate_limiter is not None:
+                            prompt_tokens, reserved_tokens = estimate_reservation(
+                                args, kwargs
+                            )
+                            reserved_tokens = await rate_limiter.acquire(
+                                reserved_tokens, priority
+                            )
+                            # A call with a higher priority queued while waiting for
+                            # quota takes over the reservation, this one is re-queued
+                            if not queue.empty():
+                                head = queue.get_nowait()
+                                if head[:2] < (priority, count):
+                                    queue.put_nowait(item)
+                                    priority, count, task_id, args, kwargs = head
+                                    old_reserved = reserved_tokens
+                                    prompt_tokens, reserved_tokens = (
+                                        estimate_reservation(args, kwargs)
+                                    )
+                                    rate_limiter.settle(old_reserved, reserved_tokens)
+                                else:
+                                    queue.put_nowait(head)
+                                queue.task_done()
+
+                        executing += 1
+                        execution_error = None
+                        execution_cancelled = False
 
                         # Get task state and mark worker as started
                         async with task_states_lock:
                             if task_id not in task_states:
+                                rate_limiter_refund(reserved_tokens)
+                                await release_slot(None)
                                 queue.task_done()
                                 continue
                             task_state = task_states[task_id]
@@ -787,6 +1450,8 @@ def priority_limit_async_func_call(
                         ):
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
+                            rate_limiter_refund(reserved_tokens)
+                            await release_slot(None)
                             queue.task_done()
                             continue
 
@@ -799,12 +1464,22 @@ def priority_limit_async_func_call(
                             else:
                                 result = await func(*args, **kwargs)
 
+                            # Correct the reserved token estimate by the actual output
+                            if reserved_tokens and isinstance(result, str):
+                                rate_limiter.settle(
+                                    reserved_tokens,
+                                    prompt_tokens + len(tokenizer.encode(result)),
+                                )
+
                             # Set result if future is still valid
                             if not task_state.future.done():
                                 task_state.future.set_result(result)
 
                         except asyncio.TimeoutError:
                             # Worker-level timeout (max_execution_timeout exceeded)
+                            execution_error = WorkerTimeoutError(
+                                max_execution_timeout, "execution"
+                            )
                             logger.warning(
                                 f"{queue_name}: Worker timeout for task {task_id} after {max_execution_timeout}s"
                             )
@@ -816,6 +1491,7 @@ def priority_limit_async_func_call(
                                 )
                         except asyncio.CancelledError:
                             # Task was cancelled during execution
+                            execution_cancelled = True
                             if not task_state.future.done():
                                 task_state.future.cancel()
                             logger.debug(
@@ -823,6 +1499,7 @@ def priority_limit_async_func_call(
                             )
                         except Exception as e:
                             # Function execution error
+                            execution_error = e
                             logger.error(
                                 f"{queue_name}: Error in decorated function for task {task_id}: {str(e)}"
                             )
@@ -832,6 +1509,13 @@ def priority_limit_async_func_call(
                             # Clean up task state
                             async with task_states_lock:
                                 task_states.pop(task_id, None)
+                            await release_slot(
+                                None
+                                if execution_cancelled
+                                else asyncio.get_event_loop().time()
+                                - task_state.execution_start_time,
+                                execution_error,
+                            )
                             queue.task_done()
 
                     except Exception as e:
@@ -843,6 +1527,32 @@ def priority_limit_async_func_call(
             finally:
                 logger.debug(f"{queue_name}: Worker exiting")
 
+        def estimate_reservation(args: tuple, kwargs: dict) -> tuple[int, int]:
+            """(prompt tokens, tokens to reserve) of a call for the rate limiter"""
+            if tokenizer is None or not rate_limiter.tokens_per_minute:
+                return 0, 0
+            prompt_tokens, completion_tokens = estimate_call_tokens(
+                args, kwargs, tokenizer
+            )
+            # A single request larger than the bucket could never be served
+            return prompt_tokens, min(
+                prompt_tokens + completion_tokens, rate_limiter.tokens_per_minute
+            )
+
+        def rate_limiter_refund(reserved_tokens: int) -> None:
+            """Return the reserved tokens of a task that was skipped before running"""
+            if reserved_tokens:
+                rate_limiter.settle(reserved_tokens, 0)
+
+        async def release_slot(
+            latency: float | None, error: BaseException | None = None
+        ):
+            """Free the execution slot taken by a worker and report the outcome"""
+            nonlocal executing
+            executing -= 1
+            if controller is not None:
+                await controller.release(latency, error)
+
         async def enhanced_health_check():
             """Enhanced health check with stuck task detection and recovery"""
             nonlocal initialized
@@ -1126,8 +1836,31 @@ def priority_limit_async_func_call(
                 async with task_states_lock:
                     task_states.pop(task_id, None)
 
+        def get_metrics() -> dict[str, Any]:
+            """Current concurrency limit, executing calls, queue depth and quota state"""
+            metrics = {
+                "queue_name": queue_name,
+                "adaptive": controller is not None,
+                "limit": controller.limit if controller is not None else max_size,
+                "executing": executing,
+                "queue_depth": queue.qsize(),
+                "workers": len(tasks),
+            }
+            for source in (controller, rate_limiter):
+                if source is not None:
+                    metrics.update(
+                        {
+                            key: value
+                            for key, value in source.get_metrics().items()
+                            if key not in metrics
+                        }
+                    )
+            return metrics
+
         # Add shutdown method to decorated function
         wait_func.shutdown = shutdown
+        wait_func.get_metrics = get_metrics
+        _limited_funcs.add(wait_func)
 
         return wait_func
 
@@ -1448,6 +2181,114 @@ def cosine_similarity(v1, v2):
     return dot_product / (norm1 * norm2)
 
 
+class _LeaderCancelled(Exception):
+    """Set on a single-flight future whose leader was cancelled"""
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution
+
+    The first caller of a key (the leader) runs the call; callers arriving while it
+    is in flight (followers) await the leader's future and receive its result or
+    exception. With a window, successful results are also shared with callers
+    arriving up to window seconds after completion. If the leader is cancelled, a
+    waiting follower takes over the call.
+    """
+
+    def __init__(self, window: float = 0.0):
+        self.window = window
+        self.leaders = 0
+        self.coalesced = 0
+        self._futures: dict[Any, asyncio.Future] = {}
+        self._expires: dict[Any, float] = {}  # insertion ordered by expiry
+
+    def claim(self, key) -> tuple[asyncio.Future, bool]:
+        """Return the future for key and whether the caller has to resolve it"""
+        self._purge_expired()
+        future = self._futures.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future, False
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        self.leaders += 1
+        return future, True
+
+    def resolve(self, key, future: asyncio.Future, result: Any) -> None:
+        future.set_result(result)
+        if self.window > 0:
+            self._expires.pop(key, None)
+            self._expires[key] = time.monotonic() + self.window
+        else:
+            self._forget(key, future)
+
+    def fail(self, key, future: asyncio.Future, error: BaseException) -> None:
+        if not isinstance(error, Exception):
+            error = _LeaderCancelled()
+        future.set_exception(error)
+        future.exception()  # mark retrieved, there may be no followers
+        self._forget(key, future)
+
+    def _forget(self, key, future: asyncio.Future) -> None:
+        if self._futures.get(key) is future:
+            del self._futures[key]
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        while self._expires:
+            key, expires = next(iter(self._expires.items()))
+            if expires > now:
+                break
+            del self._expires[key]
+            self._futures.pop(key, None)
+
+    async def do(self, key, func: Callable[[], Any]) -> Any:
+        """Run func() once for all concurrent callers of key (None: no coalescing)"""
+        if key is None:
+            return await func()
+        while True:
+            future, leader = self.claim(key)
+            if leader:
+                break
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = await func()
+        except BaseException as e:
+            self.fail(key, future, e)
+            raise
+        self.resolve(key, future, result)
+        return result
+
+    def get_metrics(self) -> dict[str, int]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": sum(not f.done() for f in self._futures.values()),
+        }
+
+
+# Shared by all LLM call sites that are keyed on the LLM response cache
+llm_single_flight = SingleFlight()
+
+
+def single_flight_key(
+    hashing_kv, mode: str, cache_type: str, args_hash: str, *extra: str
+) -> tuple | None:
+    """Single-flight key of a cached LLM call, None when there is no cache namespace
+
+    Keys are scoped to the cache storage instance so that different workspaces
+    and LightRAG instances never share responses. extra holds inputs that affect
+    the response but are not part of the cache args hash.
+    """
+    if hashing_kv is None:
+        return None
+    return (id(hashing_kv), generate_cache_key(mode, cache_type, args_hash), *extra)
+
+
 async def handle_cache(
     hashing_kv,
     args_hash,
@@ -1475,11 +2316,13 @@ async def handle_cache(
     cache_entry = await hashing_kv.get_by_id(flattened_key)
     if cache_entry:
         logger.debug(f"Flattened cache hit(key:{flattened_key})")
+        record_cache(cache_type, hits=1)
         content = cache_entry["return"]
         timestamp = cache_entry.get("create_time", 0)
         return content, timestamp
 
     logger.debug(f"Cache missed(mode:{mode} type:{cache_type})")
+    record_cache(cache_type, misses=1)
     return None
 
 
@@ -1596,140 +2439,424 @@ def always_get_an_event_loop() -> asyncio.AbstractEventLoop:
         return new_loop
 
 
-async def aexport_data(
+# Formats written incrementally by aexport_data with constant memory
+EXPORT_STREAM_FORMATS = ("csv", "jsonl", "parquet")
+
+_EXPORT_SECTIONS = {
+    "entities": ("entity", "ENTITIES"),
+    "relations": ("relation", "RELATIONS"),
+    "relationships": ("relationship", "RELATIONSHIPS"),
+}
+
+_EXPORT_PARQUET_COLUMNS = (
+    "record_type",
+    "entity_name",
+    "src_entity",
+    "tgt_entity",
+    "relationship_id",
+    "source_id",
+    "graph_data",
+    "vector_data",
+    "data",
+)
+
+
+async def aiter_export_records(
     chunk_entity_relation_graph,
     entities_vdb,
     relationships_vdb,
-    output_path: str,
-    file_format: str = "csv",
     include_vector_data: bool = False,
-) -> None:
+    batch_size: int = 1000,
+    progress_callback: Callable[[str, int], None] | None = None,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
     """
-    Asynchronously exports all entities, relations, and relationships to various formats.
+    Stream all entities, relations and relationships as (section, row) tuples.
+
+    Sections are produced in order: "entities", "relations", "relationships".
+    Graph data is read batch by batch with iter_nodes/iter_edges, and vector
+    data with a single get_by_ids call per batch. iter_edges yields each
+    relation in one direction only, so no set of exported edges is kept and
+    memory stays bounded by the batch size for storages that stream edges.
 
     Args:
         chunk_entity_relation_graph: Graph storage instance for entities and relations
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
-        output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
-            - csv: Comma-separated values file
-            - excel: Microsoft Excel file with multiple sheets
-            - md: Markdown tables
-            - txt: Plain text formatted output
         include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of nodes/edges fetched per batch.
+        progress_callback: Called as progress_callback(section, exported_count) after each batch.
     """
-    # Collect data
-    entities_data = []
-    relations_data = []
-    relationships_data = []
 
-    # --- Entities ---
-    all_entities = await chunk_entity_relation_graph.get_all_labels()
-    for entity_name in all_entities:
-        # Get entity information from graph
-        node_data = await chunk_entity_relation_graph.get_node(entity_name)
-        source_id = node_data.get("source_id") if node_data else None
-
-        entity_info = {
-            "graph_data": node_data,
-            "source_id": source_id,
-        }
+    def report(section: str, count: int):
+        if progress_callback is not None:
+            progress_callback(section, count)
 
-        # Optional: Get vector database information
+    # --- Entities ---
+    count = 0
+    async for nodes in chunk_entity_relation_graph.iter_nodes(batch_size):
+        names = [node.get("id") or node.get("entity_id") for node in nodes]
+        vector_records = {}
         if include_vector_data:
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
-            vector_data = await entities_vdb.get_by_id(entity_id)
-            entity_info["vector_data"] = vector_data
-
-        entity_row = {
-            "entity_name": entity_name,
-            "source_id": source_id,
-            "graph_data": str(
-                entity_info["graph_data"]
-            ),  # Convert to string to ensure compatibility
-        }
-        if include_vector_data and "vector_data" in entity_info:
-            entity_row["vector_data"] = str(entity_info["vector_data"])
-        entities_data.append(entity_row)
+            found = await entities_vdb.get_by_ids(
+                [compute_mdhash_id(name, prefix="ent-") for name in names]
+            )
+            vector_records = {r["id"]: r for r in found if r}
+
+        for name, node in zip(names, nodes):
+            graph_data = {k: v for k, v in node.items() if k != "id"}
+            row = {
+                "entity_name": name,
+                "source_id": graph_data.get("source_id"),
+                "graph_data": graph_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_records.get(
+                    compute_mdhash_id(name, prefix="ent-")
+                )
+            yield "entities", row
+        count += len(nodes)
+        report("entities", count)
+    logger.info(f"Export: {count} entities")
 
     # --- Relations ---
-    for src_entity in all_entities:
-        for tgt_entity in all_entities:
-            if src_entity == tgt_entity:
-                continue
+    count = 0
+    async for edges in chunk_entity_relation_graph.iter_edges(batch_size):
+        batch = [(edge.get("source"), edge.get("target"), edge) for edge in edges]
+
+        vector_records = {}
+        if include_vector_data and batch:
+            # Relation vectors may be stored under either direction
+            rel_ids = []
+            for src, tgt, _ in batch:
+                rel_ids.append(compute_mdhash_id(src + tgt, prefix="rel-"))
+                rel_ids.append(compute_mdhash_id(tgt + src, prefix="rel-"))
+            found = await relationships_vdb.get_by_ids(rel_ids)
+            vector_records = {r["id"]: r for r in found if r}
+
+        for src, tgt, edge in batch:
+            graph_data = {
+                k: v for k, v in edge.items() if k not in ("source", "target")
+            }
+            row = {
+                "src_entity": src,
+                "tgt_entity": tgt,
+                "source_id": graph_data.get("source_id"),
+                "graph_data": graph_data,
+            }
+            if include_vector_data:
+                row["vector_data"] = vector_records.get(
+                    compute_mdhash_id(src + tgt, prefix="rel-")
+                ) or vector_records.get(compute_mdhash_id(tgt + src, prefix="rel-"))
+            yield "relations", row
+        count += len(batch)
+        report("relations", count)
+    logger.info(f"Export: {count} relations")
 
-            edge_exists = await chunk_entity_relation_graph.has_edge(
-                src_entity, tgt_entity
-            )
-            if edge_exists:
-                # Get edge information from graph
-                edge_data = await chunk_entity_relation_graph.get_edge(
-                    src_entity, tgt_entity
-                )
-                source_id = edge_data.get("source_id") if edge_data else None
+    # --- Relationships (from VectorDB) ---
+    # Only in-process vector storages expose their raw records
+    all_relationships = getattr(relationships_vdb, "client_storage", None)
+    if inspect.isawaitable(all_relationships):
+        all_relationships = await all_relationships
+    if all_relationships is None:
+        logger.info("Export: relationship vector storage does not expose raw records")
+        return
 
-                relation_info = {
-                    "graph_data": edge_data,
-                    "source_id": source_id,
-                }
+    count = 0
+    for rel in all_relationships.get("data", []):
+        yield "relationships", {"relationship_id": rel["__id__"], "data": rel}
+        count += 1
+        if count % batch_size == 0:
+            report("relationships", count)
+    report("relationships", count)
+    logger.info(f"Export: {count} relationships")
 
-                # Optional: Get vector database information
-                if include_vector_data:
-                    rel_id = compute_mdhash_id(src_entity + tgt_entity, prefix="rel-")
-                    vector_data = await relationships_vdb.get_by_id(rel_id)
-                    relation_info["vector_data"] = vector_data
-
-                relation_row = {
-                    "src_entity": src_entity,
-                    "tgt_entity": tgt_entity,
-                    "source_id": relation_info["source_id"],
-                    "graph_data": str(relation_info["graph_data"]),  # Convert to string
-                }
-                if include_vector_data and "vector_data" in relation_info:
-                    relation_row["vector_data"] = str(relation_info["vector_data"])
-                relations_data.append(relation_row)
 
-    # --- Relationships (from VectorDB) ---
-    all_relationships = await relationships_vdb.client_storage
-    for rel in all_relationships["data"]:
-        relationships_data.append(
-            {
-                "relationship_id": rel["__id__"],
-                "data": str(rel),  # Convert to string for compatibility
+def _legacy_export_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Render structured export values as strings, as earlier exports did"""
+    return {
+        k: str(v) if k in ("graph_data", "vector_data", "data") else v
+        for k, v in row.items()
+    }
+
+
+async def aiter_export_text(
+    records: AsyncIterator[tuple[str, dict[str, Any]]],
+    file_format: str = "jsonl",
+    flush_size: int = 64 * 1024,
+) -> AsyncIterator[str]:
+    """
+    Encode export records as CSV or JSONL text, yielded in chunks of about flush_size characters.
+
+    - csv: one "# SECTION" block with its own header per section
+    - jsonl: one JSON object per line with a "record_type" field
+    """
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported text export format: {file_format}")
+
+    buffer = io.StringIO()
+    writer = None
+    current_section = None
+    async for section, row in records:
+        if file_format == "csv":
+            row = _legacy_export_row(row)
+            if section != current_section:
+                if current_section is not None:
+                    buffer.write("\n\n")
+                buffer.write(f"# {_EXPORT_SECTIONS[section][1]}\n")
+                writer = csv.DictWriter(buffer, fieldnames=row.keys())
+                writer.writeheader()
+                current_section = section
+            writer.writerow(row)
+        else:
+            record = {"record_type": _EXPORT_SECTIONS[section][0], **row}
+            buffer.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+        if buffer.tell() >= flush_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _awrite_export_parquet(
+    records: AsyncIterator[tuple[str, dict[str, Any]]],
+    output_path: str,
+    batch_size: int = 1000,
+) -> None:
+    """Write export records to a single Parquet file, one row group per batch"""
+    import pipmaster as pm
+
+    if not pm.is_installed("pyarrow"):
+        pm.install("pyarrow")
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # One table for all sections; nested values are stored as JSON strings
+    schema = pa.schema([(column, pa.string()) for column in _EXPORT_PARQUET_COLUMNS])
+    rows = []
+    with pq.ParquetWriter(output_path, schema) as writer:
+        async for section, row in records:
+            record = {"record_type": _EXPORT_SECTIONS[section][0]}
+            for key, value in row.items():
+                if value is not None and not isinstance(value, str):
+                    value = json.dumps(value, ensure_ascii=False, default=str)
+                record[key] = value
+            rows.append(record)
+            if len(rows) >= batch_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+
+def project_knowledge_graph(
+    knowledge_graph: KnowledgeGraph, fields: Collection[str] | None
+) -> KnowledgeGraph:
+    """Keep only the given properties on every node and edge.
+
+    fields=None returns the graph unchanged; an empty collection keeps ids,
+    labels, edge endpoints and types only, so clients can fetch details on demand.
+    """
+    if fields is None:
+        return knowledge_graph
+
+    def project(properties: dict[str, Any]) -> dict[str, Any]:
+        return {key: properties[key] for key in fields if key in properties}
+
+    return knowledge_graph.model_copy(
+        update={
+            "nodes": [
+                node.model_copy(update={"properties": project(node.properties)})
+                for node in knowledge_graph.nodes
+            ],
+            "edges": [
+                edge.model_copy(update={"properties": project(edge.properties)})
+                for edge in knowledge_graph.edges
+            ],
+        }
+    )
+
+
+def iter_knowledge_graph_ndjson(
+    knowledge_graph: KnowledgeGraph, flush_size: int = 64 * 1024
+) -> Iterator[str]:
+    """
+    Encode a knowledge graph as NDJSON, yielded in chunks of about flush_size characters.
+
+    The first line is {"record_type": "graph", "is_truncated", "node_count",
+    "edge_count"}, followed by one {"record_type": "node", ...} line per node and
+    one {"record_type": "edge", ...} line per edge, so clients can render nodes
+    before the edges arrive.
+    """
+    buffer = io.StringIO()
+    header = {
+        "record_type": "graph",
+        "is_truncated": knowledge_graph.is_truncated,
+        "node_count": len(knowledge_graph.nodes),
+        "edge_count": len(knowledge_graph.edges),
+    }
+    buffer.write(json.dumps(header) + "\n")
+    for record_type, items in (
+        ("node", knowledge_graph.nodes),
+        ("edge", knowledge_graph.edges),
+    ):
+        for item in items:
+            record = {"record_type": record_type, **item.model_dump()}
+            buffer.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            if buffer.tell() >= flush_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_knowledge_graph_arrow(
+    knowledge_graph: KnowledgeGraph, batch_size: int = 1000
+) -> Iterator[bytes]:
+    """
+    Encode a knowledge graph as an Apache Arrow IPC stream, one record batch at a time.
+
+    Nodes and edges share one columnar table tagged with record_type: nodes fill
+    id and labels, edges fill id, type, source and target. Properties are JSON
+    strings (null when empty). is_truncated, node_count and edge_count are
+    stored in the schema metadata.
+    """
+    import pipmaster as pm
+
+    if not pm.is_installed("pyarrow"):
+        pm.install("pyarrow")
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            ("record_type", pa.string()),
+            ("id", pa.string()),
+            ("labels", pa.list_(pa.string())),
+            ("type", pa.string()),
+            ("source", pa.string()),
+            ("target", pa.string()),
+            ("properties", pa.string()),
+        ],
+        metadata={
+            "is_truncated": str(knowledge_graph.is_truncated).lower(),
+            "node_count": str(len(knowledge_graph.nodes)),
+            "edge_count": str(len(knowledge_graph.edges)),
+        },
+    )
+
+    def encode(properties: dict[str, Any]) -> str | None:
+        if not properties:
+            return None
+        return json.dumps(properties, ensure_ascii=False, default=str)
+
+    def rows() -> Iterator[dict[str, Any]]:
+        for node in knowledge_graph.nodes:
+            yield {
+                "record_type": "node",
+                "id": node.id,
+                "labels": node.labels,
+                "properties": encode(node.properties),
             }
+        for edge in knowledge_graph.edges:
+            yield {
+                "record_type": "edge",
+                "id": edge.id,
+                "type": edge.type,
+                "source": edge.source,
+                "target": edge.target,
+                "properties": encode(edge.properties),
+            }
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        batch = []
+        for row in rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+                batch = []
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+    # Remaining batch (or just the schema for an empty graph) and end-of-stream marker
+    yield sink.getvalue()
+
+
+async def aexport_data(
+    chunk_entity_relation_graph,
+    entities_vdb,
+    relationships_vdb,
+    output_path: str,
+    file_format: str = "csv",
+    include_vector_data: bool = False,
+    batch_size: int = 1000,
+    progress_callback: Callable[[str, int], None] | None = None,
+) -> None:
+    """
+    Asynchronously exports all entities, relations, and relationships to various formats.
+
+    Args:
+        chunk_entity_relation_graph: Graph storage instance for entities and relations
+        entities_vdb: Vector database storage for entities
+        relationships_vdb: Vector database storage for relationships
+        output_path: The path to the output file (including extension).
+        file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+            - csv: Comma-separated values file
+            - jsonl: One JSON object per line, tagged with record_type
+            - parquet: Single Parquet table, tagged with record_type (requires pyarrow)
+            - excel: Microsoft Excel file with multiple sheets
+            - md: Markdown tables
+            - txt: Plain text formatted output
+            csv, jsonl and parquet are written incrementally with constant memory;
+            excel, md and txt need all rows in memory to lay out the document.
+        include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of nodes/edges fetched per batch.
+        progress_callback: Called as progress_callback(section, exported_count) after each batch.
+    """
+    if file_format not in EXPORT_STREAM_FORMATS + ("excel", "md", "txt"):
+        raise ValueError(
+            f"Unsupported file format: {file_format}. "
+            "Choose from: csv, jsonl, parquet, excel, md, txt"
         )
 
-    # Export based on format
-    if file_format == "csv":
-        # CSV export
-        with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
-            # Entities
-            if entities_data:
-                csvfile.write("# ENTITIES\n")
-                writer = csv.DictWriter(csvfile, fieldnames=entities_data[0].keys())
-                writer.writeheader()
-                writer.writerows(entities_data)
-                csvfile.write("\n\n")
+    records = aiter_export_records(
+        chunk_entity_relation_graph,
+        entities_vdb,
+        relationships_vdb,
+        include_vector_data=include_vector_data,
+        batch_size=batch_size,
+        progress_callback=progress_callback,
+    )
 
-            # Relations
-            if relations_data:
-                csvfile.write("# RELATIONS\n")
-                writer = csv.DictWriter(csvfile, fieldnames=relations_data[0].keys())
-                writer.writeheader()
-                writer.writerows(relations_data)
-                csvfile.write("\n\n")
+    if file_format in ("csv", "jsonl"):
+        with open(output_path, "w", newline="", encoding="utf-8") as outfile:
+            async for chunk in aiter_export_text(records, file_format):
+                outfile.write(chunk)
+        print(f"Data exported to: {output_path} with format: {file_format}")
+        return
+    if file_format == "parquet":
+        await _awrite_export_parquet(records, output_path, batch_size)
+        print(f"Data exported to: {output_path} with format: {file_format}")
+        return
 
-            # Relationships
-            if relationships_data:
-                csvfile.write("# RELATIONSHIPS\n")
-                writer = csv.DictWriter(
-                    csvfile, fieldnames=relationships_data[0].keys()
-                )
-                writer.writeheader()
-                writer.writerows(relationships_data)
+    # Collect data for the document formats
+    entities_data = []
+    relations_data = []
+    relationships_data = []
+    sections = {
+        "entities": entities_data,
+        "relations": relations_data,
+        "relationships": relationships_data,
+    }
+    async for section, row in records:
+        sections[section].append(_legacy_export_row(row))
 
-    elif file_format == "excel":
+    if file_format == "excel":
         # Excel export
         import pandas as pd
 
@@ -1889,14 +3016,7 @@ async def aexport_data(
             else:
                 txtfile.write("No relationship data available\n\n")
 
-    else:
-        raise ValueError(
-            f"Unsupported file format: {file_format}. Choose from: csv, excel, md, txt"
-        )
-    if file_format is not None:
-        print(f"Data exported to: {output_path} with format: {file_format}")
-    else:
-        print("Data displayed as table format")
+    print(f"Data exported to: {output_path} with format: {file_format}")
 
 
 def export_data(
@@ -1906,6 +3026,8 @@ def export_data(
     output_path: str,
     file_format: str = "csv",
     include_vector_data: bool = False,
+    batch_size: int = 1000,
+    progress_callback: Callable[[str, int], None] | None = None,
 ) -> None:
     """
     Synchronously exports all entities, relations, and relationships to various formats.
@@ -1915,12 +3037,11 @@ def export_data(
         entities_vdb: Vector database storage for entities
         relationships_vdb: Vector database storage for relationships
         output_path: The path to the output file (including extension).
-        file_format: Output format - "csv", "excel", "md", "txt".
-            - csv: Comma-separated values file
-            - excel: Microsoft Excel file with multiple sheets
-            - md: Markdown tables
-            - txt: Plain text formatted output
+        file_format: Output format - "csv", "jsonl", "parquet", "excel", "md", "txt".
+            See aexport_data for details.
         include_vector_data: Whether to include data from the vector database.
+        batch_size: Number of nodes/edges fetched per batch.
+        progress_callback: Called as progress_callback(section, exported_count) after each batch.
     """
     try:
         loop = asyncio.get_event_loop()
@@ -1936,6 +3057,8 @@ def export_data(
             output_path,
             file_format,
             include_vector_data,
+            batch_size,
+            progress_callback,
         )
     )
 
@@ -2078,60 +3201,67 @@ async def use_llm_func_with_cache(
         # Generate cache key for this LLM call
         cache_key = generate_cache_key("default", cache_type, arg_hash)
 
-        cached_result = await handle_cache(
-            llm_response_cache,
-            arg_hash,
-            _prompt,
-            "default",
-            cache_type=cache_type,
-        )
-        if cached_result:
-            content, timestamp = cached_result
-            logger.debug(f"Found cache for {arg_hash}")
-            statistic_data["llm_cache"] += 1
-
-            # Add cache key to collector if provided
-            if cache_keys_collector is not None:
-                cache_keys_collector.append(cache_key)
-
-            return content, timestamp
-        statistic_data["llm_call"] += 1
-
-        # Call LLM with sanitized input
-        kwargs = {}
-        if safe_history_messages:
-            kwargs["history_messages"] = safe_history_messages
-        if max_tokens is not None:
-            kwargs["max_tokens"] = max_tokens
-        if max_completion_tokens is not None:
-            kwargs["max_completion_tokens"] = max_completion_tokens
-
-        res: str = await use_llm_func(
-            safe_user_prompt, system_prompt=safe_system_prompt, **kwargs
-        )
+        async def call_llm_with_cache() -> tuple[str, int]:
+            cached_result = await handle_cache(
+                llm_response_cache,
+                arg_hash,
+                _prompt,
+                "default",
+                cache_type=cache_type,
+            )
+            if cached_result:
+                content, timestamp = cached_result
+                logger.debug(f"Found cache for {arg_hash}")
+                statistic_data["llm_cache"] += 1
+                return content, timestamp
+            statistic_data["llm_call"] += 1
+
+            # Call LLM with sanitized input
+            kwargs = {}
+            if safe_history_messages:
+                kwargs["history_messages"] = safe_history_messages
+            if max_tokens is not None:
+                kwargs["max_tokens"] = max_tokens
+            if max_completion_tokens is not None:
+                kwargs["max_completion_tokens"] = max_completion_tokens
+
+            res: str = await use_llm_func(
+                safe_user_prompt, system_prompt=safe_system_prompt, **kwargs
+            )
 
-        res = remove_think_tags(res)
+            res = remove_think_tags(res)
 
-        # Generate timestamp for cache miss (LLM call completion time)
-        current_timestamp = int(time.time())
+            # Generate timestamp for cache miss (LLM call completion time)
+            current_timestamp = int(time.time())
 
-        if llm_response_cache.global_config.get("enable_llm_cache_for_entity_extract"):
-            await save_to_cache(
-                llm_response_cache,
-                CacheData(
-                    args_hash=arg_hash,
-                    content=res,
-                    prompt=_prompt,
-                    cache_type=cache_type,
-                    chunk_id=chunk_id,
-                ),
-            )
+            if llm_response_cache.global_config.get(
+                "enable_llm_cache_for_entity_extract"
+            ):
+                await save_to_cache(
+                    llm_response_cache,
+                    CacheData(
+                        args_hash=arg_hash,
+                        content=res,
+                        prompt=_prompt,
+                        cache_type=cache_type,
+                        chunk_id=chunk_id,
+                    ),
+                )
+            return res, current_timestamp
 
-            # Add cache key to collector if provided
-            if cache_keys_collector is not None:
-                cache_keys_collector.append(cache_key)
+        # Concurrent calls for the same uncached prompt share a single LLM call
+        res, timestamp = await llm_single_flight.do(
+            single_flight_key(llm_response_cache, "default", cache_type, arg_hash),
+            call_llm_with_cache,
+        )
+
+        # Add cache key to collector if provided (the response is cached)
+        if cache_keys_collector is not None and llm_response_cache.global_config.get(
+            "enable_llm_cache_for_entity_extract"
+        ):
+            cache_keys_collector.append(cache_key)
 
-        return res, current_timestamp
+        return res, timestamp
 
     # When cache is disabled, directly call LLM with sanitized input
     kwargs = {}
@@ -2640,6 +3770,24 @@ async def pick_by_vector_similarity(
         return all_chunk_ids[:num_of_chunks]
 
 
+# Heading in front of the retrieved context in the query prompts (rag_response,
+# naive_rag_response); everything before it is the same for every query
+PROMPT_CONTEXT_HEADING = "---Context---"
+
+
+def split_prompt_context(system_prompt: str) -> tuple[str, str]:
+    """Split a system prompt into its static instructions and per-query context
+
+    Returns (instructions, context), where context starts at the last context
+    heading. Prompts without the heading, such as the extraction prompts, are
+    static as a whole and return an empty context.
+    """
+    index = system_prompt.rfind(PROMPT_CONTEXT_HEADING)
+    if index < 0:
+        return system_prompt, ""
+    return system_prompt[:index], system_prompt[index:]
+
+
 class TokenTracker:
     """Track token usage for LLM calls."""
 
@@ -2655,6 +3803,7 @@ class TokenTracker:
 
     def reset(self):
         self.prompt_tokens = 0
+        self.cached_tokens = 0
         self.completion_tokens = 0
         self.total_tokens = 0
         self.call_count = 0
@@ -2664,8 +3813,11 @@ class TokenTracker:
 
         Args:
             token_counts: A dictionary containing prompt_tokens, completion_tokens, total_tokens
+                and optionally cached_tokens, the part of prompt_tokens served from the
+                provider's prompt cache
         """
         self.prompt_tokens += token_counts.get("prompt_tokens", 0)
+        self.cached_tokens += token_counts.get("cached_tokens", 0)
         self.completion_tokens += token_counts.get("completion_tokens", 0)
 
         # If total_tokens is provided, use it directly; otherwise calculate the sum
@@ -2682,6 +3834,8 @@ class TokenTracker:
         """Get current usage statistics."""
         return {
             "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "uncached_prompt_tokens": self.prompt_tokens - self.cached_tokens,
             "completion_tokens": self.completion_tokens,
             "total_tokens": self.total_tokens,
             "call_count": self.call_count,
@@ -2691,12 +3845,95 @@ class TokenTracker:
         usage = self.get_usage()
         return (
             f"LLM call count: {usage['call_count']}, "
-            f"Prompt tokens: {usage['prompt_tokens']}, "
+            f"Prompt tokens: {usage['prompt_tokens']} "
+            f"({usage['cached_tokens']} cached), "
             f"Completion tokens: {usage['completion_tokens']}, "
             f"Total tokens: {usage['total_tokens']}"
         )
 
 
+class RerankScoreCache:
+    """Bounded LRU cache of rerank scores.
+
+    Entries are keyed by (workspace, rerank model, normalized query hash, chunk
+    key), so repeated and follow-up queries only send unseen chunks to the
+    reranker. Cached scores for a chunk are dropped when the chunk is deleted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_RERANK_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._scores: OrderedDict[tuple[str, str, str, str], float] = OrderedDict()
+        # (workspace, chunk key) -> cache keys, for invalidation on chunk deletion
+        self._chunk_keys: dict[tuple[str, str], set[tuple[str, str, str, str]]] = (
+            defaultdict(set)
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def query_hash(query: str) -> str:
+        """Hash a query after case and whitespace normalization"""
+        return md5(" ".join(query.lower().split()).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, key: tuple[str, str, str, str]) -> float | None:
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._scores.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def set(self, key: tuple[str, str, str, str], score: float) -> None:
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        self._chunk_keys[(key[0], key[3])].add(key)
+        while len(self._scores) > max(self.max_size, 0):
+            self._discard(self._scores.popitem(last=False)[0])
+
+    def _discard(self, key: tuple[str, str, str, str]) -> None:
+        chunk_key = (key[0], key[3])
+        keys = self._chunk_keys.get(chunk_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._chunk_keys[chunk_key]
+
+    def invalidate_chunks(self, workspace: str, chunk_ids: Iterable[str]) -> int:
+        """Remove all cached scores of the given chunks, returns entries removed"""
+        removed = 0
+        for chunk_id in chunk_ids:
+            for key in self._chunk_keys.pop((workspace, chunk_id), ()):
+                if self._scores.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self._scores.clear()
+        self._chunk_keys.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Process-wide rerank score cache shared by all LightRAG instances (keys carry
+# the workspace). Module level because global_config is rebuilt per query.
+rerank_score_cache = RerankScoreCache()
+
+
+def _get_rerank_model_name(rerank_func: Callable[..., Any]) -> str:
+    """Identify the reranker so scores from different models never mix"""
+    func = rerank_func
+    model = getattr(func, "model", None)
+    while model is None and isinstance(func, partial):
+        model = func.keywords.get("model")
+        func = func.func
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', type(func).__name__)}"
+    return f"{name}:{model}" if model else name
+
+
 async def apply_rerank_if_enabled(
     query: str,
     retrieved_docs: list[dict],
@@ -2707,6 +3944,10 @@ async def apply_rerank_if_enabled(
     """
     Apply reranking to retrieved documents if rerank is enabled.
 
+    When ``enable_rerank_cache`` is set in global_config, previously computed
+    scores are reused from ``rerank_score_cache`` and only uncached documents
+    are sent to the rerank model.
+
     Args:
         query: The search query
         retrieved_docs: List of retrieved documents
@@ -2741,12 +3982,17 @@ async def apply_rerank_if_enabled(
             )
             document_texts.append(content)
 
-        # Call the new rerank function that returns index-based results
-        rerank_results = await rerank_func(
-            query=query,
-            documents=document_texts,
-            top_n=top_n,
-        )
+        if global_config.get("enable_rerank_cache", False):
+            rerank_results = await _rerank_with_cache(
+                query, retrieved_docs, document_texts, rerank_func, global_config, top_n
+            )
+        else:
+            # Call the new rerank function that returns index-based results
+            rerank_results = await rerank_func(
+                query=query,
+                documents=document_texts,
+                top_n=top_n,
+            )
 
         # Process rerank results based on return format
         if rerank_results and len(rerank_results) > 0:
@@ -2781,6 +4027,67 @@ async def apply_rerank_if_enabled(
         return retrieved_docs
 
 
+async def _rerank_with_cache(
+    query: str,
+    retrieved_docs: list[dict],
+    document_texts: list[str],
+    rerank_func: Callable[..., Any],
+    global_config: dict,
+    top_n: int | None,
+) -> list[Any]:
+    """Rerank through rerank_score_cache, scoring only uncached documents
+
+    Returns index-based results sorted by score (top_n applied), or the raw
+    output of rerank_func if it uses the legacy document-list format.
+    """
+    rerank_score_cache.max_size = global_config.get(
+        "rerank_cache_max_size", DEFAULT_RERANK_CACHE_MAX_SIZE
+    )
+    workspace = global_config.get("workspace") or ""
+    model_name = _get_rerank_model_name(rerank_func)
+    query_hash = RerankScoreCache.query_hash(query)
+
+    cache_keys = [
+        (
+            workspace,
+            model_name,
+            query_hash,
+            doc.get("chunk_id") or compute_mdhash_id(text, prefix="content-"),
+        )
+        for doc, text in zip(retrieved_docs, document_texts)
+    ]
+    scores = [rerank_score_cache.get(key) for key in cache_keys]
+    missing = [i for i, score in enumerate(scores) if score is None]
+
+    if missing:
+        # Score every uncached document (no top_n) so all results can be cached
+        results = await rerank_func(
+            query=query,
+            documents=[document_texts[i] for i in missing],
+            top_n=None,
+        )
+        if results and not (isinstance(results[0], dict) and "index" in results[0]):
+            # Legacy document-list format cannot be cached
+            return results[:top_n] if top_n else results
+        for result in results or []:
+            if 0 <= result["index"] < len(missing):
+                doc_index = missing[result["index"]]
+                scores[doc_index] = result["relevance_score"]
+                rerank_score_cache.set(cache_keys[doc_index], result["relevance_score"])
+
+    logger.debug(
+        f"Rerank cache: {len(retrieved_docs) - len(missing)} hits, {len(missing)} scored"
+    )
+
+    rerank_results = [
+        {"index": i, "relevance_score": score}
+        for i, score in enumerate(scores)
+        if score is not None
+    ]
+    rerank_results.sort(key=lambda x: x["relevance_score"], reverse=True)
+    return rerank_results[:top_n] if top_n else rerank_results
+
+
 async def process_chunks_unified(
     query: str,
     unique_chunks: list[dict],
@@ -2811,13 +4118,14 @@ async def process_chunks_unified(
     # 1. Apply reranking if enabled and query is provided
     if query_param.enable_rerank and query and unique_chunks:
         rerank_top_k = query_param.chunk_top_k or len(unique_chunks)
-        unique_chunks = await apply_rerank_if_enabled(
-            query=query,
-            retrieved_docs=unique_chunks,
-            global_config=global_config,
-            enable_rerank=query_param.enable_rerank,
-            top_n=rerank_top_k,
-        )
+        with stage_span("rerank"):
+            unique_chunks = await apply_rerank_if_enabled(
+                query=query,
+                retrieved_docs=unique_chunks,
+                global_config=global_config,
+                enable_rerank=query_param.enable_rerank,
+                top_n=rerank_top_k,
+            )
 
     # 2. Filter by minimum rerank score if reranking is enabled
     if query_param.enable_rerank and unique_chunks:
@@ -0,0 +1,150 @@
+"""
+Tests for the adaptive (AIMD) concurrency limit of priority_limit_async_func_call.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag.utils import (
+    AdaptiveConcurrencyController,
+    get_concurrency_metrics,
+    priority_limit_async_func_call,
+)
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+async def run_call(controller, latency, error=None):
+    await controller.acquire()
+    await controller.release(latency, error)
+
+
+@pytest.mark.offline
+class TestAdaptiveConcurrencyController:
+    async def test_additive_increase_up_to_max(self):
+        controller = AdaptiveConcurrencyController(1, 4, initial_limit=2)
+        for _ in range(20):
+            await run_call(controller, 1.0)
+        assert controller.limit == 4
+
+    async def test_multiplicative_decrease_once_per_round(self):
+        controller = AdaptiveConcurrencyController(1, 16, initial_limit=16)
+        for _ in range(3):
+            await run_call(controller, 1.0, RateLimitError())
+        # A burst of 429s from the same round only halves the limit once
+        assert controller.limit == 8
+        assert controller.get_metrics()["rate_limited"] == 3
+
+        controller._last_decrease -= 10
+        await run_call(controller, 1.0, TimeoutError())
+        assert controller.limit == 4
+
+    async def test_errors_without_capacity_signal_are_ignored(self):
+        controller = AdaptiveConcurrencyController(1, 8, initial_limit=8)
+        await run_call(controller, 1.0, ValueError("bad request"))
+        assert controller.limit == 8
+
+    async def test_latency_rise_backs_off(self):
+        controller = AdaptiveConcurrencyController(1, 8, initial_limit=8)
+        for _ in range(20):
+            await run_call(controller, 0.1)
+        for _ in range(5):
+            await run_call(controller, 2.0)
+        assert controller.limit < 8
+
+    async def test_retry_after_pauses_new_calls(self):
+        controller = AdaptiveConcurrencyController(1, 4, initial_limit=4)
+        await run_call(controller, 0.01, RateLimitError(retry_after=0.3))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await controller.acquire()
+        assert loop.time() - start >= 0.25
+        await controller.release(0.01)
+
+
+@pytest.mark.offline
+async def test_limited_func_follows_adaptive_limit():
+    running = 0
+    over_limit = []
+    failures = iter([True, True])
+
+    async def call(x):
+        nonlocal running
+        running += 1
+        # A call only starts while fewer calls than the current limit are running
+        if running > func.get_metrics()["limit"]:
+            over_limit.append(running)
+        try:
+            await asyncio.sleep(0.01)
+            if next(failures, False):
+                raise RateLimitError()
+            return x
+        finally:
+            running -= 1
+
+    func = priority_limit_async_func_call(
+        8, queue_name="adaptive-test", adaptive=True, min_size=1
+    )(call)
+    try:
+        metrics = func.get_metrics()
+        assert metrics["adaptive"] and metrics["limit"] == 4
+
+        results = await asyncio.gather(
+            *(func(i) for i in range(20)), return_exceptions=True
+        )
+        assert [r for r in results if not isinstance(r, Exception)] == list(
+            range(2, 20)
+        )
+        assert over_limit == []
+        metrics = func.get_metrics()
+        assert metrics["rate_limited"] == 2
+        assert metrics["queue_depth"] == 0 and metrics["executing"] == 0
+        assert any(
+            m["queue_name"] == "adaptive-test" for m in get_concurrency_metrics()
+        )
+    finally:
+        await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_reduced_limit_keeps_waiting_calls_queued():
+    order = []
+    release = asyncio.Event()
+
+    async def call(name):
+        if name == "rate-limited":
+            raise RateLimitError()
+        if name == "blocker":
+            await release.wait()
+        order.append(name)
+        return name
+
+    func = priority_limit_async_func_call(
+        4, queue_name="adaptive-priority-test", adaptive=True, min_size=1
+    )(call)
+    try:
+        with pytest.raises(RateLimitError):
+            await func("rate-limited")
+        assert func.get_metrics()["limit"] == 1
+
+        blocker = asyncio.create_task(func("blocker", _priority=8))
+        await asyncio.sleep(0.05)
+        bulk = [asyncio.create_task(func(f"bulk-{i}", _priority=8)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        # Idle workers must not hold bulk calls while the limit is reduced
+        query = asyncio.create_task(func("query", _priority=5))
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(blocker, query, *bulk)
+
+        assert order == ["blocker", "query", "bulk-0", "bulk-1", "bulk-2"]
+    finally:
+        await func.shutdown()
@@ -0,0 +1,147 @@
+"""
+Tests for rebuilding the knowledge graph from structured chunk extraction records.
+"""
+
+import pytest
+
+from lightrag import operate
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.operate import (
+    _build_chunk_extraction_record,
+    _parse_chunk_extraction_record,
+    rebuild_knowledge_from_chunks,
+)
+
+EXTRACTION_OUTPUT = (
+    "entity<|#|>Alice<|#|>person<|#|>Alice is an engineer.\n"
+    "entity<|#|>Acme<|#|>organization<|#|>Acme builds robots.\n"
+    "relation<|#|>Alice<|#|>Acme<|#|>employment<|#|>Alice works at Acme.\n"
+    "<|COMPLETE|>"
+)
+
+
+class FakeKV:
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.requested = []
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        self.requested.extend(ids)
+        return [self.data.get(i) for i in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+class FakeGraph:
+    def __init__(self):
+        self.nodes = {
+            "Alice": {"entity_id": "Alice", "description": "stale"},
+            "Acme": {"entity_id": "Acme", "description": "stale"},
+        }
+
+    async def get_node(self, name):
+        return self.nodes.get(name)
+
+    async def upsert_node(self, name, data):
+        self.nodes[name] = data
+
+
+class FakeVDB:
+    def __init__(self):
+        self.data = {}
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+def make_config():
+    return {
+        "max_source_ids_per_entity": 300,
+        "source_ids_limit_method": "KEEP",
+        "llm_model_max_async": 2,
+        "workspace": "",
+    }
+
+
+async def rebuild(text_chunks, llm_cache, chunk_extractions):
+    graph, entities_vdb = FakeGraph(), FakeVDB()
+    await rebuild_knowledge_from_chunks(
+        entities_to_rebuild={"Alice": ["chunk-1"]},
+        relationships_to_rebuild={},
+        knowledge_graph_inst=graph,
+        entities_vdb=entities_vdb,
+        relationships_vdb=FakeVDB(),
+        text_chunks_storage=text_chunks,
+        llm_response_cache=llm_cache,
+        global_config=make_config(),
+        chunk_extractions_storage=chunk_extractions,
+    )
+    return graph
+
+
+@pytest.fixture(autouse=True)
+def shared_storage():
+    initialize_share_data(workers=1)
+
+
+@pytest.mark.offline
+class TestChunkExtractionRecords:
+    async def test_record_round_trip(self):
+        nodes, edges = await operate._process_extraction_result(
+            EXTRACTION_OUTPUT, "chunk-1", 100, "doc.txt"
+        )
+        record = _build_chunk_extraction_record(nodes, edges)
+
+        entities, relationships = _parse_chunk_extraction_record(record)
+        assert dict(entities) == nodes
+        assert dict(relationships) == edges
+        assert _parse_chunk_extraction_record(None) is None
+        assert _parse_chunk_extraction_record({"entities": "bad"}) is None
+
+    async def test_rebuild_uses_records_without_parsing(self, monkeypatch):
+        nodes, edges = await operate._process_extraction_result(
+            EXTRACTION_OUTPUT, "chunk-1", 100, "doc.txt"
+        )
+        chunk_extractions = FakeKV(
+            {"chunk-1": _build_chunk_extraction_record(nodes, edges)}
+        )
+        llm_cache = FakeKV()
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("records must not be re-parsed")
+
+        monkeypatch.setattr(operate, "_process_extraction_result", fail)
+        graph = await rebuild(FakeKV(), llm_cache, chunk_extractions)
+
+        assert graph.nodes["Alice"]["description"] == "Alice is an engineer."
+        assert graph.nodes["Alice"]["file_path"] == "doc.txt"
+        assert llm_cache.requested == []
+
+    async def test_legacy_chunks_are_parsed_and_backfilled(self):
+        text_chunks = FakeKV(
+            {"chunk-1": {"file_path": "doc.txt", "llm_cache_list": ["cache-1"]}}
+        )
+        llm_cache = FakeKV(
+            {
+                "cache-1": {
+                    "cache_type": "extract",
+                    "chunk_id": "chunk-1",
+                    "return": EXTRACTION_OUTPUT,
+                    "create_time": 100,
+                }
+            }
+        )
+        chunk_extractions = FakeKV()
+
+        graph = await rebuild(text_chunks, llm_cache, chunk_extractions)
+
+        assert graph.nodes["Alice"]["description"] == "Alice is an engineer."
+        record = chunk_extractions.data["chunk-1"]
+        assert [e["entity_name"] for e in record["entities"]] == ["Alice", "Acme"]
+        assert [(r["src_id"], r["tgt_id"]) for r in record["relations"]] == [
+            ("Alice", "Acme")
+        ]
@@ -0,0 +1,169 @@
+"""
+Tests for evidence-weighted ranking of retrieved entities and relations.
+"""
+
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.operate import _get_edge_data, _get_node_data
+from lightrag.utils import compute_evidence_scores
+
+
+@pytest.mark.offline
+class TestComputeEvidenceScores:
+    def test_evidence_level_breaks_similarity_ties(self):
+        scores = compute_evidence_scores(
+            ["C", "S", "B", "A"], similarities=[0.8, 0.8, 0.8, 0.8]
+        )
+        assert np.argsort(-scores, kind="stable").tolist() == [1, 3, 2, 0]
+
+    def test_features_are_scaled_to_the_candidate_set(self):
+        scores = compute_evidence_scores(
+            ["B", "B"],
+            similarities=[0.2, 0.1],
+            degrees=[0, 1000],
+            edge_weights=[1.0, 2.0],
+            weights=(1.0, 0.0, 0.0, 0.0),
+        )
+        assert scores.tolist() == [1.0, 0.5]
+
+    def test_missing_features_do_not_lower_the_scale(self):
+        # Without degrees and edge weights the score is the mean of the
+        # remaining weighted features, so a perfect candidate still scores 1
+        scores = compute_evidence_scores(["S"], similarities=[0.9])
+        assert scores.tolist() == pytest.approx([1.0])
+
+    def test_degenerate_inputs(self):
+        assert compute_evidence_scores([]).size == 0
+        assert compute_evidence_scores(
+            ["S", "C"], similarities=[None, 0.5], weights=(1.0, 0.0, 0.0, 0.0)
+        ).tolist() == [0.0, 1.0]
+        assert compute_evidence_scores(["S"], weights=(0, 0, 0, 0)).tolist() == [0.0]
+        # Unknown levels count as B
+        assert (
+            compute_evidence_scores(["x"]).tolist()
+            == compute_evidence_scores(["B"]).tolist()
+        )
+
+
+def make_graph(nodes, degrees, edges=None, edge_degrees=None):
+    graph = AsyncMock()
+    graph.get_nodes_batch.side_effect = lambda ids: {
+        i: nodes[i] for i in ids if i in nodes
+    }
+    graph.node_degrees_batch.return_value = degrees
+    graph.get_nodes_edges_batch.return_value = {}
+    graph.get_edges_batch.return_value = edges or {}
+    graph.edge_degrees_batch.return_value = edge_degrees or {}
+    return graph
+
+
+@pytest.mark.offline
+async def test_local_entities_put_strong_evidence_first():
+    nodes = {
+        "weak": {"entity_type": "x", "evidence_level": "C"},
+        "strong": {"entity_type": "x", "evidence_level": "S"},
+    }
+    entities_vdb = AsyncMock()
+    entities_vdb.cosine_better_than_threshold = 0.2
+    entities_vdb.query.return_value = [
+        {"entity_name": "weak", "distance": 0.82},
+        {"entity_name": "strong", "distance": 0.80},
+    ]
+
+    node_datas, _ = await _get_node_data(
+        "q",
+        make_graph(nodes, {"weak": 3, "strong": 3}),
+        entities_vdb,
+        QueryParam(evidence_ranking=True),
+    )
+    assert [n["entity_name"] for n in node_datas] == ["strong", "weak"]
+    assert node_datas[0]["evidence_score"] > node_datas[1]["evidence_score"]
+
+    # Off by default: entities keep their similarity order
+    node_datas, _ = await _get_node_data(
+        "q", make_graph(nodes, {"weak": 3, "strong": 3}), entities_vdb, QueryParam()
+    )
+    assert [n["entity_name"] for n in node_datas] == ["weak", "strong"]
+
+
+@pytest.mark.offline
+async def test_global_relations_and_entities_are_ranked():
+    edges = {
+        ("a", "b"): {"weight": 1.0, "evidence_level": "C"},
+        ("c", "d"): {"weight": 1.0, "evidence_level": "S"},
+    }
+    nodes = {name: {"entity_type": "x"} for name in "abcd"}
+    nodes["d"]["evidence_level"] = "S"
+    graph = make_graph(nodes, {}, edges, {("a", "b"): 2, ("c", "d"): 2})
+    relationships_vdb = AsyncMock()
+    relationships_vdb.cosine_better_than_threshold = 0.2
+    relationships_vdb.query.return_value = [
+        {"src_id": "a", "tgt_id": "b", "distance": 0.9},
+        {"src_id": "c", "tgt_id": "d", "distance": 0.88},
+    ]
+
+    edge_datas, entities = await _get_edge_data(
+        "q", graph, relationships_vdb, QueryParam(evidence_ranking=True)
+    )
+    assert [(e["src_id"], e["tgt_id"]) for e in edge_datas] == [
+        ("c", "d"),
+        ("a", "b"),
+    ]
+    assert entities[0]["entity_name"] == "d"
+    graph.edge_degrees_batch.assert_awaited_once()
+
+    # Degrees are not fetched when they carry no weight
+    graph.edge_degrees_batch.reset_mock()
+    await _get_edge_data(
+        "q",
+        graph,
+        relationships_vdb,
+        QueryParam(evidence_ranking=True, rank_degree_weight=0.0),
+    )
+    graph.edge_degrees_batch.assert_not_awaited()
+
+
+@pytest.mark.offline
+async def test_rows_without_distance_rank_by_vector_position():
+    # PostgreSQL-style rows: best first, but no distance column
+    nodes = {name: {"entity_type": "x"} for name in ("first", "second", "third")}
+    entities_vdb = AsyncMock()
+    entities_vdb.cosine_better_than_threshold = 0.2
+    entities_vdb.query.return_value = [
+        {"entity_name": "first"},
+        {"entity_name": "second"},
+        {"entity_name": "third"},
+    ]
+    similarity_only = QueryParam(
+        evidence_ranking=True,
+        rank_similarity_weight=1.0,
+        rank_degree_weight=0.0,
+        rank_edge_weight=0.0,
+        rank_evidence_weight=0.0,
+    )
+
+    node_datas, _ = await _get_node_data(
+        "q", make_graph(nodes, {}), entities_vdb, similarity_only
+    )
+    scores = [n["evidence_score"] for n in node_datas]
+    assert [n["entity_name"] for n in node_datas] == ["first", "second", "third"]
+    assert scores[0] > scores[1] > scores[2]
+
+    edges = {("a", "b"): {"weight": 1.0}, ("c", "d"): {"weight": 1.0}}
+    relationships_vdb = AsyncMock()
+    relationships_vdb.cosine_better_than_threshold = 0.2
+    relationships_vdb.query.return_value = [
+        {"src_id": "a", "tgt_id": "b"},
+        {"src_id": "c", "tgt_id": "d"},
+    ]
+    edge_datas, _ = await _get_edge_data(
+        "q",
+        make_graph({n: {"entity_type": "x"} for n in "abcd"}, {}, edges),
+        relationships_vdb,
+        similarity_only,
+    )
+    assert edge_datas[0]["evidence_score"] > edge_datas[1]["evidence_score"]
@@ -0,0 +1,375 @@
+"""
+Tests for the streaming, cursor-paged evidence query endpoints.
+"""
+
+import asyncio
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from lightrag.kg.neo4j_impl import Neo4JStorage, keyset_condition
+
+
+class FakeRecord:
+    def __init__(self, row):
+        self.row = row
+
+    def data(self):
+        return dict(self.row)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+        self.consumed = False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self.rows:
+            yield FakeRecord(row)
+
+    async def data(self):
+        return [dict(row) for row in self.rows]
+
+    async def consume(self):
+        self.consumed = True
+
+
+class FakeSession:
+    def __init__(self, driver, **kwargs):
+        self.driver = driver
+        self.driver.session_kwargs = kwargs
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def run(self, query, parameters=None, **params):
+        self.driver.runs.append((query, {**(parameters or {}), **params}))
+        if self.driver.error is not None:
+            raise self.driver.error
+        self.driver.result = FakeResult(self.driver.rows)
+        return self.driver.result
+
+    async def execute_write(self, func):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, rows=(), error=None):
+        self.rows = list(rows)
+        self.runs = []
+        self.error = error
+
+    def session(self, **kwargs):
+        return FakeSession(self, **kwargs)
+
+
+def make_storage(driver):
+    storage = Neo4JStorage(
+        namespace="chunk_entity_relation",
+        global_config={"working_dir": "tmp"},
+        embedding_func=None,
+        workspace="ws",
+    )
+    storage._driver = driver
+    storage._DATABASE = None
+    return storage
+
+
+@pytest.mark.offline
+class TestNeo4jEvidencePages:
+    def test_keyset_condition(self):
+        assert keyset_condition([("a", "ASC")]) == "a > $after[0]"
+        assert keyset_condition([("a", "DESC"), ("b", "ASC")]) == (
+            "(a < $after[0] OR (a = $after[0] AND b > $after[1]))"
+        )
+
+    def test_page_queries(self):
+        storage = make_storage(FakeDriver())
+
+        query, params = storage._build_evidence_page_query(
+            "entities", {"evidence_level": "s", "scene_tag": "金融"}
+        )
+        assert "n.evidence_level = $evidence_level" in query
+        assert "$after" not in query and "SKIP" not in query
+        assert query.rstrip().endswith("LIMIT $limit")
+        assert params["evidence_level"] == "S"
+        assert params["scene_key"] == "|金融|"
+
+        query, params = storage._build_evidence_page_query(
+            "causal_chain", {"entity_id": "E", "max_depth": 3}, after=[3, 7, "|E|F"]
+        )
+        assert "[:DIRECTED*1..3]" in query
+        assert "chain_length < $after[0]" in query
+        assert params["after"] == [3, 7, "|E|F"]
+
+        with pytest.raises(ValueError):
+            storage._build_evidence_page_query("causal_chain", {})
+        with pytest.raises(ValueError):
+            storage._build_evidence_page_query(
+                "causal_chain", {"entity_id": "E", "max_depth": 50}
+            )
+        with pytest.raises(ValueError):
+            storage._build_evidence_page_query("relations", {}, after=["only-one"])
+        with pytest.raises(ValueError):
+            storage._build_evidence_page_query("everything", {})
+
+    async def test_iter_evidence_streams_decoded_rows(self):
+        driver = FakeDriver(
+            [
+                {
+                    "entity": {"entity_id": "E", "scene_tags_key": "|a|"},
+                    "_sort_key": ["E"],
+                }
+            ]
+        )
+        storage = make_storage(driver)
+
+        rows = [
+            row
+            async for row in storage.iter_evidence(
+                "entities", {"file_path": "f.pdf"}, limit=5, timeout=2.5
+            )
+        ]
+
+        assert rows == [({"entity": {"entity_id": "E"}}, ["E"])]
+        query, params = driver.runs[0]
+        assert query.timeout == 2.5
+        assert params == {"file_path": "f.pdf", "limit": 5}
+        assert driver.session_kwargs["default_access_mode"] == "READ"
+        assert driver.result.consumed
+
+    async def test_iter_evidence_keeps_scalar_aggregate_fields(self):
+        row = {
+            "entity": "Apple",
+            "entity_type": "organization",
+            "level": "S",
+            "tags": ["金融"],
+            "relations": [{"target": "AB", "relation": "owns", "level": "A"}],
+            "total_weight": 3.0,
+            "relation_count": 1,
+        }
+        storage = make_storage(FakeDriver([{**row, "_sort_key": [3.0, "Apple"]}]))
+
+        rows = [r async for r in storage.iter_evidence("aggregate", {}, limit=5)]
+
+        assert rows == [(row, [3.0, "Apple"])]
+
+    async def test_provenance_queries_raise_on_failure(self):
+        driver = FakeDriver([{"provenance": '[{"file": "f.pdf"}]'}])
+        storage = make_storage(driver)
+
+        assert await storage.get_entity_provenance("E") == ['[{"file": "f.pdf"}]']
+        assert await storage.get_relation_provenance("A", "B") == [
+            '[{"file": "f.pdf"}]'
+        ]
+        assert "{entity_id: $entity_name}" in driver.runs[0][0]
+        assert "{entity_id: $source}" in driver.runs[1][0]
+
+        # A failed query is not reported as "no provenance"
+        driver.error = RuntimeError("connection lost")
+        with pytest.raises(RuntimeError):
+            await storage.get_entity_provenance("E")
+        with pytest.raises(RuntimeError):
+            await storage.get_relation_provenance("A", "B")
+
+    async def test_writes_change_the_data_version(self):
+        storage = make_storage(FakeDriver())
+        assert storage.get_data_version() == 0
+
+        await storage.upsert_node("E", {"entity_id": "E", "entity_type": "x"})
+        version = storage.get_data_version()
+        assert version != 0
+
+        await storage.delete_node("E")
+        assert storage.get_data_version() != version
+
+
+class FakeEvidenceGraph:
+    workspace = "ws"
+    namespace = "chunk_entity_relation"
+
+    def __init__(self, count=5, delay=0.0):
+        self.version = 1
+        self.calls = 0
+        self.fail = False
+        self.delay = delay
+        self.entities = [f"E{i}" for i in range(count)]
+
+    def get_data_version(self):
+        return self.version
+
+    async def iter_evidence(self, kind, filters, after=None, limit=100, timeout=None):
+        if kind == "causal_chain" and not filters.get("entity_id"):
+            raise ValueError("causal_chain requires entity_id")
+        self.calls += 1
+        remaining = [e for e in self.entities if after is None or e > after[0]]
+        for entity in remaining[:limit]:
+            await asyncio.sleep(self.delay)
+            yield {"entity": {"entity_id": entity, **filters}}, [entity]
+
+    async def get_entity_provenance(self, entity_name):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("connection lost")
+        return [{"file": "f.pdf"}]
+
+    async def cross_validate(self, claim, min_evidence_count=1):
+        self.calls += 1
+        if self.fail:
+            return {"claim": claim, "conclusion": "查询错误", "error": "unavailable"}
+        return {"claim": claim, "conclusion": "证据不足"}
+
+
+def make_client(graph):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    class FakeRag:
+        chunk_entity_relation_graph = graph
+
+    # The API config parses the command line on first use, and other tests may
+    # have replaced API modules with mocks: import fresh copies for this test
+    with patch.object(sys, "argv", ["lightrag-server"]), patch.dict(sys.modules):
+        for name in [m for m in sys.modules if m.startswith("lightrag.api")]:
+            del sys.modules[name]
+        from lightrag.api.routers.graph_routes import create_graph_routes
+
+        app = FastAPI()
+        app.include_router(create_graph_routes(FakeRag()))
+    return TestClient(app)
+
+
+def read_ndjson(response):
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return [line["record"] for line in lines[:-1]], lines[-1]
+
+
+@pytest.mark.offline
+class TestEvidenceRoutes:
+    def test_cursor_pagination_and_cache(self):
+        graph = FakeEvidenceGraph(count=5)
+        client = make_client(graph)
+
+        response = client.get(
+            "/graph/evidence/entities", params={"evidence_level": "S", "limit": 2}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["x-cache"] == "miss"
+        records, footer = read_ndjson(response)
+        assert [r["entity"]["entity_id"] for r in records] == ["E0", "E1"]
+        assert records[0]["entity"]["evidence_level"] == "S"
+        assert footer["count"] == 2
+
+        seen = [r["entity"]["entity_id"] for r in records]
+        while footer["next_cursor"]:
+            response = client.get(
+                "/graph/evidence/entities",
+                params={
+                    "evidence_level": "S",
+                    "limit": 2,
+                    "cursor": footer["next_cursor"],
+                },
+            )
+            records, footer = read_ndjson(response)
+            seen += [r["entity"]["entity_id"] for r in records]
+        assert seen == ["E0", "E1", "E2", "E3", "E4"]
+        assert graph.calls == 3
+
+        # Repeated pages come from the cache until the graph changes
+        params = {"evidence_level": "S", "limit": 2}
+        response = client.get("/graph/evidence/entities", params=params)
+        assert response.headers["x-cache"] == "hit"
+        assert read_ndjson(response)[0][0]["entity"]["entity_id"] == "E0"
+        assert graph.calls == 3
+
+        graph.version = 2
+        response = client.get("/graph/evidence/entities", params=params)
+        assert response.headers["x-cache"] == "miss"
+        assert response.headers["x-data-version"] == "2"
+        assert graph.calls == 4
+
+    def test_errors(self):
+        client = make_client(FakeEvidenceGraph())
+
+        response = client.get("/graph/evidence/entities", params={"cursor": "!!"})
+        assert response.status_code == 400
+        response = client.get(
+            "/graph/evidence/entities", params={"evidence_level": "X"}
+        )
+        assert response.status_code == 422
+        response = client.get("/graph/evidence/provenance")
+        assert response.status_code == 400
+
+        class PlainGraph:
+            pass
+
+        response = make_client(PlainGraph()).get("/graph/evidence/entities")
+        assert response.status_code == 501
+
+    def test_timeout_mid_stream_returns_resumable_cursor(self):
+        graph = FakeEvidenceGraph(count=50, delay=0.02)
+        client = make_client(graph)
+
+        response = client.get(
+            "/graph/evidence/entities", params={"timeout": 0.1, "limit": 50}
+        )
+        assert response.status_code == 200
+        records, footer = read_ndjson(response)
+        assert "timed out" in footer["error"]
+        assert 0 < len(records) < 50
+
+        # Resume from the cursor of the last streamed row
+        response = client.get(
+            "/graph/evidence/entities",
+            params={"cursor": footer["next_cursor"], "limit": 50},
+        )
+        assert response.status_code == 200
+        resumed, _ = read_ndjson(response)
+        assert resumed[0]["entity"]["entity_id"] > records[-1]["entity"]["entity_id"]
+
+    def test_single_result_queries_are_cached(self):
+        graph = FakeEvidenceGraph()
+        client = make_client(graph)
+
+        for _ in range(2):
+            response = client.get(
+                "/graph/evidence/cross-validate", params={"claim": "C"}
+            )
+            assert response.json()["claim"] == "C"
+        assert graph.calls == 1
+
+    def test_error_results_are_not_cached(self):
+        graph = FakeEvidenceGraph()
+        graph.fail = True
+        client = make_client(graph)
+
+        response = client.get("/graph/evidence/cross-validate", params={"claim": "C"})
+        assert response.json()["error"] == "unavailable"
+
+        # The next request retries the query instead of replaying the error
+        graph.fail = False
+        response = client.get("/graph/evidence/cross-validate", params={"claim": "C"})
+        assert "error" not in response.json()
+        assert graph.calls == 2
+
+    def test_failed_provenance_is_not_cached(self):
+        graph = FakeEvidenceGraph()
+        graph.fail = True
+        client = make_client(graph)
+
+        response = client.get("/graph/evidence/provenance", params={"entity": "E"})
+        assert response.status_code == 500
+
+        graph.fail = False
+        response = client.get("/graph/evidence/provenance", params={"entity": "E"})
+        assert response.json() == {"provenance": [{"file": "f.pdf"}]}
+        assert graph.calls == 2
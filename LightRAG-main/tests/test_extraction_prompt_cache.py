@@ -0,0 +1,117 @@
+"""
+Tests for rendering entity extraction prompts once and sharing their prefixes.
+"""
+
+import pytest
+
+from lightrag import operate
+from lightrag.operate import (
+    _compile_extraction_prompts,
+    _render_extraction_prompts,
+    extract_entities,
+)
+from lightrag.prompt import PROMPTS
+from lightrag.utils import Tokenizer, statistic_data
+
+
+class WordTokenizer:
+    def encode(self, content):
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, prompt, system_prompt=None, **kwargs):
+        self.calls.append((system_prompt, prompt))
+        return "entity<|#|>Alice<|#|>person<|#|>Alice is mentioned.\n<|COMPLETE|>"
+
+
+def make_chunks(count):
+    return {
+        f"chunk-{i}": {
+            "tokens": 3,
+            "content": f"Clause P{i} applies.",
+            "full_doc_id": "doc",
+            "chunk_order_index": i,
+            "file_path": "policy.txt",
+        }
+        for i in range(count)
+    }
+
+
+def make_config(llm, enable_evidence=False, gleaning=0):
+    return {
+        "llm_model_func": llm,
+        "entity_extract_max_gleaning": gleaning,
+        "addon_params": {"enable_evidence": enable_evidence},
+        "tokenizer": Tokenizer("words", WordTokenizer()),
+        "max_extract_input_tokens": 100000,
+        "entity_extract_max_completion_tokens": 1024,
+    }
+
+
+@pytest.mark.offline
+class TestExtractionPromptCache:
+    @pytest.mark.parametrize("enable_evidence", [False, True])
+    async def test_prompts_rendered_once_with_shared_prefix(
+        self, monkeypatch, enable_evidence
+    ):
+        _render_extraction_prompts.cache_clear()
+        renders = []
+        original_render_around = operate._render_around
+
+        def counting_render_around(template, placeholder, **context):
+            renders.append(placeholder)
+            return original_render_around(template, placeholder, **context)
+
+        monkeypatch.setattr(operate, "_render_around", counting_render_around)
+        llm = FakeLLM()
+        for _ in range(2):
+            await extract_entities(make_chunks(3), make_config(llm, enable_evidence))
+
+        # One render for all six chunks of both documents
+        assert renders == ["input_text", "input_texts"]
+        system_prompts = {system for system, _ in llm.calls}
+        assert len(system_prompts) == 1
+        prompts = _compile_extraction_prompts("English", ["Person"], enable_evidence)
+        assert prompts.user_prompt_prefix.startswith("---Task---")
+        for index, (_, user_prompt) in enumerate(llm.calls):
+            # The input text is sent in both modes, after a byte-identical prefix
+            assert f"Clause P{index % 3} applies." in user_prompt
+            assert user_prompt.startswith(
+                user_prompt[: user_prompt.index("```\nClause")]
+            )
+        prefixes = {
+            user_prompt[: user_prompt.index("Clause P")] for _, user_prompt in llm.calls
+        }
+        assert len(prefixes) == 1
+
+    def test_runtime_prompt_changes_are_picked_up(self, monkeypatch):
+        before = _compile_extraction_prompts("English", ["Person"], False)
+        assert _compile_extraction_prompts("English", ["Person"], False) is before
+
+        monkeypatch.setitem(
+            PROMPTS, "entity_extraction_system_prompt", "Custom {language}"
+        )
+        after = _compile_extraction_prompts("English", ["Person"], False)
+        assert after.system_prompt == "Custom English"
+        assert after.user_prompt("text") == before.user_prompt("text")
+
+    async def test_prefix_token_ratio_is_recorded(self):
+        llm = FakeLLM()
+        prompt_tokens = statistic_data["extract_prompt_tokens"]
+        prefix_tokens = statistic_data["extract_prefix_tokens"]
+
+        await extract_entities(make_chunks(2), make_config(llm, gleaning=1))
+
+        prompt_delta = statistic_data["extract_prompt_tokens"] - prompt_tokens
+        prefix_delta = statistic_data["extract_prefix_tokens"] - prefix_tokens
+        assert len(llm.calls) == 4  # initial request and gleaning per chunk
+        assert 0 < prefix_delta < prompt_delta
+        # Only the input text and the closing lines differ between chunks
+        assert prefix_delta / prompt_delta > 0.9
@@ -0,0 +1,208 @@
+"""
+Tests for the configurable Faiss index types (flat, HNSW, IVF-PQ).
+"""
+
+import json
+import os
+import zlib
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+from lightrag.kg.shared_storage import initialize_share_data  # noqa: E402
+from lightrag.namespace import NameSpace  # noqa: E402
+from lightrag.utils import EmbeddingFunc  # noqa: E402
+
+DIM = 16
+
+
+async def deterministic_embedding(texts: list[str], _priority: int = 0) -> np.ndarray:
+    return np.stack(
+        [
+            np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIM)
+            for text in texts
+        ]
+    ).astype(np.float32)
+
+
+async def make_storage(tmp_path, **options):
+    initialize_share_data(workers=1)
+    storage = FaissVectorDBStorage(
+        namespace=NameSpace.VECTOR_STORE_CHUNKS,
+        workspace="ws",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 64,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                **options,
+            },
+        },
+        embedding_func=EmbeddingFunc(
+            embedding_dim=DIM, func=deterministic_embedding, model_name="test"
+        ),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    return storage
+
+
+def docs(start, end):
+    return {f"doc-{i}": {"content": f"text {i}"} for i in range(start, end)}
+
+
+@pytest.mark.offline
+class TestFaissIndexTypes:
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    async def test_delete_without_full_rebuild(self, tmp_path, index_type):
+        storage = await make_storage(tmp_path, faiss_index_type=index_type)
+        await storage.upsert(docs(0, 50))
+        index = storage._index
+
+        await storage.delete(["doc-3", "doc-7"])
+
+        # The same index object is kept; deletes are applied in place
+        assert storage._index is index
+        results = await storage.query("text 3", top_k=50)
+        ids = {r["id"] for r in results}
+        assert "doc-3" not in ids and "doc-7" not in ids
+        assert len(ids) == 48
+        assert (await storage.query("text 5", top_k=1))[0]["id"] == "doc-5"
+
+    async def test_upsert_replaces_existing_vector(self, tmp_path):
+        storage = await make_storage(tmp_path)
+        await storage.upsert(docs(0, 5))
+        await storage.upsert({"doc-1": {"content": "text 4"}})
+
+        assert storage._index.ntotal == 5
+        results = await storage.query("text 4", top_k=2)
+        assert {r["id"] for r in results} == {"doc-1", "doc-4"}
+
+    async def test_ivfpq_trains_after_threshold(self, tmp_path):
+        storage = await make_storage(
+            tmp_path,
+            faiss_index_type="ivfpq",
+            faiss_train_min_vectors=300,
+            faiss_ivf_nlist=4,
+            faiss_pq_m=4,
+            faiss_pq_nbits=4,
+        )
+        await storage.upsert(docs(0, 100))
+        await storage.index_done_callback()
+        # Too few vectors to train: exact flat search is used meanwhile
+        assert storage._index_kind(storage._index) == "flat"
+
+        await storage.upsert(docs(100, 400))
+        await storage.index_done_callback()
+        assert storage._index_kind(storage._index) == "ivfpq"
+        assert storage._index.ntotal == 400
+
+        await storage.delete(["doc-0"])
+        assert storage._index.ntotal == 399
+        assert storage._index_kind(storage._index) == "ivfpq"
+
+    async def test_hnsw_tombstones_rebuild_and_reload(self, tmp_path):
+        storage = await make_storage(
+            tmp_path, faiss_index_type="hnsw", faiss_rebuild_deleted_ratio=0.5
+        )
+        await storage.upsert(docs(0, 20))
+        await storage.delete([f"doc-{i}" for i in range(5)])
+        await storage.index_done_callback()
+
+        # Below the rebuild ratio: tombstones survive a save/reload
+        reloaded = await make_storage(
+            tmp_path, faiss_index_type="hnsw", faiss_rebuild_deleted_ratio=0.5
+        )
+        assert reloaded._deleted_fids == storage._deleted_fids
+        assert len(await reloaded.query("text 1", top_k=20)) == 15
+
+        await storage.delete([f"doc-{i}" for i in range(5, 15)])
+        await storage.index_done_callback()
+        assert not storage._deleted_fids
+        assert storage._index.ntotal == 5
+
+    async def test_ivfpq_delete_keeps_ids_consistent(self, tmp_path):
+        storage = await make_storage(
+            tmp_path,
+            faiss_index_type="ivfpq",
+            faiss_train_min_vectors=300,
+            faiss_ivf_nlist=4,
+            faiss_ivf_nprobe=4,
+        )
+        await storage.upsert(docs(0, 400))
+        await storage.index_done_callback()
+        await storage.delete([f"doc-{i}" for i in range(100)])
+
+        # Removed vectors must not shift the ids of the remaining ones
+        for i in (150, 250, 399):
+            hits = await storage.query(f"text {i}", top_k=1)
+            assert hits[0]["id"] == f"doc-{i}"
+        vectors = await storage.get_vectors_by_ids(["doc-250", "doc-5"])
+        assert list(vectors) == ["doc-250"]
+
+    async def test_metadata_file_has_no_vectors_and_round_trips(self, tmp_path):
+        storage = await make_storage(tmp_path)
+        await storage.upsert(docs(0, 10))
+        await storage.upsert({"doc-3": {"content": "unicode 文本"}})
+        await storage.delete(["doc-5"])
+        await storage.index_done_callback()
+
+        reloaded = await make_storage(tmp_path)
+        assert reloaded._id_to_meta == storage._id_to_meta
+        assert reloaded._custom_id_to_fid == storage._custom_id_to_fid
+        assert (await reloaded.get_by_id("doc-3"))["content"] == "unicode 文本"
+        assert await reloaded.get_by_id("doc-5") is None
+        with np.load(storage._meta_file, allow_pickle=False) as data:
+            assert data["fids"].tolist() == list(storage._id_to_meta)
+
+        vectors = await reloaded.get_vectors_by_ids(["doc-1", "doc-3"])
+        expected = (await deterministic_embedding(["text 1"]))[0]
+        expected /= np.linalg.norm(expected)
+        assert np.allclose(vectors["doc-1"], expected, atol=1e-6)
+        assert set(vectors) == {"doc-1", "doc-3"}
+
+    async def test_legacy_files_are_migrated(self, tmp_path):
+        storage = await make_storage(tmp_path)
+        vectors = await deterministic_embedding([f"text {i}" for i in range(10)])
+        faiss.normalize_L2(vectors)
+        # Write the previous layout: a bare IndexFlatIP with positional ids and
+        # a JSON metadata file holding a copy of every vector
+        legacy = faiss.IndexFlatIP(DIM)
+        legacy.add(vectors)
+        faiss.write_index(legacy, storage._faiss_index_file)
+        with open(storage._legacy_meta_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    str(i): {
+                        "__id__": f"doc-{i}",
+                        "__created_at__": 0,
+                        "content": f"text {i}",
+                        "__vector__": vectors[i].tolist(),
+                    }
+                    for i in range(10)
+                },
+                f,
+            )
+
+        migrated = await make_storage(tmp_path, faiss_index_type="hnsw")
+        assert migrated._index_kind(migrated._index) == "hnsw"
+        assert "__vector__" not in migrated._id_to_meta[6]
+        assert (await migrated.query("text 6", top_k=1))[0]["id"] == "doc-6"
+
+        await migrated.upsert(docs(10, 11))
+        assert migrated._find_faiss_id_by_custom_id("doc-10") == 10
+
+        await migrated.index_done_callback()
+        assert not os.path.exists(migrated._legacy_meta_file)
+        assert os.path.exists(migrated._meta_file)
+
+    async def test_invalid_options(self, tmp_path):
+        with pytest.raises(ValueError):
+            await make_storage(tmp_path, faiss_index_type="lsh")
+
+        storage = await make_storage(tmp_path, faiss_pq_m=5)
+        with pytest.raises(ValueError):
+            storage._pq_subquantizers()
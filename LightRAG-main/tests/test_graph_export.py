@@ -0,0 +1,238 @@
+"""
+Tests for the streaming, edge-list based graph export.
+"""
+
+import csv
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from lightrag.base import BaseGraphStorage
+from lightrag.utils import (
+    aexport_data,
+    aiter_export_records,
+    aiter_export_text,
+    compute_mdhash_id,
+)
+
+
+class FakeGraph:
+    """Undirected graph returning every edge in both directions, like Neo4j"""
+
+    iter_nodes = BaseGraphStorage.iter_nodes
+    iter_edges = BaseGraphStorage.iter_edges
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.edges = edges
+
+    async def get_all_nodes(self):
+        return [
+            {"id": name, "entity_id": name, "source_id": f"chunk-{name}"}
+            for name in self.nodes
+        ]
+
+    async def get_all_edges(self):
+        result = []
+        for src, tgt in self.edges:
+            result.append({"source": src, "target": tgt, "weight": 1.0})
+            result.append({"source": tgt, "target": src, "weight": 1.0})
+        return result
+
+    async def has_edge(self, src, tgt):
+        raise AssertionError("export must not probe entity pairs")
+
+
+class FakeVDB:
+    def __init__(self, records, raw=None):
+        self.records = records
+        self.calls = []
+        self._raw = raw
+
+    async def get_by_ids(self, ids):
+        self.calls.append(len(ids))
+        return [self.records.get(i) for i in ids]
+
+    @property
+    def client_storage(self):
+        if self._raw is None:
+            raise AttributeError("client_storage")
+        return {"data": self._raw}
+
+
+def make_storages():
+    graph = FakeGraph(["A", "B", "C"], [("A", "B"), ("B", "C")])
+    entities_vdb = FakeVDB(
+        {
+            compute_mdhash_id(name, prefix="ent-"): {"id": name, "content": name}
+            for name in "ABC"
+        }
+    )
+    # One relation vector is stored under the reverse direction
+    relationships_vdb = FakeVDB(
+        {
+            compute_mdhash_id("AB", prefix="rel-"): {"id": "rAB", "content": "A-B"},
+            compute_mdhash_id("CB", prefix="rel-"): {"id": "rCB", "content": "C-B"},
+        },
+        raw=[{"__id__": "rel-1", "content": "A-B"}],
+    )
+    for vdb in (entities_vdb, relationships_vdb):
+        vdb.records = {k: {**v, "id": k} for k, v in vdb.records.items()}
+    return graph, entities_vdb, relationships_vdb
+
+
+@pytest.mark.offline
+class TestGraphExport:
+    async def test_records_are_batched_and_deduplicated(self):
+        graph, entities_vdb, relationships_vdb = make_storages()
+        progress = []
+
+        records = [
+            r
+            async for r in aiter_export_records(
+                graph,
+                entities_vdb,
+                relationships_vdb,
+                include_vector_data=True,
+                batch_size=2,
+                progress_callback=lambda section, n: progress.append((section, n)),
+            )
+        ]
+
+        sections = [section for section, _ in records]
+        assert sections == ["entities"] * 3 + ["relations"] * 2 + ["relationships"]
+        relations = [row for section, row in records if section == "relations"]
+        assert {(r["src_entity"], r["tgt_entity"]) for r in relations} == {
+            ("A", "B"),
+            ("B", "C"),
+        }
+        assert relations[1]["vector_data"]["content"] == "C-B"
+        assert records[0][1]["graph_data"] == {"entity_id": "A", "source_id": "chunk-A"}
+        # One get_by_ids call per batch, both directions for relations
+        assert entities_vdb.calls == [2, 1]
+        assert sum(relationships_vdb.calls) == 4
+        assert ("entities", 3) in progress and ("relations", 2) in progress
+
+    async def test_jsonl_stream(self):
+        graph, entities_vdb, relationships_vdb = make_storages()
+        records = aiter_export_records(graph, entities_vdb, relationships_vdb)
+        chunks = [c async for c in aiter_export_text(records, "jsonl", flush_size=10)]
+
+        assert len(chunks) > 1
+        lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert [line["record_type"] for line in lines] == [
+            "entity",
+            "entity",
+            "entity",
+            "relation",
+            "relation",
+            "relationship",
+        ]
+        assert "vector_data" not in lines[0]
+
+    async def test_csv_file_keeps_section_layout(self, tmp_path):
+        graph, entities_vdb, _ = make_storages()
+        output = tmp_path / "export.csv"
+
+        # Storages without raw record access skip the relationships section
+        await aexport_data(graph, entities_vdb, FakeVDB({}), str(output), "csv")
+
+        text = output.read_text(encoding="utf-8")
+        assert text.startswith("# ENTITIES\n")
+        assert "# RELATIONS\n" in text and "# RELATIONSHIPS" not in text
+        relations = text.split("# RELATIONS\n")[1]
+        rows = list(csv.DictReader(relations.splitlines()))
+        assert [row["src_entity"] for row in rows] == ["A", "B"]
+
+    async def test_parquet_file(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        graph, entities_vdb, relationships_vdb = make_storages()
+        output = tmp_path / "export.parquet"
+
+        await aexport_data(
+            graph,
+            entities_vdb,
+            relationships_vdb,
+            str(output),
+            "parquet",
+            include_vector_data=True,
+            batch_size=2,
+        )
+
+        table = pq.read_table(output).to_pylist()
+        assert [row["record_type"] for row in table].count("relation") == 2
+        assert json.loads(table[0]["vector_data"])["content"] == "A"
+
+    async def test_streamed_edges_are_exported_batch_by_batch(self):
+        class StreamingGraph(FakeGraph):
+            """Streams each edge once, like Neo4j's iter_edges"""
+
+            def __init__(self, edge_count):
+                super().__init__([], [])
+                self.edge_count = edge_count
+                self.batches = 0
+
+            async def iter_edges(self, batch_size=1000):
+                for i in range(0, self.edge_count, batch_size):
+                    self.batches += 1
+                    yield [
+                        {"source": f"n{j}", "target": f"n{j + 1}"}
+                        for j in range(i, min(i + batch_size, self.edge_count))
+                    ]
+
+        graph = StreamingGraph(10)
+        records = aiter_export_records(graph, FakeVDB({}), FakeVDB({}), batch_size=3)
+
+        section, row = await anext(records)
+        assert (section, row["src_entity"]) == ("relations", "n0")
+        # Only the first batch has been read from the storage
+        assert graph.batches == 1
+        assert len([r async for r in records]) == 9
+        assert graph.batches == 4
+
+    async def test_default_iter_edges_yields_each_edge_once(self):
+        graph, _, _ = make_storages()
+        batches = [batch async for batch in graph.iter_edges(batch_size=1)]
+        assert [(e["source"], e["target"]) for [e] in batches] == [
+            ("A", "B"),
+            ("B", "C"),
+        ]
+
+    async def test_unsupported_format(self, tmp_path):
+        graph, entities_vdb, relationships_vdb = make_storages()
+        with pytest.raises(ValueError):
+            await aexport_data(
+                graph, entities_vdb, relationships_vdb, str(tmp_path / "x"), "xml"
+            )
+
+
+@pytest.mark.offline
+def test_export_endpoint_streams_jsonl():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    graph, entities_vdb, relationships_vdb = make_storages()
+
+    class FakeRag:
+        chunk_entity_relation_graph = graph
+
+    FakeRag.entities_vdb = entities_vdb
+    FakeRag.relationships_vdb = relationships_vdb
+
+    # The API config parses the command line on first use, and other tests may
+    # have replaced API modules with mocks: import fresh copies for this test
+    with patch.object(sys, "argv", ["lightrag-server"]), patch.dict(sys.modules):
+        for name in [m for m in sys.modules if m.startswith("lightrag.api")]:
+            del sys.modules[name]
+        from lightrag.api.routers.graph_routes import create_graph_routes
+
+        app = FastAPI()
+        app.include_router(create_graph_routes(FakeRag()))
+        response = TestClient(app).get("/graph/export", params={"format": "jsonl"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "graph_export.jsonl" in response.headers["content-disposition"]
+    assert len(response.text.splitlines()) == 6
@@ -0,0 +1,154 @@
+"""
+Tests for the streamed and projected /graphs responses.
+"""
+
+import json
+import sys
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+
+from lightrag.types import KnowledgeGraph, KnowledgeGraphEdge, KnowledgeGraphNode
+from lightrag.utils import (
+    iter_knowledge_graph_arrow,
+    iter_knowledge_graph_ndjson,
+    project_knowledge_graph,
+)
+
+
+def make_graph(node_count=3):
+    nodes = [
+        KnowledgeGraphNode(
+            id=f"n{i}",
+            labels=[f"n{i}"],
+            properties={"entity_type": "person", "description": "long text " * 50},
+        )
+        for i in range(node_count)
+    ]
+    edges = [
+        KnowledgeGraphEdge(
+            id=f"n{i}-n{i + 1}",
+            type="DIRECTED",
+            source=f"n{i}",
+            target=f"n{i + 1}",
+            properties={"weight": 1.0, "description": "edge"},
+        )
+        for i in range(node_count - 1)
+    ]
+    return KnowledgeGraph(nodes=nodes, edges=edges, is_truncated=True)
+
+
+@pytest.mark.offline
+class TestGraphEncoding:
+    def test_projection(self):
+        graph = make_graph()
+
+        assert project_knowledge_graph(graph, None) is graph
+        projected = project_knowledge_graph(graph, ["entity_type", "weight"])
+        assert projected.nodes[0].properties == {"entity_type": "person"}
+        assert projected.edges[0].properties == {"weight": 1.0}
+        assert project_knowledge_graph(graph, []).nodes[0].properties == {}
+        # The original graph is left untouched
+        assert "description" in graph.nodes[0].properties
+
+    def test_ndjson_header_nodes_then_edges(self):
+        chunks = list(iter_knowledge_graph_ndjson(make_graph(50), flush_size=1024))
+        assert len(chunks) > 1
+
+        lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert lines[0] == {
+            "record_type": "graph",
+            "is_truncated": True,
+            "node_count": 50,
+            "edge_count": 49,
+        }
+        record_types = [line["record_type"] for line in lines[1:]]
+        assert record_types == ["node"] * 50 + ["edge"] * 49
+        assert lines[51]["source"] == "n0"
+
+    def test_arrow_round_trip(self):
+        chunks = list(iter_knowledge_graph_arrow(make_graph(5), batch_size=2))
+        assert len(chunks) > 2
+
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        assert table.schema.metadata[b"node_count"] == b"5"
+        assert table.schema.metadata[b"is_truncated"] == b"true"
+        rows = table.to_pylist()
+        assert [r["record_type"] for r in rows] == ["node"] * 5 + ["edge"] * 4
+        assert rows[0]["labels"] == ["n0"]
+        assert json.loads(rows[5]["properties"])["weight"] == 1.0
+
+        empty = pa.ipc.open_stream(
+            b"".join(iter_knowledge_graph_arrow(KnowledgeGraph()))
+        ).read_all()
+        assert empty.num_rows == 0
+
+
+def make_client(graph):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    class FakeStorage:
+        async def has_node(self, name):
+            return name == "n0"
+
+        async def has_edge(self, source, target):
+            return False
+
+    class FakeRag:
+        chunk_entity_relation_graph = FakeStorage()
+
+        async def get_knowledge_graph(self, node_label, max_depth, max_nodes):
+            return graph
+
+        async def get_entity_info(self, name):
+            return {"entity_name": name, "graph_data": graph.nodes[0].properties}
+
+    with patch.object(sys, "argv", ["lightrag-server"]), patch.dict(sys.modules):
+        for name in [m for m in sys.modules if m.startswith("lightrag.api")]:
+            del sys.modules[name]
+        from lightrag.api.routers.graph_routes import create_graph_routes
+
+        app = FastAPI()
+        app.include_router(create_graph_routes(FakeRag()))
+    return TestClient(app)
+
+
+@pytest.mark.offline
+class TestGraphRoutes:
+    def test_formats_and_projection(self):
+        client = make_client(make_graph())
+
+        response = client.get("/graphs", params={"label": "*"})
+        assert response.json()["nodes"][0]["properties"]["entity_type"] == "person"
+
+        response = client.get(
+            "/graphs", params={"label": "*", "format": "ndjson", "properties": ""}
+        )
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1 + 3 + 2
+        assert all(line.get("properties", {}) == {} for line in lines[1:])
+
+        response = client.get(
+            "/graphs",
+            params={"label": "*", "format": "arrow", "properties": "entity_type"},
+        )
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert json.loads(table.to_pylist()[0]["properties"]) == {
+            "entity_type": "person"
+        }
+
+    def test_details_on_demand(self):
+        client = make_client(make_graph())
+
+        response = client.get("/graph/entity/detail", params={"name": "n0"})
+        assert response.json()["graph_data"]["entity_type"] == "person"
+        response = client.get("/graph/entity/detail", params={"name": "missing"})
+        assert response.status_code == 404
+        response = client.get(
+            "/graph/relation/detail", params={"source": "n0", "target": "n1"}
+        )
+        assert response.status_code == 404
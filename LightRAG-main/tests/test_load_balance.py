@@ -0,0 +1,147 @@
+"""
+Tests for load balancing and failover across LLM/embedding endpoints.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lightrag.llm.load_balance import (
+    Endpoint,
+    build_endpoints,
+    get_endpoint_stats,
+    is_endpoint_error,
+    load_balanced_func,
+)
+from lightrag.utils import EmbeddingFunc
+
+
+class StatusError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(status_code=status, headers={})
+
+
+class FakeReplicas:
+    def __init__(self, failing=(), delays=None):
+        self.failing = set(failing)
+        self.delays = delays or {}
+        self.calls = []
+
+    async def __call__(self, prompt, base_url=None, api_key=None, **kwargs):
+        self.calls.append((base_url, api_key))
+        await asyncio.sleep(self.delays.get(base_url, 0))
+        if base_url in self.failing:
+            raise ConnectionError(f"{base_url} unreachable")
+        return f"{prompt}@{base_url}"
+
+
+URLS = ["http://a", "http://b", "http://c"]
+
+
+@pytest.mark.offline
+class TestLoadBalancedFunc:
+    async def test_least_outstanding_spreads_concurrent_calls(self):
+        replicas = FakeReplicas()
+        func = load_balanced_func(replicas, build_endpoints(URLS))
+
+        await asyncio.gather(*(func(str(i)) for i in range(6)))
+        used = [url for url, _ in replicas.calls]
+        assert {url: used.count(url) for url in URLS} == dict.fromkeys(URLS, 2)
+
+    async def test_failover_and_ejection(self):
+        replicas = FakeReplicas(failing={"http://a"})
+        func = load_balanced_func(
+            replicas, build_endpoints(URLS), eject_after=2, eject_seconds=60
+        )
+
+        for i in range(6):
+            assert not (await func(str(i))).endswith("@http://a")
+
+        stats = {e["name"]: e for e in func.get_stats()["endpoints"]}
+        # The broken replica is ejected after two failures and not tried again
+        assert stats["http://a"]["failures"] == 2
+        assert stats["http://a"]["ejections"] == 1
+        assert not stats["http://a"]["healthy"]
+        assert stats["http://b"]["requests"] + stats["http://c"]["requests"] == 6
+        assert any(
+            pool["endpoints"] == func.get_stats()["endpoints"]
+            for pool in get_endpoint_stats()
+        )
+
+    async def test_request_errors_are_not_retried(self):
+        calls = []
+
+        async def llm(prompt, base_url=None, **kwargs):
+            calls.append(base_url)
+            raise StatusError(400)
+
+        func = load_balanced_func(llm, build_endpoints(URLS))
+        with pytest.raises(StatusError):
+            await func("bad request")
+        assert len(calls) == 1
+        assert func.pool.endpoints[0].failures == 0
+
+    async def test_all_endpoints_failing_raises(self):
+        replicas = FakeReplicas(failing=set(URLS))
+        func = load_balanced_func(replicas, build_endpoints(URLS))
+        with pytest.raises(ConnectionError):
+            await func("hello")
+        assert len(replicas.calls) == 3
+
+    async def test_latency_strategy_prefers_fast_endpoint(self):
+        replicas = FakeReplicas(delays={"http://a": 0.05, "http://b": 0.0})
+        func = load_balanced_func(
+            replicas, build_endpoints(URLS[:2]), strategy="latency"
+        )
+        for i in range(10):
+            await func(str(i))
+        used = [url for url, _ in replicas.calls]
+        assert used.count("http://b") > used.count("http://a")
+
+    async def test_embedding_func_keeps_attributes(self):
+        hosts = []
+
+        async def embed(texts, host=None, api_key=None):
+            hosts.append((host, api_key))
+            return np.zeros((len(texts), 4))
+
+        embedding_func = EmbeddingFunc(embedding_dim=4, func=embed, model_name="m")
+        balanced = load_balanced_func(
+            embedding_func,
+            [{"url": None, "api_key": "k1"}, {"url": None, "api_key": "k2"}],
+            url_kwarg="host",
+        )
+
+        assert isinstance(balanced, EmbeddingFunc)
+        assert balanced.embedding_dim == 4 and balanced.model_name == "m"
+        await balanced(["x"])
+        await balanced(["y"])
+        assert hosts == [(None, "k1"), (None, "k2")]
+
+
+@pytest.mark.offline
+def test_build_endpoints_pairs_hosts_and_keys():
+    endpoints = build_endpoints(["http://a"], ["k1", "k2"])
+    assert [(e.url, e.api_key) for e in endpoints] == [
+        ("http://a", "k1"),
+        ("http://a", "k2"),
+    ]
+    # API keys never appear in names or statistics
+    assert [e.name for e in endpoints] == ["http://a#key1", "http://a#key2"]
+    assert [e.api_key for e in build_endpoints(URLS, ["k"])] == ["k"] * 3
+    with pytest.raises(ValueError):
+        build_endpoints(URLS, ["k1", "k2"])
+    assert Endpoint(url=None).name == "default"
+
+
+@pytest.mark.offline
+def test_is_endpoint_error():
+    assert is_endpoint_error(StatusError(429))
+    assert is_endpoint_error(StatusError(503))
+    assert is_endpoint_error(asyncio.TimeoutError())
+    assert is_endpoint_error(type("APIConnectionError", (Exception,), {})())
+    assert not is_endpoint_error(StatusError(400))
+    assert not is_endpoint_error(ValueError("bad response format"))
@@ -0,0 +1,164 @@
+"""
+Unit tests for the in-process cross-encoder reranker.
+
+The model loader is replaced by a deterministic scorer so the batching,
+ordering and error handling of LocalCrossEncoderReranker can be tested
+without downloading a model.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from lightrag.rerank import (
+    LocalCrossEncoderReranker,
+    _get_rerank_tokenizer,
+    _logits_to_scores,
+    chunk_documents_for_rerank,
+)
+
+
+class FakeReranker(LocalCrossEncoderReranker):
+    """Scores a pair by the number of query words present in the document"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def _load_predictor(self):
+        def predict(pairs):
+            self.batches.append(len(pairs))
+            return [
+                sum(word in doc.split() for word in query.split()) / 10
+                for query, doc in pairs
+            ]
+
+        return predict
+
+
+@pytest.mark.offline
+class TestLocalCrossEncoderReranker:
+    async def test_results_sorted_and_limited(self):
+        reranker = FakeReranker(batch_wait_ms=0)
+        docs = ["alpha", "alpha beta gamma", "alpha beta", "delta"]
+
+        results = await reranker("alpha beta gamma", docs, top_n=2)
+
+        assert [r["index"] for r in results] == [1, 2]
+        assert results[0]["relevance_score"] == pytest.approx(0.3)
+        reranker.close()
+
+    async def test_concurrent_queries_share_a_batch(self):
+        reranker = FakeReranker(max_batch_size=64, batch_wait_ms=20)
+        docs = ["a b", "b c", "c d"]
+
+        results = await asyncio.gather(*(reranker(f"q{i} b", docs) for i in range(5)))
+
+        assert all(len(r) == 3 for r in results)
+        # 5 queries x 3 docs collected within the wait window -> one forward pass
+        assert reranker.batches == [15]
+        reranker.close()
+
+    async def test_batches_respect_max_batch_size(self):
+        reranker = FakeReranker(max_batch_size=4, batch_wait_ms=0)
+
+        results = await reranker("x", [f"doc {i}" for i in range(10)])
+
+        assert len(results) == 10
+        assert reranker.batches == [4, 4, 2]
+        reranker.close()
+
+    async def test_batches_run_concurrently_up_to_max_workers(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BlockingReranker(LocalCrossEncoderReranker):
+            def _load_predictor(self):
+                def predict(pairs):
+                    # Only returns once two batches are being scored at once
+                    barrier.wait()
+                    return [1.0] * len(pairs)
+
+                return predict
+
+        reranker = BlockingReranker(max_batch_size=1, batch_wait_ms=0, max_workers=2)
+        results = await asyncio.gather(reranker("q1", ["a"]), reranker("q2", ["b"]))
+
+        assert [len(r) for r in results] == [1, 1]
+        reranker.close()
+
+    async def test_errors_propagate_to_all_waiters(self):
+        class FailingReranker(LocalCrossEncoderReranker):
+            def _load_predictor(self):
+                def predict(pairs):
+                    raise RuntimeError("model failure")
+
+                return predict
+
+        reranker = FailingReranker(batch_wait_ms=10)
+        results = await asyncio.gather(
+            reranker("q1", ["a"]), reranker("q2", ["b"]), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        # The worker keeps serving requests after a failed batch
+        with pytest.raises(RuntimeError):
+            await reranker("q3", ["c"])
+        reranker.close()
+
+    async def test_chunked_documents_aggregate_to_original_index(self):
+        reranker = FakeReranker(batch_wait_ms=0)
+        long_doc = " ".join(["filler"] * 300 + ["needle"])
+        docs = ["short text", long_doc]
+
+        results = await reranker(
+            "needle", docs, enable_chunking=True, max_tokens_per_doc=100
+        )
+
+        assert [r["index"] for r in results] == [1, 0]
+        assert results[0]["relevance_score"] == pytest.approx(0.1)
+        reranker.close()
+
+    async def test_empty_documents(self):
+        reranker = FakeReranker()
+        assert await reranker("q", []) == []
+        reranker.close()
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            LocalCrossEncoderReranker(backend="tensorrt")
+
+
+@pytest.mark.offline
+def test_logits_to_scores():
+    single = _logits_to_scores([[0.0], [100.0]])
+    assert single[0] == pytest.approx(0.5)
+    assert single[1] == pytest.approx(1.0)
+
+    pairwise = _logits_to_scores([[0.0, 0.0], [-10.0, 10.0]])
+    assert pairwise[0] == pytest.approx(0.5)
+    assert pairwise[1] == pytest.approx(1.0, abs=1e-6)
+
+
+@pytest.mark.offline
+def test_rerank_tokenizer_is_cached():
+    created = []
+
+    class CountingTokenizer:
+        def __init__(self, model_name):
+            created.append(model_name)
+
+        def encode(self, text):
+            return list(range(len(text.split())))
+
+        def decode(self, tokens):
+            return " ".join("w" for _ in tokens)
+
+    _get_rerank_tokenizer.cache_clear()
+    with patch("lightrag.utils.TiktokenTokenizer", CountingTokenizer):
+        chunk_documents_for_rerank(["one"], max_tokens=10, overlap_tokens=2)
+        chunk_documents_for_rerank(["two"], max_tokens=10, overlap_tokens=2)
+    _get_rerank_tokenizer.cache_clear()
+
+    assert created == ["gpt-4o-mini"]
@@ -0,0 +1,229 @@
+"""
+Tests for metadata-filtered vector retrieval.
+"""
+
+import importlib.util
+import zlib
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.kg.faiss_impl import FaissVectorDBStorage
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.namespace import NameSpace
+from lightrag.utils import (
+    EmbeddingFunc,
+    match_metadata_filter,
+    normalize_metadata_filter,
+)
+
+META_FIELDS = {"content", "evidence_level", "scene_tags", "file_path"}
+
+RECORDS = {
+    f"chunk-{i}": {
+        "content": f"document {i}",
+        "evidence_level": "SABC"[i % 4],
+        "scene_tags": [["金融"], ["医疗"], ["金融", "医疗"], []][i % 4],
+        "file_path": f"file-{i % 3}.txt",
+    }
+    for i in range(40)
+}
+
+
+async def embed(texts, **kwargs):
+    vectors = []
+    for text in texts:
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        vectors.append(rng.normal(size=16))
+    return np.array(vectors, dtype=np.float32)
+
+
+def expected_ids(metadata_filter):
+    metadata_filter = normalize_metadata_filter(metadata_filter)
+    return {
+        key
+        for key, record in RECORDS.items()
+        if match_metadata_filter(record, metadata_filter)
+    }
+
+
+async def make_storage(storage_cls, tmp_path, **kwargs):
+    initialize_share_data(workers=1)
+    storage = storage_cls(
+        namespace=NameSpace.VECTOR_STORE_CHUNKS,
+        workspace="ws",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 32,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                **kwargs,
+            },
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=16, func=embed),
+        meta_fields=META_FIELDS,
+    )
+    await storage.initialize()
+    await storage.upsert(RECORDS)
+    return storage
+
+
+@pytest.mark.offline
+class TestMetadataFilterHelpers:
+    def test_normalize(self):
+        assert normalize_metadata_filter(None) is None
+        assert normalize_metadata_filter({}) is None
+        assert normalize_metadata_filter(
+            {"evidence_level": ("S", "A", "S"), "scene_tags": "金融"}
+        ) == {"evidence_level": ["S", "A"], "scene_tags": ["金融"]}
+        for bad in (
+            {"evidence level": "S"},
+            {"evidence_level": []},
+            {"evidence_level": {"$ne": "C"}},
+            ["evidence_level"],
+        ):
+            with pytest.raises(ValueError):
+                normalize_metadata_filter(bad)
+
+    def test_match(self):
+        metadata_filter = {"evidence_level": ["S", "A"], "scene_tags": ["金融"]}
+        assert match_metadata_filter(
+            {"evidence_level": "S", "scene_tags": ["医疗", "金融"]}, metadata_filter
+        )
+        assert not match_metadata_filter(
+            {"evidence_level": "B", "scene_tags": ["金融"]}, metadata_filter
+        )
+        assert not match_metadata_filter(
+            {"evidence_level": "A", "scene_tags": []}, metadata_filter
+        )
+        assert not match_metadata_filter({}, metadata_filter)
+
+
+@pytest.mark.offline
+class TestFilteredQuery:
+    FILTERS = [
+        {"evidence_level": ["S", "A"]},
+        {"evidence_level": ["S", "C"], "scene_tags": ["金融"]},
+        {"file_path": "file-1.txt", "scene_tags": ["医疗"]},
+    ]
+
+    async def check_storage(self, storage):
+        for metadata_filter in self.FILTERS:
+            matching = expected_ids(metadata_filter)
+            results = await storage.query(
+                "query", top_k=5, metadata_filter=metadata_filter
+            )
+            # Results are top_k-sized and all match the filter
+            assert len(results) == min(5, len(matching))
+            assert {r["id"] for r in results} <= matching
+
+            # They are the best matches among the filtered records
+            results = await storage.query(
+                "query", top_k=len(RECORDS), metadata_filter=metadata_filter
+            )
+            assert {r["id"] for r in results} == matching
+            distances = [r["distance"] for r in results]
+            assert distances == sorted(distances, reverse=True)
+
+        assert (
+            await storage.query(
+                "query", top_k=5, metadata_filter={"evidence_level": "Z"}
+            )
+            == []
+        )
+        # Fields the storage does not keep are ignored
+        assert (
+            len(
+                await storage.query("query", top_k=5, metadata_filter={"industry": "x"})
+            )
+            == 5
+        )
+
+    async def test_nano_vector_db(self, tmp_path):
+        await self.check_storage(await make_storage(NanoVectorDBStorage, tmp_path))
+
+    async def test_faiss_exact_scoring(self, tmp_path):
+        await self.check_storage(await make_storage(FaissVectorDBStorage, tmp_path))
+
+    async def test_faiss_index_selector(self, tmp_path):
+        for index_type in ("flat", "hnsw"):
+            storage = await make_storage(
+                FaissVectorDBStorage,
+                tmp_path / index_type,
+                faiss_index_type=index_type,
+                faiss_filter_exact_max=0,
+            )
+            await self.check_storage(storage)
+
+
+@pytest.mark.offline
+def test_query_param_default():
+    assert QueryParam().metadata_filter is None
+
+
+@pytest.mark.offline
+def test_qdrant_conditions():
+    if importlib.util.find_spec("qdrant_client") is None:
+        pytest.skip("qdrant-client not installed")
+    from qdrant_client import models
+
+    from lightrag.kg.qdrant_impl import metadata_filter_conditions
+
+    assert metadata_filter_conditions(None) == []
+    conditions = metadata_filter_conditions(
+        {"evidence_level": ["S", "A"], "weight": [1.5]}
+    )
+    assert conditions[0] == models.FieldCondition(
+        key="evidence_level", match=models.MatchAny(any=["S", "A"])
+    )
+    assert conditions[1].should[0].range == models.Range(gte=1.5, lte=1.5)
+
+
+@pytest.mark.offline
+def test_milvus_expression():
+    if importlib.util.find_spec("pymilvus") is None:
+        pytest.skip("pymilvus not installed")
+    from lightrag.kg.milvus_impl import build_metadata_filter_expr
+
+    assert build_metadata_filter_expr(None) == ""
+    assert (
+        build_metadata_filter_expr(
+            {"evidence_level": ["S", 'A" or 1==1'], "scene_tags": ["金融"]}
+        )
+        == 'evidence_level in ["S", "A\\" or 1==1"] and '
+        'json_contains_any(scene_tags, ["金融"])'
+    )
+
+
+@pytest.mark.offline
+def test_pgvector_filter_clause():
+    if importlib.util.find_spec("pgvector") is None:
+        pytest.skip("pgvector not installed")
+    from lightrag.kg.postgres_impl import SQL_TEMPLATES, PGVectorStorage
+
+    storage = PGVectorStorage(
+        namespace=NameSpace.VECTOR_STORE_CHUNKS,
+        workspace="ws",
+        global_config={
+            "working_dir": "unused",
+            "embedding_batch_num": 32,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.2},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=16, func=embed),
+        meta_fields=META_FIELDS,
+    )
+    clause, params = storage._build_metadata_filter(
+        {"evidence_level": ["S", "A"], "scene_tags": ["金融"], "content": ["x"]}, 4
+    )
+    assert clause == (
+        "\n  AND c.evidence_level = ANY($4::text[])\n  AND c.scene_tags ?| $5::text[]"
+    )
+    assert params == [["S", "A"], ["金融"]]
+    assert storage._build_metadata_filter(None, 4) == ("", [])
+
+    sql = SQL_TEMPLATES["chunks"].format(
+        embedding_string="0", table_name="t", metadata_filter=clause
+    )
+    assert "c.workspace = $1\n  AND c.evidence_level" in sql
@@ -0,0 +1,155 @@
+"""
+Tests for query stage metrics and the Prometheus text rendering.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag import metrics
+from lightrag.kg.shared_storage import get_storage_keyed_lock, initialize_share_data
+from lightrag.metrics import (
+    CACHE_REQUESTS,
+    LOCK_WAIT_SECONDS,
+    QUERY_STAGE_SECONDS,
+    MetricsRegistry,
+    query_labels,
+    render_metrics,
+    stage_span,
+    time_first_item,
+)
+from lightrag.utils import EmbeddingFunc, handle_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+@pytest.mark.offline
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "A counter", ("name",))
+    histogram = registry.histogram("h_seconds", "A histogram", ("stage",), (0.1, 1))
+    assert registry.counter("c_total", "Again", ("name",)) is counter
+
+    counter.inc('say "hi"\n', amount=2)
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, "search")
+
+    assert registry.render().splitlines() == [
+        "# HELP c_total A counter",
+        "# TYPE c_total counter",
+        'c_total{name="say \\"hi\\"\\n"} 2',
+        "# HELP h_seconds A histogram",
+        "# TYPE h_seconds histogram",
+        'h_seconds_bucket{stage="search",le="0.1"} 2',
+        'h_seconds_bucket{stage="search",le="1.0"} 3',
+        'h_seconds_bucket{stage="search",le="+Inf"} 4',
+        'h_seconds_sum{stage="search"} 3.65',
+        'h_seconds_count{stage="search"} 4',
+    ]
+    with pytest.raises(ValueError):
+        registry.histogram("c_total", "Not a counter")
+
+
+@pytest.mark.offline
+async def test_stage_span_labels_and_timings():
+    timings = {}
+    with query_labels("hybrid", "ws"):
+        with stage_span("search", timings):
+            await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError), stage_span("truncate"):
+            raise RuntimeError("failed stages are still timed")
+    with stage_span("search"):
+        pass
+
+    assert timings["search"] >= 10
+    assert QUERY_STAGE_SECONDS.get_count("search", "hybrid", "ws") == 1
+    assert QUERY_STAGE_SECONDS.get_count("truncate", "hybrid", "ws") == 1
+    assert QUERY_STAGE_SECONDS.get_count("search", "", "") == 1
+
+
+@pytest.mark.offline
+async def test_stage_span_with_tracing():
+    pytest.importorskip("opentelemetry")
+    assert metrics.enable_tracing()
+    try:
+        with query_labels("local", ""), stage_span("keywords"):
+            pass
+    finally:
+        metrics.enable_tracing(False)
+    assert QUERY_STAGE_SECONDS.get_count("keywords", "local", "") == 1
+
+
+@pytest.mark.offline
+async def test_time_first_item():
+    closed = []
+
+    async def stream():
+        try:
+            for chunk in ["a", "b", "c"]:
+                yield chunk
+        finally:
+            closed.append(True)
+
+    with query_labels("mix", "ws"):
+        wrapped = time_first_item(stream())
+    assert [chunk async for chunk in wrapped] == ["a", "b", "c"]
+    assert QUERY_STAGE_SECONDS.get_count("llm_first_token", "mix", "ws") == 1
+
+    # Closing the wrapper early closes the provider stream
+    wrapped = time_first_item(stream())
+    assert await wrapped.__anext__() == "a"
+    await wrapped.aclose()
+    assert closed == [True, True]
+
+
+@pytest.mark.offline
+async def test_cache_hits_and_misses():
+    class FakeKV:
+        def __init__(self):
+            self.global_config = {"enable_llm_cache": True}
+
+        async def get_by_id(self, key):
+            return {"return": "cached"} if key.endswith("hit") else None
+
+    await handle_cache(FakeKV(), "hit", "prompt", "mix", cache_type="keywords")
+    await handle_cache(FakeKV(), "miss", "prompt", "mix", cache_type="keywords")
+    await handle_cache(FakeKV(), "miss", "prompt", "mix", cache_type="query")
+    assert CACHE_REQUESTS.get("keywords", "hit") == 1
+    assert CACHE_REQUESTS.get("keywords", "miss") == 1
+    assert CACHE_REQUESTS.get("query", "miss") == 1
+
+    async def embed(texts):
+        return np.ones((len(texts), 2))
+
+    func = EmbeddingFunc(embedding_dim=2, func=embed, coalesce_window=60)
+    await func(["a", "b"])
+    await func(["a", "c"])
+    assert CACHE_REQUESTS.get("embedding", "hit") == 1
+    assert CACHE_REQUESTS.get("embedding", "miss") == 3
+
+
+@pytest.mark.offline
+async def test_lock_wait_and_render():
+    initialize_share_data(workers=1)
+
+    async def hold():
+        async with get_storage_keyed_lock(["k"], namespace="ws:GraphDB"):
+            await asyncio.sleep(0.02)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    async with get_storage_keyed_lock(["k"], namespace="ws:GraphDB"):
+        pass
+    await holder
+
+    assert LOCK_WAIT_SECONDS.get_count("ws:GraphDB") == 2
+    text = render_metrics()
+    assert 'lightrag_lock_wait_seconds_count{lock="ws:GraphDB"} 2' in text
+    assert "# TYPE lightrag_llm_queue_depth gauge" in text
+    assert 'lightrag_llm_single_flight_calls_total{role="coalesced"}' in text
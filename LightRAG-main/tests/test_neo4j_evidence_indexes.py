@@ -0,0 +1,216 @@
+"""
+Tests for the Neo4j evidence field indexes and the denormalized scene_tags_key.
+"""
+
+import pytest
+
+from lightrag.kg.neo4j_impl import (
+    SCENE_TAGS_KEY_FIELD,
+    SCENE_TAGS_MIGRATION_BATCH_SIZE,
+    Neo4JStorage,
+    scene_tags_key,
+)
+
+
+class FakeResult:
+    def __init__(self, record=None, rows=()):
+        self.record = record
+        self.rows = list(rows)
+
+    async def single(self):
+        return self.record
+
+    async def data(self):
+        return self.rows
+
+    async def consume(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def run(self, query, parameters=None, **params):
+        self.driver.runs.append((query, {**(parameters or {}), **params}))
+        if self.driver.fail_on and self.driver.fail_on in query:
+            raise RuntimeError("unsupported index type")
+        if self.driver.updates:
+            return FakeResult({"updated": self.driver.updates.pop(0)})
+        if self.driver.results:
+            return self.driver.results.pop(0)
+        return FakeResult()
+
+
+class FakeDriver:
+    def __init__(self, updates=(), fail_on=None, results=()):
+        self.runs = []
+        self.updates = list(updates)
+        self.fail_on = fail_on
+        self.results = list(results)
+
+    def session(self, database=None, **kwargs):
+        return FakeSession(self)
+
+
+class FakeNode(dict):
+    def __init__(self, node_id, properties):
+        super().__init__(properties)
+        self.id = node_id
+
+
+class FakeRelationship(dict):
+    def __init__(self, rel_id, start, end, properties):
+        super().__init__(properties)
+        self.id = rel_id
+        self.type = "DIRECTED"
+        self.start_node = start
+        self.end_node = end
+
+
+def make_storage(driver=None):
+    storage = Neo4JStorage(
+        namespace="test",
+        global_config={"working_dir": "tmp"},
+        embedding_func=None,
+        workspace="my-ws",
+    )
+    storage._driver = driver or FakeDriver()
+    storage._DATABASE = None
+    return storage
+
+
+@pytest.mark.offline
+def test_scene_tags_key_is_written_and_hidden():
+    properties = Neo4JStorage._sanitize_properties(
+        {"entity_id": "E", "scene_tags": ["金融", "医疗"]}
+    )
+    assert properties[SCENE_TAGS_KEY_FIELD] == "|金融|医疗|"
+    assert scene_tags_key([]) == "|"
+    assert SCENE_TAGS_KEY_FIELD not in Neo4JStorage._decode_properties(properties)
+    assert SCENE_TAGS_KEY_FIELD not in Neo4JStorage._sanitize_properties(
+        {"entity_id": "E"}
+    )
+
+
+@pytest.mark.offline
+async def test_evidence_indexes_are_idempotent_and_tolerate_failures():
+    driver = FakeDriver(fail_on="TEXT INDEX")
+    storage = make_storage(driver)
+
+    await storage._create_evidence_indexes(driver, None, "my-ws")
+
+    statements = [query for query, _ in driver.runs]
+    assert len(statements) == 6
+    assert all("IF NOT EXISTS" in s for s in statements)
+    assert (
+        "CREATE INDEX evidence_level_idx_my_ws IF NOT EXISTS "
+        "FOR (n:`my-ws`) ON (n.evidence_level)"
+    ) in statements
+    assert any("()-[r:DIRECTED]-() ON (r.relation_type)" in s for s in statements)
+
+
+@pytest.mark.offline
+async def test_scene_tags_key_backfill_runs_in_batches():
+    driver = FakeDriver(updates=[SCENE_TAGS_MIGRATION_BATCH_SIZE, 5, 0])
+    storage = make_storage(driver)
+
+    await storage._migrate_scene_tags_key(driver, None, "my-ws")
+
+    # Two node batches (the second one is partial), then one relationship batch
+    assert len(driver.runs) == 3
+    assert all(
+        params == {"batch_size": SCENE_TAGS_MIGRATION_BATCH_SIZE}
+        for _, params in driver.runs
+    )
+    assert "MATCH (n:`my-ws`)" in driver.runs[0][0]
+    assert "[r:DIRECTED]" in driver.runs[2][0]
+
+
+@pytest.mark.offline
+async def test_scene_queries_use_indexable_predicates():
+    storage = make_storage()
+
+    await storage.get_entities_by_evidence_level_and_scene("s", "金融")
+    await storage.get_relations_by_type("causal")
+
+    (scene_query, scene_params), (type_query, _) = storage._driver.runs
+    assert f"n.{SCENE_TAGS_KEY_FIELD} CONTAINS $scene_key" in scene_query
+    assert scene_params["scene_key"] == "|金融|"
+    assert scene_params["evidence_level"] == "S"
+    assert "[r:DIRECTED]" in type_query
+
+
+def stored_properties(entity_id):
+    return Neo4JStorage._sanitize_properties(
+        {"entity_id": entity_id, "scene_tags": ["金融"]}
+    )
+
+
+@pytest.mark.offline
+async def test_scene_tags_key_is_not_returned_by_graph_reads():
+    a = FakeNode(1, stored_properties("A"))
+    b = FakeNode(2, stored_properties("B"))
+    rel = FakeRelationship(3, a, b, stored_properties("rel"))
+    driver = FakeDriver(
+        results=[
+            FakeResult({"total": 2}),
+            FakeResult(
+                {"node_info": [{"node": a}, {"node": b}], "relationships": [rel]}
+            ),
+        ]
+    )
+    storage = make_storage(driver)
+
+    graph = await storage.get_knowledge_graph("*", max_nodes=10)
+
+    properties = [n.properties for n in graph.nodes] + [
+        e.properties for e in graph.edges
+    ]
+    assert len(properties) == 3
+    for props in properties:
+        assert SCENE_TAGS_KEY_FIELD not in props
+        assert props["scene_tags"] == ["金融"]
+
+
+@pytest.mark.offline
+async def test_scene_tags_key_is_not_returned_by_evidence_reads():
+    node_rows = [{"n": stored_properties("A")}]
+    # Record.data() returns relationships as (start, type, end) tuples
+    relation_rows = [
+        {
+            "source": stored_properties("A"),
+            "r": (stored_properties("A"), "DIRECTED", stored_properties("B")),
+            "target": stored_properties("B"),
+        }
+    ]
+    storage = make_storage(
+        FakeDriver(
+            results=[FakeResult(rows=node_rows) for _ in range(4)]
+            + [FakeResult(rows=relation_rows) for _ in range(3)]
+        )
+    )
+
+    results = [
+        *await storage.get_entities_by_evidence_level("S"),
+        *await storage.get_entities_by_file("a.txt"),
+        *await storage.get_entities_by_scene("金融"),
+        *await storage.get_entities_by_evidence_level_and_scene("S", "金融"),
+    ]
+    for getter, arg in (
+        (storage.get_relations_by_evidence_level, "S"),
+        (storage.get_relations_by_scene, "金融"),
+        (storage.get_relations_by_type, "causal"),
+    ):
+        for row in await getter(arg):
+            results += [row["source"], row["target"]]
+            results += [v for v in row["relation"] if isinstance(v, dict)]
+
+    assert len(results) == 4 + 3 * 4
+    assert all(SCENE_TAGS_KEY_FIELD not in props for props in results)
@@ -0,0 +1,92 @@
+"""
+Tests for the NetworkXStorage CSR read snapshot.
+"""
+
+import random
+
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
+
+@pytest.fixture
+async def storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_READ_SNAPSHOT", "true")
+    initialize_share_data(workers=1)
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="snapshot",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+
+    rng = random.Random(7)
+    for i in range(40):
+        await storage.upsert_node(
+            f"n{i}", {"entity_type": "t", "scene_tags": ["a", str(i)]}
+        )
+    for _ in range(120):
+        src, tgt = f"n{rng.randrange(40)}", f"n{rng.randrange(40)}"
+        await storage.upsert_edge(src, tgt, {"weight": 1.0, "scene_tags": [src]})
+    await storage.upsert_edge("n0", "n0", {"weight": 2.0})
+    return storage
+
+
+async def read_all(storage, node_ids, pairs):
+    return (
+        await storage.get_nodes_batch(node_ids),
+        await storage.node_degrees_batch(node_ids),
+        await storage.edge_degrees_batch(pairs),
+        await storage.get_edges_batch([{"src": s, "tgt": t} for s, t in pairs]),
+        await storage.get_nodes_edges_batch(node_ids),
+    )
+
+
+@pytest.mark.offline
+async def test_snapshot_matches_graph_reads(storage):
+    node_ids = [f"n{i}" for i in range(40)] + ["missing"]
+    pairs = [(f"n{i}", f"n{j}") for i in range(40) for j in range(0, 40, 3)]
+    pairs += [("n0", "missing"), ("n0", "n0")]
+
+    # Writes since the last save: reads go to the NetworkX graph
+    assert storage._snapshot_dirty
+    expected = await read_all(storage, node_ids, pairs)
+    assert storage._snapshot is None
+
+    await storage.index_done_callback()
+    actual = await read_all(storage, node_ids, pairs)
+    assert storage._snapshot is not None
+    assert actual == expected
+
+    nodes, degrees, _, edges, node_edges = actual
+    assert nodes["n3"]["scene_tags"] == ["a", "3"]
+    assert degrees["n0"] == storage._graph.degree("n0")
+    assert degrees["missing"] == 0
+    assert edges[("n0", "n0")]["weight"] == 2.0
+    assert ("n0", "missing") not in edges
+    assert node_edges["missing"] == []
+
+    # Returned properties are copies
+    nodes["n3"]["entity_type"] = "changed"
+    assert (await storage.get_nodes_batch(["n3"]))["n3"]["entity_type"] == "t"
+
+
+@pytest.mark.offline
+async def test_writes_drop_the_snapshot_until_the_next_save(storage):
+    await storage.index_done_callback()
+    await storage.node_degrees_batch(["n1"])
+    assert storage._snapshot is not None
+
+    await storage.upsert_edge("n1", "new", {"weight": 1.0})
+    assert storage._snapshot is None
+    degree = (await storage.node_degrees_batch(["n1"]))["n1"]
+    assert degree == storage._graph.degree("n1")
+    assert storage._snapshot is None
+
+    await storage.index_done_callback()
+    assert (await storage.node_degrees_batch(["n1"]))["n1"] == degree
+    assert storage._snapshot is not None
+    edges = await storage.get_edges_batch([{"src": "new", "tgt": "n1"}])
+    assert ("new", "n1") in edges
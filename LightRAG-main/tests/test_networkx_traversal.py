@@ -0,0 +1,102 @@
+"""
+Tests for the NetworkXStorage degree index and subgraph traversal.
+"""
+
+import networkx as nx
+import pytest
+
+from lightrag.kg.networkx_impl import NetworkXStorage, _DegreeIndex
+from lightrag.kg.shared_storage import initialize_share_data
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    initialize_share_data(workers=1)
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="traversal",
+        global_config={"working_dir": str(tmp_path), "max_graph_nodes": 1000},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+async def add_star(storage, center, leaves):
+    for leaf in leaves:
+        await storage.upsert_edge(center, leaf, {"weight": 1.0})
+
+
+@pytest.mark.offline
+def test_degree_index_keeps_top_order_for_tail_writes():
+    graph = nx.star_graph(5)
+    graph.add_edge(10, 11)
+    index = _DegreeIndex(graph)
+    assert index.top(1) == [0]
+
+    index.update(11, 2)  # below the cached prefix
+    assert index._top
+    index.update(11, 9)
+    assert not index._top
+    assert index.top(1) == [11]
+    index.update(11, None)
+    assert index.top(1) == [0]
+    assert 11 not in index.degrees
+
+
+@pytest.mark.offline
+async def test_popular_labels_follow_writes(storage):
+    await add_star(storage, "hub", ["a", "b", "c"])
+    await add_star(storage, "b", ["x"])
+    assert await storage.get_popular_labels(2) == ["hub", "b"]
+
+    await add_star(storage, "x", ["p", "q", "r", "s"])
+    assert (await storage.get_popular_labels(1)) == ["x"]
+
+    await storage.delete_node("x")
+    assert (await storage.get_popular_labels(1)) == ["hub"]
+    assert storage._degree_index.degrees["b"] == 1
+
+    await storage.remove_edges([("hub", "a")])
+    await storage.remove_nodes(["c"])
+    assert storage._degree_index.degrees == dict(storage._graph.degree())
+
+
+@pytest.mark.offline
+async def test_star_view_takes_highest_degree_nodes(storage):
+    await add_star(storage, "hub", ["a", "b", "c"])
+    await add_star(storage, "b", ["x"])
+
+    kg = await storage.get_knowledge_graph("*", max_nodes=2)
+    assert kg.is_truncated
+    assert {n.id for n in kg.nodes} == {"hub", "b"}
+    assert [(e.source, e.target) for e in kg.edges] == [("b", "hub")]
+
+    kg = await storage.get_knowledge_graph("*", max_nodes=10)
+    assert not kg.is_truncated
+    assert len(kg.nodes) == 5
+
+
+@pytest.mark.offline
+async def test_bfs_prefers_high_degree_nodes_in_the_overflowing_level(storage):
+    # root -> a, b, c; b has the most neighbours, then c
+    await add_star(storage, "root", ["a", "b", "c"])
+    await add_star(storage, "b", ["b1", "b2", "b3"])
+    await add_star(storage, "c", ["c1"])
+
+    kg = await storage.get_knowledge_graph("root", max_depth=3, max_nodes=3)
+    assert kg.is_truncated
+    assert {n.id for n in kg.nodes} == {"root", "b", "c"}
+
+    kg = await storage.get_knowledge_graph("root", max_depth=1, max_nodes=10)
+    assert not kg.is_truncated
+    assert {n.id for n in kg.nodes} == {"root", "a", "b", "c"}
+
+    # A level that exactly fills max_nodes is only truncated if more follow
+    kg = await storage.get_knowledge_graph("root", max_depth=3, max_nodes=4)
+    assert kg.is_truncated
+    kg = await storage.get_knowledge_graph("root", max_depth=3, max_nodes=8)
+    assert not kg.is_truncated
+    assert len(kg.nodes) == 8
+
+    assert (await storage.get_knowledge_graph("missing")).nodes == []
@@ -0,0 +1,164 @@
+"""
+Tests for packing several small chunks into one entity extraction request.
+"""
+
+import pytest
+
+from lightrag.operate import (
+    _get_cached_extraction_results,
+    _split_packed_extraction_result,
+    extract_entities,
+)
+from lightrag.utils import Tokenizer
+
+CHUNK = "<|CHUNK|>"
+COMPLETE = "<|COMPLETE|>"
+
+
+class WordTokenizer:
+    def encode(self, content):
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def entity_line(name):
+    return f"entity<|#|>{name}<|#|>person<|#|>{name} is mentioned in the clause."
+
+
+class FakeLLM:
+    """Answers packed prompts with one section per chunk marker"""
+
+    def __init__(self, broken_packs=False):
+        self.broken_packs = broken_packs
+        self.prompts = []
+
+    async def __call__(self, prompt, system_prompt=None, **kwargs):
+        self.prompts.append(prompt)
+        names = [line for line in prompt.splitlines() if line.startswith("Clause ")]
+        if "<Input Texts>" not in prompt:
+            return f"{entity_line(names[0].split()[1])}\n{COMPLETE}"
+        if self.broken_packs:
+            return f"{entity_line('Lost')}\n{COMPLETE}"
+        sections = [
+            f"{CHUNK}{index}\n{entity_line(name.split()[1])}"
+            for index, name in enumerate(names, start=1)
+        ]
+        return "\n".join(sections) + f"\n{COMPLETE}"
+
+
+class FakeKV:
+    def __init__(self, data=None, global_config=None):
+        self.data = dict(data or {})
+        self.global_config = global_config or {}
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def get_by_ids(self, ids):
+        return [self.data.get(i) for i in ids]
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+def make_chunks(count):
+    return {
+        f"chunk-{i}": {
+            "tokens": 3,
+            "content": f"Clause P{i} applies.",
+            "full_doc_id": "doc",
+            "chunk_order_index": i,
+            "file_path": "policy.txt",
+        }
+        for i in range(count)
+    }
+
+
+def make_config(llm, pack_size):
+    return {
+        "llm_model_func": llm,
+        "entity_extract_max_gleaning": 0,
+        "addon_params": {},
+        "tokenizer": Tokenizer("words", WordTokenizer()),
+        "max_extract_input_tokens": 100000,
+        "entity_extract_max_completion_tokens": 1024,
+        "entity_extract_pack_size": pack_size,
+        "entity_extract_pack_max_tokens": 1000,
+    }
+
+
+def extracted_names(results):
+    return sorted(name for nodes, _ in results for name in nodes)
+
+
+@pytest.mark.offline
+class TestPackedExtraction:
+    def test_split_requires_every_marker(self):
+        result = f"{CHUNK}1\nA\n{CHUNK} 2\nB\n{COMPLETE}"
+        assert _split_packed_extraction_result(result, 2, CHUNK, COMPLETE) == [
+            f"A\n{COMPLETE}",
+            f"B\n{COMPLETE}",
+        ]
+        # Missing marker, truncated output or text outside sections are rejected
+        assert _split_packed_extraction_result(result, 3, CHUNK, COMPLETE) is None
+        assert (
+            _split_packed_extraction_result(f"{CHUNK}1\nA", 1, CHUNK, COMPLETE) is None
+        )
+        assert (
+            _split_packed_extraction_result(
+                f"A\n{CHUNK}1\n{COMPLETE}", 1, CHUNK, COMPLETE
+            )
+            is None
+        )
+
+    async def test_chunks_are_packed_and_demultiplexed(self):
+        llm = FakeLLM()
+        results = await extract_entities(make_chunks(5), make_config(llm, 2))
+
+        assert len(llm.prompts) == 3  # packs of 2 + 2 + 1
+        assert extracted_names(results) == ["P0", "P1", "P2", "P3", "P4"]
+        for nodes, _ in results:
+            (entity,) = [dp for dps in nodes.values() for dp in dps]
+            assert entity["source_id"] == f"chunk-{entity['entity_name'][1:]}"
+
+    async def test_unsplittable_pack_falls_back_to_single_chunks(self):
+        llm = FakeLLM(broken_packs=True)
+        results = await extract_entities(make_chunks(3), make_config(llm, 3))
+
+        assert len(llm.prompts) == 1 + 3
+        assert extracted_names(results) == ["P0", "P1", "P2"]
+
+    async def test_packing_disabled_by_default(self):
+        llm = FakeLLM()
+        config = make_config(llm, 1)
+        results = await extract_entities(make_chunks(3), config)
+
+        assert len(llm.prompts) == 3
+        assert all("<Input Texts>" not in prompt for prompt in llm.prompts)
+        assert extracted_names(results) == ["P0", "P1", "P2"]
+
+    async def test_pack_writes_per_chunk_cache_entries(self):
+        llm = FakeLLM()
+        chunks = make_chunks(2)
+        llm_cache = FakeKV(global_config={"enable_llm_cache_for_entity_extract": True})
+        text_chunks = FakeKV(chunks)
+
+        await extract_entities(
+            chunks,
+            make_config(llm, 2),
+            llm_response_cache=llm_cache,
+            text_chunks_storage=text_chunks,
+        )
+
+        pack_entries = [e for e in llm_cache.data.values() if e["chunk_id"] is None]
+        assert len(pack_entries) == 1
+        # Rebuilding from the LLM cache sees only each chunk's own section
+        cached = await _get_cached_extraction_results(
+            llm_cache, set(chunks), text_chunks_storage=text_chunks
+        )
+        assert sorted(cached) == ["chunk-0", "chunk-1"]
+        assert "P0" in cached["chunk-0"][0][0] and "P1" not in cached["chunk-0"][0][0]
+        for chunk in text_chunks.data.values():
+            assert len(chunk["llm_cache_list"]) == 2
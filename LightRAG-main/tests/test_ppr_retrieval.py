@@ -0,0 +1,138 @@
+"""
+Tests for personalized PageRank multi-hop retrieval.
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.operate import _select_by_ppr
+from lightrag.utils import personalized_pagerank
+
+
+@pytest.mark.offline
+class TestPersonalizedPagerank:
+    def test_matches_closed_form(self):
+        rng = np.random.default_rng(0)
+        node_count = 30
+        src = rng.integers(0, node_count, 80)
+        dst = rng.integers(0, node_count, 80)
+        weights = rng.uniform(0.5, 3.0, 80)
+        restart = np.zeros(node_count)
+        restart[[0, 4]] = [2.0, 1.0]
+        damping = 0.6
+
+        scores, flows = personalized_pagerank(
+            restart, src, dst, weights, damping=damping, max_iter=500, tol=1e-14
+        )
+
+        adjacency = np.zeros((node_count, node_count))
+        np.add.at(adjacency, (src, dst), weights)
+        np.add.at(adjacency, (dst, src), weights)
+        p = restart / restart.sum()
+        out = adjacency.sum(axis=1)
+        transition = np.divide(
+            adjacency,
+            out[:, None],
+            out=np.zeros_like(adjacency),
+            where=out[:, None] > 0,
+        )
+        # Dangling nodes restart at the seeds
+        transition[out == 0] = p
+        expected = (1 - damping) * np.linalg.solve(
+            np.eye(node_count) - damping * transition.T, p
+        )
+        assert scores == pytest.approx(expected, abs=1e-9)
+        assert scores.sum() == pytest.approx(1.0)
+        assert len(flows) == 80 and (flows >= 0).all()
+
+    def test_degenerate_inputs(self):
+        scores, flows = personalized_pagerank([], [], [])
+        assert scores.size == 0 and flows.size == 0
+        scores, _ = personalized_pagerank([0.0, 0.0], [0], [1])
+        assert scores.tolist() == [0.0, 0.0]
+        # An isolated seed keeps all the mass
+        scores, _ = personalized_pagerank([1.0, 0.0], [], [])
+        assert scores.tolist() == [1.0, 0.0]
+
+
+@pytest.fixture
+async def storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_READ_SNAPSHOT", "true")
+    initialize_share_data(workers=1)
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="ppr",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    # A chain A-B-C-D with a hub H attached to B and many leaves
+    for name in "ABCDH":
+        await storage.upsert_node(name, {"entity_type": "t", "description": name})
+    for src, tgt in [("A", "B"), ("B", "C"), ("C", "D"), ("B", "H")]:
+        await storage.upsert_edge(src, tgt, {"weight": 1.0, "description": src + tgt})
+    for i in range(5):
+        await storage.upsert_node(f"L{i}", {"entity_type": "t"})
+        await storage.upsert_edge("H", f"L{i}", {"weight": 1.0})
+    return storage
+
+
+@pytest.mark.offline
+async def test_snapshot_walk_matches_default_walk(storage):
+    seeds = {"A": 1.0, "D": 0.5}
+    default = await storage.personalized_pagerank(seeds, max_hops=10)
+    assert storage._snapshot is None  # writes pending, snapshot not built yet
+
+    await storage.index_done_callback()
+    snapshot = await storage.personalized_pagerank(seeds, max_hops=10)
+    assert storage._snapshot is not None
+
+    assert snapshot[0] == pytest.approx(default[0])
+    assert snapshot[1] == pytest.approx(default[1])
+    assert set(snapshot[1]) == {("A", "B"), ("B", "C"), ("C", "D"), ("B", "H")} | {
+        ("H", f"L{i}") for i in range(5)
+    }
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("use_snapshot", [True, False])
+async def test_hops_and_node_cap_bound_the_walk(storage, use_snapshot):
+    storage._snapshot_enabled = use_snapshot
+    await storage.index_done_callback()
+
+    scores, edges = await storage.personalized_pagerank({"A": 1.0}, max_hops=1)
+    assert set(scores) == {"A", "B"}
+    assert set(edges) == {("A", "B")}
+
+    scores, _ = await storage.personalized_pagerank({"A": 1.0}, max_hops=5, max_nodes=3)
+    assert len(scores) == 3
+
+    # Unknown seeds reach nothing
+    _, edges = await storage.personalized_pagerank({"missing": 1.0})
+    assert edges == {}
+
+
+@pytest.mark.offline
+async def test_select_by_ppr_reaches_multi_hop_evidence(storage):
+    entities = [{"entity_name": "A", "description": "seed", "evidence_score": 0.5}]
+    relations = [{"src_tgt": ("A", "B"), "weight": 1.0, "description": "AB"}]
+
+    selected_entities, selected_relations = await _select_by_ppr(
+        entities, relations, storage, QueryParam(top_k=3, ppr_max_hops=3)
+    )
+
+    assert [e["entity_name"] for e in selected_entities] == ["A", "B", "H"]
+    assert selected_entities[0] is entities[0]
+    assert selected_entities[1]["description"] == "B"
+    assert selected_entities[1]["rank"] == 3
+    scores = [e["ppr_score"] for e in selected_entities]
+    assert scores == sorted(scores, reverse=True)
+
+    pairs = [r["src_tgt"] for r in selected_relations]
+    assert pairs[0] == ("A", "B") and selected_relations[0] is relations[0]
+    assert ("B", "C") in pairs
+    new = selected_relations[pairs.index(("B", "C"))]
+    assert new["description"] == "BC" and new["rank"] == 5
@@ -0,0 +1,232 @@
+"""
+Tests for provider prompt caching and cached-token accounting.
+"""
+
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from lightrag.prompt import PROMPTS
+from lightrag.utils import TokenTracker, split_prompt_context
+
+
+def query_system_prompt(context: str) -> str:
+    return PROMPTS["rag_response"].format(
+        response_type="Multiple Paragraphs",
+        user_prompt="n/a",
+        context_data=context,
+    )
+
+
+@pytest.mark.offline
+def test_split_prompt_context():
+    first = split_prompt_context(query_system_prompt("entities of query one"))
+    second = split_prompt_context(query_system_prompt("entities of query two"))
+
+    assert first[0] == second[0]
+    assert "---Context---" not in first[0]
+    assert first[1].startswith("---Context---")
+    assert first[1].rstrip().endswith("entities of query one")
+    # Prompts without a context section are static as a whole
+    assert split_prompt_context("extraction instructions") == (
+        "extraction instructions",
+        "",
+    )
+
+
+@pytest.mark.offline
+def test_token_tracker_reports_cached_tokens():
+    tracker = TokenTracker()
+    tracker.add_usage(
+        {"prompt_tokens": 100, "cached_tokens": 80, "completion_tokens": 10}
+    )
+    tracker.add_usage({"prompt_tokens": 50, "completion_tokens": 5})
+
+    usage = tracker.get_usage()
+    assert usage["cached_tokens"] == 80
+    assert usage["uncached_prompt_tokens"] == 70
+    assert usage["total_tokens"] == 165
+    assert "(80 cached)" in str(tracker)
+
+
+@pytest.mark.offline
+def test_openai_cached_tokens_from_usage():
+    from lightrag.llm.openai import _get_cached_tokens
+
+    usage = SimpleNamespace(prompt_tokens_details=SimpleNamespace(cached_tokens=64))
+    assert _get_cached_tokens(usage) == 64
+    # Older endpoints and OpenAI-compatible servers may not report details
+    assert _get_cached_tokens(SimpleNamespace(prompt_tokens_details=None)) == 0
+    assert _get_cached_tokens(SimpleNamespace()) == 0
+
+
+class FakeGeminiClient:
+    def __init__(self, fail_cache=False):
+        self.fail_cache = fail_cache
+        self.attempts = 0
+        self.created = []
+        self.requests = []
+        self.contents = []
+        self.aio = SimpleNamespace(
+            caches=SimpleNamespace(create=self._create_cache),
+            models=SimpleNamespace(generate_content=self._generate),
+        )
+
+    async def _create_cache(self, model, config):
+        self.attempts += 1
+        if self.fail_cache:
+            raise ValueError("Cached content is too small")
+        self.created.append(config)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    async def _generate(self, model, contents, config=None):
+        self.requests.append(config)
+        self.contents.append(contents)
+        part = SimpleNamespace(text="answer", thought=False)
+        return SimpleNamespace(
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))],
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=1200,
+                cached_content_token_count=1100,
+                candidates_token_count=5,
+                total_token_count=1205,
+            ),
+        )
+
+
+@pytest.mark.offline
+class TestGeminiContextCache:
+    @pytest.fixture(autouse=True)
+    def gemini(self, monkeypatch):
+        gemini = pytest.importorskip("lightrag.llm.gemini")
+        monkeypatch.setattr(gemini, "_context_caches", OrderedDict())
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        return gemini
+
+    async def complete(
+        self, gemini, client, monkeypatch, system_prompt="static instructions", **kwargs
+    ):
+        monkeypatch.setattr(gemini, "_get_gemini_client", lambda *args: client)
+        tracker = TokenTracker()
+        result = await gemini.gemini_complete_if_cache.retry_with(stop=lambda _: True)(
+            "gemini-test",
+            "user prompt",
+            system_prompt=system_prompt,
+            token_tracker=tracker,
+            **kwargs,
+        )
+        assert result == "answer"
+        return tracker
+
+    async def test_system_prompt_served_from_context_cache(self, gemini, monkeypatch):
+        client = FakeGeminiClient()
+        for _ in range(2):
+            tracker = await self.complete(
+                gemini,
+                client,
+                monkeypatch,
+                generation_config={"temperature": 0.1, "context_cache_ttl": 600},
+            )
+
+        assert len(client.created) == 1
+        assert client.created[0].system_instruction == "static instructions"
+        for config in client.requests:
+            assert config.cached_content == "cachedContents/1"
+            assert config.system_instruction is None
+            assert config.temperature == 0.1
+        assert tracker.get_usage()["cached_tokens"] == 1100
+
+    async def test_uncacheable_prompt_is_sent_inline(self, gemini, monkeypatch):
+        client = FakeGeminiClient(fail_cache=True)
+        for _ in range(2):
+            await self.complete(gemini, client, monkeypatch, context_cache_ttl=600)
+
+        # The failed creation is remembered instead of being retried per request
+        assert client.attempts == 1
+        for config in client.requests:
+            assert config.cached_content is None
+            assert config.system_instruction == "static instructions"
+
+    async def test_context_cache_disabled_by_default(self, gemini, monkeypatch):
+        client = FakeGeminiClient()
+        await self.complete(gemini, client, monkeypatch)
+
+        assert client.created == []
+        assert client.requests[0].system_instruction == "static instructions"
+
+    async def test_query_context_is_not_cached(self, gemini, monkeypatch):
+        client = FakeGeminiClient()
+        for context in ("entities of query one", "entities of query two"):
+            await self.complete(
+                gemini,
+                client,
+                monkeypatch,
+                system_prompt=query_system_prompt(context),
+                context_cache_ttl=600,
+            )
+
+        # Both queries share one cache holding the instructions ahead of the context
+        instructions = split_prompt_context(query_system_prompt(""))[0]
+        assert len(client.created) == 1
+        assert client.created[0].system_instruction == instructions
+        assert [config.cached_content for config in client.requests] == [
+            "cachedContents/1",
+            "cachedContents/1",
+        ]
+        assert "entities of query one" in client.contents[0][0]
+        assert "entities of query two" in client.contents[1][0]
+        assert client.contents[1][1] == "[user] user prompt"
+
+    async def test_context_caches_are_bounded_and_per_client(self, gemini, monkeypatch):
+        monkeypatch.setattr(gemini, "_CONTEXT_CACHE_MAX_ENTRIES", 2)
+        client = FakeGeminiClient()
+        for prompt in ("first", "second", "third"):
+            await gemini._get_context_cache(client, "key-a", "m", prompt, 600)
+        assert len(gemini._context_caches) == 2
+        assert [k[2] for k in gemini._context_caches] == [
+            gemini.md5(p.encode()).hexdigest() for p in ("second", "third")
+        ]
+
+        # Another API key (project) cannot use caches created by the first one
+        await gemini._get_context_cache(client, "key-b", "m", "third", 600)
+        assert len(client.created) == 4
+
+        # Expired entries are dropped before new ones are added
+        for entry in gemini._context_caches.values():
+            entry.refresh_at = 0.0
+        await gemini._get_context_cache(client, "key-a", "m", "fourth", 600)
+        assert len(gemini._context_caches) == 1
+        assert gemini._client_identity("a", None) != gemini._client_identity("b", None)
+
+
+@pytest.mark.offline
+def test_anthropic_query_context_outside_cached_prefix():
+    pytest.importorskip("anthropic")
+    pytest.importorskip("voyageai")
+    from lightrag.llm.anthropic import _build_cacheable_messages
+
+    systems = []
+    for context in ("entities of query one", "entities of query two"):
+        system, messages = _build_cacheable_messages(
+            query_system_prompt(context), [], "question"
+        )
+        systems.append(system)
+        assert messages == [{"role": "user", "content": "question"}]
+
+    # The cached block is identical for both queries, the context is not cached
+    first, second = systems
+    assert first[0] == second[0]
+    assert first[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in first[1]
+    assert "entities of query one" in first[1]["text"]
+    assert "entities of query two" in second[1]["text"]
+
+    system, _ = _build_cacheable_messages("extraction instructions", [], "text")
+    assert system == [
+        {
+            "type": "text",
+            "text": "extraction instructions",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
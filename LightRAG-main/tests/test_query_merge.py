@@ -0,0 +1,59 @@
+"""
+Tests for the round-robin merge and dedup of query search results.
+"""
+
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.operate import (
+    _merge_all_chunks,
+    _relation_key,
+    _round_robin_merge,
+)
+
+
+@pytest.mark.offline
+class TestRoundRobinMerge:
+    def test_interleaves_and_keeps_first_occurrence(self):
+        local = [{"entity_name": n, "src": "local"} for n in ["a", "b", "c", "d"]]
+        global_ = [{"entity_name": n, "src": "global"} for n in ["b", "e", "a"]]
+        global_.append({"description": "no name"})
+
+        merged = _round_robin_merge([local, global_], lambda e: e.get("entity_name"))
+
+        assert [e["entity_name"] for e in merged] == ["a", "b", "e", "c", "d"]
+        assert merged[1] is global_[0]
+        assert _round_robin_merge([[], []], lambda e: e) == []
+
+    def test_relation_key_is_order_independent(self):
+        assert _relation_key({"src_tgt": ("b", "a")}) == ("a", "b")
+        assert _relation_key({"src_id": "a", "tgt_id": "b"}) == ("a", "b")
+
+        relations = [
+            {"src_tgt": ("a", "b"), "description": "local"},
+            {"src_id": "b", "tgt_id": "a", "description": "global"},
+            {"src_id": "c", "tgt_id": "a"},
+        ]
+        merged = _round_robin_merge([relations[:1], relations[1:]], _relation_key)
+        assert [r.get("description") for r in merged] == ["local", None]
+
+
+@pytest.mark.offline
+async def test_merge_all_chunks_dedups_across_sources():
+    vector_chunks = [
+        {"chunk_id": "c1", "content": "one", "file_path": "f", "distance": 0.1},
+        {"id": "c2", "content": "two"},
+        {"content": "no id"},
+    ]
+
+    merged = await _merge_all_chunks(
+        filtered_entities=[],
+        filtered_relations=[],
+        vector_chunks=vector_chunks + [vector_chunks[0]],
+        query_param=QueryParam(),
+    )
+
+    assert merged == [
+        {"content": "one", "file_path": "f", "chunk_id": "c1"},
+        {"content": "two", "file_path": "unknown_source", "chunk_id": "c2"},
+    ]
@@ -0,0 +1,131 @@
+"""
+Tests for the RPM/TPM token-bucket limiter of the LLM and embedding call path.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.utils import (
+    TokenBucketRateLimiter,
+    Tokenizer,
+    estimate_call_tokens,
+    get_rate_limiter,
+    priority_limit_async_func_call,
+)
+
+
+class WordTokenizer:
+    def encode(self, content):
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+TOKENIZER = Tokenizer("words", WordTokenizer())
+
+
+@pytest.mark.offline
+class TestTokenBucketRateLimiter:
+    async def test_requests_wait_for_refill(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=600)
+        limiter._requests = 0
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire()
+        # 600 RPM refills one request every 0.1s
+        assert 0.08 <= loop.time() - start < 0.5
+
+    async def test_queries_preempt_extraction(self):
+        limiter = TokenBucketRateLimiter(tokens_per_minute=60000)
+        limiter._tokens = 0
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(50, priority)
+            order.append(name)
+
+        extraction = asyncio.create_task(call("extract", 8))
+        await asyncio.sleep(0)
+        query = asyncio.create_task(call("query", 5))
+        await asyncio.gather(extraction, query)
+        assert order == ["query", "extract"]
+
+    async def test_settle_corrects_estimate(self):
+        limiter = TokenBucketRateLimiter(tokens_per_minute=1000)
+        reserved = await limiter.acquire(600)
+        limiter.settle(reserved, 100)
+        assert limiter.get_metrics()["available_tokens"] == pytest.approx(900, abs=1)
+        # Oversized requests are capped at the bucket size instead of blocking forever
+        limiter = TokenBucketRateLimiter(tokens_per_minute=1000)
+        assert await limiter.acquire(5000) == 1000
+
+    def test_shared_limiter_per_model(self):
+        assert get_rate_limiter("llm:test-model") is None
+        limiter = get_rate_limiter("llm:test-model", 100, 0)
+        assert get_rate_limiter("llm:test-model", 100, 0) is limiter
+        assert get_rate_limiter("llm:test-model", 200, 0) is not limiter
+
+
+@pytest.mark.offline
+def test_estimate_call_tokens():
+    prompt, completion = estimate_call_tokens(
+        ("one two three",),
+        {
+            "system_prompt": "four five",
+            "history_messages": [{"role": "user", "content": "six"}],
+            "max_tokens": 100,
+        },
+        TOKENIZER,
+    )
+    assert (prompt, completion) == (6, 100)
+    assert estimate_call_tokens((["a b", "c"],), {}, TOKENIZER) == (3, 0)
+
+
+@pytest.mark.offline
+async def test_limited_func_meters_actual_tokens():
+    limiter = TokenBucketRateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+
+    async def llm(prompt, **kwargs):
+        return "a short answer"
+
+    func = priority_limit_async_func_call(
+        2, queue_name="rate-test", rate_limiter=limiter, tokenizer=TOKENIZER
+    )(llm)
+    try:
+        assert await func("one two three four", max_tokens=500) == "a short answer"
+        metrics = func.get_metrics()
+        # 4 prompt + 3 completion tokens remain charged after settlement
+        assert metrics["available_tokens"] == pytest.approx(993, abs=1)
+        assert metrics["available_requests"] == pytest.approx(99, abs=0.1)
+    finally:
+        await func.shutdown()
+
+
+@pytest.mark.offline
+async def test_urgent_call_takes_over_rate_limit_reservation():
+    limiter = TokenBucketRateLimiter(requests_per_minute=600)
+    limiter._requests = 0  # next request allowed in about 0.1s
+    order = []
+
+    async def llm(name):
+        order.append(name)
+        return name
+
+    func = priority_limit_async_func_call(
+        2, queue_name="rate-priority-test", rate_limiter=limiter
+    )(llm)
+    try:
+        bulk = [asyncio.create_task(func(f"bulk-{i}", _priority=8)) for i in range(3)]
+        await asyncio.sleep(0.02)
+        # Queued after the bulk calls started waiting for quota, served first
+        query = asyncio.create_task(func("query", _priority=5))
+        await asyncio.gather(query, *bulk)
+
+        assert order[0] == "query"
+        assert sorted(order[1:]) == ["bulk-0", "bulk-1", "bulk-2"]
+        assert func.get_metrics()["queue_depth"] == 0
+    finally:
+        await func.shutdown()
@@ -0,0 +1,188 @@
+"""
+Tests for the index-backed RedisDocStatusStorage, run against fakeredis.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting support of fakeredis
+
+from lightrag.base import DocStatus
+from lightrag.kg import redis_impl
+from lightrag.kg.redis_impl import RedisDocStatusStorage
+
+
+@pytest.fixture(autouse=True)
+def mock_data_init_lock():
+    with patch("lightrag.kg.redis_impl.get_data_init_lock") as mock_lock:
+        mock_lock.return_value = AsyncMock()
+        yield mock_lock
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+async def make_storage(server) -> RedisDocStatusStorage:
+    storage = RedisDocStatusStorage(
+        namespace="doc_status",
+        workspace="test",
+        global_config={},
+        embedding_func=None,
+    )
+    storage._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return storage
+
+
+def doc(status, created, updated=None, file_path=None, track_id="track-1"):
+    return {
+        "content_summary": "summary",
+        "content_length": 10,
+        "file_path": file_path or f"{created}.txt",
+        "status": status,
+        "created_at": f"2025-01-01T00:00:{created:02d}+00:00",
+        "updated_at": f"2025-01-02T00:00:{updated or created:02d}+00:00",
+        "track_id": track_id,
+    }
+
+
+@pytest.mark.offline
+class TestRedisDocStatusStorage:
+    async def test_upsert_counts_and_lookups(self, server):
+        storage = await make_storage(server)
+        await storage.initialize()
+        await storage.upsert(
+            {
+                "doc-1": doc(DocStatus.PENDING, 1),
+                "doc-2": doc(DocStatus.PROCESSED, 2, track_id="track-2"),
+                "doc-3": doc(DocStatus.PROCESSED, 3, file_path="same.txt"),
+            }
+        )
+
+        counts = await storage.get_all_status_counts()
+        assert counts[DocStatus.PENDING.value] == 1
+        assert counts[DocStatus.PROCESSED.value] == 2
+        assert counts["all"] == 3
+        assert set(await storage.get_docs_by_status(DocStatus.PROCESSED)) == {
+            "doc-2",
+            "doc-3",
+        }
+        assert set(await storage.get_docs_by_track_id("track-2")) == {"doc-2"}
+        assert (await storage.get_doc_by_file_path("same.txt"))["created_at"] == (
+            doc(DocStatus.PROCESSED, 3)["created_at"]
+        )
+        assert await storage.filter_keys({"doc-1", "doc-9"}) == {"doc-9"}
+
+        # A status change moves the document between index entries
+        await storage.upsert({"doc-1": doc(DocStatus.PROCESSED, 1, updated=9)})
+        counts = await storage.get_status_counts()
+        assert counts[DocStatus.PENDING.value] == 0
+        assert counts[DocStatus.PROCESSED.value] == 3
+        assert (await storage.get_by_id("doc-1"))["chunks_list"] == []
+
+    async def test_delete_removes_index_entries(self, server):
+        storage = await make_storage(server)
+        await storage.initialize()
+        await storage.upsert(
+            {
+                "doc-1": doc(DocStatus.PENDING, 1),
+                "doc-2": doc(DocStatus.PENDING, 2),
+            }
+        )
+
+        await storage.delete(["doc-1", "missing"])
+
+        assert await storage.get_by_id("doc-1") is None
+        assert (await storage.get_status_counts())[DocStatus.PENDING.value] == 1
+        assert set(await storage.get_docs_by_track_id("track-1")) == {"doc-2"}
+        assert await storage.get_doc_by_file_path("1.txt") is None
+        docs, total = await storage.get_docs_paginated()
+        assert [doc_id for doc_id, _ in docs] == ["doc-2"] and total == 1
+
+        await storage.drop()
+        assert await storage.is_empty()
+        assert await storage._redis.keys("*") == []
+
+    async def test_pagination_order_and_status_filter(self, server):
+        storage = await make_storage(server)
+        await storage.initialize()
+        await storage.upsert(
+            {
+                f"doc-{i:02d}": doc(
+                    DocStatus.PROCESSED if i % 2 else DocStatus.FAILED,
+                    i,
+                    updated=30 - i,
+                    file_path=f"file-{25 - i:02d}.txt",
+                )
+                for i in range(25)
+            }
+        )
+
+        docs, total = await storage.get_docs_paginated(
+            page=2, page_size=10, sort_field="created_at", sort_direction="asc"
+        )
+        assert total == 25
+        assert [doc_id for doc_id, _ in docs] == [f"doc-{i:02d}" for i in range(10, 20)]
+
+        docs, total = await storage.get_docs_paginated(
+            status_filter=DocStatus.PROCESSED, sort_field="updated_at"
+        )
+        assert total == 12
+        assert [doc_id for doc_id, _ in docs][:2] == ["doc-01", "doc-03"]
+
+        docs, _ = await storage.get_docs_paginated(
+            page=3, sort_field="file_path", sort_direction="asc", page_size=10
+        )
+        assert [d.file_path for _, d in docs] == [
+            f"file-{i:02d}.txt" for i in range(21, 26)
+        ]
+
+    async def test_existing_documents_are_indexed_on_initialize(self, server):
+        redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        for i in range(3):
+            await redis.set(
+                f"test_doc_status:doc-{i}", json.dumps(doc(DocStatus.PENDING, i))
+            )
+        await redis.set("test_doc_status:broken", "{not json")
+
+        storage = await make_storage(server)
+        await storage.initialize()
+
+        assert (await storage.get_status_counts())[DocStatus.PENDING.value] == 3
+        assert await redis.get("test_doc_status#idx:version") == (
+            redis_impl.DOC_STATUS_INDEX_VERSION
+        )
+
+        # Later starts find the version marker and skip the rebuild
+        await redis.hset("test_doc_status#idx:counts", "pending", 7)
+        storage = await make_storage(server)
+        await storage.initialize()
+        assert (await storage.get_status_counts())[DocStatus.PENDING.value] == 7
+
+    async def test_failed_index_build_is_retried(self, server):
+        storage = await make_storage(server)
+        failing_build = AsyncMock(side_effect=RuntimeError("boom"))
+        with (
+            patch.object(storage, "_ensure_indexes", failing_build),
+            pytest.raises(RuntimeError),
+        ):
+            await storage.initialize()
+        assert not storage._initialized
+
+        await storage.initialize()
+        assert storage._initialized
+
+    async def test_redis_cluster_is_rejected(self, server):
+        storage = await make_storage(server)
+        storage._redis.execute_command = AsyncMock(return_value="cluster_state:ok")
+        with (
+            patch.object(storage, "close", AsyncMock()) as close,
+            pytest.raises(RuntimeError, match="Redis Cluster"),
+        ):
+            await storage.initialize()
+        close.assert_awaited_once()
+        assert not storage._initialized
@@ -0,0 +1,142 @@
+"""
+Unit tests for the rerank score cache used by apply_rerank_if_enabled.
+"""
+
+from functools import partial
+
+import pytest
+
+from lightrag.utils import (
+    RerankScoreCache,
+    apply_rerank_if_enabled,
+    rerank_score_cache,
+)
+
+
+class CountingRerank:
+    """Scores documents by length and records what was sent to the model"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, query, documents, top_n=None, **kwargs):
+        self.calls.append(list(documents))
+        results = [
+            {"index": i, "relevance_score": len(doc) / 100}
+            for i, doc in enumerate(documents)
+        ]
+        results.sort(key=lambda x: x["relevance_score"], reverse=True)
+        return results[:top_n] if top_n else results
+
+
+def make_chunks(*contents):
+    return [
+        {"chunk_id": f"chunk-{i}", "content": content}
+        for i, content in enumerate(contents)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    rerank_score_cache.clear()
+    yield
+    rerank_score_cache.clear()
+
+
+@pytest.mark.offline
+class TestRerankScoreCache:
+    async def test_only_uncached_chunks_are_reranked(self):
+        rerank = CountingRerank()
+        config = {
+            "rerank_model_func": rerank,
+            "enable_rerank_cache": True,
+            "workspace": "ws",
+        }
+
+        first = await apply_rerank_if_enabled(
+            "What is X?", make_chunks("aa", "aaaa"), config, top_n=2
+        )
+        # Same query after normalization, plus one new chunk
+        second = await apply_rerank_if_enabled(
+            "  what is   x? ", make_chunks("aa", "aaaa", "aaa"), config, top_n=2
+        )
+
+        assert rerank.calls == [["aa", "aaaa"], ["aaa"]]
+        assert [c["chunk_id"] for c in first] == ["chunk-1", "chunk-0"]
+        assert [c["chunk_id"] for c in second] == ["chunk-1", "chunk-2"]
+        assert second[0]["rerank_score"] == pytest.approx(0.04)
+
+    async def test_fully_cached_query_skips_rerank_model(self):
+        rerank = CountingRerank()
+        config = {"rerank_model_func": rerank, "enable_rerank_cache": True}
+        chunks = make_chunks("a", "bb", "ccc")
+
+        await apply_rerank_if_enabled("q", chunks, config)
+        result = await apply_rerank_if_enabled("q", chunks, config)
+
+        assert len(rerank.calls) == 1
+        assert [c["rerank_score"] for c in result] == pytest.approx([0.03, 0.02, 0.01])
+
+    async def test_cache_disabled(self):
+        rerank = CountingRerank()
+        config = {"rerank_model_func": rerank, "enable_rerank_cache": False}
+        chunks = make_chunks("a", "bb")
+
+        await apply_rerank_if_enabled("q", chunks, config)
+        await apply_rerank_if_enabled("q", chunks, config)
+
+        assert len(rerank.calls) == 2
+        assert len(rerank_score_cache) == 0
+
+    async def test_model_and_workspace_are_part_of_the_key(self):
+        rerank = CountingRerank()
+        chunks = make_chunks("a")
+        base = {"enable_rerank_cache": True, "workspace": "ws1"}
+
+        await apply_rerank_if_enabled(
+            "q", chunks, {**base, "rerank_model_func": partial(rerank, model="m1")}
+        )
+        await apply_rerank_if_enabled(
+            "q", chunks, {**base, "rerank_model_func": partial(rerank, model="m2")}
+        )
+        await apply_rerank_if_enabled(
+            "q",
+            chunks,
+            {
+                **base,
+                "workspace": "ws2",
+                "rerank_model_func": partial(rerank, model="m2"),
+            },
+        )
+
+        assert len(rerank.calls) == 3
+
+    async def test_invalidate_deleted_chunks(self):
+        rerank = CountingRerank()
+        config = {
+            "rerank_model_func": rerank,
+            "enable_rerank_cache": True,
+            "workspace": "ws",
+        }
+        chunks = make_chunks("a", "bb")
+
+        await apply_rerank_if_enabled("q1", chunks, config)
+        await apply_rerank_if_enabled("q2", chunks, config)
+        assert rerank_score_cache.invalidate_chunks("ws", ["chunk-0"]) == 2
+        assert rerank_score_cache.invalidate_chunks("other", ["chunk-1"]) == 0
+
+        await apply_rerank_if_enabled("q1", chunks, config)
+        assert rerank.calls[-1] == ["a"]
+
+    def test_lru_eviction(self):
+        cache = RerankScoreCache(max_size=2)
+        cache.set(("ws", "m", "q", "c1"), 0.1)
+        cache.set(("ws", "m", "q", "c2"), 0.2)
+        assert cache.get(("ws", "m", "q", "c1")) == 0.1  # c1 becomes most recent
+        cache.set(("ws", "m", "q", "c3"), 0.3)
+
+        assert cache.get(("ws", "m", "q", "c2")) is None
+        assert cache.get(("ws", "m", "q", "c1")) == 0.1
+        assert len(cache) == 2
+        # Evicted entries are also removed from the chunk index
+        assert cache.invalidate_chunks("ws", ["c2"]) == 0
@@ -0,0 +1,170 @@
+"""
+Tests for coalescing identical in-flight LLM and embedding calls.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.utils import EmbeddingFunc, SingleFlight, use_llm_func_with_cache
+
+
+class MemoryKV:
+    def __init__(self):
+        self.global_config = {"enable_llm_cache_for_entity_extract": True}
+        self.data = {}
+
+    async def get_by_id(self, key):
+        return self.data.get(key)
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+@pytest.mark.offline
+class TestSingleFlight:
+    async def test_followers_share_leader_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert results == [1] * 5
+        assert flight.get_metrics() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+        # Completed calls are not reused without a window
+        assert await flight.do("key", work) == 2
+
+    async def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        results = await asyncio.gather(
+            *(flight.do("key", work) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.get_metrics()["leaders"] == 1
+
+    async def test_follower_takes_over_when_leader_is_cancelled(self):
+        flight = SingleFlight()
+        started = []
+
+        async def work():
+            started.append(asyncio.current_task())
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == "done"
+        assert len(started) == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    async def test_window_reuses_recent_results(self):
+        flight = SingleFlight(window=0.05)
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 1
+        await asyncio.sleep(0.06)
+        assert await flight.do("key", work) == 2
+
+
+@pytest.mark.offline
+async def test_concurrent_identical_prompts_call_llm_once():
+    cache = MemoryKV()
+    calls = []
+
+    async def llm(prompt, system_prompt=None, **kwargs):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"answer to {prompt}"
+
+    collectors = [[] for _ in range(3)]
+    results = await asyncio.gather(
+        *(
+            use_llm_func_with_cache(
+                "same chunk",
+                llm,
+                llm_response_cache=cache,
+                system_prompt="extract",
+                cache_keys_collector=collector,
+            )
+            for collector in collectors
+        )
+    )
+
+    assert calls == ["same chunk"]
+    assert {content for content, _ in results} == {"answer to same chunk"}
+    # Every caller references the cached response
+    assert all(collector == collectors[0] != [] for collector in collectors)
+    assert len(cache.data) == 1
+
+    # A second cache namespace (another workspace) does not share the call
+    await use_llm_func_with_cache(
+        "same chunk", llm, llm_response_cache=MemoryKV(), system_prompt="extract"
+    )
+    assert len(calls) == 2
+
+
+@pytest.mark.offline
+class TestEmbeddingCoalescing:
+    def make_func(self, **kwargs):
+        batches = []
+
+        async def embed(texts, **call_kwargs):
+            batches.append(list(texts))
+            await asyncio.sleep(0.01)
+            return np.array([[float(len(text)), 1.0] for text in texts])
+
+        return EmbeddingFunc(embedding_dim=2, func=embed, **kwargs), batches
+
+    async def test_identical_texts_are_embedded_once(self):
+        func, batches = self.make_func()
+
+        first, second = await asyncio.gather(
+            func(["alpha", "beta", "alpha"]), func(["beta", "gamma"], _priority=5)
+        )
+
+        assert batches == [["alpha", "beta"], ["gamma"]]
+        assert first.tolist() == [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0]]
+        assert second.tolist() == [[4.0, 1.0], [5.0, 1.0]]
+
+    async def test_window_and_opt_out(self):
+        func, batches = self.make_func(coalesce_window=10)
+        await func(["alpha"])
+        await func(["alpha"])
+        assert batches == [["alpha"]]
+
+        func, batches = self.make_func(coalesce=False)
+        await asyncio.gather(func(["alpha"]), func(["alpha"]))
+        assert batches == [["alpha"], ["alpha"]]
+
+    async def test_errors_reach_all_callers(self):
+        async def embed(texts):
+            await asyncio.sleep(0.01)
+            raise ConnectionError("embedding service down")
+
+        func = EmbeddingFunc(embedding_dim=2, func=embed)
+        results = await asyncio.gather(
+            func(["alpha"]), func(["alpha"]), return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
@@ -0,0 +1,133 @@
+"""
+Tests for the concurrent, incremental map-reduce description summarization.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from lightrag.operate import _handle_entity_relation_summary
+from lightrag.utils import Tokenizer
+
+
+class WordTokenizer:
+    """One token per whitespace separated word"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, content):
+        self.encoded.append(content)
+        return list(range(len(content.split())))
+
+    def decode(self, tokens):
+        return " ".join("w" for _ in tokens)
+
+
+class FakeLLM:
+    """Summarizes to a fixed size summary and records concurrency"""
+
+    def __init__(self, summary_words=5):
+        self.summary_words = summary_words
+        self.prompts = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return " ".join(["summary"] * self.summary_words) + f" {len(self.prompts)}"
+
+
+def make_config(llm, tokenizer, **overrides):
+    config = {
+        "llm_model_func": llm,
+        "tokenizer": Tokenizer("words", tokenizer),
+        "summary_context_size": 40,
+        "summary_max_tokens": 20,
+        "summary_length_recommended": 10,
+        "force_llm_summary_on_merge": 4,
+        "addon_params": {},
+        "summary_incremental": True,
+    }
+    config.update(overrides)
+    return config
+
+
+def descriptions_in(prompt):
+    return [
+        json.loads(line)["Description"]
+        for line in prompt.splitlines()
+        if line.startswith('{"Description"')
+    ]
+
+
+@pytest.mark.offline
+class TestSummaryMapReduce:
+    async def test_groups_are_summarized_concurrently(self):
+        llm, tokenizer = FakeLLM(), WordTokenizer()
+        descriptions = [f"desc {i} " + "word " * 12 for i in range(12)]
+
+        summary, llm_used = await _handle_entity_relation_summary(
+            "Entity", "Hub", descriptions, "<SEP>", make_config(llm, tokenizer)
+        )
+
+        assert llm_used and summary.startswith("summary")
+        # 12 descriptions of 14 tokens => 6 groups in the first map phase
+        assert llm.max_running > 1
+        # Token counts are cached: each description is encoded once
+        assert all(tokenizer.encoded.count(desc) == 1 for desc in descriptions)
+
+    async def test_incremental_keeps_existing_summary_out_of_map_phase(self):
+        llm, tokenizer = FakeLLM(), WordTokenizer()
+        existing = "existing " * 15
+        new = [f"new {i} " + "word " * 12 for i in range(6)]
+
+        await _handle_entity_relation_summary(
+            "Entity",
+            "Hub",
+            [existing] + new,
+            "<SEP>",
+            make_config(llm, tokenizer),
+            existing_count=1,
+        )
+
+        *map_prompts, final_prompt = llm.prompts
+        assert map_prompts
+        assert all(existing not in descriptions_in(p) for p in map_prompts)
+        assert descriptions_in(final_prompt)[0] == existing
+
+    async def test_oversized_existing_summary_is_reduced_with_new_descriptions(self):
+        llm, tokenizer = FakeLLM(), WordTokenizer()
+        existing = "existing " * 30  # above summary_max_tokens
+        new = [f"new {i} " + "word " * 12 for i in range(6)]
+
+        await _handle_entity_relation_summary(
+            "Entity",
+            "Hub",
+            [existing] + new,
+            "<SEP>",
+            make_config(llm, tokenizer),
+            existing_count=1,
+        )
+
+        assert existing in descriptions_in(llm.prompts[0])
+
+    async def test_small_lists_are_joined_without_llm(self):
+        llm, tokenizer = FakeLLM(), WordTokenizer()
+
+        summary, llm_used = await _handle_entity_relation_summary(
+            "Entity",
+            "Small",
+            ["existing summary", "a new fact"],
+            "<SEP>",
+            make_config(llm, tokenizer),
+            existing_count=1,
+        )
+
+        assert summary == "existing summary<SEP>a new fact"
+        assert not llm_used and not llm.prompts